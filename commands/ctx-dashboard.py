@@ -12,15 +12,22 @@ Beautiful, real-time dashboard showing:
 - Matcher efficiency
 - Recent errors
 - System health
+
+Usage:
+    ctx-dashboard.py            # Render once (full-table analysis)
+    ctx-dashboard.py --watch    # Live: apply only new rows, redraw on change
 """
 
+import argparse
 import sys
+import time
 from pathlib import Path
 
 # Add lib directory to path
 PLUGIN_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PLUGIN_ROOT / "lib"))
 
+from live_stats import LiveStats
 from observability_db import ObservabilityDB
 import json
 from datetime import datetime
@@ -38,11 +45,45 @@ def format_duration(seconds: float) -> str:
         return f"{seconds/86400:.1f}d ago"
 
 
+DB_PATH = ".contextune/observability.db"
+
+# Clear screen and move the cursor home (watch mode redraws in place)
+CLEAR_SCREEN = "\033[H\033[J"
+
+
 def render_dashboard():
     """Render comprehensive observability dashboard."""
-    db = ObservabilityDB(".contextune/observability.db")
-    stats = db.get_stats()
+    db = ObservabilityDB(DB_PATH)
+    render(db.get_stats(), db.get_recent_detections(5), db.get_error_summary(24))
+
+
+def watch_dashboard(interval: float = 2.0):
+    """
+    Live dashboard: poll for new rows and redraw only when something changed.
 
+    Each refresh costs time proportional to the new activity, not the
+    history size (see lib/live_stats.py).
+    """
+    ObservabilityDB(DB_PATH)  # Create the schema if this is a fresh project
+    live = LiveStats(DB_PATH)
+    try:
+        first = True
+        while True:
+            if live.poll() or first:
+                first = False
+                print(CLEAR_SCREEN, end="")
+                render(live.stats(), list(live.recent_detections), live.recent_error_summary(24))
+                print(f"👀 Watching {DB_PATH} (every {interval:g}s, Ctrl+C to stop) "
+                      f"- updated {datetime.now().strftime('%H:%M:%S')}")
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print()
+    finally:
+        live.close()
+
+
+def render(stats: dict, recent: list[dict], recent_errors: list[dict]):
+    """Print the dashboard for get_stats()-shaped stats."""
     print("=" * 70)
     print("🎯 CONTEXTUNE OBSERVABILITY DASHBOARD".center(70))
     print("=" * 70)
@@ -114,7 +155,6 @@ def render_dashboard():
         print()
 
     # === RECENT DETECTIONS ===
-    recent = db.get_recent_detections(5)
     if recent:
         print("🔍 RECENT DETECTIONS (Last 5)")
         print("-" * 70)
@@ -145,7 +185,6 @@ def render_dashboard():
             print()
 
         # Recent errors
-        recent_errors = db.get_error_summary(24)
         if recent_errors:
             print("  Recent Errors (Last 24h):")
             for err in recent_errors[:3]:
@@ -223,8 +262,18 @@ def render_dashboard():
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Contextune observability dashboard")
+    parser.add_argument("--watch", action="store_true",
+                        help="Keep running and redraw as new metrics arrive")
+    parser.add_argument("--interval", type=float, default=2.0,
+                        help="Seconds between polls in watch mode (default: 2)")
+    args = parser.parse_args()
+
     try:
-        render_dashboard()
+        if args.watch:
+            watch_dashboard(args.interval)
+        else:
+            render_dashboard()
     except FileNotFoundError:
         print("⚠ No observability data yet. Use Contextune first to collect metrics!")
         sys.exit(0)
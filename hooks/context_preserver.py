@@ -16,8 +16,13 @@ Benefits:
 - Compaction clears old discussion (reduces bloat)
 - Working context stays focused on current plan
 - Cumulative documentation without context pollution
+
+PreCompact fires repeatedly in long sessions; a transcript cursor keeps the
+offset from the previous run so only newly appended lines are scanned for
+completed plans.
 """
 
+import io
 import json
 import sys
 import re
@@ -28,6 +33,17 @@ import yaml
 
 # Import extraction functions from session_end_extractor
 sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+
+import tracing
+from content_writer import ContentWriter
+from extraction_patterns import scan_markers
+from job_queue import JobQueue, job_queue_dir, spawn_worker
+from transcript_cursor import TranscriptCursor
+from transcript_io import iter_entries_reverse
+
+CURSOR_CONSUMER = "context_preserver"
+JOB_KIND = "precompact_preserve"
 
 # High-value patterns for in-progress work
 HIGH_VALUE_PATTERNS = [
@@ -43,32 +59,9 @@ HIGH_VALUE_PATTERNS = [
     r'task-\d+\.md',
 ]
 
-# Plan completion markers
-PLAN_COMPLETION_MARKERS = [
-    r'\*\*Type:\*\* (Design|Plan|Architecture)',
-    r'\*\*Status:\*\* (Complete|Ready)',
-    r'## Success Criteria',
-    r'## Task Breakdown',
-    r'Ready for: /ctx:plan',
-    r'Ready for: /ctx:execute',
-]
-
-def read_full_transcript(transcript_path: str) -> List[dict]:
-    """
-    Read full conversation transcript.
-
-    Args:
-        transcript_path: Path to transcript JSONL file
-
-    Returns:
-        List of conversation entries
-    """
-    try:
-        with open(transcript_path, 'r') as f:
-            return [json.loads(line) for line in f if line.strip()]
-    except Exception as e:
-        print(f"DEBUG: Failed to read transcript: {e}", file=sys.stderr)
-        return []
+# Plan completion markers (see extraction_patterns.MARKER_CATEGORIES['completion']):
+#   **Type:** Design|Plan|Architecture, **Status:** Complete|Ready,
+#   ## Success Criteria, ## Task Breakdown, Ready for: /ctx:plan|/ctx:execute
 
 def extract_assistant_text(entry: dict) -> Optional[str]:
     """Extract text from assistant message entry."""
@@ -102,26 +95,22 @@ def is_completed_plan(text: str) -> int:
     if not text:
         return 0
 
-    count = 0
-    for pattern in PLAN_COMPLETION_MARKERS:
-        matches = re.findall(pattern, text, re.IGNORECASE)
-        count += len(matches)
-
-    return count
+    return scan_markers(text)['completion']
 
-def extract_plans_from_transcript(transcript: List[dict]) -> List[dict]:
+def extract_plans_from_transcript(transcript: List[dict], start_index: int = 0) -> List[dict]:
     """
     Extract all completed plans from conversation.
 
     Args:
-        transcript: Full conversation transcript
+        transcript: Conversation entries (full, or appended since a cursor)
+        start_index: Absolute index of the first entry
 
     Returns:
         List of {index, timestamp, content, completion_score} dicts
     """
     plans = []
 
-    for i, entry in enumerate(transcript):
+    for i, entry in enumerate(transcript, start_index):
         text = extract_assistant_text(entry)
         if not text:
             continue
@@ -188,16 +177,18 @@ def save_plan_to_disk(project_root: Path, plan: dict, session_id: str) -> bool:
         plans_dir = project_root / '.plans' / topic_slug
         plans_dir.mkdir(parents=True, exist_ok=True)
 
-        # Write design.md
+        # Write design.md (skipped when this checkpoint is already on disk)
         design_file = plans_dir / 'design.md'
-        with open(design_file, 'w') as f:
-            f.write(content)
-
-        print(f"DEBUG: ✅ Checkpoint: Saved plan to {design_file}", file=sys.stderr)
+        writer = ContentWriter(plans_dir)
+        if writer.write_text(design_file, content):
+            print(f"DEBUG: ✅ Checkpoint: Saved plan to {design_file}", file=sys.stderr)
+        else:
+            print(f"DEBUG: Checkpoint unchanged: {design_file}", file=sys.stderr)
 
         # Extract and save tasks if present
         yaml_blocks = extract_yaml_blocks(content)
         task_count = 0
+        tasks_changed = 0
 
         for yaml_data in yaml_blocks:
             if 'tasks' in yaml_data and isinstance(yaml_data['tasks'], list):
@@ -211,21 +202,25 @@ def save_plan_to_disk(project_root: Path, plan: dict, session_id: str) -> bool:
                     task_id = task.get('id', f'task-{task_count + 1}')
                     task_file = tasks_dir / f"{task_id}.md"
 
-                    with open(task_file, 'w') as f:
-                        # YAML frontmatter
-                        f.write('---\n')
-                        yaml.dump(task, f, default_flow_style=False, sort_keys=False)
-                        f.write('---\n\n')
+                    f = io.StringIO()
+                    # YAML frontmatter
+                    f.write('---\n')
+                    yaml.dump(task, f, default_flow_style=False, sort_keys=False)
+                    f.write('---\n\n')
 
-                        # Task body
-                        title = task.get('title', 'Untitled')
-                        f.write(f"# {task_id}: {title}\n\n")
-                        f.write(task.get('description', '(To be filled in)\n'))
+                    # Task body
+                    title = task.get('title', 'Untitled')
+                    f.write(f"# {task_id}: {title}\n\n")
+                    f.write(task.get('description', '(To be filled in)\n'))
+                    if writer.write_text(task_file, f.getvalue()):
+                        tasks_changed += 1
 
                     task_count += 1
 
+        writer.save()
+
         if task_count:
-            print(f"DEBUG: ✅ Checkpoint: Saved {task_count} task files", file=sys.stderr)
+            print(f"DEBUG: ✅ Checkpoint: Saved {task_count} task files ({tasks_changed} changed)", file=sys.stderr)
 
         return True
 
@@ -234,27 +229,20 @@ def save_plan_to_disk(project_root: Path, plan: dict, session_id: str) -> bool:
         return False
 
 def extract_last_message_for_scratch_pad(transcript_path: str) -> Optional[str]:
-    """Extract last Claude message for scratch_pad."""
+    """Extract last Claude message for scratch_pad (reads only the tail)."""
     try:
-        with open(transcript_path, 'r') as f:
-            lines = f.readlines()
-
-        for line in reversed(lines):
-            try:
-                entry = json.loads(line)
-                if entry.get('type') == 'assistant':
-                    message = entry.get('message', {})
-                    if isinstance(message, dict):
-                        content = message.get('content', [])
-                        if isinstance(content, list):
-                            text = ' '.join(
-                                block.get('text', '')
-                                for block in content
-                                if block.get('type') == 'text'
-                            )
-                            return text if text.strip() else None
-            except json.JSONDecodeError:
-                continue
+        for entry in iter_entries_reverse(Path(transcript_path)):
+            if entry.get('type') == 'assistant':
+                message = entry.get('message', {})
+                if isinstance(message, dict):
+                    content = message.get('content', [])
+                    if isinstance(content, list):
+                        text = ' '.join(
+                            block.get('text', '')
+                            for block in content
+                            if block.get('type') == 'text'
+                        )
+                        return text if text.strip() else None
 
         return None
 
@@ -276,6 +264,86 @@ def write_scratch_pad(project_root: Path, content: str, session_id: str):
 
     print(f"DEBUG: ✅ Preserved in-progress work to scratch_pad.md", file=sys.stderr)
 
+def find_project_root(transcript_path: str) -> Path:
+    """Nearest ancestor of the transcript with .git or pyproject.toml (else cwd)."""
+    temp_root = Path(transcript_path).parent
+    while temp_root.parent != temp_root:
+        if (temp_root / '.git').exists() or (temp_root / 'pyproject.toml').exists():
+            return temp_root
+        temp_root = temp_root.parent
+    return Path.cwd()
+
+@tracing.span("checkpoint_plans")
+def checkpoint_plans(transcript_path: str, session_id: str) -> int:
+    """
+    Save COMPLETED plans to .plans/ (checkpoint pattern).
+
+    Runs in the background job worker. Plans before the transcript cursor
+    were checkpointed by an earlier PreCompact, so a retried job does not
+    save them again.
+
+    Returns: Number of plans saved
+    """
+    project_root = find_project_root(transcript_path)
+    print(f"DEBUG: Project root: {project_root}", file=sys.stderr)
+
+    cursor = TranscriptCursor(session_id, CURSOR_CONSUMER, Path(transcript_path))
+    base_index = cursor.entry_count
+    transcript = cursor.read_new()
+    print(
+        f"DEBUG: Scanning {len(transcript)} new entries for completed plans "
+        f"({base_index} already checkpointed)...",
+        file=sys.stderr,
+    )
+    completed_plans = extract_plans_from_transcript(transcript, base_index)
+
+    print(f"DEBUG: Found {len(completed_plans)} completed plans", file=sys.stderr)
+
+    plans_saved = 0
+    for plan in completed_plans:
+        if save_plan_to_disk(project_root, plan, session_id):
+            plans_saved += 1
+
+    if plans_saved:
+        print(f"DEBUG: 🎯 Checkpoint: {plans_saved} completed plans saved to .plans/", file=sys.stderr)
+
+    cursor.state["plans_saved"] = cursor.state.get("plans_saved", 0) + plans_saved
+    cursor.save()
+
+    print(f"DEBUG: 📋 Checkpoint Summary:", file=sys.stderr)
+    print(f"DEBUG:   Completed plans: {plans_saved} saved to .plans/ "
+          f"({cursor.state.get('plans_saved', 0)} this session)", file=sys.stderr)
+    return plans_saved
+
+@tracing.span("preserve_in_progress")
+def preserve_in_progress(transcript_path: str, session_id: str) -> bool:
+    """
+    Preserve IN-PROGRESS work to scratch_pad.md.
+
+    Runs inline in the hook (it only reads the transcript tail), so the
+    scratch pad is in place before SessionStart restores it after
+    compaction.
+
+    Returns: True if scratch_pad.md was written
+    """
+    last_message = extract_last_message_for_scratch_pad(transcript_path)
+    if not last_message:
+        return False
+
+    # Check if last message is in-progress work (not a completed plan)
+    if is_completed_plan(last_message) >= 2:
+        print(f"DEBUG: Last message is completed plan (extracted by checkpoint job)", file=sys.stderr)
+        return False
+
+    pattern_count = len([p for p in HIGH_VALUE_PATTERNS
+                       if re.search(p, last_message, re.IGNORECASE)])
+    if pattern_count < 3:
+        return False
+
+    write_scratch_pad(find_project_root(transcript_path), last_message, session_id)
+    print(f"DEBUG: ✅ Preserved in-progress work ({pattern_count} patterns)", file=sys.stderr)
+    return True
+
 def main():
     """
     Enhanced PreCompact hook with checkpoint pattern.
@@ -283,9 +351,15 @@ def main():
     1. Extracts COMPLETED plans to .plans/ (checkpoints)
     2. Preserves IN-PROGRESS work to scratch_pad.md
     3. Enables compact-after-plan workflow
+
+    The scratch pad is written inline (tail read only) so it is ready for
+    the SessionStart after compaction. Plan extraction is queued as a
+    background job so the 2s hook window is never spent parsing the whole
+    transcript; falls back to running inline if the job cannot be queued.
     """
     try:
-        hook_data = json.loads(sys.stdin.read())
+        with tracing.span("parse_stdin"):
+            hook_data = json.loads(sys.stdin.read())
 
         transcript_path = hook_data.get('transcript_path', '')
         session_id = hook_data.get('session_id', 'unknown')
@@ -299,55 +373,22 @@ def main():
             print(json.dumps(output))
             sys.exit(0)
 
-        # Find project root
-        project_root = Path.cwd()
-        transcript_dir = Path(transcript_path).parent
-        temp_root = transcript_dir
-        while temp_root.parent != temp_root:
-            if (temp_root / '.git').exists() or (temp_root / 'pyproject.toml').exists():
-                project_root = temp_root
-                break
-            temp_root = temp_root.parent
+        saved = preserve_in_progress(transcript_path, session_id)
+        print(f"DEBUG:   In-progress work: {'saved to scratch_pad.md' if saved else 'none'}", file=sys.stderr)
 
-        print(f"DEBUG: Project root: {project_root}", file=sys.stderr)
-
-        # Step 1: Extract COMPLETED plans (checkpoint pattern)
-        print(f"DEBUG: Scanning for completed plans...", file=sys.stderr)
-        transcript = read_full_transcript(transcript_path)
-        completed_plans = extract_plans_from_transcript(transcript)
-
-        print(f"DEBUG: Found {len(completed_plans)} completed plans", file=sys.stderr)
-
-        plans_saved = 0
-        for plan in completed_plans:
-            if save_plan_to_disk(project_root, plan, session_id):
-                plans_saved += 1
-
-        if plans_saved:
-            print(f"DEBUG: 🎯 Checkpoint: {plans_saved} completed plans saved to .plans/", file=sys.stderr)
-
-        # Step 2: Preserve IN-PROGRESS work to scratch_pad.md
-        last_message = extract_last_message_for_scratch_pad(transcript_path)
-
-        if last_message:
-            # Check if last message is in-progress work (not a completed plan)
-            completion_score = is_completed_plan(last_message)
-
-            if completion_score < 2:
-                # In-progress work - save to scratch_pad
-                pattern_count = len([p for p in HIGH_VALUE_PATTERNS
-                                   if re.search(p, last_message, re.IGNORECASE)])
-
-                if pattern_count >= 3:
-                    write_scratch_pad(project_root, last_message, session_id)
-                    print(f"DEBUG: ✅ Preserved in-progress work ({pattern_count} patterns)", file=sys.stderr)
-            else:
-                print(f"DEBUG: Last message is completed plan (already extracted)", file=sys.stderr)
-
-        # Summary
-        print(f"DEBUG: 📋 Checkpoint Summary:", file=sys.stderr)
-        print(f"DEBUG:   Completed plans: {plans_saved} saved to .plans/", file=sys.stderr)
-        print(f"DEBUG:   In-progress work: {'saved to scratch_pad.md' if last_message and completion_score < 2 else 'none'}", file=sys.stderr)
+        project_root = Path(hook_data.get('cwd') or Path.cwd())
+        try:
+            queue = JobQueue(job_queue_dir(project_root))
+            job = queue.enqueue(
+                JOB_KIND,
+                {'transcript_path': transcript_path, 'session_id': session_id},
+                dedupe_key=f"{JOB_KIND}:{session_id}",
+            )
+            spawn_worker(project_root)
+            print(f"DEBUG: Queued checkpoint job {job.id}", file=sys.stderr)
+        except Exception as e:
+            print(f"DEBUG: Could not queue job ({e}), checkpointing inline", file=sys.stderr)
+            checkpoint_plans(transcript_path, session_id)
 
     except Exception as e:
         print(f"DEBUG: Checkpoint failed: {e}", file=sys.stderr)
@@ -360,4 +401,5 @@ def main():
     sys.exit(0)
 
 if __name__ == '__main__':
-    main()
+    with tracing.trace("context_preserver"):
+        main()
@@ -22,7 +22,10 @@ import sys
 from pathlib import Path
 from typing import Any
 
-import yaml
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+
+import tracing
+import yaml_cache
 
 
 def log(message: str, data: dict[str, Any] | None = None) -> None:
@@ -33,6 +36,7 @@ def log(message: str, data: dict[str, Any] | None = None) -> None:
     print(json.dumps(log_entry), file=sys.stderr)
 
 
+@tracing.span("find_plan")
 def get_plan_path() -> Path | None:
     """Get path to current plan.yaml.
 
@@ -55,6 +59,7 @@ def get_plan_path() -> Path | None:
     return None
 
 
+@tracing.span("create_features")
 def create_features_from_tasks(plan_path: Path) -> list[str]:
     """Create HtmlGraph features for each task in plan.
 
@@ -75,8 +80,7 @@ def create_features_from_tasks(plan_path: Path) -> list[str]:
             return []
 
         # Load plan
-        with open(plan_path) as f:
-            plan_data = yaml.safe_load(f)
+        plan_data = yaml_cache.load_file(plan_path)
 
         if not plan_data:
             log("Empty plan file", {"path": str(plan_path)})
@@ -176,7 +180,8 @@ def main() -> None:
     """Hook entry point."""
     try:
         # Read hook input (PostToolUse format)
-        input_data = json.loads(sys.stdin.read())
+        with tracing.span("parse_stdin"):
+            input_data = json.loads(sys.stdin.read())
 
         # Get plan path
         plan_path = get_plan_path()
@@ -215,4 +220,5 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    with tracing.trace("contextune_execute_tracker"):
+        main()
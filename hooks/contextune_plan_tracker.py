@@ -22,7 +22,10 @@ import sys
 from pathlib import Path
 from typing import Any
 
-import yaml
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+
+import tracing
+import yaml_cache
 
 
 def log(message: str, data: dict[str, Any] | None = None) -> None:
@@ -33,6 +36,7 @@ def log(message: str, data: dict[str, Any] | None = None) -> None:
     print(json.dumps(log_entry), file=sys.stderr)
 
 
+@tracing.span("find_plan")
 def find_recent_plan() -> Path | None:
     """Find most recently created plan.yaml.
 
@@ -56,6 +60,7 @@ def find_recent_plan() -> Path | None:
     return max(plan_files, key=lambda p: p.stat().st_mtime)
 
 
+@tracing.span("create_track")
 def create_track_from_plan(plan_path: Path) -> str | None:
     """Create HtmlGraph track from plan.
 
@@ -75,8 +80,7 @@ def create_track_from_plan(plan_path: Path) -> str | None:
             return None
 
         # Load plan
-        with open(plan_path) as f:
-            plan_data = yaml.safe_load(f)
+        plan_data = yaml_cache.load_file(plan_path)
 
         if not plan_data:
             log("Empty plan file", {"path": str(plan_path)})
@@ -117,8 +121,7 @@ def create_track_from_plan(plan_path: Path) -> str | None:
         plan_data["metadata"] = metadata
 
         # Write back to plan.yaml
-        with open(plan_path, 'w') as f:
-            yaml.dump(plan_data, f, default_flow_style=False, sort_keys=False)
+        yaml_cache.dump_file(plan_path, plan_data)
 
         log("Updated plan with track_id", {"plan_path": str(plan_path)})
 
@@ -133,7 +136,8 @@ def main() -> None:
     """Hook entry point."""
     try:
         # Read hook input (PostToolUse format)
-        input_data = json.loads(sys.stdin.read())
+        with tracing.span("parse_stdin"):
+            input_data = json.loads(sys.stdin.read())
 
         # Check if this was a plan creation command
         # We detect this by looking for recent plan.yaml files
@@ -182,4 +186,5 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    with tracing.trace("contextune_plan_tracker"):
+        main()
@@ -29,6 +29,10 @@ import re
 from pathlib import Path
 from datetime import datetime
 
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+
+import tracing
+
 # Preference storage
 PREFERENCE_FILE = Path.home() / ".claude" / "plugins" / "contextune" / "data" / "git_workflow_preferences.json"
 
@@ -63,6 +67,7 @@ SCRIPT_SUGGESTIONS = {
     }
 }
 
+@tracing.span("read_preference")
 def read_preference() -> dict:
     """
     Read user's git workflow preference.
@@ -96,6 +101,7 @@ def write_preference(auto_use_scripts: bool):
     with open(PREFERENCE_FILE, 'w') as f:
         json.dump(data, f, indent=2)
 
+@tracing.span("detect_workflow")
 def detect_git_workflow(command: str) -> tuple[bool, dict]:
     """
     Detect if command contains multi-step git workflow.
@@ -204,7 +210,8 @@ def main():
     """PreToolUse hook entry point."""
 
     try:
-        hook_data = json.loads(sys.stdin.read())
+        with tracing.span("parse_stdin"):
+            hook_data = json.loads(sys.stdin.read())
 
         tool = hook_data.get('tool', {})
         tool_name = tool.get('name', '')
@@ -271,4 +278,5 @@ def main():
     sys.exit(0)
 
 if __name__ == '__main__':
-    main()
+    with tracing.trace("git_workflow_detector"):
+        main()
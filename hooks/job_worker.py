@@ -0,0 +1,122 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.10"
+# dependencies = ["pyyaml>=6.0"]
+# ///
+"""
+Background Job Worker - Drains hook jobs queued under .contextune/jobs/
+
+SessionEnd (session_end_extractor.py) and PreCompact (context_preserver.py)
+queue their heavy transcript work and spawn this worker detached, so the
+hook itself returns in milliseconds. Only one worker drains a project's
+queue at a time; later spawns exit immediately and their jobs are picked
+up by the running worker.
+
+Usage:
+    job_worker.py drain [--project PATH] [--budget SECONDS]
+    job_worker.py status [--project PATH] [--json]
+"""
+
+import argparse
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+
+import tracing
+from job_queue import Job, JobQueue, job_queue_dir
+
+# Upper bound for one detached drain (retries included)
+DRAIN_BUDGET_SECONDS = 300.0
+
+
+@tracing.span("session_end_extract")
+def run_session_end_extract(job: Job, queue: JobQueue) -> None:
+    import session_end_extractor
+
+    session_end_extractor.extract_session(
+        job.payload["transcript_path"],
+        job.payload["session_id"],
+        checkpoint=lambda **progress: queue.checkpoint(job, **progress),
+        done_steps=job.progress.get("steps", []),
+    )
+
+
+@tracing.span("precompact_preserve")
+def run_precompact_preserve(job: Job, queue: JobQueue) -> None:
+    import context_preserver
+
+    context_preserver.checkpoint_plans(job.payload["transcript_path"], job.payload["session_id"])
+
+
+HANDLERS = {
+    "session_end_extract": run_session_end_extract,
+    "precompact_preserve": run_precompact_preserve,
+}
+
+
+def format_time(timestamp: float | None) -> str:
+    if not timestamp:
+        return "-"
+    return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def print_status(queue: JobQueue, as_json: bool) -> None:
+    status = queue.status()
+
+    if as_json:
+        print(json.dumps(
+            {state: [json.loads(job.to_json()) for job in jobs] for state, jobs in status.items()},
+            indent=2,
+        ))
+        return
+
+    print("Job queue: " + ", ".join(f"{state} {len(jobs)}" for state, jobs in status.items()))
+    for state in ("running", "pending", "failed"):
+        for job in status[state]:
+            line = f"  [{state}] {job.kind} {job.id} attempts={job.attempts}/{job.max_attempts}"
+            if job.progress.get("steps"):
+                line += f" steps={','.join(job.progress['steps'])}"
+            if state == "pending" and job.not_before:
+                line += f" retry_at={format_time(job.not_before)}"
+            print(line)
+            if job.error:
+                print(f"      error: {job.error}")
+    recent = status["done"][-5:]
+    if recent:
+        print("  recently done:")
+        for job in reversed(recent):
+            print(f"    {format_time(job.finished_at)} {job.kind} {job.id}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Drain or inspect background hook jobs")
+    parser.add_argument("command", choices=["drain", "status"])
+    parser.add_argument("--project", type=Path, default=Path.cwd(), help="Project root")
+    parser.add_argument("--budget", type=float, default=DRAIN_BUDGET_SECONDS,
+                        help="Max seconds to spend draining")
+    parser.add_argument("--json", action="store_true", help="Status as JSON")
+    args = parser.parse_args()
+
+    queue = JobQueue(job_queue_dir(args.project))
+
+    if args.command == "status":
+        print_status(queue, args.json)
+        return
+
+    stats = queue.drain(HANDLERS, budget_seconds=args.budget)
+    if stats.get("locked"):
+        print("DEBUG: Another worker is draining this queue", file=sys.stderr)
+    else:
+        print(
+            f"DEBUG: Jobs done={stats['done']} retried={stats['retried']} failed={stats['failed']}",
+            file=sys.stderr,
+        )
+
+
+if __name__ == "__main__":
+    with tracing.trace("job_worker"):
+        main()
@@ -20,8 +20,14 @@ Hook Protocol:
 import json
 import re
 import sys
+from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
 
+import tracing
+
+
+@tracing.span("detect_workflow")
 def detect_git_workflow_in_bash(command: str) -> tuple[bool, str | None, str | None]:
     """
     Detect git multi-tool workflows in Bash commands.
@@ -83,7 +89,8 @@ def main():
     """PreToolUse hook entry point."""
     try:
         # Read hook data from stdin
-        hook_data = json.loads(sys.stdin.read())
+        with tracing.span("parse_stdin"):
+            hook_data = json.loads(sys.stdin.read())
 
         tool_name = hook_data.get("tool_name", "")
         tool_input = hook_data.get("tool_input", {})
@@ -188,4 +195,5 @@ Co-Authored-By: Claude <noreply@anthropic.com>"
 
 
 if __name__ == "__main__":
-    main()
+    with tracing.trace("pre_tool_use_git_advisor"):
+        main()
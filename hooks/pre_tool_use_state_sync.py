@@ -26,7 +26,12 @@ import sys
 from pathlib import Path
 from datetime import datetime
 
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
 
+import tracing
+
+
+@tracing.span("git_status")
 def get_file_git_status(file_path: str) -> tuple[bool, str]:
     """
     Check if file has uncommitted changes or differs from last commit.
@@ -71,6 +76,7 @@ def get_file_git_status(file_path: str) -> tuple[bool, str]:
         return False, "unknown"
 
 
+@tracing.span("git_diff")
 def get_file_diff_summary(file_path: str) -> str:
     """
     Get summary of changes in file since last commit.
@@ -135,7 +141,8 @@ def main():
     """PreToolUse hook entry point."""
     try:
         # Read hook data from stdin
-        hook_data = json.loads(sys.stdin.read())
+        with tracing.span("parse_stdin"):
+            hook_data = json.loads(sys.stdin.read())
 
         tool_name = hook_data.get("tool_name", "")
         tool_input = hook_data.get("tool_input", {})
@@ -227,4 +234,5 @@ git log -1 --oneline -- {file_path}
 
 
 if __name__ == "__main__":
-    main()
+    with tracing.trace("pre_tool_use_state_sync"):
+        main()
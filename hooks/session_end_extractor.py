@@ -7,25 +7,44 @@
 SessionEnd Extractor - Extract completed work to structured files
 
 Runs when session ends (user quits, closes tab, session timeout).
-Scans full conversation transcript and extracts:
+Scans the conversation transcript and extracts:
   - Design proposals → .plans/[topic]/design.md
   - Task breakdowns → .plans/[topic]/tasks/task-*.md
   - Decisions → decisions.yaml (append)
   - Research → decisions.yaml (append)
 
-Zero conversation overhead - runs after session ends.
+Zero conversation overhead - runs after session ends. The hook only queues
+a job under .contextune/jobs/; hooks/job_worker.py does the extraction in
+the background so long transcripts are not cut off by the hook timeout.
+
+Incremental: a transcript cursor remembers the last processed offset per
+session, so a resumed session only scans lines appended since the previous
+SessionEnd. The best design/plan seen so far is carried in cursor state.
 
 Leverages extraction-optimized output style for reliable parsing.
 """
 
+import io
 import json
 import sys
 import re
 from pathlib import Path
 from datetime import datetime
-from typing import Optional
+from typing import Callable, Iterable, Optional
 import yaml
 
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+
+import tracing
+from decision_store import DecisionStore
+from content_writer import ContentWriter
+from extraction_patterns import scan_markers
+from job_queue import JobQueue, job_queue_dir, spawn_worker
+from transcript_cursor import TranscriptCursor
+
+CURSOR_CONSUMER = "session_end_extractor"
+JOB_KIND = "session_end_extract"
+
 
 def extract_designs(transcript: list[dict]) -> list[dict]:
     """
@@ -61,20 +80,7 @@ def extract_designs(transcript: list[dict]) -> list[dict]:
         else:
             continue
 
-        # Detect extraction-optimized design patterns
-        patterns = [
-            r"\*\*Type:\*\* Design",
-            r"## Architecture",
-            r"## Task Breakdown",
-            r"```yaml\n.*?architecture:",
-            r"```yaml\n.*?tasks:",
-            r"\*\*Status:\*\* (Complete|Draft)",
-            r"\*\*Estimated Tokens:\*\*",
-        ]
-
-        pattern_count = sum(
-            len(re.findall(p, text, re.IGNORECASE | re.DOTALL)) for p in patterns
-        )
+        pattern_count = scan_markers(text)["design"]
 
         # Require at least 3 patterns for design detection
         if pattern_count >= 3:
@@ -124,19 +130,7 @@ def extract_plans(transcript: list[dict]) -> list[dict]:
         else:
             continue
 
-        # Detect extraction-optimized plan patterns
-        patterns = [
-            r"\*\*Type:\*\* Plan",
-            r"## Plan Structure",
-            r"## Task Details",
-            r"```yaml\n.*?metadata:",
-            r"```yaml\n.*?tasks:",
-            r"\*\*Status:\*\* (Ready|Draft)",
-        ]
-
-        pattern_count = sum(
-            len(re.findall(p, text, re.IGNORECASE | re.DOTALL)) for p in patterns
-        )
+        pattern_count = scan_markers(text)["plan"]
 
         # Require at least 3 patterns for plan detection
         if pattern_count >= 3:
@@ -242,27 +236,35 @@ def write_design_files(project_root: Path, designs: list[dict], session_id: str)
     plans_dir = project_root / ".plans" / topic_slug
     plans_dir.mkdir(parents=True, exist_ok=True)
 
-    # Write design.md
+    # Write design.md and task files (unchanged files are left untouched)
     design_file = plans_dir / "design.md"
-    with open(design_file, "w") as f:
-        f.write(content)
-
-    print(f"DEBUG: ✅ Wrote design to {design_file}", file=sys.stderr)
+    with ContentWriter(plans_dir) as writer:
+        if writer.write_text(design_file, content):
+            print(f"DEBUG: ✅ Wrote design to {design_file}", file=sys.stderr)
+        else:
+            print(f"DEBUG: Design unchanged at {design_file}", file=sys.stderr)
 
-    # Extract and write task files
-    task_count = write_task_files(plans_dir, content)
+        # Extract and write task files
+        task_count = write_task_files(plans_dir, content, writer)
 
     return 1
 
 
-def write_task_files(plans_dir: Path, content: str) -> int:
+def write_task_files(
+    plans_dir: Path, content: str, writer: Optional[ContentWriter] = None
+) -> int:
     """
     Extract tasks from YAML blocks and write individual task files.
 
-    Returns: Number of task files written
+    Returns: Number of task files rendered (unchanged ones are not rewritten)
     """
+    if writer is None:
+        with ContentWriter(plans_dir) as writer:
+            return write_task_files(plans_dir, content, writer)
+
     yaml_blocks = extract_yaml_blocks(content)
     task_count = 0
+    tasks_changed = 0
 
     for yaml_data in yaml_blocks:
         if "tasks" in yaml_data:
@@ -280,53 +282,58 @@ def write_task_files(plans_dir: Path, content: str) -> int:
                 task_id = task.get("id", f"task-{task_count + 1}")
                 task_file = tasks_dir / f"{task_id}.md"
 
-                with open(task_file, "w") as f:
-                    # Write YAML frontmatter
-                    f.write("---\n")
-                    yaml.dump(task, f, default_flow_style=False, sort_keys=False)
-                    f.write("---\n\n")
-
-                    # Write task details
-                    title = task.get("title", "Untitled Task")
-                    f.write(f"# {task_id}: {title}\n\n")
-
-                    f.write("## Description\n\n")
-                    f.write(task.get("description", "(To be filled in)\n\n"))
-
-                    # Files section
-                    files_created = task.get("files_created", [])
-                    files_modified = task.get("files_modified", [])
-
-                    if files_created or files_modified:
-                        f.write("## Files\n\n")
-
-                        if files_created:
-                            f.write("**Created:**\n")
-                            for file_info in files_created:
-                                if isinstance(file_info, dict):
-                                    path = file_info.get("path", "")
-                                    purpose = file_info.get("purpose", "")
-                                    f.write(f"- `{path}` - {purpose}\n")
-
-                        if files_modified:
-                            f.write("\n**Modified:**\n")
-                            for file_info in files_modified:
-                                if isinstance(file_info, dict):
-                                    path = file_info.get("path", "")
-                                    changes = file_info.get("changes", "")
-                                    f.write(f"- `{path}` - {changes}\n")
-
-                    # Validation section
-                    validation = task.get("validation", [])
-                    if validation:
-                        f.write("\n## Validation Checklist\n\n")
-                        for item in validation:
-                            f.write(f"- [ ] {item}\n")
+                f = io.StringIO()
+                # Write YAML frontmatter
+                f.write("---\n")
+                yaml.dump(task, f, default_flow_style=False, sort_keys=False)
+                f.write("---\n\n")
+
+                # Write task details
+                title = task.get("title", "Untitled Task")
+                f.write(f"# {task_id}: {title}\n\n")
+
+                f.write("## Description\n\n")
+                f.write(task.get("description", "(To be filled in)\n\n"))
+
+                # Files section
+                files_created = task.get("files_created", [])
+                files_modified = task.get("files_modified", [])
+
+                if files_created or files_modified:
+                    f.write("## Files\n\n")
+
+                    if files_created:
+                        f.write("**Created:**\n")
+                        for file_info in files_created:
+                            if isinstance(file_info, dict):
+                                path = file_info.get("path", "")
+                                purpose = file_info.get("purpose", "")
+                                f.write(f"- `{path}` - {purpose}\n")
+
+                    if files_modified:
+                        f.write("\n**Modified:**\n")
+                        for file_info in files_modified:
+                            if isinstance(file_info, dict):
+                                path = file_info.get("path", "")
+                                changes = file_info.get("changes", "")
+                                f.write(f"- `{path}` - {changes}\n")
+
+                # Validation section
+                validation = task.get("validation", [])
+                if validation:
+                    f.write("\n## Validation Checklist\n\n")
+                    for item in validation:
+                        f.write(f"- [ ] {item}\n")
+                if writer.write_text(task_file, f.getvalue()):
+                    tasks_changed += 1
 
                 task_count += 1
 
     if task_count:
-        print(f"DEBUG: ✅ Wrote {task_count} task files", file=sys.stderr)
+        print(
+            f"DEBUG: ✅ Wrote {task_count} task files ({tasks_changed} changed)",
+            file=sys.stderr,
+        )
 
     return task_count
 
@@ -366,17 +373,19 @@ def write_plan_files(project_root: Path, plans: list[dict], session_id: str) ->
     plans_dir = project_root / ".parallel" / "plans"
     plans_dir.mkdir(parents=True, exist_ok=True)
 
-    # Write plan.yaml
+    # Write plan.yaml (skipped when the rendered content is unchanged)
+    writer = ContentWriter(plans_dir)
     plan_file = plans_dir / "plan.yaml"
-    with open(plan_file, "w") as f:
-        yaml.dump(plan_data, f, default_flow_style=False, sort_keys=False)
-
-    print(f"DEBUG: ✅ Wrote plan to {plan_file}", file=sys.stderr)
+    if writer.write_yaml(plan_file, plan_data):
+        print(f"DEBUG: ✅ Wrote plan to {plan_file}", file=sys.stderr)
+    else:
+        print(f"DEBUG: Plan unchanged at {plan_file}", file=sys.stderr)
 
     # Extract and write task files from ## Task Details sections
     task_pattern = r"### Task (\d+):\s*(.+?)\n.*?```yaml\n(.*?)```\n(.*?)(?=###|---|\Z)"
     task_matches = re.findall(task_pattern, content, re.DOTALL)
 
+    tasks_changed = 0
     if task_matches:
         tasks_dir = plans_dir / "tasks"
         tasks_dir.mkdir(exist_ok=True)
@@ -393,23 +402,28 @@ def write_plan_files(project_root: Path, plans: list[dict], session_id: str) ->
             task_id = task_yaml.get("id", f"task-{task_num}")
             task_file = tasks_dir / f"{task_id}.md"
 
-            with open(task_file, "w") as f:
-                # Write YAML frontmatter
-                f.write("---\n")
-                yaml.dump(task_yaml, f, default_flow_style=False, sort_keys=False)
-                f.write("---\n\n")
+            f = io.StringIO()
+            # Write YAML frontmatter
+            f.write("---\n")
+            yaml.dump(task_yaml, f, default_flow_style=False, sort_keys=False)
+            f.write("---\n\n")
 
-                # Write task name
-                f.write(f"# {task_name.strip()}\n\n")
+            # Write task name
+            f.write(f"# {task_name.strip()}\n\n")
 
-                # Write task content
-                f.write(task_content.strip())
-                f.write("\n")
+            # Write task content
+            f.write(task_content.strip())
+            f.write("\n")
+            if writer.write_text(task_file, f.getvalue()):
+                tasks_changed += 1
 
         print(
-            f"DEBUG: ✅ Wrote {len(task_matches)} task files", file=sys.stderr
+            f"DEBUG: ✅ Wrote {len(task_matches)} task files ({tasks_changed} changed)",
+            file=sys.stderr,
         )
 
+    writer.save()
+
     # Create helper scripts (templates)
     scripts_dir = plans_dir / "scripts"
     templates_dir = plans_dir / "templates"
@@ -453,15 +467,7 @@ def extract_decisions(transcript: list[dict]) -> list[dict]:
         else:
             continue
 
-        decision_patterns = [
-            r"## Decision:",
-            r"\*\*Status:\*\* (Accepted|Proposed|Rejected)",
-            r"### Alternatives Considered",
-            r"### Context",
-            r"### Consequences",
-        ]
-
-        if sum(len(re.findall(p, text, re.IGNORECASE)) for p in decision_patterns) >= 3:
+        if scan_markers(text)["decision"] >= 3:
             decisions.append({"timestamp": entry.get("timestamp", ""), "content": text})
 
     return decisions
@@ -664,7 +670,7 @@ def extract_decision_data(
 
 def append_decisions(project_root: Path, decisions: list[dict], session_id: str) -> int:
     """
-    Append extracted decisions to decisions.yaml.
+    Append extracted decisions to the decision store and re-export decisions.yaml.
 
     Returns: Number of decisions appended
     """
@@ -676,23 +682,15 @@ def append_decisions(project_root: Path, decisions: list[dict], session_id: str)
         print(f"DEBUG: decisions.yaml not found at {decisions_file}", file=sys.stderr)
         return 0
 
-    # Load existing decisions.yaml
+    # decisions.yaml is a generated export of the indexed store
     try:
-        with open(decisions_file, "r") as f:
-            data = yaml.safe_load(f) or {}
+        store = DecisionStore(decisions_file)
     except Exception as e:
-        print(f"DEBUG: Failed to load decisions.yaml: {e}", file=sys.stderr)
+        print(f"DEBUG: Failed to open decision store: {e}", file=sys.stderr)
         return 0
 
-    # Ensure 'decisions' section exists
-    if "decisions" not in data:
-        data["decisions"] = {"entries": []}
-    if "entries" not in data["decisions"]:
-        data["decisions"]["entries"] = []
-
-    # Extract and append each decision
-    appended_count = 0
-    existing_entries = data["decisions"].get("entries", [])
+    new_entries = []
+    batch_ids = set()
 
     for decision_entry in decisions:
         content = decision_entry.get("content", "")
@@ -708,50 +706,138 @@ def append_decisions(project_root: Path, decisions: list[dict], session_id: str)
         timestamp_ms = decision_data["conversation_link"].get("timestamp", 0)
         decision_id = f"dec-{timestamp_ms % 1000000:06d}-{title_slug[:20]}"
 
-        # Check if similar decision already exists
-        existing_ids = [e.get("id") for e in existing_entries if isinstance(e, dict)]
-        if decision_id in existing_ids:
-            print(
-                f"DEBUG: Decision {decision_id} already exists, skipping",
-                file=sys.stderr,
-            )
+        if decision_id in batch_ids:
             continue
+        batch_ids.add(decision_id)
 
         decision_data["id"] = decision_id
+        new_entries.append(decision_data)
 
-        # Append to entries list
-        existing_entries.append(decision_data)
-        appended_count += 1
+    # Primary key dedups against existing entries
+    added = store.add_entries("decisions", new_entries)
+    skipped = len(new_entries) - len(added)
+    if skipped:
+        print(f"DEBUG: {skipped} decisions already exist, skipping", file=sys.stderr)
 
-    # Update entries
-    data["decisions"]["entries"] = existing_entries
+    if not added:
+        return 0
 
-    # Write back to decisions.yaml atomically
+    # Entries are already durable in the journal; fold them into
+    # decisions.yaml unless another writer is compacting right now
     try:
-        with open(decisions_file, "w") as f:
-            yaml.dump(
-                data, f, default_flow_style=False, sort_keys=False, allow_unicode=True
+        if store.compact(blocking=False):
+            print(
+                f"DEBUG: ✅ Appended {len(added)} decisions to decisions.yaml",
+                file=sys.stderr,
             )
+        else:
+            print(
+                f"DEBUG: ✅ Journaled {len(added)} decisions (compaction busy)",
+                file=sys.stderr,
+            )
+    except Exception as e:
+        print(f"DEBUG: Failed to compact decisions.yaml: {e}", file=sys.stderr)
+
+    return len(added)
+
+
+@tracing.span("extract_session")
+def extract_session(
+    transcript_path: str,
+    session_id: str,
+    checkpoint: Optional[Callable[..., None]] = None,
+    done_steps: Iterable[str] = (),
+) -> None:
+    """
+    Extract completed work from a session transcript.
+
+    Runs in the background job worker. checkpoint(steps=[...]) records each
+    finished write step; a retried job passes them back as done_steps and
+    skips them (the transcript cursor is only saved once everything ran, so
+    a retry re-reads the same lines).
+    """
+    done_steps = list(done_steps)
+
+    def finish_step(step: str):
+        done_steps.append(step)
+        if checkpoint:
+            checkpoint(steps=done_steps)
+
+    # Read only entries appended since the previous run for this session
+    cursor = TranscriptCursor(session_id, CURSOR_CONSUMER, Path(transcript_path))
+    base_index = cursor.entry_count
+    transcript = cursor.read_new()
+
+    print(
+        f"DEBUG: Loaded {len(transcript)} new conversation entries "
+        f"({base_index} already processed)",
+        file=sys.stderr,
+    )
+
+    # Find project root from first entry's cwd (remembered across runs)
+    project_root = Path(cursor.state.get("project_root") or Path.cwd())
+    if transcript and "project_root" not in cursor.state:
+        cwd = transcript[0].get("cwd")
+        if cwd:
+            project_root = Path(cwd)
+    cursor.state["project_root"] = str(project_root)
+
+    print(f"DEBUG: Project root: {project_root}", file=sys.stderr)
+
+    # Extract components
+    designs = extract_designs(transcript)
+    plans = extract_plans(transcript)
+    decisions_found = extract_decisions(transcript)
+
+    for found in designs + plans:
+        found["index"] += base_index
+
+    print(f"DEBUG: Found {len(designs)} design proposals", file=sys.stderr)
+    print(f"DEBUG: Found {len(plans)} parallel plans", file=sys.stderr)
+    print(f"DEBUG: Found {len(decisions_found)} decision points", file=sys.stderr)
+
+    # Only rewrite files when a new candidate appeared; compare against
+    # the best one from earlier runs so the most complete version wins
+    designs_written = plans_written = decisions_written = 0
+    if designs and "designs" not in done_steps:
+        if "best_design" in cursor.state:
+            designs.append(cursor.state["best_design"])
+        cursor.state["best_design"] = max(designs, key=lambda d: d["pattern_count"])
+        designs_written = write_design_files(project_root, designs, session_id)
+        finish_step("designs")
+    if plans and "plans" not in done_steps:
+        if "best_plan" in cursor.state:
+            plans.append(cursor.state["best_plan"])
+        cursor.state["best_plan"] = max(plans, key=lambda p: p["pattern_count"])
+        plans_written = write_plan_files(project_root, plans, session_id)
+        finish_step("plans")
+    if "decisions" not in done_steps:
+        decisions_written = append_decisions(project_root, decisions_found, session_id)
+        finish_step("decisions")
+
+    cursor.save()
+
+    if designs_written or plans_written or decisions_written:
         print(
-            f"DEBUG: ✅ Appended {appended_count} decisions to decisions.yaml",
+            f"DEBUG: ✅ Extracted {designs_written} designs, {plans_written} plans, {decisions_written} decisions",
             file=sys.stderr,
         )
-    except Exception as e:
-        print(f"DEBUG: Failed to write decisions.yaml: {e}", file=sys.stderr)
-        return 0
-
-    return appended_count
+    else:
+        print(f"DEBUG: No extractable content found", file=sys.stderr)
 
 
 def main():
     """
     SessionEnd hook entry point.
 
-    Reads full transcript, extracts completed work, writes structured files.
+    Queues extraction as a background job and returns immediately; parsing
+    a long transcript does not fit in the hook timeout. Falls back to
+    extracting inline if the job cannot be queued.
     """
     try:
         # Read hook data
-        hook_data = json.loads(sys.stdin.read())
+        with tracing.span("parse_stdin"):
+            hook_data = json.loads(sys.stdin.read())
 
         transcript_path = hook_data.get("transcript_path", "")
         session_id = hook_data.get("session_id", "unknown")
@@ -766,42 +852,19 @@ def main():
             print(json.dumps(output))
             sys.exit(0)
 
-        # Read full transcript
-        with open(transcript_path, "r") as f:
-            transcript = [json.loads(line) for line in f if line.strip()]
-
-        print(f"DEBUG: Loaded {len(transcript)} conversation entries", file=sys.stderr)
-
-        # Find project root from first entry's cwd
-        project_root = Path.cwd()
-        if transcript:
-            cwd = transcript[0].get("cwd")
-            if cwd:
-                project_root = Path(cwd)
-
-        print(f"DEBUG: Project root: {project_root}", file=sys.stderr)
-
-        # Extract components
-        designs = extract_designs(transcript)
-        plans = extract_plans(transcript)
-        decisions_found = extract_decisions(transcript)
-
-        print(f"DEBUG: Found {len(designs)} design proposals", file=sys.stderr)
-        print(f"DEBUG: Found {len(plans)} parallel plans", file=sys.stderr)
-        print(f"DEBUG: Found {len(decisions_found)} decision points", file=sys.stderr)
-
-        # Write structured files
-        designs_written = write_design_files(project_root, designs, session_id)
-        plans_written = write_plan_files(project_root, plans, session_id)
-        decisions_written = append_decisions(project_root, decisions_found, session_id)
-
-        if designs_written or plans_written or decisions_written:
-            print(
-                f"DEBUG: ✅ Extracted {designs_written} designs, {plans_written} plans, {decisions_written} decisions",
-                file=sys.stderr,
+        project_root = Path(hook_data.get("cwd") or Path.cwd())
+        try:
+            queue = JobQueue(job_queue_dir(project_root))
+            job = queue.enqueue(
+                JOB_KIND,
+                {"transcript_path": transcript_path, "session_id": session_id},
+                dedupe_key=f"{JOB_KIND}:{session_id}",
             )
-        else:
-            print(f"DEBUG: No extractable content found", file=sys.stderr)
+            spawn_worker(project_root)
+            print(f"DEBUG: Queued extraction job {job.id}", file=sys.stderr)
+        except Exception as e:
+            print(f"DEBUG: Could not queue job ({e}), extracting inline", file=sys.stderr)
+            extract_session(transcript_path, session_id)
 
     except Exception as e:
         print(f"DEBUG: SessionEnd extraction failed: {e}", file=sys.stderr)
@@ -816,4 +879,5 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    with tracing.trace("session_end_extractor"):
+        main()
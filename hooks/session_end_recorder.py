@@ -29,7 +29,12 @@ from pathlib import Path
 from datetime import datetime
 import yaml
 
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
 
+import tracing
+
+
+@tracing.span("git_head")
 def get_current_commit_hash() -> str:
     """Get current git commit hash."""
     try:
@@ -45,6 +50,7 @@ def get_current_commit_hash() -> str:
         return "unknown"
 
 
+@tracing.span("git_branch")
 def get_current_branch() -> str:
     """Get current git branch."""
     try:
@@ -60,6 +66,7 @@ def get_current_branch() -> str:
         return "unknown"
 
 
+@tracing.span("git_changed_files")
 def get_files_changed_in_session(start_hash: str) -> list[str]:
     """Get files changed between start_hash and HEAD."""
     try:
@@ -100,7 +107,8 @@ def main():
     """SessionEnd recorder entry point."""
     try:
         # Read hook data
-        hook_data = json.loads(sys.stdin.read())
+        with tracing.span("parse_stdin"):
+            hook_data = json.loads(sys.stdin.read())
 
         session_id = hook_data.get("session_id", "unknown")
 
@@ -161,4 +169,5 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    with tracing.trace("session_end_recorder"):
+        main()
@@ -19,6 +19,9 @@ function main() {
     // Clear old detection state from observability database
     const dbFile = path.join('.contextune', 'observability.db');
     try {
+      // Status line snapshot mirrors current_detection (lib/statusline_snapshot.py)
+      fs.rmSync(path.join('.contextune', 'statusline'), { force: true });
+
       if (fs.existsSync(dbFile)) {
         // Fast SQLite DELETE query (0.1ms)
         execSync(`sqlite3 "${dbFile}" "DELETE FROM current_detection WHERE id = 1"`, {
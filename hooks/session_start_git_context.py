@@ -27,12 +27,18 @@ from typing import Optional
 
 import yaml
 
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
 
+import tracing
+
+CACHE_DIR = Path.home() / ".claude" / "plugins" / "contextune" / ".cache"
+
+
+@tracing.span("load_last_session")
 def load_last_session() -> Optional[dict]:
     """Load last session metadata from cache."""
     try:
-        cache_dir = Path.home() / ".claude" / "plugins" / "contextune" / ".cache"
-        last_session_file = cache_dir / "last_session.yaml"
+        last_session_file = CACHE_DIR / "last_session.yaml"
 
         if not last_session_file.exists():
             return None
@@ -179,16 +185,40 @@ def get_time_since(timestamp: str) -> str:
         return 'recently'
 
 
+@tracing.span("generate_summary")
 def generate_context_summary(last_session: dict) -> str:
     """Generate context summary."""
-    commits = get_commits_since_last_session(last_session['last_commit'])
-    files_changed = get_files_changed(last_session['last_commit'])
-    diff_stats = get_diff_stats(last_session['last_commit'])
-    current_status = get_current_status()
+    return render_summary_header(last_session) + render_summary_body(last_session)
+
+
+def render_summary_header(last_session: dict) -> str:
+    """Render the time-relative header line (cheap, no git calls)."""
     time_since = get_time_since(last_session['ended_at'])
+    return f"📋 Git Context Since Last Session ({time_since})\n\n"
+
+
+def render_summary_body(last_session: dict) -> str:
+    """Render everything below the header."""
+    return render_git_history(last_session) + render_working_state(last_session)
+
 
-    # Build summary
-    summary = f"📋 Git Context Since Last Session ({time_since})\n\n"
+def render_git_history(last_session: dict) -> str:
+    """
+    Render commits and files changed since last_commit.
+
+    last_commit is HEAD when the last session ended. If HEAD is still there
+    (read from .git, no subprocess) the range is empty and git is skipped;
+    otherwise only the delta last_commit..HEAD is computed.
+    """
+    last_commit = last_session['last_commit']
+    if last_commit and read_head_commit() == last_commit:
+        commits, files_changed, diff_stats = [], [], ''
+    else:
+        commits = get_commits_since_last_session(last_commit)
+        files_changed = get_files_changed(last_commit)
+        diff_stats = get_diff_stats(last_commit)
+
+    summary = ""
 
     # Commit activity
     if commits:
@@ -236,6 +266,15 @@ def generate_context_summary(last_session: dict) -> str:
 
         summary += '\n'
 
+    return summary
+
+
+def render_working_state(last_session: dict) -> str:
+    """Render the working tree status and last session work (always live)."""
+    current_status = get_current_status()
+
+    summary = ""
+
     # Current working directory status
     if not current_status['clean']:
         summary += "**Current Status:**\n"
@@ -270,11 +309,65 @@ def generate_context_summary(last_session: dict) -> str:
     return summary
 
 
+def find_git_dir(start: Path) -> Optional[Path]:
+    """Locate the git directory for start (handles worktree .git files)."""
+    for directory in (start, *start.parents):
+        dot_git = directory / '.git'
+        if dot_git.is_dir():
+            return dot_git
+        if dot_git.is_file():
+            content = dot_git.read_text().strip()
+            if content.startswith('gitdir: '):
+                git_dir = Path(content[len('gitdir: '):])
+                return git_dir if git_dir.is_absolute() else (directory / git_dir).resolve()
+    return None
+
+
+def read_head_commit(repo_dir: Optional[Path] = None) -> Optional[str]:
+    """
+    Resolve HEAD by reading .git directly.
+
+    Avoids spawning git on the SessionStart fast path. Returns None whenever
+    the layout is unusual; callers then fall back to the git-based summary.
+    """
+    try:
+        git_dir = find_git_dir(repo_dir or Path.cwd())
+        if git_dir is None:
+            return None
+
+        head = (git_dir / 'HEAD').read_text().strip()
+        if not head.startswith('ref: '):
+            return head  # Detached HEAD
+
+        ref = head[len('ref: '):]
+        common_dir = git_dir
+        commondir_file = git_dir / 'commondir'
+        if commondir_file.exists():
+            common_dir = (git_dir / commondir_file.read_text().strip()).resolve()
+
+        for base in (git_dir, common_dir):
+            ref_file = base / ref
+            if ref_file.exists():
+                return ref_file.read_text().strip()
+
+        packed_refs = common_dir / 'packed-refs'
+        if packed_refs.exists():
+            for line in packed_refs.read_text().splitlines():
+                if line.endswith(' ' + ref):
+                    return line.split(' ', 1)[0]
+
+        return None
+
+    except OSError:
+        return None
+
+
 def main():
     """Main hook entry point."""
     try:
         # Read stdin
-        hook_data = json.load(sys.stdin)
+        with tracing.span("parse_stdin"):
+            hook_data = json.load(sys.stdin)
 
         print("DEBUG: SessionStart git context injector triggered", file=sys.stderr)
 
@@ -291,7 +384,6 @@ def main():
         print(f"DEBUG: Last session: {last_session.get('session_id')}", file=sys.stderr)
         print(f"DEBUG: Last commit: {last_session.get('last_commit')}", file=sys.stderr)
 
-        # Generate context summary
         summary = generate_context_summary(last_session)
 
         print(f"DEBUG: Generated context summary ({len(summary)} chars)", file=sys.stderr)
@@ -313,4 +405,5 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    with tracing.trace("session_start_git_context"):
+        main()
@@ -16,11 +16,13 @@ Compares routing decisions with actual token usage to:
 
 import json
 import sys
+import time
 from pathlib import Path
 from typing import Any
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
+from lib import sampling, tracing
 from lib.observability_db import ObservabilityDB
 
 
@@ -40,9 +42,7 @@ class CostTracker:
     HAIKU_INPUT_COST = 0.00025
     HAIKU_OUTPUT_COST = 0.00125
 
-    def __init__(self):
-        self.db = ObservabilityDB()
-
+    @tracing.span("track_cost")
     def track_tool_usage(
         self,
         tool_name: str,
@@ -125,13 +125,14 @@ class CostTracker:
             # Generic: ~4 chars per token
             return len(result_str) // 4
 
-    def log_cost_metrics(self, cost_analysis: dict[str, Any]):
-        """Log cost metrics to observability database."""
+    @tracing.span("log_cost")
+    def log_cost_metrics(self, cost_analysis: dict[str, Any], latency_ms: float = 0.0):
+        """Log cost metrics to observability database (sampled: runs on every tool call)."""
 
-        self.db.log_performance_metric(
+        sampling.record(
             component="cost_tracker",
             operation="tool_cost",
-            latency_ms=0.0,
+            latency_ms=latency_ms,
             metadata={
                 "tool": cost_analysis["tool"],
                 "model": cost_analysis["model"],
@@ -147,7 +148,8 @@ def main():
     """Main entry point for PostToolUse hook."""
     try:
         # Read hook input from stdin
-        hook_data: dict[str, Any] = json.load(sys.stdin)
+        with tracing.span("parse_stdin"):
+            hook_data: dict[str, Any] = json.load(sys.stdin)
 
         tool: dict[str, Any] = hook_data.get("tool", {})
         tool_name: str = tool.get("name", "")
@@ -161,12 +163,14 @@ def main():
 
         # Track cost
         tracker = CostTracker()
+        started = time.perf_counter()
         cost_analysis = tracker.track_tool_usage(
             tool_name, tool_params, result, model_used
         )
+        latency_ms = (time.perf_counter() - started) * 1000
 
         # Log to database
-        tracker.log_cost_metrics(cost_analysis)
+        tracker.log_cost_metrics(cost_analysis, latency_ms)
 
         # Generate feedback if significant savings possible
         if cost_analysis["potential_savings"] > 0.01:  # $0.01 threshold
@@ -203,4 +207,5 @@ This operation could be delegated to Haiku for cost efficiency.
 
 
 if __name__ == "__main__":
-    main()
+    with tracing.trace("tool_cost_tracker", sample=sampling.policy_for("cost_tracker")):
+        main()
@@ -18,6 +18,7 @@ Tracks routing decisions via observability database.
 import json
 import os
 import sys
+import time
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
@@ -25,6 +26,7 @@ from typing import Any, Dict, Optional
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
+from lib import sampling, tracing
 from lib.observability_db import ObservabilityDB
 
 
@@ -68,9 +70,7 @@ class IntelligentRouter:
     BASH_COMMAND_THRESHOLD = 5
     MULTI_FILE_THRESHOLD = 3
 
-    def __init__(self):
-        self.db = ObservabilityDB()
-
+    @tracing.span("route")
     def route_tool_call(self, tool_name: str, tool_params: Dict[str, Any]) -> RoutingResult:
         """
         Determine optimal routing for a tool call.
@@ -220,7 +220,8 @@ def main():
     """Main entry point for PreToolUse hook."""
     try:
         # Read hook input from stdin
-        hook_data = json.load(sys.stdin)
+        with tracing.span("parse_stdin"):
+            hook_data = json.load(sys.stdin)
 
         tool = hook_data.get("tool", {})
         tool_name = tool.get("name", "")
@@ -228,13 +229,15 @@ def main():
 
         # Route the tool call
         router = IntelligentRouter()
+        started = time.perf_counter()
         result = router.route_tool_call(tool_name, tool_params)
+        latency_ms = (time.perf_counter() - started) * 1000
 
-        # Log routing decision to observability database
-        router.db.log_performance_metric(
+        # Log routing decision (sampled: runs on every tool call)
+        sampling.record(
             component="tool_router",
             operation="route_decision",
-            latency_ms=0.0,  # Routing is near-instant
+            latency_ms=latency_ms,
             metadata={
                 "tool": tool_name,
                 "decision": result.decision.value,
@@ -275,8 +278,7 @@ Consider using the Task tool with subagent_type="general-purpose" for this opera
             db.log_error(
                 component="tool_router",
                 error_type=type(e).__name__,
-                error_message=str(e),
-                context={"hook": "PreToolUse"}
+                message=str(e),
             )
         except:
             pass
@@ -286,4 +288,5 @@ Consider using the Task tool with subagent_type="general-purpose" for this opera
 
 
 if __name__ == "__main__":
-    main()
+    with tracing.trace("tool_router", sample=sampling.policy_for("tool_router")):
+        main()
@@ -34,6 +34,8 @@ from typing import Any
 PLUGIN_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PLUGIN_ROOT / "lib"))
 
+import tracing
+
 # Import matchers (now using RapidFuzz-based keyword matcher v2!)
 from keyword_matcher_v2 import IntentMatch, KeywordMatcherV2 as KeywordMatcher
 from model2vec_matcher import Model2VecMatcher
@@ -81,6 +83,7 @@ class ContextuneDetector:
             self._semantic = m if m.is_available() else None
         return self._semantic
 
+    @tracing.span("detect")
     def detect(self, text: str) -> IntentMatch | None:
         """Detect intent using 3-tier cascade."""
 
@@ -120,6 +123,7 @@ class ClaudeCodeHaikuEngineer:
     def __init__(self):
         self._claude_available = None
 
+    @tracing.span("claude_check")
     def is_available(self) -> bool:
         """Check if Claude Code CLI is available."""
         if self._claude_available is None:
@@ -133,6 +137,7 @@ class ClaudeCodeHaikuEngineer:
 
         return self._claude_available
 
+    @tracing.span("haiku_analysis")
     def analyze_and_enhance(
         self,
         prompt: str,
@@ -236,6 +241,12 @@ Be concise. Focus on actionability."""
             return None
 
 
+def emit(response: dict[str, Any]) -> None:
+    """Write the hook response to stdout."""
+    with tracing.span("output"):
+        print(json.dumps(response))
+
+
 def should_process(prompt: str) -> bool:
     """Check if prompt needs intent detection."""
     if not prompt or not prompt.strip():
@@ -256,6 +267,7 @@ def should_process(prompt: str) -> bool:
     return True
 
 
+@tracing.span("write_detection")
 def write_detection_for_statusline(match: IntentMatch, prompt: str):
     """Write detection data to observability DB for status line to read."""
     try:
@@ -286,6 +298,7 @@ def write_detection_for_statusline(match: IntentMatch, prompt: str):
             pass
 
 
+@tracing.span("clear_detection")
 def clear_detection_statusline():
     """Clear status line detection (no match found)."""
     try:
@@ -299,37 +312,17 @@ def clear_detection_statusline():
         )
 
 
+@tracing.span("detection_count")
 def get_detection_count() -> int:
-    """Get total number of detections for progressive tips."""
+    """Get total number of detections for progressive tips (counted by set_detection)."""
     try:
         db = ObservabilityDB(".contextune/observability.db")
-        stats = db.get_stats()
-        return stats.get("detections", {}).get("total", 0)
+        return db.get_counter("detections", "total")
     except:
         pass
     return 0
 
 
-def increment_detection_count():
-    """Increment detection counter for progressive disclosure."""
-    try:
-        data_dir = Path.home() / ".claude" / "plugins" / "contextune" / "data"
-        data_dir.mkdir(parents=True, exist_ok=True)
-        stats_file = data_dir / "detection_stats.json"
-
-        stats = {"total_detections": 0, "by_method": {}, "by_command": {}}
-        if stats_file.exists():
-            with open(stats_file) as f:
-                stats = json.load(f)
-
-        stats["total_detections"] = stats.get("total_detections", 0) + 1
-
-        with open(stats_file, "w") as f:
-            json.dump(stats, f, indent=2)
-    except:
-        pass  # Don't fail hook if stats tracking fails
-
-
 # Command action descriptions for directive feedback
 COMMAND_ACTIONS = {
     # Contextune commands
@@ -639,8 +632,9 @@ def main():
 
     try:
         # Read hook event from stdin
-        event_json = sys.stdin.read()
-        event = json.loads(event_json)
+        with tracing.span("parse_stdin"):
+            event_json = sys.stdin.read()
+            event = json.loads(event_json)
 
         prompt = event.get("prompt", "")
 
@@ -654,7 +648,7 @@ def main():
             print("DEBUG: Skipping prompt (should_process=False)", file=sys.stderr)
             # Pass through unchanged
             response = {"continue": True, "suppressOutput": True}
-            print(json.dumps(response))
+            emit(response)
             return
 
         print("DEBUG: Processing prompt (should_process=True)", file=sys.stderr)
@@ -691,7 +685,7 @@ Continuing with your original prompt, but consider using the slash command for e
                 "additionalContext": feedback,
                 "suppressOutput": False
             }
-            print(json.dumps(response))
+            emit(response)
             return
 
         # SKILL DETECTION: Check if user is trying to invoke a skill
@@ -727,7 +721,7 @@ Available skills:
                         "additionalContext": suggestion,
                         "suppressOutput": False
                     }
-                    print(json.dumps(response))
+                    emit(response)
                     return
                 else:
                     print(f"DEBUG: Skill name already correct: {correct_skill}", file=sys.stderr)
@@ -750,20 +744,17 @@ Available skills:
             clear_detection_statusline()
             # No match or low confidence - pass through
             response = {"continue": True, "suppressOutput": True}
-            print(json.dumps(response))
+            emit(response)
             return
 
         # Write detection for status line
         write_detection_for_statusline(match, prompt)
 
-        # Get current detection count for progressive tips
+        # Get current detection count for progressive tips (includes this one)
         detection_count = get_detection_count()
 
-        # Increment counter
-        increment_detection_count()
-
         print(
-            f"DEBUG: Command detected (detection #{detection_count + 1})",
+            f"DEBUG: Command detected (detection #{detection_count})",
             file=sys.stderr,
         )
 
@@ -906,7 +897,7 @@ Available skills:
         }
 
         print(f"DEBUG: Response: {json.dumps(response)}", file=sys.stderr)
-        print(json.dumps(response))
+        emit(response)
 
     except Exception as e:
         # Log error but don't block Claude
@@ -915,8 +906,9 @@ Available skills:
         print(f"Contextune error: {e}", file=sys.stderr)
         print(f"DEBUG: Traceback: {traceback.format_exc()}", file=sys.stderr)
         response = {"continue": True, "suppressOutput": True}
-        print(json.dumps(response))
+        emit(response)
 
 
 if __name__ == "__main__":
-    main()
+    with tracing.trace("user_prompt_submit"):
+        main()
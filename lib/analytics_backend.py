@@ -0,0 +1,509 @@
+#!/usr/bin/env python3
+"""
+Analytics Backend - Pluggable query engines for observability reporting
+
+Reporting code (GlobalObservability, ObservabilityDB.get_stats) asks a
+backend for per-project summaries and latency percentiles instead of
+looping over SQLite connections itself:
+
+- SQLiteBackend: one connection per project DB, queried from a thread
+  pool (SQLite releases the GIL while a query runs). Always available.
+- DuckDBBackend: every project DB is attached through DuckDB's SQLite
+  scanner and exposed as one UNION ALL view per table, so cross-project
+  breakdowns, time buckets, sketch buckets and percentiles run as
+  vectorized columnar queries. When the scanner extension can't be loaded
+  (e.g. offline, not yet installed) rows are staged into DuckDB tables
+  instead, which is slower but gives the same results. Only an explicit
+  duckdb selection runs INSTALL (a download); auto only tries LOAD.
+  export_parquet() writes the same tables to Parquet for notebooks.
+
+get_backend() picks one: CONTEXTUNE_ANALYTICS_BACKEND=sqlite|duckdb|auto
+(default auto = DuckDB when duckdb and its SQLite scanner are available).
+
+Summary format (one dict per project DB):
+    total_detections, commands, methods, avg_confidence, last_activity,
+    errors, hourly (24 local-time counts), daily ({YYYY-MM-DD: count}),
+    latency ({method: QuantileSketch.to_dict()})
+"""
+
+import math
+import os
+import sqlite3
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterable
+
+try:
+    from quantile_sketch import RELATIVE_ACCURACY, QuantileSketch
+except ImportError:  # imported as lib.analytics_backend
+    from lib.quantile_sketch import RELATIVE_ACCURACY, QuantileSketch
+
+# SQLite releases the GIL while it runs a query, so threads overlap well
+MAX_WORKERS = 8
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+# Columns each backend reads (anything else stays in SQLite)
+TABLE_COLUMNS = {
+    "detection_history": ("command", "method", "confidence", "timestamp", "latency_ms"),
+    "error_logs": ("component", "timestamp"),
+    "performance_metrics": ("component", "operation", "latency_ms", "timestamp"),
+}
+
+# Time bucket width for DuckDB activity counts: 15 minutes keeps every
+# UTC offset (incl. +5:45) aligned, local hour/date are derived in Python
+TIME_BUCKET_SECONDS = 900
+
+# Whether DuckDB's SQLite scanner loads, per install attempt (probed once
+# per process: INSTALL may go to the network)
+_scanner_available: dict[bool, bool] = {}
+
+
+def _percentile(ordered: list[float], q: float) -> float:
+    """Same rank as the original reports: ordered[int(q * n)]."""
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+def summarize_project(conn: sqlite3.Connection) -> dict[str, Any]:
+    """Reduce one project DB to the aggregates reporting needs."""
+    total, avg_conf, last_activity = conn.execute(
+        "SELECT COUNT(*), AVG(confidence), MAX(timestamp) FROM detection_history"
+    ).fetchone()
+
+    commands = dict(conn.execute(
+        "SELECT command, COUNT(*) FROM detection_history GROUP BY command"
+    ).fetchall())
+    methods = dict(conn.execute(
+        "SELECT method, COUNT(*) FROM detection_history GROUP BY method"
+    ).fetchall())
+
+    try:
+        errors = conn.execute("SELECT COUNT(*) FROM error_logs").fetchone()[0]
+    except sqlite3.Error:
+        errors = 0
+
+    # Local-time buckets, same as datetime.fromtimestamp()
+    hourly = [0] * 24
+    for hour, count in conn.execute("""
+        SELECT CAST(strftime('%H', timestamp, 'unixepoch', 'localtime') AS INTEGER), COUNT(*)
+        FROM detection_history GROUP BY 1
+    """):
+        hourly[hour] = count
+    daily = dict(conn.execute("""
+        SELECT date(timestamp, 'unixepoch', 'localtime'), COUNT(*)
+        FROM detection_history GROUP BY 1
+    """).fetchall())
+
+    sketches: dict[str, QuantileSketch] = {}
+    for method, latency in conn.execute(
+        "SELECT method, latency_ms FROM detection_history WHERE latency_ms IS NOT NULL"
+    ):
+        sketch = sketches.get(method)
+        if sketch is None:
+            sketch = sketches[method] = QuantileSketch()
+        sketch.add(latency)
+
+    return {
+        "total_detections": total,
+        "commands": commands,
+        "methods": methods,
+        "avg_confidence": avg_conf,
+        "last_activity": last_activity,
+        "errors": errors,
+        "hourly": hourly,
+        "daily": daily,
+        "latency": {method: sketch.to_dict() for method, sketch in sketches.items()},
+    }
+
+
+def connect_readonly(db_path: Path) -> sqlite3.Connection:
+    """
+    Open a project DB read-only, so closing never checkpoints its WAL
+    (which would touch the file other processes are writing).
+    """
+    try:
+        return sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, timeout=5.0)
+    except sqlite3.OperationalError:
+        return sqlite3.connect(db_path, timeout=5.0)
+
+
+class AnalyticsBackend:
+    """Interface shared by the analytics engines."""
+
+    name = "base"
+
+    def project_summaries(self, databases: list[Path]) -> dict[Path, dict[str, Any]]:
+        """Summary per readable project DB (unreadable ones are left out)."""
+        raise NotImplementedError
+
+    def latency_percentiles(
+        self,
+        databases: list[Path],
+        table: str = "detection_history",
+        group_by: str = "method",
+        quantiles: Iterable[float] = QUANTILES,
+    ) -> dict[str, dict[str, Any]]:
+        """
+        Exact latency percentiles per group across databases.
+
+        Returns: {group: {count, min, max, avg, p50, p95, p99}}
+        """
+        raise NotImplementedError
+
+
+class SQLiteBackend(AnalyticsBackend):
+    """Row-store backend: Python over per-project SQLite queries."""
+
+    name = "sqlite"
+
+    def project_summaries(self, databases: list[Path]) -> dict[Path, dict[str, Any]]:
+        def read(db_path: Path) -> dict[str, Any]:
+            conn = connect_readonly(db_path)
+            try:
+                return summarize_project(conn)
+            finally:
+                conn.close()
+
+        summaries: dict[Path, dict[str, Any]] = {}
+        if not databases:
+            return summaries
+
+        with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(databases))) as pool:
+            futures = {db_path: pool.submit(read, db_path) for db_path in databases}
+            for db_path, future in futures.items():
+                try:
+                    summaries[db_path] = future.result()
+                except Exception as e:
+                    print(f"Error reading {db_path}: {e}")
+        return summaries
+
+    def latency_percentiles(
+        self,
+        databases: list[Path],
+        table: str = "detection_history",
+        group_by: str = "method",
+        quantiles: Iterable[float] = QUANTILES,
+    ) -> dict[str, dict[str, Any]]:
+        if group_by not in TABLE_COLUMNS[table]:
+            raise ValueError(f"Unknown column {group_by!r} for {table}")
+
+        latencies: dict[str, list[float]] = {}
+        for db_path in databases:
+            conn = connect_readonly(db_path)
+            try:
+                for group, latency in conn.execute(
+                    f"SELECT {group_by}, latency_ms FROM {table} WHERE latency_ms IS NOT NULL"
+                ):
+                    latencies.setdefault(group, []).append(latency)
+            except sqlite3.Error as e:
+                print(f"Error reading {db_path}: {e}")
+            finally:
+                conn.close()
+
+        result = {}
+        for group, values in latencies.items():
+            values.sort()
+            stats: dict[str, Any] = {
+                "count": len(values),
+                "min": values[0],
+                "max": values[-1],
+                "avg": sum(values) / len(values),
+            }
+            for q in quantiles:
+                stats[f"p{round(q * 100):g}"] = _percentile(values, q)
+            result[group] = stats
+        return result
+
+
+class DuckDBBackend(AnalyticsBackend):
+    """Columnar backend: one DuckDB session over all project DBs."""
+
+    name = "duckdb"
+
+    def __init__(self, require_scanner: bool = False, install: bool = True):
+        """
+        Args:
+            require_scanner: Raise RuntimeError instead of staging rows when
+                the SQLite scanner extension is unavailable
+            install: INSTALL the scanner (network download) if LOAD fails
+        """
+        import duckdb
+
+        self.duckdb = duckdb
+        self.scanner = self._load_scanner(install)
+        if require_scanner and not self.scanner:
+            raise RuntimeError("DuckDB SQLite scanner extension is not available")
+
+    def _load_scanner(self, install: bool = True) -> bool:
+        if install in _scanner_available:
+            return _scanner_available[install]
+
+        conn = self.duckdb.connect()
+        try:
+            try:
+                conn.execute("LOAD sqlite")
+            except self.duckdb.Error:
+                if not install:
+                    raise
+                conn.execute("INSTALL sqlite")
+                conn.execute("LOAD sqlite")
+            _scanner_available[install] = True
+        except self.duckdb.Error as e:
+            print(f"DEBUG: DuckDB SQLite scanner unavailable: {e}", file=sys.stderr)
+            _scanner_available[install] = False
+        finally:
+            conn.close()
+        return _scanner_available[install]
+
+    # === LOADING ===
+
+    def _attach(self, conn, databases: list[Path]) -> dict[int, Path]:
+        """Attach readable DBs and create one UNION ALL view per table."""
+        conn.execute("LOAD sqlite")
+        projects: dict[int, Path] = {}
+        parts: dict[str, list[str]] = {table: [] for table in TABLE_COLUMNS}
+
+        for index, db_path in enumerate(databases):
+            alias = f"p{index}"
+            quoted = str(db_path).replace("'", "''")
+            try:
+                conn.execute(f"ATTACH '{quoted}' AS {alias} (TYPE sqlite, READ_ONLY)")
+                tables = {row[0] for row in conn.execute(
+                    "SELECT table_name FROM information_schema.tables WHERE table_catalog = ?",
+                    [alias],
+                ).fetchall()}
+            except self.duckdb.Error as e:
+                print(f"Error reading {db_path}: {e}")
+                continue
+            if "detection_history" not in tables:
+                print(f"Error reading {db_path}: no detection_history table")
+                continue
+
+            projects[index] = db_path
+            for table, columns in TABLE_COLUMNS.items():
+                if table in tables:
+                    parts[table].append(
+                        f"SELECT {index} AS project, {', '.join(columns)} FROM {alias}.{table}"
+                    )
+
+        for table, columns in TABLE_COLUMNS.items():
+            if parts[table]:
+                body = " UNION ALL ".join(parts[table])
+            else:
+                body = f"SELECT NULL::INTEGER AS project, {', '.join('NULL AS ' + c for c in columns)} LIMIT 0"
+            conn.execute(f"CREATE OR REPLACE TEMP VIEW {table} AS {body}")
+        return projects
+
+    def _stage(self, conn, databases: list[Path]) -> dict[int, Path]:
+        """Copy the needed columns into DuckDB tables (no scanner available)."""
+        types = {"command": "VARCHAR", "method": "VARCHAR", "component": "VARCHAR",
+                 "operation": "VARCHAR", "confidence": "DOUBLE", "timestamp": "DOUBLE",
+                 "latency_ms": "DOUBLE"}
+        for table, columns in TABLE_COLUMNS.items():
+            conn.execute(
+                f"CREATE OR REPLACE TEMP TABLE {table} (project INTEGER, "
+                + ", ".join(f"{c} {types[c]}" for c in columns) + ")"
+            )
+
+        projects: dict[int, Path] = {}
+        for index, db_path in enumerate(databases):
+            try:
+                source = connect_readonly(db_path)
+            except sqlite3.Error as e:
+                print(f"Error reading {db_path}: {e}")
+                continue
+            try:
+                rows_by_table = {}
+                for table, columns in TABLE_COLUMNS.items():
+                    try:
+                        rows_by_table[table] = source.execute(
+                            f"SELECT {index}, {', '.join(columns)} FROM {table}"
+                        ).fetchall()
+                    except sqlite3.Error:
+                        if table == "detection_history":
+                            raise
+                        rows_by_table[table] = []
+            except sqlite3.Error as e:
+                print(f"Error reading {db_path}: {e}")
+                continue
+            finally:
+                source.close()
+
+            for table, rows in rows_by_table.items():
+                if rows:
+                    placeholders = ", ".join("?" * len(rows[0]))
+                    conn.executemany(f"INSERT INTO {table} VALUES ({placeholders})", rows)
+            projects[index] = db_path
+        return projects
+
+    def _session(self, databases: list[Path]):
+        conn = self.duckdb.connect()
+        if self.scanner:
+            projects = self._attach(conn, databases)
+        else:
+            projects = self._stage(conn, databases)
+        return conn, projects
+
+    # === QUERIES ===
+
+    def project_summaries(self, databases: list[Path]) -> dict[Path, dict[str, Any]]:
+        if not databases:
+            return {}
+        conn, projects = self._session(databases)
+        try:
+            summaries: dict[Path, dict[str, Any]] = {
+                db_path: {
+                    "total_detections": 0, "commands": {}, "methods": {},
+                    "avg_confidence": None, "last_activity": None, "errors": 0,
+                    "hourly": [0] * 24, "daily": {}, "latency": {},
+                }
+                for db_path in projects.values()
+            }
+
+            for project, total, avg_conf, last_activity in conn.execute("""
+                SELECT project, COUNT(*), AVG(confidence), MAX(timestamp)
+                FROM detection_history GROUP BY project
+            """).fetchall():
+                summary = summaries[projects[project]]
+                summary.update(total_detections=total, avg_confidence=avg_conf,
+                               last_activity=last_activity)
+
+            for column, key in (("command", "commands"), ("method", "methods")):
+                for project, value, count in conn.execute(
+                    f"SELECT project, {column}, COUNT(*) FROM detection_history GROUP BY ALL"
+                ).fetchall():
+                    summaries[projects[project]][key][value] = count
+
+            for project, count in conn.execute(
+                "SELECT project, COUNT(*) FROM error_logs GROUP BY project"
+            ).fetchall():
+                summaries[projects[project]]["errors"] = count
+
+            # Absolute 15-minute buckets; local hour/date via fromtimestamp
+            # so DST and odd UTC offsets are handled exactly
+            for project, bucket, count in conn.execute(f"""
+                SELECT project, CAST(floor(timestamp / {TIME_BUCKET_SECONDS}) AS BIGINT), COUNT(*)
+                FROM detection_history GROUP BY ALL
+            """).fetchall():
+                local = datetime.fromtimestamp(bucket * TIME_BUCKET_SECONDS)
+                summary = summaries[projects[project]]
+                summary["hourly"][local.hour] += count
+                day = local.strftime("%Y-%m-%d")
+                summary["daily"][day] = summary["daily"].get(day, 0) + count
+
+            # Sketch buckets computed in SQL (same keys as QuantileSketch.add)
+            log_gamma = math.log((1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY))
+            sketches: dict[tuple[int, str], QuantileSketch] = {}
+            for project, method, bucket, count, total, low, high in conn.execute(f"""
+                SELECT project, method,
+                       CASE WHEN latency_ms > 0
+                            THEN CAST(ceil(ln(latency_ms) / {log_gamma!r}) AS BIGINT) END,
+                       COUNT(*), SUM(latency_ms), MIN(latency_ms), MAX(latency_ms)
+                FROM detection_history WHERE latency_ms IS NOT NULL GROUP BY ALL
+            """).fetchall():
+                sketch = sketches.get((project, method))
+                if sketch is None:
+                    sketch = sketches[(project, method)] = QuantileSketch()
+                if bucket is None:
+                    sketch.zero_count += count
+                else:
+                    sketch.buckets[bucket] = sketch.buckets.get(bucket, 0) + count
+                sketch.count += count
+                sketch.total += total
+                sketch.min = low if sketch.min is None else min(sketch.min, low)
+                sketch.max = high if sketch.max is None else max(sketch.max, high)
+
+            for (project, method), sketch in sketches.items():
+                summaries[projects[project]]["latency"][method] = sketch.to_dict()
+
+            return summaries
+        finally:
+            conn.close()
+
+    def latency_percentiles(
+        self,
+        databases: list[Path],
+        table: str = "detection_history",
+        group_by: str = "method",
+        quantiles: Iterable[float] = QUANTILES,
+    ) -> dict[str, dict[str, Any]]:
+        if group_by not in TABLE_COLUMNS[table]:
+            raise ValueError(f"Unknown column {group_by!r} for {table}")
+        quantiles = list(quantiles)
+
+        conn, _ = self._session(databases)
+        try:
+            # list_sort(...)[int(q * n) + 1] matches ordered[int(q * n)]
+            picks = ", ".join(
+                f"list_sort(list(latency_ms))"
+                f"[least(CAST(floor({q!r} * COUNT(*)) AS BIGINT), COUNT(*) - 1) + 1]"
+                for q in quantiles
+            )
+            rows = conn.execute(f"""
+                SELECT {group_by}, COUNT(*), MIN(latency_ms), MAX(latency_ms), AVG(latency_ms), {picks}
+                FROM {table} WHERE latency_ms IS NOT NULL GROUP BY {group_by}
+            """).fetchall()
+        finally:
+            conn.close()
+
+        result = {}
+        for group, count, low, high, avg, *values in rows:
+            stats: dict[str, Any] = {"count": count, "min": low, "max": high, "avg": avg}
+            for q, value in zip(quantiles, values, strict=True):
+                stats[f"p{round(q * 100):g}"] = value
+            result[group] = stats
+        return result
+
+    def export_parquet(self, databases: list[Path], output_dir: Path) -> dict[str, Path]:
+        """
+        Write each table (all projects, with a project_path column) to
+        <output_dir>/<table>.parquet.
+        """
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        conn, projects = self._session(databases)
+        try:
+            conn.execute("CREATE TEMP TABLE project_paths (project INTEGER, project_path VARCHAR)")
+            conn.executemany(
+                "INSERT INTO project_paths VALUES (?, ?)",
+                [(index, str(db_path.parent.parent)) for index, db_path in projects.items()],
+            )
+            written = {}
+            for table in TABLE_COLUMNS:
+                target = output_dir / f"{table}.parquet"
+                quoted = str(target).replace("'", "''")
+                conn.execute(f"""
+                    COPY (SELECT p.project_path, t.* EXCLUDE (project)
+                          FROM {table} t JOIN project_paths p USING (project))
+                    TO '{quoted}' (FORMAT parquet)
+                """)
+                written[table] = target
+            return written
+        finally:
+            conn.close()
+
+
+def get_backend(name: str | None = None) -> AnalyticsBackend:
+    """
+    Backend by name (sqlite, duckdb, auto); default from
+    CONTEXTUNE_ANALYTICS_BACKEND, else auto.
+
+    auto uses DuckDB only when its SQLite scanner is already installed,
+    since staging rows is slower than querying SQLite directly; it never
+    runs INSTALL, which would stall offline machines on every process.
+    """
+    name = (name or os.environ.get("CONTEXTUNE_ANALYTICS_BACKEND") or "auto").lower()
+
+    if name == "sqlite":
+        return SQLiteBackend()
+    if name == "duckdb":
+        return DuckDBBackend()
+    if name != "auto":
+        raise ValueError(f"Unknown analytics backend: {name}")
+
+    try:
+        return DuckDBBackend(require_scanner=True, install=False)
+    except (ImportError, RuntimeError):
+        return SQLiteBackend()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Content Writer - Content-hash incremental writes for generated plan files
+
+Extraction hooks and PlanBuilder regenerate design.md, plan.yaml and task
+files on every run even when nothing changed, which churns mtimes, wakes
+file watchers and shows up in git status. ContentWriter renders to a string
+first, hashes it, and only touches the file when the content differs.
+
+Each output directory keeps a small manifest (.contextune-manifest.json)
+of {relative path: sha256, size, mtime_ns}. When a file's stat still
+matches the manifest it is not even read; otherwise the on-disk bytes are
+hashed, so hand edits or files written by older versions are handled too.
+Changed files are written atomically (temp file + rename).
+
+Usage:
+    with ContentWriter(plans_dir) as writer:
+        writer.write_text(plans_dir / "design.md", content)
+        writer.write_yaml(plans_dir / "plan.yaml", data)
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+MANIFEST_NAME = ".contextune-manifest.json"
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Write via a temp file in the same directory, then rename over path."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+class ContentWriter:
+    """Skip-if-unchanged writer with a per-directory manifest."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.manifest_path = self.root / MANIFEST_NAME
+        self.manifest: dict[str, dict[str, Any]] = {}
+        self.written: list[Path] = []
+        self.unchanged: list[Path] = []
+        self._dirty = False
+
+        try:
+            self.manifest = json.loads(self.manifest_path.read_text())
+        except (OSError, json.JSONDecodeError):
+            self.manifest = {}
+
+    def __enter__(self) -> "ContentWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.save()
+
+    def _key(self, path: Path) -> str:
+        try:
+            return str(Path(path).relative_to(self.root))
+        except ValueError:
+            return str(Path(path).resolve())
+
+    def _on_disk_hash(self, path: Path, record: dict[str, Any] | None) -> str | None:
+        """Hash of the current file, trusting the manifest while stat matches."""
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+
+        if record and record.get("size") == stat.st_size and record.get("mtime_ns") == stat.st_mtime_ns:
+            return record.get("sha256")
+
+        try:
+            return content_hash(path.read_bytes())
+        except OSError:
+            return None
+
+    def write_bytes(self, path: Path, data: bytes) -> bool:
+        """
+        Write data unless the file already holds identical content.
+
+        Returns: True if the file was written
+        """
+        path = Path(path)
+        key = self._key(path)
+        digest = content_hash(data)
+        record = self.manifest.get(key)
+
+        changed = self._on_disk_hash(path, record) != digest
+        if changed:
+            atomic_write_bytes(path, data)
+            self.written.append(path)
+        else:
+            self.unchanged.append(path)
+
+        stat = path.stat()
+        new_record = {"sha256": digest, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        if record != new_record:
+            self.manifest[key] = new_record
+            self._dirty = True
+        return changed
+
+    def write_text(self, path: Path, text: str) -> bool:
+        return self.write_bytes(path, text.encode("utf-8"))
+
+    def write_yaml(self, path: Path, data: Any, **dump_options: Any) -> bool:
+        options = {"default_flow_style": False, "sort_keys": False, **dump_options}
+        return self.write_text(path, yaml.dump(data, **options))
+
+    def save(self) -> None:
+        """Persist the manifest if any record changed."""
+        if not self._dirty:
+            return
+        atomic_write_bytes(
+            self.manifest_path, json.dumps(self.manifest, indent=2, sort_keys=True).encode("utf-8")
+        )
+        self._dirty = False
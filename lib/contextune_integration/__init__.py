@@ -11,6 +11,7 @@ from .config import (
     IntegrationConfig,
     IntentDetectionConfig,
     ParallelExecutionConfig,
+    ProfilingConfig,
     TrackingConfig,
     UnifiedConfig,
 )
@@ -46,6 +47,7 @@ __all__ = [
     "IntegrationConfig",
     "IntentDetectionConfig",
     "ParallelExecutionConfig",
+    "ProfilingConfig",
     "TrackingConfig",
     "DashboardConfig",
     # Config loader
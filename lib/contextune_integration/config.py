@@ -2,7 +2,7 @@
 """Unified configuration schema for Contextune-HtmlGraph integration."""
 
 from pathlib import Path
-from typing import Optional
+from typing import Literal, Optional
 
 from pydantic import BaseModel, Field, field_validator
 
@@ -55,6 +55,31 @@ class ParallelExecutionConfig(BaseModel):
     )
 
 
+class ProfilingConfig(BaseModel):
+    """Hook profiling settings (overridden by CONTEXTUNE_PROFILE* env vars)."""
+
+    enabled: bool = Field(
+        default=False,
+        description="Profile hook invocations into .contextune/profiles/"
+    )
+    mode: Literal["sample", "cprofile"] = Field(
+        default="sample",
+        description="Stack sampler (low overhead) or deterministic cProfile"
+    )
+    rate: float = Field(
+        default=0.1,
+        ge=0.0,
+        le=1.0,
+        description="Fraction of hook invocations profiled"
+    )
+    interval_ms: float = Field(
+        default=5.0,
+        ge=0.1,
+        le=1000.0,
+        description="Stack sampling interval in milliseconds"
+    )
+
+
 class ContextuneConfig(BaseModel):
     """Contextune-specific configuration."""
 
@@ -64,6 +89,9 @@ class ContextuneConfig(BaseModel):
     parallel_execution: ParallelExecutionConfig = Field(
         default_factory=ParallelExecutionConfig
     )
+    profiling: ProfilingConfig = Field(
+        default_factory=ProfilingConfig
+    )
     data_dir: Path = Field(
         default=Path.home() / ".claude" / "plugins" / "contextune" / "data",
         description="Contextune data directory"
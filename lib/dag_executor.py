@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+DAG Executor - Run dependent tasks concurrently with bounded parallelism
+
+Shared by the features.yaml batch executor (scripts/feature-batch.py) and
+the plan runner. Tasks are ids with dependency lists; a task is submitted
+the moment its last dependency finishes (no waiting for the rest of its
+wave), so a batch takes roughly as long as its critical path instead of
+the sum of its tasks.
+
+- at most max_workers tasks run at once (thread pool; the work itself is
+  usually a subprocess)
+- a task that raises is "failed"; everything downstream of it is "skipped"
+- dependencies outside the task set must be listed in `satisfied`
+  (e.g. already-completed features), otherwise the task is skipped
+- progress is reported through on_event(event, outcome) on the calling
+  thread, so callbacks may update shared state without locking
+"""
+
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable
+
+
+@dataclass
+class TaskOutcome:
+    """What happened to one task."""
+
+    task_id: str
+    status: str = "pending"  # pending, running, done, failed, skipped
+    started_at: float | None = None
+    finished_at: float | None = None
+    result: Any = None
+    error: str | None = None
+
+    @property
+    def duration(self) -> float | None:
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return self.finished_at - self.started_at
+
+
+class DagExecutor:
+    """Dependency-ordered executor over a thread pool."""
+
+    def __init__(
+        self,
+        dependencies: dict[str, Iterable[str]],
+        max_workers: int = 3,
+        satisfied: Iterable[str] = (),
+    ):
+        """
+        Args:
+            dependencies: task id -> ids it depends on (insertion order is
+                the dispatch order among ready tasks)
+            max_workers: concurrency cap (at least 1)
+            satisfied: ids outside the task set that count as finished
+        """
+        self.dependencies = {tid: list(deps) for tid, deps in dependencies.items()}
+        self.max_workers = max(1, int(max_workers))
+        self.satisfied = set(satisfied)
+
+    def run(
+        self,
+        task: Callable[[str], Any],
+        on_event: Callable[[str, TaskOutcome], None] | None = None,
+    ) -> dict[str, TaskOutcome]:
+        """
+        Execute every reachable task; task(task_id) does the work.
+
+        Returns: {task_id: TaskOutcome} for all tasks, in dependency-dict order
+        """
+        outcomes = {tid: TaskOutcome(tid) for tid in self.dependencies}
+        waiting = {
+            tid: {dep for dep in deps if dep not in self.satisfied}
+            for tid, deps in self.dependencies.items()
+        }
+        dependents: dict[str, list[str]] = {tid: [] for tid in self.dependencies}
+        for tid, deps in waiting.items():
+            for dep in deps:
+                if dep in dependents:
+                    dependents[dep].append(tid)
+
+        def emit(event: str, outcome: TaskOutcome):
+            if on_event is not None:
+                on_event(event, outcome)
+
+        ready = deque(tid for tid, deps in waiting.items() if not deps)
+        running: dict[Future, TaskOutcome] = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while ready or running:
+                while ready and len(running) < self.max_workers:
+                    outcome = outcomes[ready.popleft()]
+                    outcome.status = "running"
+                    outcome.started_at = time.time()
+                    emit("start", outcome)
+                    running[pool.submit(task, outcome.task_id)] = outcome
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    outcome = running.pop(future)
+                    outcome.finished_at = time.time()
+                    try:
+                        outcome.result = future.result()
+                    except Exception as e:
+                        outcome.status = "failed"
+                        outcome.error = f"{type(e).__name__}: {e}"
+                        emit("failed", outcome)
+                        continue
+
+                    outcome.status = "done"
+                    emit("done", outcome)
+                    for dependent in dependents[outcome.task_id]:
+                        waiting[dependent].discard(outcome.task_id)
+                        if not waiting[dependent] and outcomes[dependent].status == "pending":
+                            ready.append(dependent)
+
+        # Whatever never became ready sits behind a failure, an unknown
+        # dependency or a cycle
+        for tid, outcome in outcomes.items():
+            if outcome.status == "pending":
+                outcome.status = "skipped"
+                outcome.error = "waiting on: " + ", ".join(sorted(waiting[tid]))
+                emit("skipped", outcome)
+
+        return outcomes
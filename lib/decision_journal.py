@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Decision Journal - Append-only write path for decisions.yaml
+
+Several writers touch decisions.yaml (SessionEnd extractor, decision-sync,
+decision-link). Each used to load the whole file, mutate it and rewrite it
+in place, so concurrent runs silently lost each other's entries and a crash
+mid-write left a truncated file.
+
+Writers now append one JSON record per line to a journal with a single
+O_APPEND write; compaction folds the journal into decisions.yaml under an
+exclusive file lock and replaces the file with an atomic rename. Readers
+load decisions.yaml and merge the journal tail, so nothing appended is
+invisible between compactions.
+
+Record ops:
+- {"op": "add", "section": "decisions", "entry": {...}}  (skipped if id exists)
+- {"op": "update", "section": "decisions", "id": "...", "fields": {...}}
+- {"op": "meta", "fields": {...}}  (merged into top-level metadata)
+"""
+
+import json
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable
+
+import yaml_cache
+
+try:
+    import fcntl
+except ImportError:  # Windows: locking degrades to best effort
+    fcntl = None
+
+
+def apply_records(document: dict, records: list[dict[str, Any]]) -> dict:
+    """Fold journal records into a decisions.yaml document (in place)."""
+    # id -> entry per section, built once for the whole batch
+    indexes: dict[str, dict[str, dict]] = {}
+
+    def section_index(section: str) -> dict[str, dict]:
+        if section not in indexes:
+            block = document.setdefault(section, {})
+            if not isinstance(block.get("entries"), list):
+                block["entries"] = []
+            indexes[section] = {
+                e["id"]: e for e in block["entries"] if isinstance(e, dict) and e.get("id")
+            }
+        return indexes[section]
+
+    for record in records:
+        op = record.get("op")
+
+        if op == "add":
+            section = record.get("section", "decisions")
+            entry = record.get("entry") or {}
+            index = section_index(section)
+            entry_id = entry.get("id")
+            if entry_id and entry_id in index:
+                continue
+            document[section]["entries"].append(entry)
+            if entry_id:
+                index[entry_id] = entry
+
+        elif op == "update":
+            target = section_index(record.get("section", "decisions")).get(record.get("id"))
+            if target is not None:
+                target.update(record.get("fields") or {})
+
+        elif op == "meta":
+            metadata = document.setdefault("metadata", {})
+            metadata.update(record.get("fields") or {})
+
+    return document
+
+
+def merge_documents(ours: dict, current: dict) -> dict:
+    """
+    Overlay a full document onto the current on-disk state.
+
+    Entries in ours win by id; entries only present in current (appended
+    concurrently since ours was loaded) are kept.
+    """
+    merged = dict(ours)
+
+    for section, block in current.items():
+        if not (isinstance(block, dict) and isinstance(block.get("entries"), list)):
+            continue
+        if section not in merged:
+            merged[section] = block
+            continue
+
+        our_block = merged[section]
+        if not isinstance(our_block, dict):
+            continue
+        our_entries = list(our_block.get("entries") or [])
+        our_ids = {e.get("id") for e in our_entries if isinstance(e, dict)}
+        our_entries.extend(
+            e for e in block["entries"]
+            if isinstance(e, dict) and e.get("id") and e["id"] not in our_ids
+        )
+        merged[section] = {**our_block, "entries": our_entries}
+
+    return merged
+
+
+class DecisionJournal:
+    """Append-only journal + locked compaction for decisions.yaml."""
+
+    def __init__(self, decisions_path: Path):
+        self.decisions_path = Path(decisions_path)
+        state_dir = self.decisions_path.parent / ".contextune"
+        self.journal_path = state_dir / "decisions.journal"
+        self.lock_path = state_dir / "decisions.lock"
+
+    @contextmanager
+    def _locked(self, exclusive: bool, blocking: bool = True):
+        """
+        Hold the journal lock.
+
+        Appenders share the lock so they never wait on each other; compaction
+        takes it exclusively so no append lands between reading and truncating
+        the journal. Yields False if a non-blocking acquire failed.
+        """
+        self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+        if fcntl is None:
+            yield True
+            return
+
+        with open(self.lock_path, "a") as lock_file:
+            flags = fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH
+            if not blocking:
+                flags |= fcntl.LOCK_NB
+            try:
+                fcntl.flock(lock_file, flags)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    # === WRITERS ===
+
+    def append(self, records: list[dict[str, Any]]) -> None:
+        """Append records with a single O_APPEND write."""
+        if not records:
+            return
+
+        payload = "".join(
+            json.dumps(record, default=str, ensure_ascii=False) + "\n" for record in records
+        ).encode("utf-8")
+
+        with self._locked(exclusive=False):
+            fd = os.open(self.journal_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, payload)
+            finally:
+                os.close(fd)
+
+    def add_entries(self, section: str, entries: list[dict[str, Any]]) -> None:
+        """Journal new entries for a section."""
+        self.append([{"op": "add", "section": section, "entry": e} for e in entries])
+
+    # === READERS ===
+
+    def size(self) -> int:
+        try:
+            return self.journal_path.stat().st_size
+        except OSError:
+            return 0
+
+    def read_records(self, offset: int = 0) -> tuple[list[dict[str, Any]], int]:
+        """
+        Read complete records starting at a byte offset.
+
+        Returns: (records, offset just past the last complete line)
+        """
+        try:
+            with open(self.journal_path, "rb") as f:
+                f.seek(offset)
+                chunk = f.read()
+        except FileNotFoundError:
+            return [], offset
+
+        # Ignore a trailing partial line from an in-flight append
+        end = chunk.rfind(b"\n") + 1
+        records = []
+        for line in chunk[:end].splitlines():
+            if not line.strip():
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+
+        return records, offset + end
+
+    def yaml_fingerprint(self) -> str | None:
+        """(mtime_ns, size) of decisions.yaml, or None if missing."""
+        try:
+            stat = self.decisions_path.stat()
+        except OSError:
+            return None
+        return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+    def read_snapshot(self) -> tuple[dict, list[dict[str, Any]], int, str | None]:
+        """
+        Read decisions.yaml and the whole journal consistently.
+
+        Holds the shared lock so compaction cannot swap the file between the
+        two reads. Returns: (yaml document, records, journal offset, fingerprint)
+        """
+        with self._locked(exclusive=False):
+            fingerprint = self.yaml_fingerprint()
+            document = self.load_yaml()
+            records, end = self.read_records()
+        return document, records, end, fingerprint
+
+    def load_yaml(self) -> dict:
+        """Load the compacted decisions.yaml (without the journal tail)."""
+        return yaml_cache.load_file(self.decisions_path, default={}) or {}
+
+    def load(self) -> dict:
+        """Load decisions.yaml merged with the journal tail."""
+        document, records, _, _ = self.read_snapshot()
+        return apply_records(document, records)
+
+    # === COMPACTION ===
+
+    def rewrite(self, build: Callable[[dict], dict], blocking: bool = True) -> bool:
+        """
+        Rewrite decisions.yaml under the exclusive lock.
+
+        build() receives the current merged document (YAML + journal) and
+        returns the document to write. The journal is truncated afterwards
+        since everything in it is now part of decisions.yaml.
+
+        Returns: False if blocking=False and another process holds the lock
+        """
+        with self._locked(exclusive=True, blocking=blocking) as acquired:
+            if not acquired:
+                return False
+
+            # Already holding the lock exclusively: read without re-locking
+            records, _ = self.read_records()
+            document = build(apply_records(self.load_yaml(), records))
+
+            # Temp file + fsync + rename; also primes the parsed-YAML cache
+            yaml_cache.dump_file(self.decisions_path, document, allow_unicode=True)
+
+            if self.journal_path.exists():
+                os.truncate(self.journal_path, 0)
+
+        return True
+
+    def compact(self, blocking: bool = True) -> bool:
+        """Fold the journal into decisions.yaml."""
+        if self.size() == 0 and self.decisions_path.exists():
+            return True
+        return self.rewrite(lambda document: document, blocking=blocking)
+
+    def save_document(self, data: dict) -> None:
+        """Write a full document, keeping entries journaled since it was loaded."""
+        self.rewrite(lambda current: merge_documents(data, current))
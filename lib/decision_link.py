@@ -11,11 +11,16 @@ Features:
 - Add observability_link fields for traceability
 - Dry-run mode for safe testing
 - Rich progress reporting with detailed output
+
+Sessions are loaded once into a start-sorted interval index (bisect lookup)
+and detections for all matched sessions are fetched in one batched query,
+so linking N entries costs O(N log S) instead of N full table scans.
 """
 
 import sqlite3
 import sys
 import time
+from bisect import bisect_right
 from datetime import datetime
 from pathlib import Path
 from typing import Any
@@ -25,6 +30,8 @@ from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.table import Table
 
+from decision_journal import DecisionJournal
+
 
 class DecisionLinker:
     """Links decisions.yaml entries to observability DB sessions."""
@@ -41,6 +48,12 @@ class DecisionLinker:
         self.decisions_path = Path(decisions_path)
         self.dry_run = dry_run
         self.console = Console()
+        self.journal = DecisionJournal(self.decisions_path)
+
+        # Interval index over sessions, built lazily on first lookup
+        self._session_starts: list[float] | None = None
+        self._sessions_by_start: list[dict[str, Any]] = []
+        self._max_end_prefix: list[float] = []
 
         # Validate paths
         if not self.db_path.exists():
@@ -54,14 +67,13 @@ class DecisionLinker:
             sys.exit(1)
 
     def load_decisions(self) -> dict[str, Any]:
-        """Load decisions.yaml file.
+        """Load decisions.yaml file merged with the pending journal tail.
 
         Returns:
             Parsed YAML content as dictionary
         """
         try:
-            with open(self.decisions_path) as f:
-                return yaml.safe_load(f) or {}
+            return self.journal.load()
         except yaml.YAMLError as e:
             self.console.print(f"[red]Error parsing YAML: {e}[/red]")
             sys.exit(1)
@@ -69,6 +81,9 @@ class DecisionLinker:
     def save_decisions(self, data: dict[str, Any]) -> None:
         """Save decisions to decisions.yaml file.
 
+        Written under the journal lock with an atomic rename; entries other
+        writers journaled since load_decisions() are kept.
+
         Args:
             data: Decisions dictionary to save
         """
@@ -77,8 +92,7 @@ class DecisionLinker:
             return
 
         try:
-            with open(self.decisions_path, "w") as f:
-                yaml.dump(data, f, default_flow_style=False, sort_keys=False)
+            self.journal.save_document(data)
             self.console.print(
                 f"[green]Saved decisions to {self.decisions_path}[/green]"
             )
@@ -137,13 +151,66 @@ class DecisionLinker:
             self.console.print(f"[red]Database error: {e}[/red]")
             return []
 
+    def query_detections_for_sessions(
+        self, session_ids: list[str]
+    ) -> dict[str, list[dict[str, Any]]]:
+        """Query detections for many sessions with batched IN (...) queries.
+
+        Args:
+            session_ids: Session identifiers
+
+        Returns:
+            Mapping of session_id to its detections (timestamp order)
+        """
+        detections: dict[str, list[dict[str, Any]]] = {sid: [] for sid in session_ids}
+        unique_ids = list(detections)
+
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.row_factory = sqlite3.Row
+                # Stay well under SQLite's host parameter limit
+                for i in range(0, len(unique_ids), 500):
+                    batch = unique_ids[i : i + 500]
+                    placeholders = ",".join("?" * len(batch))
+                    cursor = conn.execute(
+                        f"""
+                        SELECT id, command, confidence, method, timestamp, session_id
+                        FROM detection_history
+                        WHERE session_id IN ({placeholders})
+                        ORDER BY timestamp ASC
+                        """,
+                        batch,
+                    )
+                    for row in cursor:
+                        record = dict(row)
+                        detections[record.pop("session_id")].append(record)
+        except sqlite3.Error as e:
+            self.console.print(f"[red]Database error: {e}[/red]")
+
+        return detections
+
+    def _build_session_index(self) -> None:
+        """Load sessions once, sorted by start_time, with running max end_time."""
+        now = time.time()
+        sessions = sorted(self.query_sessions(), key=lambda s: s["start_time"])
+
+        self._sessions_by_start = sessions
+        self._session_starts = [s["start_time"] for s in sessions]
+        self._max_end_prefix = []
+
+        running_max = float("-inf")
+        for session in sessions:
+            running_max = max(running_max, session.get("end_time") or now)
+            self._max_end_prefix.append(running_max)
+
     def find_matching_session(
         self, timestamp_ms: int, tolerance_ms: int = 5000
     ) -> dict[str, Any] | None:
         """Find session matching a given timestamp.
 
         Matches based on whether timestamp falls within session duration.
-        Uses tolerance for fuzzy matching (default 5 seconds).
+        Uses tolerance for fuzzy matching (default 5 seconds). When sessions
+        overlap, the most recently started one wins.
 
         Args:
             timestamp_ms: Timestamp in milliseconds
@@ -152,20 +219,26 @@ class DecisionLinker:
         Returns:
             Session record if found, None otherwise
         """
-        sessions = self.query_sessions()
+        if self._session_starts is None:
+            self._build_session_index()
 
         # Convert timestamp to seconds (DB uses seconds)
         timestamp_sec = timestamp_ms / 1000
+        tolerance_sec = tolerance_ms / 1000
 
-        for session in sessions:
-            start_time = session["start_time"]
-            end_time = session.get("end_time")
+        # Candidates started no later than timestamp + tolerance
+        i = bisect_right(self._session_starts, timestamp_sec + tolerance_sec) - 1
 
-            # Check if timestamp is within session bounds (with tolerance)
-            if start_time - tolerance_ms / 1000 <= timestamp_sec <= (
-                end_time or time.time()
-            ) + tolerance_ms / 1000:
+        while i >= 0:
+            # No earlier session ends late enough: stop scanning
+            if self._max_end_prefix[i] + tolerance_sec < timestamp_sec:
+                break
+
+            session = self._sessions_by_start[i]
+            end_time = session.get("end_time") or time.time()
+            if timestamp_sec <= end_time + tolerance_sec:
                 return session
+            i -= 1
 
         return None
 
@@ -202,6 +275,7 @@ class DecisionLinker:
         entries = decisions["decisions"]["entries"]
         linked_count = 0
         skipped_count = 0
+        matches: list[tuple[dict[str, Any], dict[str, Any]]] = []
 
         with Progress(
             SpinnerColumn(),
@@ -240,25 +314,33 @@ class DecisionLinker:
                     skipped_count += 1
                     continue
 
-                # Add observability link
-                session_id = matching_session["session_id"]
-                detections = self.query_detections_for_session(session_id)
-
-                entry["observability_link"] = {
-                    "session_id": session_id,
-                    "timestamp": matching_session["start_time"],
-                    "detection_count": len(detections),
-                    "linked_at": datetime.utcnow().isoformat() + "Z",
+                matches.append((entry, matching_session))
+
+        # One batched detection query for every matched session
+        detections_by_session = self.query_detections_for_sessions(
+            [session["session_id"] for _, session in matches]
+        )
+
+        for entry, matching_session in matches:
+            # Add observability link
+            session_id = matching_session["session_id"]
+            detections = detections_by_session.get(session_id, [])
+
+            entry["observability_link"] = {
+                "session_id": session_id,
+                "timestamp": matching_session["start_time"],
+                "detection_count": len(detections),
+                "linked_at": datetime.utcnow().isoformat() + "Z",
+            }
+
+            if detections:
+                entry["observability_link"]["first_detection"] = {
+                    "command": detections[0]["command"],
+                    "confidence": detections[0]["confidence"],
+                    "method": detections[0]["method"],
                 }
 
-                if detections:
-                    entry["observability_link"]["first_detection"] = {
-                        "command": detections[0]["command"],
-                        "confidence": detections[0]["confidence"],
-                        "method": detections[0]["method"],
-                    }
-
-                linked_count += 1
+            linked_count += 1
 
         # Display summary
         self.console.print()
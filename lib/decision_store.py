@@ -0,0 +1,687 @@
+#!/usr/bin/env python3
+"""
+Decision Store - Indexed SQLite backing store for decisions.yaml
+
+decisions.yaml grows without bound and every reader re-parses the whole
+file while every writer rewrites it. The store keeps entries in SQLite and
+treats decisions.yaml as a generated export:
+- Entries indexed by id, section, category, status, tags and created_at
+- Dedup by primary key (no list scans on append)
+- Query filters pushed into SQL instead of Python loops
+- New entries are written to the decision journal and folded into
+  decisions.yaml by compaction (see decision_journal.py)
+- Journal tail applied incrementally; YAML fully re-imported only when it
+  changed outside the store (git pull, manual edits, compaction)
+- BM25-ranked full-text search (FTS5) over title, context, decision and
+  tags, with per-entry token counts cached for budgeted context loading
+"""
+
+import json
+import re
+import sqlite3
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from decision_journal import DecisionJournal, apply_records
+
+# Bump to rebuild the store (it is an index over decisions.yaml + journal)
+SCHEMA_VERSION = 2
+
+# bm25() column weights: title, context, decision, tags
+BM25_WEIGHTS = (10.0, 2.0, 4.0, 5.0)
+
+# Section key in decisions.yaml -> entry type reported to callers
+SECTION_TYPES = {
+    "research": "research",
+    "plans": "plan",
+    "decisions": "decision",
+    "features": "feature",
+}
+
+
+def parse_iso_timestamp(value: Any) -> float | None:
+    """Parse an ISO timestamp to epoch seconds (naive values treated as UTC)."""
+    if isinstance(value, datetime):
+        dt = value
+    elif isinstance(value, str) and value:
+        try:
+            dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    else:
+        return None
+
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def estimate_tokens(entry: dict[str, Any]) -> int:
+    """Estimate token count for a decision entry.
+
+    Rough estimation:
+    - Title/ID: ~20 tokens
+    - Context/Description: ~100 tokens per 500 chars
+    - Decision: ~100 tokens per 500 chars
+    - Alternatives: ~50 tokens per alternative
+    - Consequences: ~50 tokens
+    """
+    tokens = 20
+
+    # Context/Description
+    if "context" in entry:
+        tokens += len(str(entry["context"])) // 5
+
+    # Decision
+    if "decision" in entry:
+        tokens += len(str(entry["decision"])) // 5
+
+    # Rationale
+    if "rationale" in entry:
+        tokens += len(str(entry["rationale"])) // 5
+
+    # Alternatives
+    if "alternatives_considered" in entry:
+        tokens += len(entry["alternatives_considered"]) * 50
+
+    # Consequences
+    if "consequences" in entry:
+        tokens += 50
+
+    return max(tokens, 100)  # Minimum 100 tokens per entry
+
+
+@dataclass
+class SearchHit:
+    """Ranked search result."""
+
+    entry: dict[str, Any]
+    score: float  # Higher is more relevant
+    tokens: int
+
+
+def select_within_budget(
+    hits: list[SearchHit], budget: int, granularity: int = 25
+) -> list[SearchHit]:
+    """
+    Pick the most relevant set of hits whose tokens fit the budget.
+
+    0/1 knapsack over cached token counts (value = relevance score). Token
+    weights are rounded up to `granularity` so the DP table stays small;
+    rounding up never overshoots the budget. Keeps the input (rank) order.
+    """
+    capacity = budget // granularity
+    if capacity <= 0 or not hits:
+        return []
+
+    weights = [-(-hit.tokens // granularity) for hit in hits]  # ceil
+    values = [max(hit.score, 1e-9) for hit in hits]
+
+    # best[c] = best value with capacity c; keep[i] = capacities where item i was taken
+    best = [0.0] * (capacity + 1)
+    keep = []
+    for weight, value in zip(weights, values, strict=True):
+        taken = bytearray(capacity + 1)
+        for c in range(capacity, weight - 1, -1):
+            candidate = best[c - weight] + value
+            if candidate > best[c]:
+                best[c] = candidate
+                taken[c] = 1
+        keep.append(taken)
+
+    chosen = set()
+    c = capacity
+    for i in range(len(hits) - 1, -1, -1):
+        if keep[i][c]:
+            chosen.add(i)
+            c -= weights[i]
+
+    return [hit for i, hit in enumerate(hits) if i in chosen]
+
+
+def build_match_query(text: str) -> str | None:
+    """Turn free text into an FTS5 query: OR of prefix-matched terms."""
+    terms = re.findall(r"\w+", text.lower())
+    if not terms:
+        return None
+    return " OR ".join(f'"{term}"*' for term in terms)
+
+
+def default_store_path(decisions_path: Path) -> Path:
+    """Store lives next to the other project databases in .contextune/."""
+    return decisions_path.parent / ".contextune" / "decisions.db"
+
+
+class DecisionStore:
+    """SQLite index derived from decisions.yaml and the decision journal (rebuildable)."""
+
+    def __init__(self, decisions_path: Path, db_path: Path | None = None):
+        self.decisions_path = Path(decisions_path)
+        self.db_path = Path(db_path) if db_path else default_store_path(self.decisions_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.journal = DecisionJournal(self.decisions_path)
+        self._init_db()
+        self.sync_from_yaml()
+
+    def _init_db(self):
+        """Initialize store schema."""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+
+            # The store is rebuilt from YAML + journal, so schema upgrades
+            # simply drop everything and re-import
+            if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                for table in ("entries", "entry_tags", "entries_fts", "store_meta"):
+                    conn.execute(f"DROP TABLE IF EXISTS {table}")
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+            # === ENTRIES ===
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS entries (
+                    id TEXT PRIMARY KEY,
+                    section TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    title TEXT,
+                    topic TEXT,
+                    context TEXT,
+                    decision TEXT,
+                    category TEXT,
+                    status TEXT,
+                    impact TEXT,
+                    created_at REAL,
+                    expires_at REAL,
+                    permanent INTEGER NOT NULL DEFAULT 0,
+                    tokens INTEGER NOT NULL DEFAULT 0,
+                    data TEXT NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_entries_section
+                ON entries(section, position)
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_entries_category
+                ON entries(category)
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_entries_status
+                ON entries(status)
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_entries_created_at
+                ON entries(created_at)
+            """)
+
+            # === TAGS ===
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS entry_tags (
+                    tag TEXT NOT NULL,
+                    entry_id TEXT NOT NULL,
+                    PRIMARY KEY (tag, entry_id)
+                )
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_entry_tags_entry
+                ON entry_tags(entry_id)
+            """)
+
+            # === FULL-TEXT SEARCH ===
+            # rowid mirrors entries.rowid
+            try:
+                conn.execute("""
+                    CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts
+                    USING fts5(title, context, decision, tags)
+                """)
+                self.fts_enabled = True
+            except sqlite3.OperationalError:
+                # SQLite built without FTS5: search() falls back to LIKE
+                self.fts_enabled = False
+
+            # === DOCUMENT METADATA ===
+            # skeleton: decisions.yaml without entry lists (metadata, section order)
+            # yaml_fingerprint: (mtime_ns, size) of the last full import
+            # journal_offset: journal bytes already applied to the store
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS store_meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                )
+            """)
+
+            conn.commit()
+
+    # === YAML SYNC ===
+
+    def _get_meta(self, conn: sqlite3.Connection, key: str) -> str | None:
+        row = conn.execute(
+            "SELECT value FROM store_meta WHERE key = ?", (key,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, conn: sqlite3.Connection, key: str, value: str):
+        conn.execute(
+            "INSERT OR REPLACE INTO store_meta (key, value) VALUES (?, ?)",
+            (key, value),
+        )
+
+    def sync_from_yaml(self) -> bool:
+        """
+        Bring the store up to date with decisions.yaml + journal.
+
+        Appended journal records are applied incrementally; a changed YAML
+        (or a truncated journal, i.e. compaction) triggers a full re-import.
+
+        Returns: True if anything was applied
+        """
+        fingerprint = self.journal.yaml_fingerprint()
+        if fingerprint is None:
+            return False
+
+        with sqlite3.connect(self.db_path) as conn:
+            stored_fingerprint = self._get_meta(conn, "yaml_fingerprint")
+            offset = int(self._get_meta(conn, "journal_offset") or 0)
+
+        journal_size = self.journal.size()
+        if stored_fingerprint == fingerprint and journal_size >= offset:
+            if journal_size == offset:
+                return False
+            records, end = self.journal.read_records(offset)
+            if all(r.get("op") == "add" for r in records):
+                self._apply_adds(records, end)
+                return True
+
+        document, records, end, fingerprint = self.journal.read_snapshot()
+        self.import_document(
+            apply_records(document, records), journal_offset=end, fingerprint=fingerprint
+        )
+        return True
+
+    def _apply_adds(self, records: list[dict], journal_offset: int):
+        by_section: dict[str, list[dict]] = {}
+        for record in records:
+            by_section.setdefault(record.get("section", "decisions"), []).append(
+                record.get("entry") or {}
+            )
+
+        with sqlite3.connect(self.db_path) as conn:
+            for section, entries in by_section.items():
+                self._insert_many(conn, section, entries)
+            self._set_meta(conn, "journal_offset", str(journal_offset))
+            conn.commit()
+
+    def import_document(
+        self, data: dict, journal_offset: int = 0, fingerprint: str | None = None
+    ):
+        """Replace store contents with a parsed decisions.yaml document."""
+        skeleton = {}
+        rows = []
+
+        for key, value in data.items():
+            if isinstance(value, dict) and "entries" in value:
+                skeleton[key] = {k: v for k, v in value.items() if k != "entries"}
+                skeleton[key]["entries"] = []
+                for position, entry in enumerate(value.get("entries") or []):
+                    if isinstance(entry, dict):
+                        rows.append((key, position, entry))
+            else:
+                skeleton[key] = value
+
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("DELETE FROM entries")
+            conn.execute("DELETE FROM entry_tags")
+            if self.fts_enabled:
+                conn.execute("DELETE FROM entries_fts")
+            for section, position, entry in rows:
+                self._insert(conn, section, position, entry, replace=True)
+            self._set_meta(conn, "skeleton", json.dumps(skeleton, default=str))
+            if fingerprint:
+                self._set_meta(conn, "yaml_fingerprint", fingerprint)
+            self._set_meta(conn, "journal_offset", str(journal_offset))
+            conn.commit()
+
+    def _insert(
+        self,
+        conn: sqlite3.Connection,
+        section: str,
+        position: int,
+        entry: dict[str, Any],
+        replace: bool = False,
+    ) -> bool:
+        entry_id = entry.get("id")
+        key = str(entry_id) if entry_id else f"_{section}-{position}"
+
+        if replace and self.fts_enabled:
+            old = conn.execute("SELECT rowid FROM entries WHERE id = ?", (key,)).fetchone()
+            if old:
+                conn.execute("DELETE FROM entries_fts WHERE rowid = ?", old)
+
+        verb = "INSERT OR REPLACE" if replace else "INSERT OR IGNORE"
+        cursor = conn.execute(
+            f"""
+            {verb} INTO entries
+            (id, section, position, title, topic, context, decision,
+             category, status, impact, created_at, expires_at, permanent,
+             tokens, data)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                key,
+                section,
+                position,
+                _text(entry.get("title")),
+                _text(entry.get("topic")),
+                _text(entry.get("context")),
+                _text(entry.get("decision")),
+                entry.get("category"),
+                entry.get("status"),
+                entry.get("impact"),
+                parse_iso_timestamp(entry.get("created_at", entry.get("date"))),
+                parse_iso_timestamp(entry.get("expires_at")),
+                1 if entry.get("permanent") else 0,
+                estimate_tokens(entry),
+                json.dumps(entry, default=str),
+            ),
+        )
+        if cursor.rowcount == 0:
+            return False
+
+        tags = entry.get("tags") or []
+        if not isinstance(tags, list):
+            tags = []
+        conn.executemany(
+            "INSERT OR IGNORE INTO entry_tags (tag, entry_id) VALUES (?, ?)",
+            [(str(tag), key) for tag in tags],
+        )
+
+        if self.fts_enabled:
+            # Research entries carry topic/findings, plans a summary
+            conn.execute(
+                """
+                INSERT INTO entries_fts (rowid, title, context, decision, tags)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (
+                    cursor.lastrowid,
+                    " ".join(filter(None, [_text(entry.get("title")), _text(entry.get("topic"))])),
+                    " ".join(
+                        filter(
+                            None,
+                            [
+                                _text(entry.get("context")),
+                                _text(entry.get("summary")),
+                                _text(entry.get("findings")),
+                            ],
+                        )
+                    ),
+                    _text(entry.get("decision")) or "",
+                    " ".join(str(tag) for tag in tags),
+                ),
+            )
+        return True
+
+    # === WRITES ===
+
+    def _insert_many(
+        self, conn: sqlite3.Connection, section: str, entries: list[dict[str, Any]]
+    ) -> list[dict]:
+        row = conn.execute(
+            "SELECT COALESCE(MAX(position), -1) FROM entries WHERE section = ?",
+            (section,),
+        ).fetchone()
+        position = row[0] + 1
+
+        added = []
+        for entry in entries:
+            if self._insert(conn, section, position, entry):
+                added.append(entry)
+                position += 1
+
+        skeleton = json.loads(self._get_meta(conn, "skeleton") or "{}")
+        if section not in skeleton:
+            skeleton[section] = {"entries": []}
+            self._set_meta(conn, "skeleton", json.dumps(skeleton, default=str))
+
+        return added
+
+    def add_entries(self, section: str, entries: list[dict[str, Any]]) -> list[dict]:
+        """
+        Add entries to a section, skipping ids that already exist.
+
+        New entries are indexed and appended to the journal; call compact()
+        to fold them into decisions.yaml.
+
+        Returns: The entries that were actually added
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            added = self._insert_many(conn, section, entries)
+            conn.commit()
+
+        self.journal.add_entries(section, added)
+        return added
+
+    def has_entry(self, entry_id: str) -> bool:
+        """Check whether an entry id exists (primary key lookup)."""
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute(
+                "SELECT 1 FROM entries WHERE id = ?", (entry_id,)
+            ).fetchone()
+        return row is not None
+
+    def existing_ids(self, entry_ids: list[str]) -> set[str]:
+        """Subset of entry_ids already in the store (batched lookups)."""
+        found: set[str] = set()
+        with sqlite3.connect(self.db_path) as conn:
+            for start in range(0, len(entry_ids), 500):
+                chunk = entry_ids[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                found.update(
+                    row[0]
+                    for row in conn.execute(
+                        f"SELECT id FROM entries WHERE id IN ({placeholders})", chunk
+                    )
+                )
+        return found
+
+    # === QUERIES ===
+
+    def _filter_clauses(
+        self,
+        tags: list[str] | None = None,
+        category: str | None = None,
+        status: str | None = None,
+        since_days: int | None = None,
+        impact: str | None = None,
+        include_expired: bool = False,
+        sections: list[str] | None = None,
+    ) -> tuple[list[str], list[Any]]:
+        """SQL WHERE clauses for the structured filters (columns of e)."""
+        clauses = []
+        params: list[Any] = []
+        now = datetime.now(timezone.utc).timestamp()
+
+        if not include_expired:
+            clauses.append("(e.permanent = 1 OR e.expires_at IS NULL OR e.expires_at > ?)")
+            params.append(now)
+
+        if tags:
+            placeholders = ",".join("?" * len(tags))
+            clauses.append(
+                f"e.id IN (SELECT entry_id FROM entry_tags WHERE tag IN ({placeholders}))"
+            )
+            params.extend(tags)
+
+        if category:
+            clauses.append("e.category = ?")
+            params.append(category)
+
+        if status:
+            clauses.append("e.status = ?")
+            params.append(status)
+
+        if impact:
+            clauses.append("e.impact = ?")
+            params.append(impact)
+
+        if since_days:
+            clauses.append("(e.created_at IS NULL OR e.created_at >= ?)")
+            params.append(now - since_days * 86400)
+
+        if sections:
+            clauses.append(f"e.section IN ({','.join('?' * len(sections))})")
+            params.extend(sections)
+
+        return clauses, params
+
+    def query(self, **filters: Any) -> list[dict[str, Any]]:
+        """
+        Query entries with filters evaluated in SQL.
+
+        Expired entries (expires_at passed, not permanent) are skipped
+        unless include_expired; topic is a case-insensitive substring of
+        title, topic, context or decision; tags match any; since_days uses
+        created_at (or date). Each entry is returned with a "_type" key
+        naming its section.
+        """
+        return [hit.entry for hit in self.query_hits(**filters)]
+
+    def query_hits(
+        self,
+        topic: str | None = None,
+        tags: list[str] | None = None,
+        category: str | None = None,
+        status: str | None = None,
+        since_days: int | None = None,
+        impact: str | None = None,
+        include_expired: bool = False,
+        sections: list[str] | None = None,
+    ) -> list[SearchHit]:
+        """
+        Like query(), but with cached token counts.
+
+        Hits are not ranked by relevance; score is recency instead (the
+        fraction of hits created no later than this one, newest 1.0), so a
+        token budget prefers recent entries.
+        """
+        clauses, params = self._filter_clauses(
+            tags, category, status, since_days, impact, include_expired, sections
+        )
+
+        if topic:
+            like = f"%{topic}%"
+            clauses.append(
+                "(e.title LIKE ? OR e.context LIKE ? OR e.decision LIKE ? OR e.topic LIKE ?)"
+            )
+            params.extend([like] * 4)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute(
+                f"SELECT e.section, e.data, e.tokens, e.created_at FROM entries e {where}", params
+            ).fetchall()
+            order = self._section_order(conn)
+
+        # Undated entries count as the oldest
+        created = sorted(row[3] or 0.0 for row in rows)
+        by_section: dict[str, list[SearchHit]] = {}
+        for section, data, tokens, created_at in rows:
+            entry = json.loads(data)
+            entry["_type"] = SECTION_TYPES.get(section, section)
+            recency = bisect_right(created, created_at or 0.0) / len(created)
+            by_section.setdefault(section, []).append(
+                SearchHit(entry=entry, score=recency, tokens=tokens)
+            )
+
+        return [hit for section in order for hit in by_section.pop(section, [])]
+
+    def search(
+        self,
+        text: str,
+        limit: int | None = None,
+        tags: list[str] | None = None,
+        category: str | None = None,
+        status: str | None = None,
+        since_days: int | None = None,
+        impact: str | None = None,
+        include_expired: bool = False,
+        sections: list[str] | None = None,
+    ) -> list[SearchHit]:
+        """
+        BM25-ranked full-text search, most relevant first.
+
+        Terms are prefix-matched and OR-ed, so entries matching more (and
+        rarer) terms rank higher. Structured filters are applied in the
+        same query.
+        """
+        match = build_match_query(text)
+        if match is None:
+            return []
+
+        clauses, params = self._filter_clauses(
+            tags, category, status, since_days, impact, include_expired, sections
+        )
+        limit_sql = f"LIMIT {int(limit)}" if limit else ""
+
+        with sqlite3.connect(self.db_path) as conn:
+            if self.fts_enabled:
+                weights = ", ".join(str(w) for w in BM25_WEIGHTS)
+                where = " AND ".join(["entries_fts MATCH ?", *clauses])
+                rows = conn.execute(
+                    f"""
+                    SELECT e.section, e.data, e.tokens, bm25(entries_fts, {weights}) AS rank
+                    FROM entries_fts
+                    JOIN entries e ON e.rowid = entries_fts.rowid
+                    WHERE {where}
+                    ORDER BY rank
+                    {limit_sql}
+                    """,
+                    [match, *params],
+                ).fetchall()
+            else:
+                like = f"%{text}%"
+                where = " AND ".join(
+                    [
+                        "(e.title LIKE ? OR e.context LIKE ? OR e.decision LIKE ? OR e.topic LIKE ?)",
+                        *clauses,
+                    ]
+                )
+                rows = conn.execute(
+                    f"""
+                    SELECT e.section, e.data, e.tokens, -1.0 AS rank
+                    FROM entries e WHERE {where} {limit_sql}
+                    """,
+                    [like] * 4 + params,
+                ).fetchall()
+
+        hits = []
+        for section, data, tokens, rank in rows:
+            entry = json.loads(data)
+            entry["_type"] = SECTION_TYPES.get(section, section)
+            # bm25() is negative, lower = better
+            hits.append(SearchHit(entry=entry, score=-rank, tokens=tokens))
+        return hits
+
+    def _section_order(self, conn: sqlite3.Connection) -> list[str]:
+        """Known sections first (decision-query order), then any others."""
+        skeleton = json.loads(self._get_meta(conn, "skeleton") or "{}")
+        known = [s for s in SECTION_TYPES if s in skeleton]
+        extra = [s for s, v in skeleton.items() if isinstance(v, dict) and s not in known]
+        rows = conn.execute("SELECT DISTINCT section FROM entries").fetchall()
+        extra += [r[0] for r in rows if r[0] not in known and r[0] not in extra]
+        return known + extra
+
+    # === EXPORT ===
+
+    def compact(self, blocking: bool = True) -> bool:
+        """Regenerate decisions.yaml from the journal (atomic rename under lock)."""
+        return self.journal.compact(blocking=blocking)
+
+
+def _text(value: Any) -> str | None:
+    if value is None:
+        return None
+    return value if isinstance(value, str) else json.dumps(value, default=str)
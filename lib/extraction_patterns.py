@@ -8,6 +8,10 @@ Used by:
 
 Extracts structured content from Claude Code conversation transcripts
 using extraction-optimized output format patterns.
+
+Marker detection goes through scan_markers(): one compiled scanner finds
+every marker in a single pass and reports per-category counts, instead of
+one re.findall() per pattern per message.
 """
 
 import re
@@ -15,6 +19,142 @@ from typing import Optional, List, Dict, Any
 import yaml
 
 
+# === MARKER SCANNER ===
+
+# Markdown markers (matched case-insensitively, as prefixes like the
+# original per-pattern regexes: "**Status:** Completed" counts as Complete)
+MARKER_LITERALS = {
+    'type_design': '**Type:** Design',
+    'type_plan': '**Type:** Plan',
+    'type_architecture': '**Type:** Architecture',
+    'status_complete': '**Status:** Complete',
+    'status_draft': '**Status:** Draft',
+    'status_ready': '**Status:** Ready',
+    'status_accepted': '**Status:** Accepted',
+    'status_proposed': '**Status:** Proposed',
+    'status_rejected': '**Status:** Rejected',
+    'estimated_tokens': '**Estimated Tokens:**',
+    'h_architecture': '## Architecture',
+    'h_task_breakdown': '## Task Breakdown',
+    'h_plan_structure': '## Plan Structure',
+    'h_task_details': '## Task Details',
+    'h_success_criteria': '## Success Criteria',
+    'h_decision': '## Decision:',
+    'h_alternatives': '### Alternatives Considered',
+    'h_context': '### Context',
+    'h_consequences': '### Consequences',
+}
+
+# Plain-text markers, counted with str.count on the lowercased text
+TEXT_LITERALS = {
+    'ready_for_plan': 'ready for: /ctx:plan',
+    'ready_for_execute': 'ready for: /ctx:execute',
+}
+
+# Keys that only count once per preceding ```yaml fence; equivalent to
+# re.findall(r"```yaml\n.*?<key>", text, re.DOTALL | re.IGNORECASE)
+YAML_FENCE = '```yaml\n'
+YAML_FENCE_KEYS = {
+    'yaml_architecture': 'architecture:',
+    'yaml_tasks': 'tasks:',
+    'yaml_metadata': 'metadata:',
+}
+
+MARKER_CATEGORIES = {
+    'design': (
+        'type_design', 'h_architecture', 'h_task_breakdown', 'yaml_architecture',
+        'yaml_tasks', 'status_complete', 'status_draft', 'estimated_tokens',
+    ),
+    'plan': (
+        'type_plan', 'h_plan_structure', 'h_task_details', 'yaml_metadata',
+        'yaml_tasks', 'status_ready', 'status_draft',
+    ),
+    'decision': (
+        'h_decision', 'status_accepted', 'status_proposed', 'status_rejected',
+        'h_alternatives', 'h_context', 'h_consequences',
+    ),
+    'completion': (
+        'type_design', 'type_plan', 'type_architecture', 'status_complete',
+        'status_ready', 'h_success_criteria', 'h_task_breakdown', 'ready_for_plan',
+        'ready_for_execute',
+    ),
+}
+
+# One alternation for every markdown marker. All of them start with '*' or
+# '#'; matching that first character as a class lets the engine skip ahead
+# to candidates instead of trying every branch at every position. No marker
+# contains another at a later offset, so consuming matches see the same
+# occurrences as separate findall() calls.
+MARKER_SCANNER = re.compile(
+    '[*#](?:' + '|'.join(
+        f'(?P<{name}>{re.escape(literal[1:])})' for name, literal in MARKER_LITERALS.items()
+    ) + ')',
+    re.IGNORECASE,
+)
+
+
+def _count_after_fences(lowered: str, key: str) -> int:
+    """Count key occurrences that each follow a not-yet-used ```yaml fence."""
+    count = 0
+    position = 0
+    while True:
+        fence = lowered.find(YAML_FENCE, position)
+        if fence < 0:
+            return count
+        found = lowered.find(key, fence + len(YAML_FENCE))
+        if found < 0:
+            return count
+        count += 1
+        position = found + len(key)
+
+
+def count_markers(text: str) -> Dict[str, int]:
+    """
+    Count each marker in a single scanner pass over text.
+
+    Text with none of the literal prefixes ('#', '*', '`', 'ready for')
+    returns immediately.
+
+    Returns: {marker name: count}, only for markers that occur
+    """
+    if not text:
+        return {}
+
+    counts: Dict[str, int] = {}
+    if '#' in text or '*' in text:
+        for match in MARKER_SCANNER.finditer(text):
+            name = match.lastgroup
+            counts[name] = counts.get(name, 0) + 1
+
+    has_fence = '`' in text
+    if has_fence or 'eady for' in text or 'EADY FOR' in text.upper():
+        lowered = text.lower()
+        for name, literal in TEXT_LITERALS.items():
+            found = lowered.count(literal)
+            if found:
+                counts[name] = found
+        if has_fence:
+            for name, key in YAML_FENCE_KEYS.items():
+                found = _count_after_fences(lowered, key)
+                if found:
+                    counts[name] = found
+
+    return counts
+
+
+def scan_markers(text: str) -> Dict[str, int]:
+    """
+    Per-category marker counts for one message.
+
+    Returns: {'design': n, 'plan': n, 'decision': n, 'completion': n}
+    """
+    counts = count_markers(text)
+    return {
+        category: sum(counts.get(name, 0) for name in names)
+        for category, names in MARKER_CATEGORIES.items()
+    }
+
+
 def extract_assistant_text(entry: dict) -> Optional[str]:
     """
     Extract text content from assistant message entry.
@@ -70,20 +210,7 @@ def extract_designs(transcript: List[dict]) -> List[dict]:
         if not text:
             continue
 
-        # Detect extraction-optimized design patterns
-        patterns = [
-            r"\*\*Type:\*\* Design",
-            r"## Architecture",
-            r"## Task Breakdown",
-            r"```yaml\n.*?architecture:",
-            r"```yaml\n.*?tasks:",
-            r"\*\*Status:\*\* (Complete|Draft)",
-            r"\*\*Estimated Tokens:\*\*",
-        ]
-
-        pattern_count = sum(
-            len(re.findall(p, text, re.IGNORECASE | re.DOTALL)) for p in patterns
-        )
+        pattern_count = scan_markers(text)['design']
 
         # Require at least 3 patterns for design detection
         if pattern_count >= 3:
@@ -119,17 +246,7 @@ def extract_decisions(transcript: List[dict]) -> List[dict]:
         if not text:
             continue
 
-        decision_patterns = [
-            r"## Decision:",
-            r"\*\*Status:\*\* (Accepted|Proposed|Rejected)",
-            r"### Alternatives Considered",
-            r"### Context",
-            r"### Consequences",
-        ]
-
-        pattern_count = sum(
-            len(re.findall(p, text, re.IGNORECASE)) for p in decision_patterns
-        )
+        pattern_count = scan_markers(text)['decision']
 
         if pattern_count >= 3:
             decisions.append({
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Feature Graph - Dependency index over features.yaml
+
+The feature-* scripts used to look features up with a linear scan of
+data["features"] once per dependency, which makes dependency checks O(n²)
+and scatters ad-hoc loops across feature-execute, feature-complete,
+feature-status and feature-graph. FeatureGraph is built once per load and
+provides:
+- an id map and forward/reverse edges (both `dependencies` and `blocks`
+  declarations become edges, deduplicated)
+- cycle detection
+- topological "waves": groups of features that can run in parallel once
+  the previous waves are done (Kahn's algorithm, level by level)
+- the critical path weighted by effort.estimated_tokens
+
+Feature dicts are referenced, not copied, so status changes made through
+the loaded data are seen by the graph.
+"""
+
+from typing import Any
+
+DONE_STATUSES = ("completed",)
+
+
+def estimated_tokens(feature: dict[str, Any]) -> int:
+    return int((feature.get("effort") or {}).get("estimated_tokens") or 0)
+
+
+class FeatureGraph:
+    """Indexed dependency graph of features."""
+
+    def __init__(self, features: list[dict[str, Any]]):
+        self.features = features
+        self.by_id: dict[str, dict[str, Any]] = {f["id"]: f for f in features}
+
+        # dependencies[x] = what x needs; dependents[x] = what needs x
+        self.dependencies: dict[str, list[str]] = {fid: [] for fid in self.by_id}
+        self.dependents: dict[str, list[str]] = {fid: [] for fid in self.by_id}
+        # Dependency ids that don't name a known feature
+        self.missing: dict[str, list[str]] = {}
+
+        for feature in features:
+            fid = feature["id"]
+            for dep_id in feature.get("dependencies") or []:
+                self._add_edge(dep_id, fid)
+            for blocked_id in feature.get("blocks") or []:
+                if blocked_id in self.by_id:
+                    self._add_edge(fid, blocked_id)
+
+    @classmethod
+    def from_data(cls, data: dict[str, Any]) -> "FeatureGraph":
+        return cls(data.get("features") or [])
+
+    def _add_edge(self, dep_id: str, fid: str):
+        if dep_id not in self.by_id:
+            missing = self.missing.setdefault(fid, [])
+            if dep_id not in missing:
+                missing.append(dep_id)
+            return
+        if dep_id not in self.dependencies[fid]:
+            self.dependencies[fid].append(dep_id)
+            self.dependents[dep_id].append(fid)
+
+    # === LOOKUPS ===
+
+    def get(self, feature_id: str) -> dict[str, Any] | None:
+        return self.by_id.get(feature_id)
+
+    def is_done(self, feature_id: str) -> bool:
+        feature = self.by_id.get(feature_id)
+        return feature is not None and feature.get("status") in DONE_STATUSES
+
+    def edges(self) -> list[tuple[str, str]]:
+        """(dependency, dependent) pairs in feature order."""
+        return [(dep_id, fid) for fid in self.by_id for dep_id in self.dependencies[fid]]
+
+    def unmet_dependencies(self, feature_id: str) -> list[tuple[str, dict[str, Any] | None]]:
+        """Dependencies that aren't completed, as (id, feature or None if unknown)."""
+        unmet = [(dep_id, self.by_id[dep_id]) for dep_id in self.dependencies.get(feature_id, [])
+                 if not self.is_done(dep_id)]
+        unmet.extend((dep_id, None) for dep_id in self.missing.get(feature_id, []))
+        return unmet
+
+    def ready(self, status: str = "planned") -> list[dict[str, Any]]:
+        """Features with the given status whose dependencies are all met."""
+        return [f for f in self.features
+                if f.get("status") == status and not self.unmet_dependencies(f["id"])]
+
+    def unblocked_by(self, feature_id: str, status: str = "planned") -> list[dict[str, Any]]:
+        """Dependents of feature_id that have nothing left to wait for."""
+        return [self.by_id[fid] for fid in self.dependents.get(feature_id, [])
+                if self.by_id[fid].get("status") == status and not self.unmet_dependencies(fid)]
+
+    # === STRUCTURE ===
+
+    def find_cycles(self) -> list[list[str]]:
+        """
+        Dependency cycles, each as [a, b, ..., a] in dependency order.
+
+        Iterative DFS, so deep chains don't hit the recursion limit.
+        """
+        WHITE, GRAY, BLACK = 0, 1, 2
+        color = dict.fromkeys(self.by_id, WHITE)
+        cycles = []
+
+        for root in self.by_id:
+            if color[root] != WHITE:
+                continue
+            color[root] = GRAY
+            path = [root]
+            stack = [iter(self.dependencies[root])]
+            while stack:
+                for dep_id in stack[-1]:
+                    if color[dep_id] == WHITE:
+                        color[dep_id] = GRAY
+                        path.append(dep_id)
+                        stack.append(iter(self.dependencies[dep_id]))
+                        break
+                    if color[dep_id] == GRAY:
+                        cycle = path[path.index(dep_id):] + [dep_id]
+                        cycles.append(cycle[::-1])
+                else:
+                    color[path.pop()] = BLACK
+                    stack.pop()
+
+        return cycles
+
+    def waves(self, include_done: bool = False) -> list[list[str]]:
+        """
+        Topological levels: every feature in a wave depends only on earlier
+        waves, so each wave can execute in parallel.
+
+        Completed features count as satisfied and are left out unless
+        include_done. Features on (or behind) a cycle never become ready
+        and are omitted; see find_cycles().
+        """
+        nodes = [fid for fid in self.by_id if include_done or not self.is_done(fid)]
+        node_set = set(nodes)
+        indegree = {fid: sum(1 for d in self.dependencies[fid] if d in node_set) for fid in nodes}
+
+        waves = []
+        current = [fid for fid in nodes if indegree[fid] == 0]
+        while current:
+            waves.append(current)
+            following = []
+            for fid in current:
+                for dependent in self.dependents[fid]:
+                    if dependent in indegree:
+                        indegree[dependent] -= 1
+                        if indegree[dependent] == 0:
+                            following.append(dependent)
+            current = following
+        return waves
+
+    def critical_path(self, include_done: bool = False) -> tuple[int, list[str]]:
+        """
+        Longest dependency chain weighted by estimated tokens.
+
+        Returns: (total tokens, feature ids from first to last)
+        """
+        best: dict[str, tuple[int, str | None]] = {}
+        for wave in self.waves(include_done=include_done):
+            for fid in wave:
+                prior = [(best[d][0], d) for d in self.dependencies[fid] if d in best]
+                length, via = max(prior, default=(0, None))
+                best[fid] = (length + estimated_tokens(self.by_id[fid]), via)
+
+        if not best:
+            return 0, []
+
+        end = max(best, key=lambda fid: best[fid][0])
+        total = best[end][0]
+        path = []
+        node: str | None = end
+        while node is not None:
+            path.append(node)
+            node = best[node][1]
+        return total, path[::-1]
@@ -15,6 +15,13 @@ Benefits:
 - 📈 Productivity insights
 - 🎯 Command popularity rankings
 - 🔍 Cross-project correlations
+
+Each project DB is reduced to a compact summary (counts, hourly/daily
+activity, latency sketches) in a thread pool; summaries are cached in
+~/.claude/plugins/contextune/global_summary.db keyed by the project DB's
+(mtime, WAL size, max rowids), so only projects with new activity
+are re-read. The re-reading itself is delegated to an AnalyticsBackend
+(SQLite thread pool or DuckDB, see analytics_backend.py).
 """
 
 import sqlite3
@@ -24,7 +31,26 @@ from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 import json
+import sys
+
+try:
+    from analytics_backend import AnalyticsBackend, connect_readonly, get_backend
+    from project_registry import ProjectRegistry
+    from quantile_sketch import QuantileSketch
+except ImportError:  # imported as lib.global_observability
+    from lib.analytics_backend import AnalyticsBackend, connect_readonly, get_backend
+    from lib.project_registry import ProjectRegistry
+    from lib.quantile_sketch import QuantileSketch
+
+SUMMARY_DB_PATH = Path.home() / ".claude" / "plugins" / "contextune" / "global_summary.db"
+
+# Bump when the cached summary layout changes
+SUMMARY_VERSION = 1
+
+# SQLite releases the GIL while it runs a query, so threads overlap well
+MAX_WORKERS = 8
 
 
 @dataclass
@@ -39,106 +65,192 @@ class ProjectStats:
     errors: int
 
 
+def summary_cache_key(conn: sqlite3.Connection, db_path: Path) -> str:
+    """Changes whenever the project DB may hold new data."""
+    wal_path = db_path.with_name(db_path.name + "-wal")
+    try:
+        wal_size = wal_path.stat().st_size
+    except OSError:
+        wal_size = 0
+
+    max_rowids = []
+    for table in ("detection_history", "error_logs"):
+        try:
+            max_rowids.append(conn.execute(f"SELECT MAX(rowid) FROM {table}").fetchone()[0])
+        except sqlite3.Error:
+            max_rowids.append(None)
+
+    return json.dumps([SUMMARY_VERSION, db_path.stat().st_mtime_ns, wal_size, *max_rowids])
+
+
+def _read_cache_key(db_path: Path) -> str:
+    """Worker: current cache key of a project DB."""
+    conn = connect_readonly(db_path)
+    try:
+        return summary_cache_key(conn, db_path)
+    finally:
+        conn.close()
+
+
 class GlobalObservability:
     """Cross-project analytics for Claude Code usage."""
 
-    def __init__(self, search_root: Path = None):
+    def __init__(self, search_root: Path = None, crawl: bool = False,
+                 summary_db: Path = None, backend: AnalyticsBackend = None):
         """
         Initialize global observability.
 
         Args:
-            search_root: Root directory to search for projects (default: $HOME)
+            search_root: Only include projects under this directory
+                (default: every registered project)
+            crawl: Also scan the filesystem (bounded) for projects that
+                predate the registry; searches search_root or $HOME
+            summary_db: Per-project summary cache (default: SUMMARY_DB_PATH)
+            backend: Engine for summarizing changed projects
+                (default: get_backend(), see CONTEXTUNE_ANALYTICS_BACKEND)
         """
         self.search_root = search_root or Path.home()
-        self.databases = self._find_all_databases()
-
-    def _find_all_databases(self) -> List[Path]:
-        """Find all observability.db files."""
-        # Search common project locations
-        search_paths = [
-            self.search_root / "projects",
-            self.search_root / "code",
-            self.search_root / "dev",
-            self.search_root / "work",
-            self.search_root / "DevProjects",
-            self.search_root / "Documents",
-            self.search_root / "repos",
-            self.search_root,  # Also search home directly
-        ]
-
-        databases = []
-        for search_path in search_paths:
-            if search_path.exists():
-                # Find all .contextune/observability.db files
-                dbs = list(search_path.glob("**/.contextune/observability.db"))
-                databases.extend(dbs)
-
-        # Deduplicate
-        return list(set(databases))
+        self.summary_db = Path(summary_db) if summary_db else SUMMARY_DB_PATH
+        self.registry = ProjectRegistry()
+        self.backend = backend or get_backend()
+        self._summaries: Optional[Dict[Path, Dict[str, Any]]] = None
+        self.refresh_stats = {"cached": 0, "computed": 0, "failed": 0}
+        self.databases = self._find_all_databases(
+            crawl=crawl, restrict=search_root is not None
+        )
 
-    def get_project_stats(self, db_path: Path) -> Optional[ProjectStats]:
-        """Get statistics for a single project."""
-        try:
-            conn = sqlite3.connect(db_path)
+    def _find_all_databases(self, crawl: bool = False, restrict: bool = False) -> List[Path]:
+        """Find all observability.db files via the project registry."""
+        if crawl:
+            self.registry.crawl([self.search_root])
+
+        databases = self.registry.databases()
+        if restrict:
+            root = self.search_root.resolve()
+            databases = [db for db in databases if db.is_relative_to(root)]
+        return databases
+
+    # === SUMMARIES ===
+
+    def _open_summary_db(self) -> sqlite3.Connection:
+        self.summary_db.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.summary_db, timeout=5.0)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS project_summaries (
+                db_path TEXT PRIMARY KEY,
+                cache_key TEXT NOT NULL,
+                summary TEXT NOT NULL,
+                computed_at REAL NOT NULL
+            )
+        """)
+        return conn
 
-            # Total detections
-            total = conn.execute("SELECT COUNT(*) FROM detection_history").fetchone()[0]
+    def project_summaries(self, refresh: bool = False) -> Dict[Path, Dict[str, Any]]:
+        """
+        Summaries of every project DB (memoized per instance).
 
-            if total == 0:
-                conn.close()
-                return None
+        Cached summaries are reused while the project DB is unchanged;
+        the others are recomputed by the analytics backend in one batch.
+        """
+        if self._summaries is not None and not refresh:
+            return self._summaries
 
-            # Commands
-            commands = dict(conn.execute("""
-                SELECT command, COUNT(*) FROM detection_history
-                GROUP BY command
-            """).fetchall())
+        conn = self._open_summary_db()
+        try:
+            cached = {
+                Path(path): (key, summary)
+                for path, key, summary in conn.execute(
+                    "SELECT db_path, cache_key, summary FROM project_summaries"
+                )
+            }
 
-            # Methods
-            methods = dict(conn.execute("""
-                SELECT method, COUNT(*) FROM detection_history
-                GROUP BY method
-            """).fetchall())
+            summaries: Dict[Path, Dict[str, Any]] = {}
+            keys: Dict[Path, str] = {}
+            stats = {"cached": 0, "computed": 0, "failed": 0}
+
+            workers = max(1, min(MAX_WORKERS, len(self.databases)))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = {db_path: pool.submit(_read_cache_key, db_path) for db_path in self.databases}
+                for db_path, future in futures.items():
+                    try:
+                        keys[db_path] = future.result()
+                    except Exception as e:
+                        print(f"Error reading {db_path}: {e}")
+                        stats["failed"] += 1
+
+            stale = []
+            for db_path, key in keys.items():
+                if db_path in cached and cached[db_path][0] == key:
+                    summaries[db_path] = json.loads(cached[db_path][1])
+                    stats["cached"] += 1
+                else:
+                    stale.append(db_path)
+
+            fresh = self.backend.project_summaries(stale) if stale else {}
+            updates = []
+            for db_path in stale:
+                summary = fresh.get(db_path)
+                if summary is None:
+                    stats["failed"] += 1
+                    continue
+                updates.append((str(db_path), keys[db_path], json.dumps(summary), time.time()))
+                summaries[db_path] = summary
+                stats["computed"] += 1
+
+            if updates:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO project_summaries VALUES (?, ?, ?, ?)", updates
+                )
+                conn.commit()
+        finally:
+            conn.close()
 
-            # Average confidence
-            avg_conf = conn.execute(
-                "SELECT AVG(confidence) FROM detection_history"
-            ).fetchone()[0]
+        self._summaries = summaries
+        self.refresh_stats = stats
+        return summaries
 
-            # Last activity
-            last_activity = conn.execute(
-                "SELECT MAX(timestamp) FROM detection_history"
-            ).fetchone()[0]
+    def _active_summaries(self) -> List[Tuple[Path, Dict[str, Any]]]:
+        """Summaries of projects that have at least one detection."""
+        return [
+            (db_path, summary)
+            for db_path, summary in self.project_summaries().items()
+            if summary["total_detections"]
+        ]
 
-            # Errors
-            errors = conn.execute("SELECT COUNT(*) FROM error_logs").fetchone()[0]
+    @staticmethod
+    def _stats_from_summary(db_path: Path, summary: Dict[str, Any]) -> ProjectStats:
+        return ProjectStats(
+            # Project path (parent of .contextune)
+            project_path=db_path.parent.parent,
+            total_detections=summary["total_detections"],
+            commands=summary["commands"],
+            methods=summary["methods"],
+            avg_confidence=summary["avg_confidence"],
+            last_activity=summary["last_activity"],
+            errors=summary["errors"],
+        )
 
-            conn.close()
+    def get_project_stats(self, db_path: Path) -> Optional[ProjectStats]:
+        """Get statistics for a single project."""
+        summary = self.project_summaries().get(db_path)
+        if summary is None:
+            summary = self.backend.project_summaries([db_path]).get(db_path)
+            if summary is None:
+                return None
 
-            # Project path (parent of .contextune)
-            project_path = db_path.parent.parent
-
-            return ProjectStats(
-                project_path=project_path,
-                total_detections=total,
-                commands=commands,
-                methods=methods,
-                avg_confidence=avg_conf,
-                last_activity=last_activity,
-                errors=errors
-            )
-        except Exception as e:
-            print(f"Error reading {db_path}: {e}")
+        if not summary["total_detections"]:
             return None
+        return self._stats_from_summary(db_path, summary)
+
+    # === AGGREGATES ===
 
     def aggregate_stats(self) -> Dict[str, Any]:
         """Aggregate statistics across all projects."""
         # Collect per-project stats
-        project_stats = []
-        for db_path in self.databases:
-            stats = self.get_project_stats(db_path)
-            if stats:
-                project_stats.append(stats)
+        project_stats = [
+            self._stats_from_summary(db_path, summary)
+            for db_path, summary in self._active_summaries()
+        ]
 
         if not project_stats:
             return {
@@ -214,25 +326,12 @@ class GlobalObservability:
         hourly_activity = defaultdict(int)
         daily_activity = defaultdict(int)
 
-        for db_path in self.databases:
-            try:
-                conn = sqlite3.connect(db_path)
-
-                # Get all timestamps
-                timestamps = [
-                    row[0] for row in conn.execute(
-                        "SELECT timestamp FROM detection_history"
-                    ).fetchall()
-                ]
-
-                for ts in timestamps:
-                    dt = datetime.fromtimestamp(ts)
-                    hourly_activity[dt.hour] += 1
-                    daily_activity[dt.strftime('%Y-%m-%d')] += 1
-
-                conn.close()
-            except Exception:
-                continue
+        for _, summary in self._active_summaries():
+            for hour, count in enumerate(summary["hourly"]):
+                if count:
+                    hourly_activity[hour] += count
+            for date, count in summary["daily"].items():
+                daily_activity[date] += count
 
         # Find peak hours
         if hourly_activity:
@@ -295,37 +394,21 @@ class GlobalObservability:
 
     def get_performance_overview(self) -> Dict[str, Any]:
         """Aggregate performance metrics across projects."""
-        all_latencies = defaultdict(list)
-
-        for db_path in self.databases:
-            try:
-                conn = sqlite3.connect(db_path)
+        sketches: Dict[str, QuantileSketch] = {}
 
-                # Get matcher latencies
-                for method, latency in conn.execute(
-                    "SELECT method, latency_ms FROM detection_history WHERE latency_ms IS NOT NULL"
-                ).fetchall():
-                    all_latencies[method].append(latency)
+        for _, summary in self._active_summaries():
+            for method, data in summary["latency"].items():
+                sketch = QuantileSketch.from_dict(data)
+                if method in sketches:
+                    sketches[method].merge(sketch)
+                else:
+                    sketches[method] = sketch
 
-                conn.close()
-            except Exception:
-                continue
-
-        # Calculate percentiles
+        # Percentiles from the merged sketches (within 1% of exact)
         performance = {}
-        for method, latencies in all_latencies.items():
-            if latencies:
-                latencies.sort()
-                n = len(latencies)
-                performance[method] = {
-                    "count": n,
-                    "p50": latencies[int(n * 0.5)],
-                    "p95": latencies[int(n * 0.95)],
-                    "p99": latencies[int(n * 0.99)],
-                    "min": min(latencies),
-                    "max": max(latencies),
-                    "avg": sum(latencies) / n
-                }
+        for method, sketch in sketches.items():
+            if sketch.count:
+                performance[method] = sketch.summary()
 
         return performance
 
@@ -356,9 +439,11 @@ if __name__ == "__main__":
     print("="*70)
     print()
 
-    obs = GlobalObservability()
+    obs = GlobalObservability(crawl="--crawl" in sys.argv)
 
     print(f"📁 Found {len(obs.databases)} projects with Contextune data")
+    if not obs.databases:
+        print("   (projects register on first use; run with --crawl to index older ones)")
     print()
 
     # Aggregate stats
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Job Queue - File-based background jobs for heavy hook work
+
+SessionEnd extraction and PreCompact plan checkpoints parse whole transcripts,
+dump YAML and write files inside a 2-5 second hook window; on big sessions
+the hook is killed and nothing is extracted. Hooks now enqueue a job record
+and return immediately; a detached worker (hooks/job_worker.py) drains the
+queue.
+
+Layout under <project>/.contextune/jobs/:
+- pending/   waiting jobs (FIFO by file name)
+- running/   claimed by a worker (claim = atomic rename out of pending/)
+- done/      finished jobs (last KEEP_DONE kept)
+- failed/    jobs that exhausted their retries
+- worker.lock  held by the one worker currently draining
+- worker.log   output of detached workers
+
+Jobs that fail are retried with exponential backoff. Jobs left in running/
+by a worker that died are requeued once their heartbeat goes stale.
+Handlers record progress checkpoints so a retry can skip finished steps.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+try:
+    import tracing
+except ImportError:  # imported as lib.job_queue
+    from lib import tracing
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-worker guarantee degrades to best effort
+    fcntl = None
+
+STATES = ("pending", "running", "done", "failed")
+
+# Retry schedule: attempt n waits RETRY_BASE_SECONDS * 2**(n-1)
+MAX_ATTEMPTS = 3
+RETRY_BASE_SECONDS = 5.0
+
+# A running job whose file hasn't been touched for this long is orphaned
+STALE_AFTER_SECONDS = 600.0
+
+KEEP_DONE = 50
+
+WORKER_SCRIPT = Path(__file__).parent.parent / "hooks" / "job_worker.py"
+
+
+@dataclass
+class Job:
+    """A queued unit of work."""
+
+    id: str
+    kind: str
+    payload: dict[str, Any]
+    created_at: float
+    attempts: int = 0
+    max_attempts: int = MAX_ATTEMPTS
+    not_before: float = 0.0
+    progress: dict[str, Any] = field(default_factory=dict)
+    error: str | None = None
+    finished_at: float | None = None
+    # File name inside the state directory (not serialized)
+    name: str = field(default="", repr=False)
+
+    def to_json(self) -> str:
+        data = asdict(self)
+        data.pop("name")
+        return json.dumps(data, default=str)
+
+
+def job_queue_dir(project_root: Path) -> Path:
+    return Path(project_root) / ".contextune" / "jobs"
+
+
+@tracing.span("queue.spawn_worker")
+def spawn_worker(project_root: Path) -> None:
+    """Start a detached worker draining the project's queue (outlives the hook)."""
+    log_path = job_queue_dir(project_root) / "worker.log"
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(log_path, "a") as log_file:
+        subprocess.Popen(
+            [sys.executable, str(WORKER_SCRIPT), "drain", "--project", str(project_root)],
+            cwd=str(project_root),
+            stdin=subprocess.DEVNULL,
+            stdout=log_file,
+            stderr=log_file,
+            start_new_session=True,
+        )
+
+
+class JobQueue:
+    """Directory-backed FIFO queue with atomic claims and retries."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        for state in STATES:
+            (self.root / state).mkdir(parents=True, exist_ok=True)
+
+    def _path(self, state: str, name: str) -> Path:
+        return self.root / state / name
+
+    def _write(self, path: Path, job: Job):
+        """Atomically (re)write a job file."""
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(job.to_json())
+        os.replace(tmp_path, path)
+
+    def _read(self, path: Path) -> Job | None:
+        try:
+            data = json.loads(path.read_text())
+        except (OSError, json.JSONDecodeError):
+            return None
+        return Job(**data, name=path.name)
+
+    def _jobs(self, state: str) -> list[Job]:
+        jobs = []
+        for path in sorted((self.root / state).glob("*.json")):
+            job = self._read(path)
+            if job is not None:
+                jobs.append(job)
+        return jobs
+
+    # === PRODUCERS ===
+
+    @tracing.span("queue.enqueue")
+    def enqueue(self, kind: str, payload: dict[str, Any], dedupe_key: str | None = None) -> Job:
+        """
+        Add a job to pending/.
+
+        With dedupe_key, a pending job with the same key is replaced so a
+        burst of triggers (repeated PreCompact) collapses to one job.
+        """
+        if dedupe_key:
+            for existing in self._jobs("pending"):
+                if existing.payload.get("dedupe_key") == dedupe_key:
+                    self._path("pending", existing.name).unlink(missing_ok=True)
+            payload = {**payload, "dedupe_key": dedupe_key}
+
+        now = time.time()
+        job = Job(id=uuid.uuid4().hex[:12], kind=kind, payload=payload, created_at=now)
+        # Zero-padded nanoseconds keep lexical order == FIFO order
+        job.name = f"{time.time_ns():020d}-{kind}-{job.id}.json"
+        self._write(self._path("pending", job.name), job)
+        return job
+
+    # === WORKERS ===
+
+    @contextmanager
+    def worker_lock(self):
+        """
+        Hold the single-worker lock (non-blocking).
+
+        Yields False if another worker is already draining this queue.
+        """
+        if fcntl is None:
+            yield True
+            return
+
+        with open(self.root / "worker.lock", "a") as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def claim(self) -> Job | None:
+        """Move the oldest ready job to running/ and return it."""
+        now = time.time()
+        for job in self._jobs("pending"):
+            if job.not_before > now:
+                continue
+            try:
+                os.rename(self._path("pending", job.name), self._path("running", job.name))
+            except FileNotFoundError:
+                continue  # Claimed or replaced concurrently
+            job.attempts += 1
+            self._write(self._path("running", job.name), job)
+            return job
+        return None
+
+    def next_ready_at(self) -> float | None:
+        """Earliest not_before among pending jobs (None if queue is empty)."""
+        pending = self._jobs("pending")
+        if not pending:
+            return None
+        return min(job.not_before for job in pending)
+
+    def checkpoint(self, job: Job, **progress: Any):
+        """Record progress (also refreshes the heartbeat of a running job)."""
+        job.progress.update(progress)
+        self._write(self._path("running", job.name), job)
+
+    def complete(self, job: Job):
+        job.finished_at = time.time()
+        job.error = None
+        self._write(self._path("running", job.name), job)
+        os.replace(self._path("running", job.name), self._path("done", job.name))
+        self._prune_done()
+
+    def fail(self, job: Job, error: str):
+        """Retry with backoff, or move to failed/ once attempts run out."""
+        job.error = error
+        if job.attempts < job.max_attempts:
+            job.not_before = time.time() + RETRY_BASE_SECONDS * 2 ** (job.attempts - 1)
+            target = "pending"
+        else:
+            job.finished_at = time.time()
+            target = "failed"
+        self._write(self._path("running", job.name), job)
+        os.replace(self._path("running", job.name), self._path(target, job.name))
+
+    def requeue_stale(self, stale_after: float = STALE_AFTER_SECONDS) -> int:
+        """Return orphaned running jobs to pending/. Call with the worker lock held."""
+        requeued = 0
+        cutoff = time.time() - stale_after
+        for path in (self.root / "running").glob("*.json"):
+            try:
+                if path.stat().st_mtime >= cutoff:
+                    continue
+                os.replace(path, self._path("pending", path.name))
+                requeued += 1
+            except FileNotFoundError:
+                continue
+        return requeued
+
+    def _prune_done(self):
+        done = sorted((self.root / "done").glob("*.json"))
+        for path in done[:-KEEP_DONE]:
+            path.unlink(missing_ok=True)
+
+    def drain(
+        self,
+        handlers: dict[str, Callable[[Job, "JobQueue"], None]],
+        budget_seconds: float | None = None,
+        wait_for_retries: bool = True,
+    ) -> dict[str, int]:
+        """
+        Run jobs until the queue is empty or the time budget is spent.
+
+        Handlers raise to signal failure. Unknown job kinds fail permanently.
+        With wait_for_retries, sleeps until backed-off jobs become ready
+        (within the budget) instead of leaving them for the next worker.
+
+        Returns: {'done': n, 'retried': n, 'failed': n} or {'locked': 1}
+        """
+        stats = {"done": 0, "retried": 0, "failed": 0}
+        deadline = time.time() + budget_seconds if budget_seconds else None
+        locked_out = True
+
+        while True:
+            with self.worker_lock() as acquired:
+                if not acquired:
+                    break
+                locked_out = False
+                self.requeue_stale()
+                self._run_jobs(handlers, deadline, wait_for_retries, stats)
+
+            # A job enqueued after the last claim() but before the lock was
+            # released saw the lock held, so its producer spawned no worker
+            ready_at = self.next_ready_at()
+            if ready_at is None or ready_at > time.time():
+                break
+            if deadline is not None and time.time() >= deadline:
+                break
+
+        return {"locked": 1} if locked_out else stats
+
+    def _run_jobs(
+        self,
+        handlers: dict[str, Callable[[Job, "JobQueue"], None]],
+        deadline: float | None,
+        wait_for_retries: bool,
+        stats: dict[str, int],
+    ) -> None:
+        while deadline is None or time.time() < deadline:
+            job = self.claim()
+            if job is None:
+                ready_at = self.next_ready_at() if wait_for_retries else None
+                if ready_at is None or (deadline is not None and ready_at > deadline):
+                    return
+                time.sleep(max(0.0, ready_at - time.time()))
+                continue
+
+            handler = handlers.get(job.kind)
+            if handler is None:
+                job.max_attempts = job.attempts
+                self.fail(job, f"No handler for job kind '{job.kind}'")
+                stats["failed"] += 1
+                continue
+
+            try:
+                handler(job, self)
+            except Exception as e:
+                self.fail(job, f"{type(e).__name__}: {e}")
+                stats["retried" if job.attempts < job.max_attempts else "failed"] += 1
+            else:
+                self.complete(job)
+                stats["done"] += 1
+
+    # === STATUS ===
+
+    def status(self) -> dict[str, list[Job]]:
+        """Jobs per state (oldest first)."""
+        return {state: self._jobs(state) for state in STATES}
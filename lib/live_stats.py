@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Live Stats - Incremental dashboard aggregates for watch mode
+
+ObservabilityDB.get_stats() re-scans every table on each call, so a
+refreshing dashboard costs time proportional to the whole history.
+LiveStats keeps one read-only connection and a rowid high-water mark per
+table; each poll() reads only rows past the mark and folds them into
+running aggregates (counts, sums, QuantileSketch per component).
+
+Sampled components (see sampling.py) are overlaid from metric_samples,
+like get_stats() does. Its rows are rewritten in place (INSERT OR REPLACE)
+with cumulative values, so they are kept per key instead of summed; a
+rewritten row gets a rowid past the mark, or reuses the max rowid, which
+is why that row is re-read on every poll. LiveStats opens the database
+read-only and never folds the spool itself; the writers do.
+
+The first poll() reads the existing history once. If a table's max rowid
+drops below its mark (database deleted and recreated), everything is
+rebuilt from scratch.
+
+Usage:
+    live = LiveStats(".contextune/observability.db")
+    while True:
+        if live.poll():
+            render(live.stats())
+        time.sleep(2)
+"""
+
+import json
+import sqlite3
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any
+
+try:
+    from quantile_sketch import QuantileSketch
+except ImportError:  # imported as lib.live_stats
+    from lib.quantile_sketch import QuantileSketch
+
+# Tables followed by rowid, and the columns folded into the aggregates
+TABLES = {
+    "detection_history": "command, confidence, method, timestamp, prompt_preview, latency_ms",
+    "performance_metrics": "component, latency_ms, weight",
+    "matcher_performance": "method, latency_ms, success",
+    "error_logs": "component, error_type, message, timestamp",
+}
+
+# Folded rollups of sampled components, one cumulative row per key
+SAMPLES_TABLE = "metric_samples"
+
+RECENT_DETECTIONS = 5
+RECENT_ERRORS = 3
+
+
+def _without_rowid(row: sqlite3.Row) -> dict[str, Any]:
+    return {key: row[key] for key in row.keys() if key != "_rowid"}
+
+
+class LiveStats:
+    """Running aggregates over the observability tables."""
+
+    def __init__(self, db_path: str | Path = ".contextune/observability.db"):
+        self.db_path = Path(db_path)
+        self.conn: sqlite3.Connection | None = None
+        self.reset()
+
+    def reset(self):
+        """Forget all aggregates (next poll re-reads the history)."""
+        self.high_water = dict.fromkeys((*TABLES, SAMPLES_TABLE), 0)
+        self.total_detections = 0
+        self.by_method: dict[str, int] = {}
+        self.by_command: dict[str, int] = {}
+        self.perf: dict[str, QuantileSketch] = {}
+        # component -> (operation, bucket_start) -> (count, sketch), and merged
+        self.samples: dict[str, dict[tuple[str, float], tuple[int, QuantileSketch]]] = {}
+        self.sampled: dict[str, QuantileSketch] = {}
+        # method -> [count, latency sum, successes]
+        self.matchers: dict[str, list[float]] = {}
+        self.total_errors = 0
+        self.errors_by_component: dict[str, int] = {}
+        self.recent_detections: deque[dict[str, Any]] = deque(maxlen=RECENT_DETECTIONS)
+        self.recent_errors: deque[dict[str, Any]] = deque(maxlen=RECENT_ERRORS)
+
+    def _connect(self) -> sqlite3.Connection:
+        if self.conn is None:
+            # Read-only: the watcher never checkpoints or locks the writers' WAL
+            self.conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True, timeout=5.0)
+            self.conn.row_factory = sqlite3.Row
+        return self.conn
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def poll(self) -> int:
+        """
+        Apply rows added since the last poll.
+
+        Returns: number of new rows applied
+        """
+        conn = self._connect()
+
+        for table in self.high_water:
+            max_rowid = conn.execute(f"SELECT MAX(rowid) FROM {table}").fetchone()[0] or 0
+            if max_rowid < self.high_water[table]:
+                self.reset()
+                break
+
+        applied = 0
+        for table, columns in TABLES.items():
+            rows = conn.execute(
+                f"SELECT rowid AS _rowid, {columns} FROM {table} WHERE rowid > ? ORDER BY rowid",
+                (self.high_water[table],),
+            ).fetchall()
+            if not rows:
+                continue
+            getattr(self, f"_apply_{table}")(rows)
+            self.high_water[table] = rows[-1]["_rowid"]
+            applied += len(rows)
+        return applied + self._poll_samples(conn)
+
+    def _poll_samples(self, conn: sqlite3.Connection) -> int:
+        """Apply new or rewritten metric_samples rows; returns how many changed."""
+        rows = conn.execute(
+            f"SELECT rowid AS _rowid, component, operation, bucket_start, count, sketch "
+            f"FROM {SAMPLES_TABLE} WHERE rowid >= ? ORDER BY rowid",
+            (self.high_water[SAMPLES_TABLE],),
+        ).fetchall()
+        changed = set()
+        for row in rows:
+            buckets = self.samples.setdefault(row["component"], {})
+            key = (row["operation"], row["bucket_start"])
+            # Every fold adds events, so an unchanged count is a row already seen
+            if key in buckets and buckets[key][0] == row["count"]:
+                continue
+            buckets[key] = (row["count"], QuantileSketch.from_dict(json.loads(row["sketch"])))
+            changed.add(row["component"])
+        if rows:
+            self.high_water[SAMPLES_TABLE] = rows[-1]["_rowid"]
+
+        for component in changed:
+            merged = self.sampled[component] = QuantileSketch()
+            for _, sketch in self.samples[component].values():
+                merged.merge(sketch)
+        return len(changed)
+
+    # === APPLY NEW ROWS ===
+
+    def _apply_detection_history(self, rows: list[sqlite3.Row]):
+        for row in rows:
+            self.total_detections += 1
+            self.by_method[row["method"]] = self.by_method.get(row["method"], 0) + 1
+            self.by_command[row["command"]] = self.by_command.get(row["command"], 0) + 1
+        # Newest first, like get_recent_detections()
+        for row in rows[-RECENT_DETECTIONS:]:
+            self.recent_detections.appendleft(_without_rowid(row))
+
+    def _apply_performance_metrics(self, rows: list[sqlite3.Row]):
+        for row in rows:
+            sketch = self.perf.get(row["component"])
+            if sketch is None:
+                sketch = self.perf[row["component"]] = QuantileSketch()
+            # Sampled rows stand for `weight` events (see sampling.py)
+            sketch.add(row["latency_ms"], row["weight"])
+
+    def _apply_matcher_performance(self, rows: list[sqlite3.Row]):
+        for row in rows:
+            totals = self.matchers.setdefault(row["method"], [0, 0.0, 0])
+            totals[0] += 1
+            totals[1] += row["latency_ms"]
+            totals[2] += 1 if row["success"] else 0
+
+    def _apply_error_logs(self, rows: list[sqlite3.Row]):
+        for row in rows:
+            self.total_errors += 1
+            self.errors_by_component[row["component"]] = (
+                self.errors_by_component.get(row["component"], 0) + 1
+            )
+        for row in rows[-RECENT_ERRORS:]:
+            self.recent_errors.appendleft(_without_rowid(row))
+
+    # === SNAPSHOT ===
+
+    def stats(self) -> dict[str, Any]:
+        """Same layout as ObservabilityDB.get_stats() (percentiles from sketches)."""
+        by_command = dict(
+            sorted(self.by_command.items(), key=lambda item: item[1], reverse=True)[:10]
+        )
+        # Sampled components report their folded events, not the sampled rows
+        performance = {
+            component: {
+                "p50": sketch.quantile(0.5),
+                "p95": sketch.quantile(0.95),
+                "p99": sketch.quantile(0.99),
+                "count": sketch.count,
+            }
+            for component, sketch in {**self.perf, **self.sampled}.items()
+        }
+        matchers = {
+            method: {
+                "avg_latency_ms": round(latency / count, 3) if latency else 0,
+                "success_rate": round(successes / count * 100, 1) if successes else 0,
+            }
+            for method, (count, latency, successes) in self.matchers.items()
+        }
+        return {
+            "detections": {
+                "total": self.total_detections,
+                "by_method": dict(self.by_method),
+                "by_command": by_command,
+            },
+            "performance": performance,
+            "errors": {
+                "total": self.total_errors,
+                "by_component": dict(self.errors_by_component),
+            },
+            "matchers": matchers,
+        }
+
+    def recent_error_summary(self, hours: int = 24) -> list[dict[str, Any]]:
+        """Latest errors within the window, newest first (like get_error_summary)."""
+        since = time.time() - hours * 3600
+        return [error for error in self.recent_errors if error["timestamp"] > since]
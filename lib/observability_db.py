@@ -20,10 +20,43 @@ Benefits:
 
 import json
 import sqlite3
+import sys
 import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
+
+try:
+    from analytics_backend import AnalyticsBackend, SQLiteBackend
+    from project_registry import register_database
+    from quantile_sketch import QuantileSketch
+    import sampling
+    import statusline_snapshot
+    import tracing
+except ImportError:  # imported as lib.observability_db
+    from lib.analytics_backend import AnalyticsBackend, SQLiteBackend
+    from lib.project_registry import register_database
+    from lib.quantile_sketch import QuantileSketch
+    from lib import sampling, statusline_snapshot, tracing
+
+# Closed hours are rolled up into metric_rollups (count + latency sketch)
+ROLLUP_SECONDS = 3600
+
+# Rolled-up table -> column that names the series
+ROLLUP_SOURCES = {
+    "performance_metrics": "component",
+    "detection_history": "command",
+    "error_logs": "component",
+}
+
+# Tables get_trends() can chart, and the metrics it can compute
+TREND_SOURCES = ("performance_metrics", "detection_history")
+TREND_METRICS = ("count", "mean", "p95", "error_rate")
+
+
+def _weight(table: str) -> str:
+    """Events a row stands for: performance_metrics rows may be sampled."""
+    return "weight" if table == "performance_metrics" else "1"
 
 
 @dataclass
@@ -65,7 +98,10 @@ class ObservabilityDB:
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(exist_ok=True)
         self._init_db()
+        # Let GlobalObservability find this project without crawling $HOME
+        register_database(self.db_path)
 
+    @tracing.span("db.init")
     def _init_db(self):
         """Initialize database with comprehensive observability schema."""
         with sqlite3.connect(self.db_path) as conn:
@@ -122,9 +158,15 @@ class ObservabilityDB:
                     latency_ms REAL NOT NULL,
                     timestamp REAL NOT NULL,
                     session_id TEXT,
-                    metadata TEXT
+                    metadata TEXT,
+                    weight INTEGER NOT NULL DEFAULT 1  -- events per row (see sampling.py)
                 )
             """)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(performance_metrics)")}
+            if "weight" not in columns:
+                conn.execute(
+                    "ALTER TABLE performance_metrics ADD COLUMN weight INTEGER NOT NULL DEFAULT 1"
+                )
             conn.execute(
                 "CREATE INDEX IF NOT EXISTS idx_perf_component ON performance_metrics(component)"
             )
@@ -166,6 +208,57 @@ class ObservabilityDB:
                 "CREATE INDEX IF NOT EXISTS idx_error_component ON error_logs(component)"
             )
 
+            # === ROLLUPS (downsampled trends) ===
+
+            # One row per (table, series, closed hour); sketch holds latencies
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS metric_rollups (
+                    source TEXT NOT NULL,
+                    series TEXT NOT NULL,
+                    bucket_start REAL NOT NULL,
+                    count INTEGER NOT NULL,
+                    sketch TEXT,
+                    PRIMARY KEY (source, series, bucket_start)
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS rollup_state (
+                    source TEXT PRIMARY KEY,
+                    rolled_until REAL NOT NULL
+                )
+            """)
+
+            # Every event of sampled components, folded from the spool:
+            # exact counts plus a latency sketch per (component, operation, hour)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS metric_samples (
+                    component TEXT NOT NULL,
+                    operation TEXT NOT NULL,
+                    bucket_start REAL NOT NULL,
+                    count INTEGER NOT NULL,
+                    errors INTEGER NOT NULL DEFAULT 0,
+                    sketch TEXT NOT NULL,
+                    PRIMARY KEY (component, operation, bucket_start)
+                )
+            """)
+
+            # === COUNTERS (running totals, one indexed lookup to read) ===
+
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS counters (
+                    scope TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    n INTEGER NOT NULL DEFAULT 0,
+                    updated_at REAL,
+                    PRIMARY KEY (scope, name)
+                ) WITHOUT ROWID
+            """)
+            self._seed_counters(conn)
+
+            # === TRACING (per-hook stage spans, see tracing.py) ===
+
+            tracing.ensure_schema(conn)
+
             # === SESSION TRACKING ===
 
             conn.execute("""
@@ -177,6 +270,9 @@ class ObservabilityDB:
                     total_errors INTEGER DEFAULT 0
                 )
             """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_sessions_start ON sessions(start_time)"
+            )
 
             # === COMMAND USAGE PATTERNS ===
 
@@ -248,8 +344,29 @@ class ObservabilityDB:
 
             conn.commit()
 
+    def _seed_counters(self, conn: sqlite3.Connection) -> None:
+        """Backfill detection counters once for databases that predate them."""
+        if conn.execute(
+            "SELECT 1 FROM counters WHERE scope = 'detections' AND name = 'total'"
+        ).fetchone():
+            return
+        now = time.time()
+        rows = [("detections", "total", conn.execute("SELECT COUNT(*) FROM detection_history").fetchone()[0])]
+        for scope, column in (("detections.method", "method"), ("detections.command", "command")):
+            rows.extend(
+                (scope, name, n)
+                for name, n in conn.execute(
+                    f"SELECT {column}, COUNT(*) FROM detection_history GROUP BY {column}"
+                )
+            )
+        conn.executemany(
+            "INSERT OR IGNORE INTO counters (scope, name, n, updated_at) VALUES (?, ?, ?, ?)",
+            [(scope, name, n, now) for scope, name, n in rows],
+        )
+
     # === DETECTION METHODS ===
 
+    @tracing.span("db.set_detection")
     def set_detection(
         self,
         command: str,
@@ -282,8 +399,27 @@ class ObservabilityDB:
                 (command, confidence, method, timestamp, prompt_preview, latency_ms),
             )
 
+            self._increment(
+                conn,
+                [("detections", "total"), ("detections.method", method), ("detections.command", command)],
+                timestamp,
+            )
+
             conn.commit()
 
+        self._update_statusline(statusline_snapshot.format_detection(command, confidence, method))
+
+    def _update_statusline(self, line: str | None) -> None:
+        """Mirror current_detection into the status line snapshot (None clears it)."""
+        path = statusline_snapshot.snapshot_path(self.db_path)
+        try:
+            if line is None:
+                statusline_snapshot.clear(path)
+            else:
+                statusline_snapshot.write(path, line)
+        except OSError as e:
+            print(f"DEBUG: Failed to update status line snapshot: {e}", file=sys.stderr)
+
     def get_detection(self) -> Detection | None:
         """Get current detection."""
         with sqlite3.connect(self.db_path) as conn:
@@ -303,16 +439,64 @@ class ObservabilityDB:
             conn.execute("DELETE FROM current_detection WHERE id = 1")
             conn.commit()
 
+        self._update_statusline(None)
+
+    # === COUNTER METHODS ===
+
+    @staticmethod
+    def _increment(
+        conn: sqlite3.Connection, keys: Iterable[tuple[str, str]], timestamp: float, by: int = 1
+    ) -> None:
+        conn.executemany(
+            """
+            INSERT INTO counters (scope, name, n, updated_at) VALUES (?, ?, ?, ?)
+            ON CONFLICT (scope, name) DO UPDATE SET
+                n = n + excluded.n, updated_at = excluded.updated_at
+            """,
+            [(scope, name, by, timestamp) for scope, name in keys],
+        )
+
+    def increment_counter(self, scope: str, name: str, by: int = 1) -> None:
+        """Atomically add to a counter (created at 0 if missing)."""
+        with sqlite3.connect(self.db_path) as conn:
+            self._increment(conn, [(scope, name)], time.time(), by)
+            conn.commit()
+
+    @tracing.span("db.get_counter")
+    def get_counter(self, scope: str, name: str) -> int:
+        """Current value of one counter (0 if missing)."""
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute(
+                "SELECT n FROM counters WHERE scope = ? AND name = ?", (scope, name)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def get_counters(self, scope: str, limit: int | None = None) -> dict[str, int]:
+        """All counters in a scope, largest first."""
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute(
+                "SELECT name, n FROM counters WHERE scope = ? ORDER BY n DESC, name LIMIT ?",
+                (scope, -1 if limit is None else limit),
+            ).fetchall()
+        return dict(rows)
+
     # === PERFORMANCE METHODS ===
 
+    @tracing.span("db.log_performance")
     def log_performance(
         self,
         component: str,
         operation: str,
         latency_ms: float,
         metadata: dict[str, Any] = None,
+        weight: int = 1,
     ) -> None:
-        """Log performance metric."""
+        """
+        Log performance metric.
+
+        weight: events this row stands for (1-in-N sampled rows use N;
+        high-rate components should go through sampling.record())
+        """
         timestamp = time.time()
         metadata_json = json.dumps(metadata) if metadata else None
 
@@ -320,13 +504,89 @@ class ObservabilityDB:
             conn.execute(
                 """
                 INSERT INTO performance_metrics
-                (component, operation, latency_ms, timestamp, metadata)
-                VALUES (?, ?, ?, ?, ?)
+                (component, operation, latency_ms, timestamp, metadata, weight)
+                VALUES (?, ?, ?, ?, ?, ?)
             """,
-                (component, operation, latency_ms, timestamp, metadata_json),
+                (component, operation, latency_ms, timestamp, metadata_json, weight),
             )
             conn.commit()
 
+    @tracing.span("db.fold_samples")
+    def fold_samples(self) -> int:
+        """
+        Fold spooled events of sampled components into metric_samples.
+
+        Returns: number of events folded
+        """
+        claimed = sampling.claim(sampling.spool_path(self.db_path))
+        if not claimed:
+            return 0
+
+        counts: dict[tuple[str, str, int], list[int]] = {}
+        sketches: dict[tuple[str, str, int], QuantileSketch] = {}
+        for component, operation, latency_ms, timestamp, error in sampling.read_events(claimed):
+            key = (component, operation, int(timestamp // ROLLUP_SECONDS) * ROLLUP_SECONDS)
+            totals = counts.setdefault(key, [0, 0])
+            totals[0] += 1
+            totals[1] += error
+            sketches.setdefault(key, QuantileSketch()).add(latency_ms)
+
+        with sqlite3.connect(self.db_path, timeout=10.0) as conn:
+            # Read-merge-write under the write lock, so concurrent folds add up
+            conn.execute("BEGIN IMMEDIATE")
+            for key, (count, errors) in counts.items():
+                row = conn.execute(
+                    "SELECT count, errors, sketch FROM metric_samples "
+                    "WHERE component = ? AND operation = ? AND bucket_start = ?",
+                    key,
+                ).fetchone()
+                sketch = sketches[key]
+                if row:
+                    count += row[0]
+                    errors += row[1]
+                    sketch.merge(QuantileSketch.from_dict(json.loads(row[2])))
+                conn.execute(
+                    "INSERT OR REPLACE INTO metric_samples VALUES (?, ?, ?, ?, ?, ?)",
+                    (*key, count, errors, json.dumps(sketch.to_dict())),
+                )
+            conn.commit()
+
+        for path in claimed:
+            path.unlink(missing_ok=True)
+        return sum(count for count, _ in counts.values())
+
+    def get_sampled_stats(self, since: float = 0) -> dict[str, dict[str, Any]]:
+        """
+        Exact counts and sketch percentiles of sampled components.
+
+        Folds the spool first (see fold_samples), so this writes.
+
+        Returns: {component: {"p50", "p95", "p99", "count", "errors"}}
+        """
+        self.fold_samples()
+        sketches: dict[str, QuantileSketch] = {}
+        errors: dict[str, int] = {}
+        with sqlite3.connect(self.db_path) as conn:
+            for component, error_count, sketch in conn.execute(
+                "SELECT component, errors, sketch FROM metric_samples WHERE bucket_start >= ?",
+                (since,),
+            ):
+                merged = sketches.setdefault(component, QuantileSketch())
+                merged.merge(QuantileSketch.from_dict(json.loads(sketch)))
+                errors[component] = errors.get(component, 0) + error_count
+
+        return {
+            component: {
+                "p50": sketch.quantile(0.5),
+                "p95": sketch.quantile(0.95),
+                "p99": sketch.quantile(0.99),
+                "count": sketch.count,
+                "errors": errors[component],
+            }
+            for component, sketch in sketches.items()
+        }
+
+    @tracing.span("db.log_matcher_performance")
     def log_matcher_performance(
         self, method: str, latency_ms: float, success: bool
     ) -> None:
@@ -346,6 +606,7 @@ class ObservabilityDB:
 
     # === ERROR TRACKING ===
 
+    @tracing.span("db.log_error")
     def log_error(
         self, component: str, error_type: str, message: str, stack_trace: str = None
     ) -> None:
@@ -365,6 +626,7 @@ class ObservabilityDB:
 
     # === MODEL CORRECTION TRACKING ===
 
+    @tracing.span("db.log_correction")
     def log_correction(
         self,
         original_command: str,
@@ -448,51 +710,54 @@ class ObservabilityDB:
 
     # === ANALYTICS QUERIES ===
 
-    def get_stats(self) -> dict[str, Any]:
-        """Get comprehensive statistics."""
+    def get_stats(self, backend: AnalyticsBackend | None = None) -> dict[str, Any]:
+        """
+        Get comprehensive statistics.
+
+        Args:
+            backend: Engine for latency percentiles (default: SQLiteBackend;
+                see analytics_backend.get_backend)
+
+        Sampled components (see sampling.py) report exact counts and
+        sketch percentiles over all their events, not their sampled rows.
+        To include events still in the spool, this folds it first (via
+        get_sampled_stats): a write that claims, folds and unlinks the
+        spool files, so the caller needs write access to the database.
+        """
+        sampled = self.get_sampled_stats()
+
         with sqlite3.connect(self.db_path) as conn:
-            # Detection stats
-            total_detections = conn.execute(
-                "SELECT COUNT(*) FROM detection_history"
-            ).fetchone()[0]
+            # Detection stats (running counters, no history scan)
+            row = conn.execute(
+                "SELECT n FROM counters WHERE scope = 'detections' AND name = 'total'"
+            ).fetchone()
+            total_detections = row[0] if row else 0
 
             by_method = dict(
                 conn.execute("""
-                SELECT method, COUNT(*) FROM detection_history
-                GROUP BY method
+                SELECT name, n FROM counters WHERE scope = 'detections.method'
             """).fetchall()
             )
 
             by_command = dict(
                 conn.execute("""
-                SELECT command, COUNT(*) FROM detection_history
-                GROUP BY command
-                ORDER BY COUNT(*) DESC
+                SELECT name, n FROM counters WHERE scope = 'detections.command'
+                ORDER BY n DESC, name
                 LIMIT 10
             """).fetchall()
             )
 
             # Performance stats (P50, P95, P99 by component)
-            perf_stats = {}
-            for (component,) in conn.execute(
-                "SELECT DISTINCT component FROM performance_metrics"
-            ):
-                latencies = [
-                    row[0]
-                    for row in conn.execute(
-                        "SELECT latency_ms FROM performance_metrics WHERE component = ? ORDER BY latency_ms",
-                        (component,),
-                    ).fetchall()
-                ]
-
-                if latencies:
-                    n = len(latencies)
-                    perf_stats[component] = {
-                        "p50": latencies[int(n * 0.5)],
-                        "p95": latencies[int(n * 0.95)],
-                        "p99": latencies[int(n * 0.99)],
-                        "count": n,
-                    }
+            perf_stats = {
+                component: {key: stats[key] for key in ("p50", "p95", "p99", "count")}
+                for component, stats in (backend or SQLiteBackend()).latency_percentiles(
+                    [Path(self.db_path)], table="performance_metrics", group_by="component"
+                ).items()
+            }
+            perf_stats.update(
+                (component, {key: stats[key] for key in ("p50", "p95", "p99", "count")})
+                for component, stats in sampled.items()
+            )
 
             # Error stats
             error_count = conn.execute("SELECT COUNT(*) FROM error_logs").fetchone()[0]
@@ -550,7 +815,7 @@ class ObservabilityDB:
             return [dict(row) for row in cursor.fetchall()]
 
     def get_performance_trends(self, component: str, hours: int = 24) -> list[dict]:
-        """Get performance trends over time."""
+        """Get raw performance rows over time (use get_trends() for charts)."""
         since = time.time() - (hours * 3600)
 
         with sqlite3.connect(self.db_path) as conn:
@@ -567,6 +832,260 @@ class ObservabilityDB:
 
             return [dict(row) for row in cursor.fetchall()]
 
+    # === TRENDS ===
+
+    def refresh_rollups(self) -> int:
+        """
+        Roll raw rows from closed hours up into metric_rollups.
+
+        Each table is rolled forward from its rollup_state watermark to the
+        start of the current hour, so every raw row is read once. Rows are
+        assumed to be logged with the current time (a row backdated into an
+        already rolled hour is only visible to raw trend queries).
+
+        Returns: number of rollup rows written
+        """
+        cutoff = (int(time.time()) // ROLLUP_SECONDS) * ROLLUP_SECONDS
+        written = 0
+
+        with sqlite3.connect(self.db_path) as conn:
+            for source, series_column in ROLLUP_SOURCES.items():
+                row = conn.execute(
+                    "SELECT rolled_until FROM rollup_state WHERE source = ?", (source,)
+                ).fetchone()
+                start = row[0] if row else 0
+                if start >= cutoff:
+                    continue
+
+                latency = "NULL" if source == "error_logs" else "latency_ms"
+                counts: dict[tuple[str, int], int] = {}
+                sketches: dict[tuple[str, int], QuantileSketch] = {}
+                for series, bucket, latency_ms, weight in conn.execute(
+                    f"""
+                    SELECT {series_column},
+                           CAST(timestamp / {ROLLUP_SECONDS} AS INTEGER) * {ROLLUP_SECONDS},
+                           {latency}, {_weight(source)}
+                    FROM {source}
+                    WHERE timestamp >= ? AND timestamp < ?
+                """,
+                    (start, cutoff),
+                ):
+                    key = (series, bucket)
+                    counts[key] = counts.get(key, 0) + weight
+                    if latency_ms is not None:
+                        sketches.setdefault(key, QuantileSketch()).add(latency_ms, weight)
+
+                conn.executemany(
+                    "INSERT OR REPLACE INTO metric_rollups VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (
+                            source,
+                            series,
+                            bucket,
+                            count,
+                            json.dumps(sketches[(series, bucket)].to_dict())
+                            if (series, bucket) in sketches
+                            else None,
+                        )
+                        for (series, bucket), count in counts.items()
+                    ],
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO rollup_state VALUES (?, ?)", (source, cutoff)
+                )
+                conn.commit()
+                written += len(counts)
+
+        return written
+
+    def get_trends(
+        self,
+        source: str = "performance_metrics",
+        series: str | None = None,
+        bucket_seconds: int = 3600,
+        metrics: Iterable[str] = TREND_METRICS,
+        hours: float = 24,
+        use_rollups: bool = True,
+    ) -> list[dict[str, Any]]:
+        """
+        Downsampled time series, one point per bucket with activity.
+
+        Args:
+            source: "performance_metrics" or "detection_history"
+            series: Only this component (performance_metrics) or
+                command (detection_history); errors are filtered by
+                component for performance_metrics
+            bucket_seconds: Bucket width; buckets are aligned to multiples
+                of it since the epoch (UTC days for 86400)
+            metrics: Any of count, mean, p95 (latency_ms) and error_rate
+                (error_logs rows per event); sampled performance_metrics
+                rows count `weight` times, so these stay unbiased
+            hours: How far back to look (rounded down to a bucket boundary)
+            use_rollups: Serve closed hours from metric_rollups when
+                bucket_seconds is a whole number of hours (p95 then comes
+                from merged sketches, within 1%); otherwise the buckets are
+                computed exactly from raw rows in SQL
+
+        Returns: [{"bucket_start": ts, <metric>: value, ...}] oldest first
+        """
+        if source not in TREND_SOURCES:
+            raise ValueError(f"Unknown trend source: {source}")
+        metrics = list(metrics)
+        unknown = set(metrics) - set(TREND_METRICS)
+        if unknown:
+            raise ValueError(f"Unknown trend metrics: {sorted(unknown)}")
+        bucket_seconds = int(bucket_seconds)
+        if bucket_seconds <= 0:
+            raise ValueError("bucket_seconds must be positive")
+
+        since = (int(time.time() - hours * 3600) // bucket_seconds) * bucket_seconds
+
+        if use_rollups and bucket_seconds % ROLLUP_SECONDS == 0:
+            points = self._trends_from_rollups(source, series, bucket_seconds, since)
+        else:
+            points = self._trends_from_rows(source, series, bucket_seconds, since, "p95" in metrics)
+
+        return [
+            {"bucket_start": point["bucket_start"], **{m: point[m] for m in metrics}}
+            for point in points
+        ]
+
+    def _trends_from_rows(
+        self, source: str, series: str | None, width: int, since: float, with_p95: bool
+    ) -> list[dict[str, Any]]:
+        """Exact per-bucket aggregates, computed in SQL."""
+        params: dict[str, Any] = {"width": width, "since": since, "series": series}
+        series_filter = f"AND {ROLLUP_SOURCES[source]} = :series" if series else ""
+        error_filter = (
+            "AND component = :series" if series and source == "performance_metrics" else ""
+        )
+        bucket = "CAST(timestamp / :width AS INTEGER) * :width"
+
+        p95_ctes = ""
+        p95_join = "NULL"
+        if with_p95:
+            # Same rank as sorted(values)[int(0.95 * n)], with each row
+            # repeated `weight` times: the row whose weight span holds it
+            p95_ctes = """,
+                ranked AS (
+                    SELECT bucket, latency_ms, weight,
+                           SUM(weight) OVER (
+                               PARTITION BY bucket ORDER BY latency_ms ROWS UNBOUNDED PRECEDING
+                           ) AS upto,
+                           SUM(weight) OVER (PARTITION BY bucket) AS n
+                    FROM filtered WHERE latency_ms IS NOT NULL
+                ),
+                p95 AS (
+                    SELECT bucket, latency_ms AS p95 FROM ranked
+                    WHERE MIN(CAST(0.95 * n AS INTEGER), n - 1) BETWEEN upto - weight AND upto - 1
+                )"""
+            p95_join = "(SELECT p95 FROM p95 WHERE p95.bucket = s.bucket)"
+
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute(
+                f"""
+                WITH filtered AS (
+                    SELECT {bucket} AS bucket, latency_ms, {_weight(source)} AS weight
+                    FROM {source}
+                    WHERE timestamp >= :since {series_filter}
+                ),
+                stats AS (
+                    SELECT bucket, SUM(weight) AS count,
+                           SUM(weight * latency_ms) / SUM(weight * (latency_ms IS NOT NULL)) AS mean
+                    FROM filtered GROUP BY bucket
+                ),
+                errors AS (
+                    SELECT {bucket} AS bucket, COUNT(*) AS errors
+                    FROM error_logs
+                    WHERE timestamp >= :since {error_filter}
+                    GROUP BY bucket
+                ){p95_ctes}
+                SELECT s.bucket, s.count, s.mean, {p95_join}, COALESCE(e.errors, 0)
+                FROM stats s LEFT JOIN errors e ON e.bucket = s.bucket
+                ORDER BY s.bucket
+            """,
+                params,
+            ).fetchall()
+
+        return [
+            {
+                "bucket_start": bucket_start,
+                "count": count,
+                "mean": mean,
+                "p95": p95,
+                "error_rate": errors / count,
+            }
+            for bucket_start, count, mean, p95, errors in rows
+        ]
+
+    def _trends_from_rollups(
+        self, source: str, series: str | None, width: int, since: float
+    ) -> list[dict[str, Any]]:
+        """Merge hourly rollups, plus raw rows from the still-open hour."""
+        self.refresh_rollups()
+        error_series = series if source == "performance_metrics" else None
+
+        counts: dict[int, int] = {}
+        errors: dict[int, int] = {}
+        sketches: dict[int, QuantileSketch] = {}
+
+        def add(target: dict[int, int], bucket_start: float, count: int) -> int:
+            bucket = (int(bucket_start) // width) * width
+            target[bucket] = target.get(bucket, 0) + count
+            return bucket
+
+        with sqlite3.connect(self.db_path) as conn:
+            rolled_until = dict(
+                conn.execute("SELECT source, rolled_until FROM rollup_state").fetchall()
+            )
+
+            for table, table_series, target in (
+                (source, series, counts),
+                ("error_logs", error_series, errors),
+            ):
+                until = rolled_until.get(table, 0)
+                series_filter = "AND series = ?" if table_series else ""
+                params = (table, since) + ((table_series,) if table_series else ())
+                for bucket_start, count, sketch in conn.execute(
+                    f"""
+                    SELECT bucket_start, count, sketch FROM metric_rollups
+                    WHERE source = ? AND bucket_start >= ? {series_filter}
+                """,
+                    params,
+                ):
+                    bucket = add(target, bucket_start, count)
+                    if sketch and target is counts:
+                        merged = sketches.setdefault(bucket, QuantileSketch())
+                        merged.merge(QuantileSketch.from_dict(json.loads(sketch)))
+
+                # Raw rows not rolled up yet (the open hour)
+                column = ROLLUP_SOURCES[table]
+                latency = "NULL" if table == "error_logs" else "latency_ms"
+                raw_filter = f"AND {column} = ?" if table_series else ""
+                params = (max(since, until),) + ((table_series,) if table_series else ())
+                for timestamp, latency_ms, weight in conn.execute(
+                    f"SELECT timestamp, {latency}, {_weight(table)} FROM {table} "
+                    f"WHERE timestamp >= ? {raw_filter}",
+                    params,
+                ):
+                    bucket = add(target, timestamp, weight)
+                    if latency_ms is not None:
+                        sketches.setdefault(bucket, QuantileSketch()).add(latency_ms, weight)
+
+        points = []
+        for bucket in sorted(counts):
+            sketch = sketches.get(bucket)
+            points.append(
+                {
+                    "bucket_start": bucket,
+                    "count": counts[bucket],
+                    "mean": sketch.mean if sketch else None,
+                    "p95": sketch.quantile(0.95) if sketch else None,
+                    "error_rate": errors.get(bucket, 0) / counts[bucket],
+                }
+            )
+        return points
+
     def get_error_summary(self, hours: int = 24) -> list[dict]:
         """Get recent errors."""
         since = time.time() - (hours * 3600)
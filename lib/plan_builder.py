@@ -27,6 +27,11 @@ from typing import Any, Optional
 from datetime import datetime
 import yaml
 
+try:
+    from content_writer import ContentWriter
+except ImportError:  # imported as lib.plan_builder
+    from lib.content_writer import ContentWriter
+
 
 class PlanBuilder:
     """
@@ -183,6 +188,7 @@ dependencies: []
             - "plan": Path to plan.yaml
             - "tasks": List of task file paths
             - "directories": List of created directories
+            - "changed": Files actually written (content differed)
 
         Raises:
             ValueError: If no tasks have been added
@@ -220,24 +226,38 @@ dependencies: []
             for t in self.tasks
         ]
 
-        # Write plan.yaml
+        # Write plan.yaml and task files; files whose rendered content is
+        # unchanged are not rewritten (see content_writer.py)
         plan_file = self.output_dir / "plan.yaml"
-        with open(plan_file, 'w') as f:
-            yaml.dump(self.plan_data, f, default_flow_style=False, sort_keys=False)
-        created_files["plan"] = plan_file
+        self._keep_created(plan_file)
 
-        # Write task files
-        task_files: list[Path] = []
-        for task in self.tasks:
-            task_file = tasks_dir / f"{task['id']}.md"
-            with open(task_file, 'w') as f:
-                f.write(task["content"])
-            task_files.append(task_file)
+        with ContentWriter(self.output_dir) as writer:
+            writer.write_yaml(plan_file, self.plan_data)
+            created_files["plan"] = plan_file
+
+            task_files: list[Path] = []
+            for task in self.tasks:
+                task_file = tasks_dir / f"{task['id']}.md"
+                writer.write_text(task_file, task["content"])
+                task_files.append(task_file)
 
         created_files["tasks"] = task_files
+        created_files["changed"] = writer.written
 
         return created_files
 
+    def _keep_created(self, plan_file: Path) -> None:
+        """Reuse the creation time of an existing plan.yaml for the same plan."""
+        if not plan_file.exists():
+            return
+        try:
+            existing = yaml.safe_load(plan_file.read_text())
+        except yaml.YAMLError:
+            return
+        metadata = existing.get("metadata") if isinstance(existing, dict) else None
+        if isinstance(metadata, dict) and metadata.get("name") == self.name and metadata.get("created"):
+            self.plan_data["metadata"]["created"] = metadata["created"]
+
     def get_summary(self) -> str:
         """
         Get a summary of the plan for display.
@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""
+Plan Runner - Execute a PlanBuilder plan as a dependency DAG
+
+PlanBuilder writes .parallel/plans/plan.yaml with per-task dependency lists;
+PlanRunner executes it:
+- ready sets come from each task's `dependencies`; a task starts as soon
+  as its dependencies are done (see dag_executor.py)
+- every task is dispatched to an executor: SubprocessExecutor runs a
+  command in the task's own git worktree (worktrees/<task-id>, branch
+  feature/<task-id>), LocalExecutor calls a Python function
+- bounded concurrency and a per-task timeout
+- run state is persisted next to the plan (run_state.json), so an
+  interrupted or partially failed run resumes with the unfinished tasks
+- per-task timings go to the observability DB (component "plan_runner")
+
+Usage:
+    runner = PlanRunner(".parallel/plans", SubprocessExecutor("./run-task.sh {task_file}"))
+    outcomes = runner.run()
+
+    python lib/plan_runner.py --command 'claude -p "Do {task_file}"' --max-parallel 3
+"""
+
+import json
+import os
+import re
+import shlex
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+try:
+    import yaml_cache
+    from content_writer import atomic_write_bytes
+    from dag_executor import DagExecutor, TaskOutcome
+except ImportError:  # imported as lib.plan_runner
+    from lib import yaml_cache
+    from lib.content_writer import atomic_write_bytes
+    from lib.dag_executor import DagExecutor, TaskOutcome
+
+STATE_FILE = "run_state.json"
+
+# (task, plan_dir, timeout) -> result; raises on failure
+TaskExecutor = Callable[[dict[str, Any], Path, float | None], Any]
+
+
+def ensure_worktree(project_root: Path, name: str) -> tuple[Path, str]:
+    """Create (or reuse) worktrees/<name> on branch feature/<name>. Raises on failure."""
+    project_root = Path(project_root)
+    worktree_path = project_root / "worktrees" / name
+    branch_name = f"feature/{name}"
+
+    if worktree_path.exists():
+        return worktree_path, branch_name
+
+    def git(*args: str) -> subprocess.CompletedProcess:
+        return subprocess.run(
+            ["git", "-C", str(project_root), *args], capture_output=True, text=True
+        )
+
+    if git("show-ref", "--verify", "--quiet", f"refs/heads/{branch_name}").returncode == 0:
+        result = git("worktree", "add", str(worktree_path), branch_name)
+    else:
+        result = git("worktree", "add", str(worktree_path), "-b", branch_name)
+
+    if result.returncode != 0:
+        raise RuntimeError(f"git worktree add failed: {result.stderr.strip()}")
+    return worktree_path, branch_name
+
+
+def expand_command(command: str, **values: str) -> str:
+    """
+    Substitute shell-quoted {name} tokens for the given values.
+
+    Only these exact tokens are replaced, in one pass, so other braces in
+    the command (awk '{print $1}', ${VAR}) are left alone.
+    """
+    tokens = re.compile("|".join(re.escape("{" + name + "}") for name in values))
+    return tokens.sub(lambda match: shlex.quote(values[match.group()[1:-1]]), command)
+
+
+class SubprocessExecutor:
+    """
+    Run a shell command per task.
+
+    {task_id}, {task_file}, {plan_dir} and {worktree} are substituted
+    (absolute, shell-quoted; other braces are left alone); the same values are exported as CONTEXTUNE_TASK_ID,
+    CONTEXTUNE_TASK_FILE and CONTEXTUNE_PLAN_DIR. Output goes to
+    <plan_dir>/logs/<task-id>.log. A non-zero exit or a timeout fails the task.
+    """
+
+    def __init__(self, command: str, project_root: Path = Path("."), use_worktrees: bool = True):
+        self.command = command
+        self.project_root = Path(project_root).resolve()
+        self.use_worktrees = use_worktrees
+
+    def __call__(self, task: dict[str, Any], plan_dir: Path, timeout: float | None) -> int:
+        task_id = task["id"]
+        # The command runs in the worktree, so every path it gets is absolute
+        plan_dir = Path(plan_dir).resolve()
+        task_file = (plan_dir / task.get("file", f"tasks/{task_id}.md")).resolve()
+
+        if self.use_worktrees:
+            cwd, _ = ensure_worktree(self.project_root, task_id)
+        else:
+            cwd = self.project_root
+
+        cmd = expand_command(
+            self.command,
+            task_id=task_id,
+            task_file=str(task_file),
+            plan_dir=str(plan_dir),
+            worktree=str(cwd),
+        )
+        env = {
+            **os.environ,
+            "CONTEXTUNE_TASK_ID": task_id,
+            "CONTEXTUNE_TASK_FILE": str(task_file),
+            "CONTEXTUNE_PLAN_DIR": str(plan_dir),
+        }
+
+        log_path = plan_dir / "logs" / f"{task_id}.log"
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(log_path, "w") as log_file:
+            try:
+                result = subprocess.run(
+                    cmd, shell=True, cwd=cwd, env=env,
+                    stdout=log_file, stderr=subprocess.STDOUT, timeout=timeout,
+                )
+            except subprocess.TimeoutExpired as e:
+                raise TimeoutError(f"timed out after {timeout:g}s (log: {log_path})") from e
+
+        if result.returncode != 0:
+            raise RuntimeError(f"exit code {result.returncode} (log: {log_path})")
+        return result.returncode
+
+
+class LocalExecutor:
+    """
+    Call func(task) in-process.
+
+    On timeout the task fails, but the call itself can't be interrupted and
+    is left to finish in a daemon thread.
+    """
+
+    def __init__(self, func: Callable[[dict[str, Any]], Any]):
+        self.func = func
+
+    def __call__(self, task: dict[str, Any], plan_dir: Path, timeout: float | None) -> Any:
+        if timeout is None:
+            return self.func(task)
+
+        box: dict[str, Any] = {}
+
+        def target():
+            try:
+                box["result"] = self.func(task)
+            except BaseException as e:
+                box["error"] = e
+
+        thread = threading.Thread(target=target, daemon=True)
+        thread.start()
+        thread.join(timeout)
+        if thread.is_alive():
+            raise TimeoutError(f"timed out after {timeout:g}s")
+        if "error" in box:
+            raise box["error"]
+        return box.get("result")
+
+
+class PlanRunner:
+    """Resumable, bounded-concurrency execution of plan.yaml."""
+
+    def __init__(
+        self,
+        plan_dir: Path = Path(".parallel/plans"),
+        executor: TaskExecutor | None = None,
+        max_parallel: int = 3,
+        timeout: float | None = None,
+        db_path: Path | None = Path(".contextune/observability.db"),
+    ):
+        self.plan_dir = Path(plan_dir)
+        self.executor = executor
+        self.max_parallel = max_parallel
+        self.timeout = timeout
+        self.db_path = db_path
+        self.state_path = self.plan_dir / STATE_FILE
+
+        self.plan = yaml_cache.load_file(self.plan_dir / "plan.yaml")
+        if not self.plan or not self.plan.get("tasks"):
+            raise ValueError(f"No tasks in {self.plan_dir / 'plan.yaml'}")
+        self.tasks = {task["id"]: task for task in self.plan["tasks"]}
+        self.state = self._load_state()
+
+    # === STATE ===
+
+    def _load_state(self) -> dict[str, Any]:
+        try:
+            state = json.loads(self.state_path.read_text())
+        except (OSError, json.JSONDecodeError):
+            state = {}
+        tasks = state.get("tasks", {})
+        # Forget tasks that were removed from the plan
+        state["tasks"] = {tid: record for tid, record in tasks.items() if tid in self.tasks}
+        return state
+
+    def save_state(self):
+        self.state["updated_at"] = time.time()
+        atomic_write_bytes(self.state_path, json.dumps(self.state, indent=2).encode("utf-8"))
+
+    def reset(self):
+        """Forget previous runs (every task will execute again)."""
+        self.state = {"tasks": {}}
+        self.state_path.unlink(missing_ok=True)
+
+    def task_status(self, task_id: str) -> str:
+        return self.state["tasks"].get(task_id, {}).get("status", "pending")
+
+    def completed(self) -> list[str]:
+        return [tid for tid in self.tasks if self.task_status(tid) == "done"]
+
+    def remaining(self) -> dict[str, list[str]]:
+        """Dependency map of the tasks still to run."""
+        return {
+            tid: list(task.get("dependencies") or [])
+            for tid, task in self.tasks.items()
+            if self.task_status(tid) != "done"
+        }
+
+    def ready(self) -> list[str]:
+        """Tasks whose dependencies are all done."""
+        done = set(self.completed())
+        return [tid for tid, deps in self.remaining().items() if set(deps) <= done]
+
+    # === RUN ===
+
+    def _open_db(self):
+        if self.db_path is None:
+            return None
+        try:
+            try:
+                from observability_db import ObservabilityDB
+            except ImportError:
+                from lib.observability_db import ObservabilityDB
+            return ObservabilityDB(str(self.db_path))
+        except Exception as e:
+            print(f"DEBUG: Plan metrics disabled: {e}", file=sys.stderr)
+            return None
+
+    def run(
+        self, on_event: Callable[[str, TaskOutcome], None] | None = None
+    ) -> dict[str, TaskOutcome]:
+        """
+        Execute all unfinished tasks. Tasks already done in a previous run
+        are not repeated.
+
+        Returns: {task_id: TaskOutcome} for the tasks this run covered
+        """
+        if self.executor is None:
+            raise ValueError("PlanRunner needs an executor to run tasks")
+
+        db = self._open_db()
+        plan_name = (self.plan.get("metadata") or {}).get("name") or self.plan_dir.name
+        run_started = time.time()
+
+        def record(event: str, outcome: TaskOutcome):
+            entry = self.state["tasks"].setdefault(outcome.task_id, {"attempts": 0})
+            if event == "start":
+                entry["attempts"] += 1
+                entry.update(status="running", started_at=outcome.started_at, error=None)
+            else:
+                entry.update(status=outcome.status, finished_at=outcome.finished_at, error=outcome.error)
+                if outcome.duration is not None:
+                    entry["duration_s"] = round(outcome.duration, 3)
+            self.save_state()
+
+            if db is not None and outcome.duration is not None:
+                try:
+                    db.log_performance(
+                        "plan_runner", "task", outcome.duration * 1000,
+                        {"plan": plan_name, "task_id": outcome.task_id,
+                         "status": outcome.status, "attempt": entry["attempts"]},
+                    )
+                except Exception as e:
+                    print(f"DEBUG: Failed to log task metric: {e}", file=sys.stderr)
+
+            if on_event is not None:
+                on_event(event, outcome)
+
+        executor = DagExecutor(
+            self.remaining(), max_workers=self.max_parallel, satisfied=self.completed()
+        )
+        outcomes = executor.run(
+            lambda tid: self.executor(self.tasks[tid], self.plan_dir, self.timeout),
+            on_event=record,
+        )
+
+        if db is not None:
+            counts: dict[str, int] = {}
+            for outcome in outcomes.values():
+                counts[outcome.status] = counts.get(outcome.status, 0) + 1
+            try:
+                db.log_performance(
+                    "plan_runner", "run", (time.time() - run_started) * 1000,
+                    {"plan": plan_name, "max_parallel": self.max_parallel, **counts},
+                )
+            except Exception as e:
+                print(f"DEBUG: Failed to log run metric: {e}", file=sys.stderr)
+
+        return outcomes
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Execute plan.yaml tasks in dependency order")
+    parser.add_argument("--plan-dir", type=Path, default=Path(".parallel/plans"))
+    parser.add_argument("--command", help="Command per task ({task_id}, {task_file}, {worktree}, {plan_dir})")
+    parser.add_argument("--max-parallel", type=int, help="Concurrency cap (default: usage-based)")
+    parser.add_argument("--timeout", type=float, help="Per-task timeout in seconds")
+    parser.add_argument("--no-worktrees", action="store_true", help="Run commands in the project root")
+    parser.add_argument("--reset", action="store_true", help="Ignore previous run state")
+    parser.add_argument("--status", action="store_true", help="Show run state and exit")
+    args = parser.parse_args()
+
+    runner = PlanRunner(args.plan_dir)
+    if args.reset:
+        runner.reset()
+
+    if args.status or not args.command:
+        for tid in runner.tasks:
+            record = runner.state["tasks"].get(tid, {})
+            line = f"{tid:<12} {runner.task_status(tid):<8}"
+            if "duration_s" in record:
+                line += f" {record['duration_s']:.1f}s"
+            if record.get("error"):
+                line += f"  {record['error']}"
+            print(line)
+        print(f"Ready: {', '.join(runner.ready()) or '-'}")
+        if not args.status:
+            print("Pass --command to execute the ready tasks")
+        return
+
+    if args.max_parallel:
+        runner.max_parallel = args.max_parallel
+    else:
+        from usage_monitor import UsageMonitor
+
+        runner.max_parallel = UsageMonitor().get_parallel_task_limit()
+
+    runner.executor = SubprocessExecutor(args.command, use_worktrees=not args.no_worktrees)
+    runner.timeout = args.timeout
+
+    def show(event: str, outcome: TaskOutcome):
+        if event == "start":
+            print(f"→ {outcome.task_id} started")
+        elif event == "done":
+            print(f"✓ {outcome.task_id} done ({outcome.duration:.1f}s)")
+        else:
+            print(f"✗ {outcome.task_id} {event}: {outcome.error}")
+
+    outcomes = runner.run(on_event=show)
+    if any(outcome.status != "done" for outcome in outcomes.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Profiling - On-demand profiles of hook invocations
+
+Tracing says which stage of a hook was slow; a profile says why. When
+profiling is on, tracing.trace() runs the hook's main() under one of:
+- sample:   a daemon thread snapshots the hook's stack every interval_ms
+            (overhead ~ one frame walk per interval, independent of call
+            volume); saved as collapsed stacks (<hook>.<trace_id>.folded)
+- cprofile: deterministic cProfile (exact call counts, noticeably slower);
+            saved as pstats (<hook>.<trace_id>.prof)
+
+Only a `rate` fraction of invocations is profiled, so it can be left on.
+Profiles go to .contextune/profiles/ (newest MAX_PROFILES kept) and are
+named after the hook and the trace id, so a slow trace in
+scripts/trace-report.py can be matched with its profile.
+
+Settings, first match wins:
+- CONTEXTUNE_PROFILE=sample|cprofile|1|0, CONTEXTUNE_PROFILE_RATE=0.1,
+  CONTEXTUNE_PROFILE_INTERVAL_MS=5
+- contextune.profiling in ~/.contextune-config.yaml (see ProfilingConfig
+  in lib/contextune_integration/config.py)
+
+Report: uv run scripts/profile-report.py
+"""
+
+import os
+import random
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+PROFILE_DIR = Path(".contextune") / "profiles"
+
+CONFIG_PATH = Path.home() / ".contextune-config.yaml"
+
+MODES = ("sample", "cprofile")
+
+DEFAULTS = {"enabled": False, "mode": "sample", "rate": 0.1, "interval_ms": 5.0}
+
+# Oldest profiles beyond this are deleted when a new one is written
+MAX_PROFILES = 200
+
+# Frames deeper than this are cut from sampled stacks
+MAX_DEPTH = 128
+
+
+def settings() -> dict[str, Any]:
+    """Effective profiling settings (environment over config file)."""
+    result = dict(DEFAULTS)
+
+    if CONFIG_PATH.exists():
+        try:
+            try:
+                import yaml_cache
+            except ImportError:  # imported as lib.profiling
+                from lib import yaml_cache
+            config = yaml_cache.load_file(CONFIG_PATH, default={})
+            section = (config.get("contextune") or {}).get("profiling") or {}
+            result.update({key: section[key] for key in DEFAULTS if key in section})
+        except Exception as e:
+            print(f"DEBUG: Failed to read profiling config: {e}", file=sys.stderr)
+
+    value = os.environ.get("CONTEXTUNE_PROFILE")
+    if value is not None:
+        value = value.lower()
+        result["enabled"] = value not in ("", "0", "false", "off")
+        if value in MODES:
+            result["mode"] = value
+    for key, name in (("rate", "CONTEXTUNE_PROFILE_RATE"), ("interval_ms", "CONTEXTUNE_PROFILE_INTERVAL_MS")):
+        if name in os.environ:
+            try:
+                result[key] = float(os.environ[name])
+            except ValueError:
+                print(f"DEBUG: Ignoring invalid {name}={os.environ[name]!r}", file=sys.stderr)
+
+    if result["mode"] not in MODES:
+        result["mode"] = DEFAULTS["mode"]
+    return result
+
+
+def _frame_label(code) -> str:
+    return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """Periodically records the stack of one thread as collapsed stacks."""
+
+    def __init__(self, interval_ms: float = DEFAULTS["interval_ms"], thread_id: int | None = None):
+        self.interval = max(interval_ms, 0.1) / 1000
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def sample(self) -> None:
+        frame = sys._current_frames().get(self.thread_id)
+        labels = []
+        while frame is not None and len(labels) < MAX_DEPTH:
+            labels.append(_frame_label(frame.f_code))
+            frame = frame.f_back
+        if labels:
+            self.stacks[";".join(reversed(labels))] += 1
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def start(self) -> "StackSampler":
+        self._thread = threading.Thread(target=self._run, name="contextune-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> Counter[str]:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self.stacks
+
+
+def _prune(directory: Path) -> None:
+    profiles = sorted(
+        (p for p in directory.iterdir() if p.suffix in (".folded", ".prof")),
+        key=lambda p: p.stat().st_mtime,
+    )
+    for path in profiles[:-MAX_PROFILES]:
+        path.unlink(missing_ok=True)
+
+
+@contextmanager
+def profile(hook: str, trace_id: str, directory: Path | None = None) -> Iterator[Path | None]:
+    """
+    Profile the enclosed block if profiling is enabled and this invocation
+    is sampled. Yields the profile path that will be written, else None.
+
+    Writing the profile never raises.
+    """
+    config = settings()
+    if not config["enabled"] or random.random() >= config["rate"]:
+        yield None
+        return
+
+    directory = Path(directory) if directory else PROFILE_DIR
+    mode = config["mode"]
+    path = directory / f"{hook}.{trace_id}.{'prof' if mode == 'cprofile' else 'folded'}"
+
+    if mode == "cprofile":
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+    else:
+        profiler = StackSampler(config["interval_ms"]).start()
+
+    try:
+        yield path
+    finally:
+        try:
+            if mode == "cprofile":
+                profiler.disable()
+                directory.mkdir(parents=True, exist_ok=True)
+                profiler.dump_stats(path)
+            else:
+                stacks = profiler.stop()
+                directory.mkdir(parents=True, exist_ok=True)
+                write_collapsed(path, stacks)
+            _prune(directory)
+        except Exception as e:
+            print(f"DEBUG: Failed to write profile {path}: {e}", file=sys.stderr)
+
+
+# === MERGING ===
+
+def write_collapsed(path: Path, stacks: Counter[str]) -> None:
+    """Write stacks in collapsed format ("frame;frame;frame count" per line)."""
+    with open(path, "w") as f:
+        for stack, count in stacks.most_common():
+            f.write(f"{stack} {count}\n")
+
+
+def read_collapsed(paths: Iterable[Path]) -> Counter[str]:
+    """Merge collapsed-stack files."""
+    stacks: Counter[str] = Counter()
+    for path in paths:
+        with open(path) as f:
+            for line in f:
+                stack, _, count = line.rstrip("\n").rpartition(" ")
+                if stack and count.isdigit():
+                    stacks[stack] += int(count)
+    return stacks
+
+
+def find_profiles(
+    directory: Path | None = None,
+    hook: str | None = None,
+    kind: str = "folded",
+    last: int | None = None,
+) -> list[Path]:
+    """Profiles of one kind ("folded" or "prof"), oldest first, optionally the last N."""
+    directory = Path(directory) if directory else PROFILE_DIR
+    if not directory.exists():
+        return []
+    pattern = f"{hook}.*.{kind}" if hook else f"*.{kind}"
+    paths = sorted(directory.glob(pattern), key=lambda p: p.stat().st_mtime)
+    return paths[-last:] if last else paths
+
+
+def hot_functions(stacks: Counter[str]) -> list[dict[str, Any]]:
+    """
+    Rank functions in merged sampled stacks.
+
+    self: samples with the function on top of the stack
+    total: samples with the function anywhere on the stack (counted once
+    per stack, so recursion is not double counted)
+    """
+    total_samples = sum(stacks.values())
+    self_counts: Counter[str] = Counter()
+    total_counts: Counter[str] = Counter()
+    for stack, count in stacks.items():
+        frames = stack.split(";")
+        self_counts[frames[-1]] += count
+        for frame in set(frames):
+            total_counts[frame] += count
+
+    rows = [
+        {
+            "function": function,
+            "self": self_counts[function],
+            "total": total,
+            "self_pct": self_counts[function] / total_samples * 100,
+            "total_pct": total / total_samples * 100,
+        }
+        for function, total in total_counts.items()
+    ]
+    rows.sort(key=lambda r: (r["self"], r["total"]), reverse=True)
+    return rows
+
+
+def hot_functions_cprofile(paths: Iterable[Path]) -> list[dict[str, Any]]:
+    """Rank functions across cProfile dumps by own time."""
+    import pstats
+
+    paths = [str(p) for p in paths]
+    if not paths:
+        return []
+    stats = pstats.Stats(*paths)
+    rows = []
+    for (filename, line, name), (_, calls, own, cumulative, _) in stats.stats.items():
+        rows.append({
+            # Built-ins are reported as ("~", 0, "<built-in method ...>")
+            "function": name if filename == "~" else f"{name} ({Path(filename).name}:{line})",
+            "calls": calls,
+            "self_ms": own * 1000,
+            "total_ms": cumulative * 1000,
+        })
+    rows.sort(key=lambda r: r["self_ms"], reverse=True)
+    return rows
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Project Registry - Index of per-project observability databases
+
+GlobalObservability used to find projects by globbing
+**/.contextune/observability.db under ~/projects, ~/code, ... and then
+$HOME itself, walking those subtrees twice and descending into every
+node_modules and .git (minutes on a developer laptop).
+
+Instead, every ObservabilityDB registers its path here when it is opened:
+    ~/.claude/plugins/contextune/projects.json
+    {"databases": {"/abs/path/.contextune/observability.db":
+                   {"registered_at": ts, "last_seen": ts}}}
+
+Discovery reads the registry and drops entries whose file is gone. A
+bounded os.scandir crawl (depth limit, no hidden or dependency directories,
+no symlinks) is available to index projects that predate the registry,
+but only runs when explicitly asked for.
+
+Registration is cheap on the hot path: one small JSON read, and a locked
+rewrite only when the path is new or its last_seen is over a day old.
+"""
+
+import json
+import os
+import sys
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: concurrent registrations are best effort
+    fcntl = None
+
+REGISTRY_PATH = Path.home() / ".claude" / "plugins" / "contextune" / "projects.json"
+
+DB_RELATIVE_PATH = Path(".contextune") / "observability.db"
+
+# Refresh last_seen at most this often per database
+SEEN_REFRESH_SECONDS = 86400
+
+MAX_CRAWL_DEPTH = 4
+
+# Never descended into by the crawl (hidden directories are skipped too)
+SKIP_DIRS = frozenset({
+    "node_modules", "venv", "env", "__pycache__", "site-packages",
+    "dist", "build", "target", "vendor", "Library", "Applications",
+    "Pictures", "Movies", "Music",
+})
+
+# Paths registered by this process (ObservabilityDB is opened many times per hook)
+_registered: set[str] = set()
+
+
+class ProjectRegistry:
+    """JSON registry of known observability databases."""
+
+    def __init__(self, path: Path | None = None):
+        self.path = Path(path) if path else REGISTRY_PATH
+
+    def load(self) -> dict[str, dict[str, float]]:
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, json.JSONDecodeError):
+            return {}
+        databases = data.get("databases")
+        return databases if isinstance(databases, dict) else {}
+
+    def _save(self, databases: dict[str, dict[str, float]]):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps({"databases": databases}, indent=2, sort_keys=True))
+        os.replace(tmp_path, self.path)
+
+    @contextmanager
+    def _locked(self):
+        """Serialize read-modify-write cycles across processes."""
+        if fcntl is None:
+            yield
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path.with_name(self.path.name + ".lock"), "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def register(self, db_path: Path) -> bool:
+        """
+        Record a database path (absolute).
+
+        Returns: True if the registry file was written
+        """
+        key = str(Path(db_path).resolve())
+        now = time.time()
+
+        record = self.load().get(key)
+        if record and now - record.get("last_seen", 0) < SEEN_REFRESH_SECONDS:
+            return False
+
+        with self._locked():
+            databases = self.load()
+            record = databases.setdefault(key, {"registered_at": now})
+            record["last_seen"] = now
+            self._save(databases)
+        return True
+
+    def databases(self, prune: bool = True) -> list[Path]:
+        """Registered databases that still exist; dead entries are dropped."""
+        databases = self.load()
+        alive = [Path(path) for path in databases if Path(path).is_file()]
+
+        if prune and len(alive) < len(databases):
+            with self._locked():
+                current = self.load()
+                self._save({path: record for path, record in current.items()
+                            if Path(path).is_file()})
+
+        return sorted(alive)
+
+    def crawl(
+        self,
+        roots: list[Path],
+        max_depth: int = MAX_CRAWL_DEPTH,
+        skip: frozenset[str] = SKIP_DIRS,
+    ) -> list[Path]:
+        """
+        Find and register observability databases under roots.
+
+        Breadth-first os.scandir walk, max_depth levels below each root.
+        Only visits each directory once even if roots overlap.
+
+        Returns: databases found
+        """
+        found: list[Path] = []
+        visited: set[str] = set()
+        queue = deque((Path(root), 0) for root in roots)
+
+        while queue:
+            directory, depth = queue.popleft()
+            key = os.path.realpath(directory)
+            if key in visited:
+                continue
+            visited.add(key)
+
+            db_path = directory / DB_RELATIVE_PATH
+            if db_path.is_file():
+                found.append(db_path)
+
+            if depth >= max_depth:
+                continue
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.name.startswith(".") or entry.name in skip:
+                            continue
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                queue.append((Path(entry.path), depth + 1))
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+
+        for db_path in found:
+            self.register(db_path)
+        return found
+
+
+def register_database(db_path: Path) -> None:
+    """Best-effort registration for ObservabilityDB; never raises."""
+    key = str(Path(db_path).resolve())
+    if key in _registered:
+        return
+    _registered.add(key)
+    try:
+        ProjectRegistry().register(db_path)
+    except Exception as e:
+        print(f"DEBUG: Failed to register {db_path}: {e}", file=sys.stderr)
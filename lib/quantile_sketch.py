@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Quantile Sketch - Mergeable latency percentiles in constant space
+
+Percentiles used to be computed by loading every latency from every
+project DB and sorting the lot. A QuantileSketch keeps logarithmic buckets
+instead (DDSketch-style): any quantile is returned within RELATIVE_ACCURACY
+of the exact value, sketches from different projects or time windows merge
+by adding bucket counts, and the whole thing serializes to a small dict
+that can be cached as JSON.
+
+Usage:
+    sketch = QuantileSketch()
+    for latency in latencies:
+        sketch.add(latency)
+    sketch.quantile(0.95)
+
+    merged = QuantileSketch.from_dict(cached).merge(other)
+"""
+
+import math
+from typing import Any, Iterable
+
+RELATIVE_ACCURACY = 0.01
+
+
+class QuantileSketch:
+    """Log-bucketed histogram with relative-error quantiles."""
+
+    def __init__(self, relative_accuracy: float = RELATIVE_ACCURACY):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets: dict[int, int] = {}
+        # Values <= 0 can't be log-bucketed; they all sit below bucket keys
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.min: float | None = None
+        self.max: float | None = None
+
+    def add(self, value: float, count: int = 1) -> None:
+        if value > 0:
+            key = math.ceil(math.log(value) / self._log_gamma)
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        else:
+            self.zero_count += count
+        self.count += count
+        self.total += value * count
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def extend(self, values: Iterable[float]) -> "QuantileSketch":
+        for value in values:
+            self.add(value)
+        return self
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """Add other's counts into this sketch (same accuracy required)."""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different accuracy")
+        for key, count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+        return self
+
+    def quantile(self, q: float) -> float | None:
+        """
+        Approximate value at quantile q (0..1); None when empty.
+
+        Uses the same rank as sorted(values)[int(q * n)].
+        """
+        if self.count == 0:
+            return None
+        rank = min(int(q * self.count), self.count - 1)
+
+        if rank < self.zero_count:
+            return self.min if self.min is not None and self.min <= 0 else 0.0
+
+        seen = self.zero_count
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if seen > rank:
+                # Bucket midpoint (in relative terms), clamped to observed range
+                value = 2 * self.gamma ** key / (self.gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float | None:
+        return self.total / self.count if self.count else None
+
+    def summary(self, quantiles: Iterable[float] = (0.5, 0.95, 0.99)) -> dict[str, Any]:
+        """count/min/max/avg plus pNN entries (e.g. p50, p95, p99)."""
+        result: dict[str, Any] = {
+            "count": self.count,
+            "min": self.min,
+            "max": self.max,
+            "avg": self.mean,
+        }
+        for q in quantiles:
+            result[f"p{round(q * 100):g}"] = self.quantile(q)
+        return result
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "buckets": {str(key): count for key, count in self.buckets.items()},
+            "zero_count": self.zero_count,
+            "count": self.count,
+            "total": self.total,
+            "min": self.min,
+            "max": self.max,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "QuantileSketch":
+        sketch = cls(data.get("relative_accuracy", RELATIVE_ACCURACY))
+        sketch.buckets = {int(key): count for key, count in data.get("buckets", {}).items()}
+        sketch.zero_count = data.get("zero_count", 0)
+        sketch.count = data.get("count", 0)
+        sketch.total = data.get("total", 0.0)
+        sketch.min = data.get("min")
+        sketch.max = data.get("max")
+        return sketch
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Sampling - Cheap performance logging for high-rate components
+
+tool_router and tool_cost_tracker run on every tool call; a row (and a
+write transaction) per call adds up to thousands per hour in agentic
+sessions. For components with a SamplingPolicy, record() instead:
+
+1. Appends every event to a spool file next to the DB (one O_APPEND
+   write, no SQLite). ObservabilityDB.fold_samples() folds the spool into
+   metric_samples: exact hourly counts, error counts and a mergeable
+   QuantileSketch per (component, operation).
+2. Writes a performance_metrics row only for errors, slow outliers
+   (latency >= slow_ms) and 1 in `every` of the remaining events. Sampled
+   rows carry weight=every, so SUM(weight) and weighted percentiles over
+   rows stay unbiased.
+
+The spool is folded whenever a row is written anyway, when it grows past
+SPOOL_FOLD_BYTES, and before get_stats() reads, so dashboards see exact
+counts and sketch percentiles while SQLite writes drop by ~`every`x.
+
+Policies can be overridden with
+CONTEXTUNE_SAMPLING="tool_router=1000:25,cost_tracker=1" (every[:slow_ms]).
+
+Usage:
+    import sampling
+
+    sampling.record("tool_router", "route_decision", latency_ms, metadata={...})
+"""
+
+import os
+import random
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator
+
+DB_PATH = Path(".contextune") / "observability.db"
+
+SPOOL_NAME = "perf_spool.tsv"
+
+# Fold the spool into SQLite once it holds roughly this many events' worth
+SPOOL_FOLD_BYTES = 64 * 1024
+
+# A claimed spool that is older than this belongs to a crashed folder
+STALE_CLAIM_SECONDS = 60
+
+
+@dataclass(frozen=True)
+class SamplingPolicy:
+    """Keep 1 in `every` rows; always keep errors and rows >= slow_ms."""
+
+    every: int = 1
+    slow_ms: float | None = None
+
+
+POLICIES = {
+    "tool_router": SamplingPolicy(every=100, slow_ms=50.0),
+    "cost_tracker": SamplingPolicy(every=100, slow_ms=50.0),
+}
+
+
+def policy_for(component: str) -> SamplingPolicy | None:
+    """Sampling policy of a component (None: log every event as a row)."""
+    for entry in os.environ.get("CONTEXTUNE_SAMPLING", "").split(","):
+        name, _, value = entry.strip().partition("=")
+        if name != component or not value:
+            continue
+        every, _, slow_ms = value.partition(":")
+        try:
+            return SamplingPolicy(max(int(every), 1), float(slow_ms) if slow_ms else None)
+        except ValueError:
+            print(f"DEBUG: Ignoring invalid sampling policy {entry!r}", file=sys.stderr)
+    return POLICIES.get(component)
+
+
+def row_weight(policy: SamplingPolicy, latency_ms: float, error: bool = False) -> int | None:
+    """Weight of the row to write for this event, or None to spool it only."""
+    if error or policy.every <= 1:
+        return 1
+    if policy.slow_ms is not None and latency_ms >= policy.slow_ms:
+        return 1
+    return policy.every if random.randrange(policy.every) == 0 else None
+
+
+# === SPOOL ===
+
+def spool_path(db_path: str | Path) -> Path:
+    return Path(db_path).parent / SPOOL_NAME
+
+
+def append(
+    path: Path, component: str, operation: str, latency_ms: float, error: bool = False
+) -> int:
+    """Append one event to the spool; returns the spool size afterwards."""
+    line = f"{component}\t{operation}\t{latency_ms:.6g}\t{time.time():.6f}\t{int(error)}\n"
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        # A single small O_APPEND write: concurrent hooks never interleave
+        os.write(fd, line.encode("utf-8"))
+        return os.fstat(fd).st_size
+    finally:
+        os.close(fd)
+
+
+def claim(path: Path) -> list[Path]:
+    """
+    Take the spool (and stale claims of crashed folders) for folding.
+
+    Renaming makes new appends start a fresh spool, so events are never
+    folded twice or lost.
+    """
+    claimed = []
+    target = path.with_name(f"{path.name}.{os.getpid()}.{time.time_ns()}.folding")
+    try:
+        os.replace(path, target)
+        claimed.append(target)
+    except FileNotFoundError:
+        pass
+    for stale in path.parent.glob(f"{path.name}.*.folding"):
+        if stale == target:
+            continue
+        # Age from the claim time in the name: the rename keeps the mtime of
+        # the last append, which can be old for a spool that sat idle
+        if time.time() - claim_time(stale) > STALE_CLAIM_SECONDS:
+            claimed.append(stale)
+    return claimed
+
+
+def claim_time(path: Path) -> float:
+    """When a <spool>.<pid>.<time_ns>.folding file was claimed."""
+    try:
+        return int(path.name.rsplit(".", 2)[-2]) / 1e9
+    except ValueError:
+        return time.time()
+
+
+def read_events(paths: list[Path]) -> Iterator[tuple[str, str, float, float, bool]]:
+    """(component, operation, latency_ms, timestamp, error) per spooled event."""
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                fields = line.rstrip("\n").split("\t")
+                if len(fields) != 5:
+                    continue  # Torn line from a crash mid-write
+                component, operation, latency_ms, timestamp, error = fields
+                try:
+                    yield component, operation, float(latency_ms), float(timestamp), error == "1"
+                except ValueError:
+                    continue
+
+
+# === RECORDING ===
+
+def record(
+    component: str,
+    operation: str,
+    latency_ms: float,
+    metadata: dict[str, Any] | None = None,
+    error: bool = False,
+    db_path: str | Path | None = None,
+) -> bool:
+    """
+    Log a performance event under the component's sampling policy.
+
+    Only opens the database when a row is kept or the spool is due for
+    folding. Returns True if a performance_metrics row was written.
+    """
+    try:
+        from observability_db import ObservabilityDB
+    except ImportError:  # imported as lib.sampling
+        from lib.observability_db import ObservabilityDB
+
+    db_path = Path(db_path) if db_path else DB_PATH
+    policy = policy_for(component)
+    if policy is None:
+        ObservabilityDB(str(db_path)).log_performance(component, operation, latency_ms, metadata)
+        return True
+
+    db_path.parent.mkdir(exist_ok=True)
+    spool_size = append(spool_path(db_path), component, operation, latency_ms, error)
+
+    weight = row_weight(policy, latency_ms, error)
+    if weight is None:
+        if spool_size >= SPOOL_FOLD_BYTES:
+            ObservabilityDB(str(db_path)).fold_samples()
+        return False
+
+    db = ObservabilityDB(str(db_path))
+    db.log_performance(component, operation, latency_ms, metadata, weight=weight)
+    db.fold_samples()
+    return True
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Status Line Snapshot - Pre-formatted detection line for statusline.sh
+
+The status line re-renders constantly, so it must not start an
+interpreter, jq or sqlite3. ObservabilityDB writes the active detection
+here, already formatted, next to the database:
+
+    .contextune/statusline    ->    🎯 /ctx:research (95% via keyword)
+
+statusline.sh shows it with a single shell `read`; a missing file means
+no active detection. Writes are atomic (temp file + rename), so a reader
+never sees a partial line.
+"""
+
+import os
+from pathlib import Path
+
+SNAPSHOT_NAME = "statusline"
+
+READY = "🎯 Contextune: Ready"
+
+
+def snapshot_path(db_path: str | Path) -> Path:
+    """Snapshot file that goes with an observability DB."""
+    return Path(db_path).parent / SNAPSHOT_NAME
+
+
+def format_detection(command: str, confidence: float, method: str) -> str:
+    return f"🎯 {command} ({confidence:.0%} via {method})"
+
+
+def write(path: Path, line: str) -> None:
+    """Replace the snapshot atomically."""
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(line + "\n")
+    os.replace(tmp_path, path)
+
+
+def clear(path: Path) -> None:
+    path.unlink(missing_ok=True)
+
+
+def read(path: Path) -> str:
+    """The status line text (READY if there is no active detection)."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            line = f.readline().rstrip("\n")
+    except OSError:
+        return READY
+    return line or READY
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Tracing - Per-invocation spans for hook latency breakdowns
+
+Only matcher latency used to be recorded, so nothing said where the rest
+of a slow hook went. Every Python hook now runs inside a trace: one trace
+id per invocation, a root span named after the hook and nested spans for
+its stages (stdin parse, detection, DB writes, subprocesses, output).
+
+Two synthetic spans cover the time before the hook's code runs:
+- interpreter_start: process start -> `import tracing` (Linux only, from
+  /proc; includes interpreter init and imports made before tracing)
+- imports: `import tracing` -> trace start (the hook's remaining imports)
+so hooks should import tracing as early as possible.
+
+Spans are buffered in memory and written in one batch to the trace_spans
+table of the project's observability DB when the trace ends (or every
+MAX_BUFFERED spans). Spans opened outside a trace are no-ops, so library
+code can be instrumented freely. Set CONTEXTUNE_TRACE=0 to disable.
+
+Usage:
+    import tracing
+
+    @tracing.span("detect")
+    def detect(prompt): ...
+
+    def main():
+        with tracing.span("parse_stdin"):
+            event = json.loads(sys.stdin.read())
+        ...
+
+    if __name__ == "__main__":
+        with tracing.trace("user_prompt_submit"):
+            main()
+
+Report: uv run scripts/trace-report.py
+Profiles of the same invocations: CONTEXTUNE_PROFILE (see profiling.py)
+"""
+
+import functools
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable
+
+try:
+    import profiling
+    import sampling
+except ImportError:  # imported as lib.tracing
+    from lib import profiling, sampling
+
+# When this module was first imported (end of interpreter start-up)
+IMPORTED_AT = time.time()
+
+DB_PATH = Path(".contextune") / "observability.db"
+
+# Flush early if a long-running trace accumulates this many spans
+MAX_BUFFERED = 500
+
+SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS trace_spans (
+        trace_id TEXT NOT NULL,
+        span_id TEXT NOT NULL,
+        parent_id TEXT,
+        hook TEXT NOT NULL,
+        name TEXT NOT NULL,
+        start REAL NOT NULL,
+        duration_ms REAL NOT NULL,
+        status TEXT NOT NULL DEFAULT 'ok',
+        attributes TEXT,
+        weight INTEGER NOT NULL DEFAULT 1,
+        PRIMARY KEY (trace_id, span_id)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_trace_spans_start ON trace_spans(start)",
+    "CREATE INDEX IF NOT EXISTS idx_trace_spans_hook ON trace_spans(hook, name)",
+)
+
+# The active trace of this process (hooks run one invocation per process)
+_tracer: "Tracer | None" = None
+
+# Start-up spans only make sense for the first trace of a process
+_startup_recorded = False
+
+
+def ensure_schema(conn: sqlite3.Connection) -> None:
+    conn.execute(SCHEMA[0])
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(trace_spans)")}
+    if "weight" not in columns:
+        conn.execute("ALTER TABLE trace_spans ADD COLUMN weight INTEGER NOT NULL DEFAULT 1")
+    for statement in SCHEMA[1:]:
+        conn.execute(statement)
+
+
+def enabled() -> bool:
+    return os.environ.get("CONTEXTUNE_TRACE", "1").lower() not in ("0", "false", "off")
+
+
+def process_start_time() -> float | None:
+    """Wall-clock start of this process (Linux), else None."""
+    try:
+        with open("/proc/self/stat") as f:
+            # Fields after "(comm)"; starttime is field 22 overall
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return time.time() - uptime + start_ticks / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def _new_id(nbytes: int = 4) -> str:
+    return os.urandom(nbytes).hex()
+
+
+class Tracer:
+    """Span buffer and parent stack for one trace."""
+
+    def __init__(self, hook: str, db_path: Path | None = None):
+        self.hook = hook
+        self.db_path = Path(db_path) if db_path else DB_PATH
+        self.trace_id = _new_id(8)
+        self.buffer: list[tuple] = []
+        # Traces this one stands for (1-in-N sampled traces use N, 0 drops it)
+        self.weight = 1
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._root_id: str | None = None
+
+    def _stack(self) -> list[str]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            # Spans opened in worker threads nest under the root span
+            stack = self._local.stack = [self._root_id] if self._root_id else []
+        return stack
+
+    def record(
+        self,
+        span_id: str,
+        parent_id: str | None,
+        name: str,
+        start: float,
+        end: float,
+        status: str = "ok",
+        attributes: dict[str, Any] | None = None,
+    ):
+        row = (
+            self.trace_id, span_id, parent_id, self.hook, name, start,
+            (end - start) * 1000, status,
+            json.dumps(attributes, default=str) if attributes else None,
+        )
+        with self._lock:
+            self.buffer.append(row)
+            full = len(self.buffer) >= MAX_BUFFERED
+        if full:
+            self.flush()
+
+    def flush(self) -> int:
+        """Write buffered spans in one batch; never raises."""
+        with self._lock:
+            rows, self.buffer = self.buffer, []
+        if not rows or not self.weight:
+            return 0
+        rows = [row + (self.weight,) for row in rows]
+        try:
+            self.db_path.parent.mkdir(exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=2.0)
+            try:
+                ensure_schema(conn)
+                conn.executemany(
+                    "INSERT OR REPLACE INTO trace_spans VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+                )
+                conn.commit()
+            finally:
+                conn.close()
+        except Exception as e:
+            print(f"DEBUG: Failed to write {len(rows)} trace spans: {e}", file=sys.stderr)
+            return 0
+        return len(rows)
+
+
+def _status(exc_type, exc) -> str:
+    if exc_type is None:
+        return "ok"
+    # Hooks exit via sys.exit(0) on success
+    if issubclass(exc_type, SystemExit) and getattr(exc, "code", None) in (0, None):
+        return "ok"
+    return "error"
+
+
+class Span:
+    """
+    Time a block (context manager) or every call of a function (decorator).
+
+    No-op unless a trace is active in this process.
+    """
+
+    def __init__(self, name: str, **attributes: Any):
+        self.name = name
+        self.attributes = attributes
+        self.span_id: str | None = None
+        self._tracer: Tracer | None = None
+        self._start = 0.0
+
+    def set(self, **attributes: Any) -> "Span":
+        """Add attributes while the span is open."""
+        self.attributes.update(attributes)
+        return self
+
+    def __enter__(self) -> "Span":
+        tracer = _tracer
+        if tracer is not None:
+            self._tracer = tracer
+            self.span_id = _new_id()
+            self._start = time.time()
+            tracer._stack().append(self.span_id)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        tracer = self._tracer
+        if tracer is None:
+            return False
+        end = time.time()
+        stack = tracer._stack()
+        if stack and stack[-1] == self.span_id:
+            stack.pop()
+        parent_id = stack[-1] if stack else None
+        status = _status(exc_type, exc)
+        if status == "error":
+            self.attributes.setdefault("error", exc_type.__name__)
+        tracer.record(self.span_id, parent_id, self.name, self._start, end, status, self.attributes)
+        self._tracer = None
+        return False
+
+    def __call__(self, func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with Span(self.name, **self.attributes):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+
+# Call sites read as functions: `with tracing.span(...)`, `@tracing.span(...)`
+span = Span
+
+
+@contextmanager
+def trace(
+    hook: str,
+    db_path: Path | None = None,
+    sample: "sampling.SamplingPolicy | None" = None,
+    **attributes: Any,
+):
+    """
+    Run one hook invocation as a trace, flushing its spans on exit.
+
+    With a sampling policy (high-rate hooks), only failed, slow and 1 in
+    `every` other traces are written, weighted like sampled metric rows.
+    The invocation is also profiled when profiling is on (see profiling.py).
+    Yields the root span (None when tracing is disabled).
+    """
+    global _tracer, _startup_recorded
+    if _tracer is not None:
+        yield None
+        return
+    if not enabled():
+        with profiling.profile(hook, _new_id(8)):
+            yield None
+        return
+
+    tracer = Tracer(hook, db_path)
+    started = time.time()
+    startup = not _startup_recorded
+    _startup_recorded = True
+    process_start = process_start_time() if startup else None
+    if process_start:
+        root_start = min(process_start, IMPORTED_AT)
+    else:
+        root_start = IMPORTED_AT if startup else started
+
+    root = Span(hook, **attributes)
+    root.span_id = tracer._root_id = _new_id()
+    root._tracer = tracer
+    root._start = root_start
+    tracer._stack()  # Seeded with the root span
+
+    if process_start and process_start < IMPORTED_AT:
+        tracer.record(_new_id(), root.span_id, "interpreter_start", process_start, IMPORTED_AT)
+    if startup:
+        tracer.record(_new_id(), root.span_id, "imports", IMPORTED_AT, started)
+
+    _tracer = tracer
+    status = "ok"
+    try:
+        with profiling.profile(hook, tracer.trace_id):
+            yield root
+    except BaseException:
+        status = _status(*sys.exc_info()[:2])
+        root.__exit__(*sys.exc_info())
+        raise
+    else:
+        root.__exit__(None, None, None)
+    finally:
+        _tracer = None
+        if sample is not None:
+            # Judge slowness by the hook's own run time, not interpreter start-up
+            duration_ms = (time.time() - started) * 1000
+            tracer.weight = sampling.row_weight(sample, duration_ms, status == "error") or 0
+        tracer.flush()
+
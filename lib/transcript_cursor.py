@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Transcript Cursor - Per-session checkpoints for incremental transcript hooks
+
+PreCompact (context_preserver) can fire many times in one long session and
+SessionEnd (session_end_extractor) runs again whenever a session is resumed.
+Both used to re-read and re-scan the transcript from byte 0 every time.
+
+A cursor records, per (session_id, consumer):
+- the byte offset just past the last processed line
+- how many entries precede it (so entry indexes stay absolute)
+- a hash of the already-processed head (to detect a rewritten transcript)
+- arbitrary JSON extractor state carried across invocations
+
+Each consumer keeps its own cursor, so hooks never skip lines for each other.
+"""
+
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any
+
+from transcript_io import HEAD_BYTES, head_hash, read_jsonl_from
+
+CURSOR_DIR = Path.home() / ".claude" / "plugins" / "contextune" / ".cache" / "cursors"
+
+
+class TranscriptCursor:
+    """Resume point and carried state for one consumer of one transcript."""
+
+    def __init__(
+        self,
+        session_id: str,
+        consumer: str,
+        transcript_path: Path,
+        cursor_dir: Path | None = None,
+    ):
+        self.transcript_path = Path(transcript_path)
+        safe_name = re.sub(r"[^\w.-]", "_", f"{session_id}.{consumer}")
+        self.path = (cursor_dir or CURSOR_DIR) / f"{safe_name}.json"
+
+        self.offset = 0
+        self.entry_count = 0
+        self.state: dict[str, Any] = {}
+        self._load()
+
+    def _load(self):
+        try:
+            saved = json.loads(self.path.read_text())
+        except (OSError, json.JSONDecodeError):
+            return
+
+        # Discard the checkpoint if the transcript shrank or was replaced
+        try:
+            size = self.transcript_path.stat().st_size
+            if saved.get("transcript") != str(self.transcript_path) or size < saved["offset"]:
+                return
+            if head_hash(self.transcript_path, saved["head_bytes"]) != saved["head_hash"]:
+                return
+        except (OSError, KeyError):
+            return
+
+        self.offset = saved["offset"]
+        self.entry_count = saved.get("entry_count", 0)
+        self.state = saved.get("state") or {}
+
+    @property
+    def is_fresh(self) -> bool:
+        """True when nothing has been processed yet (or the cursor was reset)."""
+        return self.offset == 0
+
+    def read_new(self) -> list[dict[str, Any]]:
+        """
+        Read entries appended since the last save().
+
+        Advances the in-memory cursor; nothing is persisted until save(), so
+        a crash mid-processing re-reads the same lines next time.
+        """
+        entries, self.offset = read_jsonl_from(self.transcript_path, self.offset)
+        self.entry_count += len(entries)
+        return entries
+
+    def save(self):
+        """Persist offset and state atomically."""
+        head_bytes = min(self.offset, HEAD_BYTES)
+        payload = {
+            "transcript": str(self.transcript_path),
+            "offset": self.offset,
+            "entry_count": self.entry_count,
+            "head_bytes": head_bytes,
+            "head_hash": head_hash(self.transcript_path, head_bytes),
+            "state": self.state,
+        }
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(payload, default=str))
+        os.replace(tmp_path, self.path)
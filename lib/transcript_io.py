@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Transcript I/O - Incremental readers for JSONL conversation transcripts
+
+Transcripts are append-only and can grow to tens of megabytes. Hooks and
+scripts that re-read them from byte 0 on every run pay for the whole
+history each time. These helpers read only what is new:
+- read_jsonl_from(): parse complete lines appended after a byte offset
+- head_hash(): fingerprint the start of a file to detect rewrites
+- iter_entries_reverse(): newest-first entries for callers that only need
+  the tail (last assistant message, most recent plan)
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Iterator
+
+# Bytes hashed by head_hash(); enough to tell transcripts apart
+HEAD_BYTES = 4096
+
+# Read size when seeking backwards from the end of a transcript
+REVERSE_BLOCK_SIZE = 64 * 1024
+
+
+def read_jsonl_from(path: Path, offset: int = 0) -> tuple[list[dict[str, Any]], int]:
+    """
+    Parse JSONL entries appended after a byte offset.
+
+    A trailing line without a newline (still being written) is left for the
+    next call. Malformed lines are skipped.
+
+    Returns: (entries, offset just past the last complete line)
+    """
+    with open(path, "rb") as f:
+        f.seek(offset)
+        chunk = f.read()
+
+    end = chunk.rfind(b"\n") + 1
+    entries = []
+    for line in chunk[:end].splitlines():
+        if not line.strip():
+            continue
+        try:
+            entries.append(json.loads(line))
+        except json.JSONDecodeError:
+            continue
+
+    return entries, offset + end
+
+
+def head_hash(path: Path, size: int = HEAD_BYTES) -> str:
+    """Hash of the first bytes of a file (changes if the file was replaced)."""
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read(size)).hexdigest()
+
+
+def iter_lines_reverse(path: Path, block_size: int = REVERSE_BLOCK_SIZE) -> Iterator[bytes]:
+    """
+    Yield complete lines newest-first, reading fixed-size blocks from the end.
+
+    Memory use is bounded by block_size plus the longest line, regardless of
+    file size. Blank lines are skipped.
+    """
+    with open(path, "rb") as f:
+        position = f.seek(0, os.SEEK_END)
+        # Bytes of a line whose start is in an earlier (not yet read) block
+        remainder = b""
+
+        while position > 0:
+            read_size = min(block_size, position)
+            position -= read_size
+            f.seek(position)
+            block = f.read(read_size) + remainder
+
+            lines = block.split(b"\n")
+            # First piece may continue into the previous block
+            remainder = lines.pop(0)
+            for line in reversed(lines):
+                if line.strip():
+                    yield line
+
+        if remainder.strip():
+            yield remainder
+
+
+def iter_entries_reverse(
+    path: Path, block_size: int = REVERSE_BLOCK_SIZE
+) -> Iterator[dict[str, Any]]:
+    """Yield parsed JSONL entries newest-first, skipping malformed lines."""
+    for line in iter_lines_reverse(path, block_size):
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError:
+            continue
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+YAML Cache - Fast YAML loading/dumping with a parsed-document cache
+
+features.yaml, decisions.yaml and plan.yaml are re-parsed by every CLI
+script and hook invocation, with PyYAML's pure-Python loader unless told
+otherwise. This module:
+- uses the libyaml C loader/dumper (CSafeLoader/CSafeDumper) when PyYAML
+  was built with it, falling back to the pure-Python safe classes
+- caches parsed documents as pickles keyed by (path, mtime, size, inode),
+  so an unchanged file is never parsed twice across processes
+- writes files atomically and primes the cache with what was written
+
+Cached documents are returned as fresh objects (unpickled per call), so
+callers can mutate them freely.
+"""
+
+import hashlib
+import os
+import pickle
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+SafeDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+CACHE_DIR = Path.home() / ".claude" / "plugins" / "contextune" / ".cache" / "yaml"
+
+# Bump when the cache record layout changes
+CACHE_VERSION = 1
+
+
+def loads(text: str) -> Any:
+    """Parse a YAML string with the fastest available safe loader."""
+    return yaml.load(text, Loader=SafeLoader)
+
+
+def dumps(data: Any, **options: Any) -> str:
+    """Serialize to YAML (block style, insertion order by default)."""
+    options = {"default_flow_style": False, "sort_keys": False, **options}
+    return yaml.dump(data, Dumper=SafeDumper, **options)
+
+
+def _cache_path(path: Path) -> Path:
+    digest = hashlib.sha1(str(path).encode("utf-8")).hexdigest()
+    return CACHE_DIR / f"{digest}.pickle"
+
+
+def _stat_key(path: Path) -> tuple[int, int, int] | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+def _store(path: Path, key: tuple[int, int, int], data: Any) -> None:
+    """Write a cache record atomically (best effort)."""
+    cache_path = _cache_path(path)
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_name(f".{cache_path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump(
+                {"version": CACHE_VERSION, "key": key, "data": data},
+                f,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        os.replace(tmp_path, cache_path)
+    except Exception:
+        pass
+
+
+def load_file(path: Path, default: Any = None, use_cache: bool = True) -> Any:
+    """
+    Load a YAML file, reusing the cached parse while the file is unchanged.
+
+    Returns default if the file is missing or the document is empty.
+    """
+    path = Path(path).resolve()
+    key = _stat_key(path)
+    if key is None:
+        return default
+
+    if use_cache:
+        try:
+            with open(_cache_path(path), "rb") as f:
+                record = pickle.load(f)
+            if record.get("version") == CACHE_VERSION and tuple(record["key"]) == key:
+                data = record["data"]
+                return default if data is None else data
+        except Exception:
+            pass
+
+    with open(path, "rb") as f:
+        data = yaml.load(f, Loader=SafeLoader)
+
+    # Only cache if the file didn't change while we were reading it
+    if use_cache and _stat_key(path) == key:
+        _store(path, key, data)
+
+    return default if data is None else data
+
+
+def dump_file(path: Path, data: Any, **options: Any) -> None:
+    """Write YAML atomically (temp file + rename) and prime the cache."""
+    path = Path(path)
+    text = dumps(data, **options)
+
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+    resolved = path.resolve()
+    key = _stat_key(resolved)
+    if key is not None:
+        # Cache the round-tripped form so readers see what a parse would give
+        _store(resolved, key, loads(text))
@@ -11,11 +11,16 @@ def _():
     import pandas as pd
     import matplotlib.pyplot as plt
     import seaborn as sns
+    import sys
     from datetime import datetime, timedelta
+    from pathlib import Path
+
+    sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+    from observability_db import ObservabilityDB
 
     sns.set_style("whitegrid")
     plt.rcParams['figure.figsize'] = (12, 6)
-    return datetime, mo, pd, plt, sqlite3, timedelta
+    return ObservabilityDB, datetime, mo, pd, plt, sqlite3, timedelta
 
 
 @app.cell
@@ -56,15 +61,58 @@ def _(mo):
 
 
 @app.cell
-def _(date_range, datetime, pd, refresh_button, sqlite3, timedelta):
+def _(
+    ObservabilityDB,
+    date_range,
+    datetime,
+    pd,
+    refresh_button,
+    sqlite3,
+    timedelta,
+):
     # Trigger refresh when button changes
     _ = refresh_button
 
     db_path = ".contextune/observability.db"
     conn = sqlite3.connect(db_path)
+    obs_db = ObservabilityDB(db_path)
 
     cutoff_date = (datetime.now() - timedelta(days=date_range.value)).timestamp()
 
+    # Daily series are bucketed in SQL: one row per day, not one per detection
+    _daily = dict(
+        source="detection_history",
+        bucket_seconds=86400,
+        metrics=["count"],
+        hours=date_range.value * 24,
+    )
+    daily_trend = pd.DataFrame(obs_db.get_trends(**_daily), columns=["bucket_start", "count"])
+
+    # Help detections: prompts that mention /ctx:help (whatever was detected),
+    # bucketed on the same UTC-day boundaries as get_trends
+    help_trend = pd.read_sql_query(
+        f"""
+        SELECT CAST(timestamp / 86400 AS INTEGER) * 86400 AS bucket_start, COUNT(*) AS count
+        FROM detection_history
+        WHERE timestamp >= {cutoff_date} AND prompt_preview LIKE '%/ctx:help%'
+        GROUP BY bucket_start
+        """,
+        conn
+    )
+
+    command_counts = pd.read_sql_query(
+        f"""
+        SELECT command, COUNT(*) AS detections
+        FROM detection_history
+        WHERE timestamp >= {cutoff_date}
+        GROUP BY command
+        ORDER BY detections DESC
+        LIMIT 10
+        """,
+        conn
+    )
+
+    # Only the rows shown in the recent-detections table
     detection_df = pd.read_sql_query(
         f"""
         SELECT
@@ -77,10 +125,11 @@ def _(date_range, datetime, pd, refresh_button, sqlite3, timedelta):
         FROM detection_history
         WHERE timestamp >= {cutoff_date}
         ORDER BY timestamp DESC
+        LIMIT 50
         """,
         conn
     )
-    return conn, cutoff_date, detection_df
+    return command_counts, conn, cutoff_date, daily_trend, detection_df, help_trend
 
 
 @app.cell
@@ -90,14 +139,12 @@ def _(mo):
 
 
 @app.cell
-def _(detection_df, pd, plt):
-    daily_stats = detection_df.copy()
-    daily_stats['date'] = pd.to_datetime(daily_stats['date']).dt.date
-
-    daily_help = daily_stats.groupby('date').agg({
-        'command': 'count',
-        'prompt_preview': lambda x: (x.str.contains('/ctx:help', case=False, na=False)).sum()
-    }).rename(columns={'command': 'total_detections', 'prompt_preview': 'help_detections'})
+def _(command_counts, daily_trend, help_trend, pd, plt):
+    daily_help = daily_trend.rename(columns={'count': 'total_detections'}).merge(
+        help_trend.rename(columns={'count': 'help_detections'}), on='bucket_start', how='left'
+    ).fillna({'help_detections': 0})
+    daily_help['date'] = pd.to_datetime(daily_help['bucket_start'], unit='s').dt.date
+    daily_help = daily_help.set_index('date')
 
     daily_help['help_percentage'] = (daily_help['help_detections'] / daily_help['total_detections'] * 100).round(2)
 
@@ -113,7 +160,7 @@ def _(detection_df, pd, plt):
     ax1.grid(True, alpha=0.3)
     ax1.tick_params(axis='x', rotation=45)
 
-    command_dist = detection_df['command'].value_counts().head(10)
+    command_dist = command_counts.set_index('command')['detections']
     ax2.barh(range(len(command_dist)), command_dist.values, color='steelblue')
     ax2.set_yticks(range(len(command_dist)))
     ax2.set_yticklabels(command_dist.index)
@@ -205,7 +252,7 @@ def _(mo):
 
 
 @app.cell
-def _(corrections_df, detection_df, pd, plt):
+def _(corrections_df, daily_help, pd, plt):
     daily_cost = corrections_df.copy()
     daily_cost['date'] = pd.to_datetime(daily_cost['date']).dt.date
 
@@ -214,9 +261,7 @@ def _(corrections_df, detection_df, pd, plt):
     }).reset_index()
     cost_summary.columns = ['date', 'total_cost', 'haiku_calls', 'avg_cost']
 
-    daily_detections = detection_df.copy()
-    daily_detections['date'] = pd.to_datetime(daily_detections['date']).dt.date
-    daily_detection_counts = daily_detections.groupby('date').size().reset_index(name='total_detections')
+    daily_detection_counts = daily_help['total_detections'].reset_index()
 
     cost_summary = cost_summary.merge(daily_detection_counts, on='date', how='left')
     cost_summary['haiku_usage_pct'] = (cost_summary['haiku_calls'] / cost_summary['total_detections'] * 100).round(2)
@@ -255,8 +300,8 @@ def _(mo):
 
 
 @app.cell
-def _(corrections_df, cost_summary, daily_help, detection_df, mo):
-    total_detections_summary = len(detection_df)
+def _(corrections_df, cost_summary, daily_help, mo):
+    total_detections_summary = int(daily_help['total_detections'].sum())
     avg_help_rate = daily_help['help_percentage'].mean() if len(daily_help) > 0 else 0
     total_haiku_calls = len(corrections_df)
     total_cost_summary = corrections_df['total_cost_usd'].sum() if len(corrections_df) > 0 else 0
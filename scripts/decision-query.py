@@ -15,7 +15,7 @@ Usage:
     uv run scripts/decision-query.py [OPTIONS]
 
 Options:
-    --topic TOPIC              Filter by topic (authentication, architecture, etc.)
+    --topic TOPIC              Ranked full-text search (authentication, architecture, etc.)
     --tags TAGS                Filter by tags (comma-separated)
     --category CATEGORY        Filter by category (architecture, process, tooling, performance)
     --status STATUS            Filter by status (accepted, rejected, pending, revisiting)
@@ -24,23 +24,29 @@ Options:
     --include-expired          Include expired research entries (default: skip)
     --format FORMAT            Output format (text, json, yaml) - default: text
     --estimate-tokens          Show token count estimation for results
+    --budget N                 Load the most relevant entries fitting N tokens
+                               (most recent ones without --topic)
 """
 
 import argparse
 import json
 import sys
-from datetime import datetime, timedelta, timezone
+from datetime import datetime
 from pathlib import Path
 from typing import Any
 
 import yaml
 from rich.console import Console
 
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+
+from decision_store import DecisionStore, estimate_tokens, select_within_budget
+
 console = Console()
 
 
-def load_decisions() -> dict:
-    """Load decisions.yaml from project root."""
+def find_decisions_file() -> Path:
+    """Locate decisions.yaml relative to this script."""
     # Try multiple paths to find decisions.yaml
     script_dir = Path(__file__).parent
     possible_paths = [
@@ -63,43 +69,7 @@ def load_decisions() -> dict:
         )
         sys.exit(1)
 
-    with open(decisions_file) as f:
-        return yaml.safe_load(f) or {}
-
-
-def estimate_tokens(entry: dict[str, Any]) -> int:
-    """Estimate token count for a decision entry.
-
-    Rough estimation:
-    - Title/ID: ~20 tokens
-    - Context/Description: ~100 tokens per 500 chars
-    - Decision: ~100 tokens per 500 chars
-    - Alternatives: ~50 tokens per alternative
-    - Consequences: ~50 tokens
-    """
-    tokens = 20
-
-    # Context/Description
-    if "context" in entry:
-        tokens += len(str(entry["context"])) // 5
-
-    # Decision
-    if "decision" in entry:
-        tokens += len(str(entry["decision"])) // 5
-
-    # Rationale
-    if "rationale" in entry:
-        tokens += len(str(entry["rationale"])) // 5
-
-    # Alternatives
-    if "alternatives_considered" in entry:
-        tokens += len(entry["alternatives_considered"]) * 50
-
-    # Consequences
-    if "consequences" in entry:
-        tokens += 50
-
-    return max(tokens, 100)  # Minimum 100 tokens per entry
+    return decisions_file
 
 
 def is_expired(entry: dict[str, Any]) -> bool:
@@ -117,76 +87,6 @@ def is_expired(entry: dict[str, Any]) -> bool:
         return False
 
 
-def filter_entries(
-    entries: list[dict[str, Any]],
-    topic: str | None = None,
-    tags: list[str] | None = None,
-    category: str | None = None,
-    status: str | None = None,
-    since_days: int | None = None,
-    impact: str | None = None,
-    include_expired: bool = False,
-) -> list[dict[str, Any]]:
-    """Filter entries based on query criteria."""
-    if not entries:
-        return []
-
-    results = []
-
-    for entry in entries:
-        # Skip expired entries unless requested
-        if is_expired(entry) and not include_expired:
-            continue
-
-        # Topic filter (search in title, context, decision)
-        if topic:
-            topic_lower = topic.lower()
-            searchable = " ".join(
-                [
-                    str(entry.get("title", "")),
-                    str(entry.get("context", "")),
-                    str(entry.get("decision", "")),
-                    str(entry.get("topic", "")),
-                ]
-            ).lower()
-            if topic_lower not in searchable:
-                continue
-
-        # Tags filter
-        if tags:
-            entry_tags = set(entry.get("tags", []))
-            if not entry_tags or not any(tag in entry_tags for tag in tags):
-                continue
-
-        # Category filter
-        if category and entry.get("category") != category:
-            continue
-
-        # Status filter
-        if status and entry.get("status") != status:
-            continue
-
-        # Impact filter
-        if impact and entry.get("impact") != impact:
-            continue
-
-        # Since filter (created_at or timestamp)
-        if since_days:
-            cutoff = datetime.now(timezone.utc) - timedelta(days=since_days)
-            try:
-                created = entry.get("created_at", entry.get("date"))
-                if created:
-                    created_dt = datetime.fromisoformat(created.replace("Z", "+00:00"))
-                    if created_dt < cutoff:
-                        continue
-            except (ValueError, TypeError):
-                pass
-
-        results.append(entry)
-
-    return results
-
-
 def format_entry_text(entry: dict[str, Any], show_tokens: bool = False) -> str:
     """Format entry for text output."""
     lines = []
@@ -337,6 +237,12 @@ def parse_args():
         action="store_true",
         help="Show token count estimation",
     )
+    parser.add_argument(
+        "--budget",
+        type=int,
+        help="Token budget: select the most relevant entries that fit "
+        "(most recent ones without --topic)",
+    )
 
     return parser.parse_args()
 
@@ -345,39 +251,8 @@ def main():
     """Main entry point."""
     args = parse_args()
 
-    # Load decisions
-    data = load_decisions()
-
-    # Collect all entries from all sections
-    all_entries = []
-
-    # Add research entries
-    if "research" in data and "entries" in data["research"]:
-        research_entries = data["research"]["entries"] or []
-        for entry in research_entries:
-            entry["_type"] = "research"
-        all_entries.extend(research_entries)
-
-    # Add plan entries
-    if "plans" in data and "entries" in data["plans"]:
-        plan_entries = data["plans"]["entries"] or []
-        for entry in plan_entries:
-            entry["_type"] = "plan"
-        all_entries.extend(plan_entries)
-
-    # Add decision entries
-    if "decisions" in data and "entries" in data["decisions"]:
-        decision_entries = data["decisions"]["entries"] or []
-        for entry in decision_entries:
-            entry["_type"] = "decision"
-        all_entries.extend(decision_entries)
-
-    # Add feature entries
-    if "features" in data and "entries" in data["features"]:
-        feature_entries = data["features"]["entries"] or []
-        for entry in feature_entries:
-            entry["_type"] = "feature"
-        all_entries.extend(feature_entries)
+    # Query the indexed store (re-imports decisions.yaml if it changed)
+    store = DecisionStore(find_decisions_file())
 
     # Parse since argument
     since_days = None
@@ -393,10 +268,7 @@ def main():
     if args.tags:
         tags = [t.strip() for t in args.tags.split(",")]
 
-    # Filter entries
-    results = filter_entries(
-        all_entries,
-        topic=args.topic,
+    filters = dict(
         tags=tags,
         category=args.category,
         status=args.status,
@@ -405,6 +277,24 @@ def main():
         include_expired=args.include_expired,
     )
 
+    # Topic queries are BM25-ranked; everything else is a plain SQL filter
+    if args.topic:
+        hits = store.search(args.topic, **filters)
+    else:
+        hits = store.query_hits(**filters)
+
+    if args.budget is not None:
+        selected = select_within_budget(hits, args.budget)
+        if args.format == "text":
+            used = sum(hit.tokens for hit in selected)
+            console.print(
+                f"[dim]Budget: {used:,}/{args.budget:,} tokens, "
+                f"{len(selected)} of {len(hits)} matches[/dim]"
+            )
+        hits = selected
+
+    results = [hit.entry for hit in hits]
+
     # Display results
     if args.format == "json":
         show_json_output(results)
@@ -16,21 +16,33 @@ Scans ~/.claude/projects/ for conversation transcripts and extracts:
 
 Uses same extraction patterns as SessionEnd hook for consistency.
 
+Incremental: a scan manifest (.contextune/sync_manifest.json next to the
+output) records size, mtime, byte offset and a head hash per transcript.
+Unchanged transcripts are skipped, grown ones are read from their last
+offset, and extraction runs in a process pool. Entry ids are derived from
+a content hash, so re-running never duplicates entries. A transcript whose
+entries were cut by the per-run caps stays pending until all are saved.
+
 Usage:
-    decision-sync.py [--dry-run] [--limit N] [--project PATH]
+    decision-sync.py [--dry-run] [--limit N] [--project PATH] [--workers N] [--full]
 
 Options:
     --dry-run       Show what would be added without modifying files
     --limit N       Only process first N conversations (default: all)
     --project PATH  Specific project to scan (default: scan all projects)
+    --workers N     Extraction processes (default: CPU count)
+    --full          Ignore the scan manifest and rescan everything
 """
 
+import hashlib
 import json
+import os
 import sys
 import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Set, Tuple
 import argparse
 
 try:
@@ -114,6 +126,31 @@ except ImportError:
                 research.append({'topic': match.group(1).strip(), 'findings': [text[:200]], 'timestamp': entry.get('timestamp', '')})
         return research
 
+try:
+    from decision_store import DecisionStore
+    from transcript_io import read_jsonl_from, head_hash
+except ImportError:
+    DecisionStore = None
+
+    def read_jsonl_from(path, offset=0):
+        """Parse complete JSONL lines after offset."""
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            chunk = f.read()
+        end = chunk.rfind(b'\n') + 1
+        entries = []
+        for line in chunk[:end].splitlines():
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+        return entries, offset + end
+
+    def head_hash(path, size=4096):
+        """Hash of the first bytes of a file."""
+        with open(path, 'rb') as f:
+            return hashlib.sha1(f.read(size)).hexdigest()
+
 def find_conversation_transcripts(project_filter: Optional[str] = None) -> List[Path]:
     """
     Find all conversation transcript files.
@@ -154,23 +191,125 @@ def find_conversation_transcripts(project_filter: Optional[str] = None) -> List[
 
     return transcripts
 
-def read_transcript(transcript_path: Path) -> List[dict]:
-    """Read conversation transcript JSONL file."""
+# extract_research imported from lib or fallback above
+
+
+class ScanManifest:
+    """Per-transcript scan state: size, mtime, byte offset and head hash."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        if path.exists():
+            try:
+                self.entries = json.loads(path.read_text()).get('transcripts', {})
+            except (OSError, json.JSONDecodeError):
+                self.entries = {}
+
+    def pending_offset(self, transcript_path: Path) -> Optional[int]:
+        """
+        Byte offset to resume scanning from, or None if unchanged.
+
+        Returns 0 for new transcripts and for ones that shrank or were
+        replaced (head hash changed).
+        """
+        try:
+            stat = transcript_path.stat()
+        except OSError:
+            return None
+
+        record = self.entries.get(str(transcript_path))
+        if not record:
+            return 0
+        if record['size'] == stat.st_size and record['mtime_ns'] == stat.st_mtime_ns:
+            return None
+        if stat.st_size < record['offset']:
+            return 0
+        if head_hash(transcript_path, record['head_bytes']) != record['head_hash']:
+            return 0
+        return record['offset']
+
+    def record(self, transcript_path: Path, size: int, mtime_ns: int, offset: int,
+               head: str, head_bytes: int):
+        self.entries[str(transcript_path)] = {
+            'size': size,
+            'mtime_ns': mtime_ns,
+            'offset': offset,
+            'head_hash': head,
+            'head_bytes': head_bytes,
+        }
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f'.{os.getpid()}.tmp')
+        tmp_path.write_text(json.dumps({'transcripts': self.entries}, indent=2))
+        os.replace(tmp_path, self.path)
+
+
+def content_id(prefix: str, content: str) -> str:
+    """Stable entry id from content, so re-scans dedup instead of duplicating."""
+    return f"{prefix}-{hashlib.sha1(content.encode('utf-8')).hexdigest()[:10]}"
+
+
+def scan_transcript(transcript_path: Path, offset: int = 0) -> Dict[str, Any]:
+    """
+    Extract research, plans and decisions from lines appended after offset.
+
+    Runs in a worker process; returns plain data plus the scan state the
+    manifest needs.
+    """
     try:
-        with open(transcript_path, 'r') as f:
-            return [json.loads(line) for line in f if line.strip()]
-    except Exception as e:
-        if console:
-            console.print(f"[yellow]Warning: Failed to read {transcript_path.name}: {e}[/yellow]")
-        return []
+        stat = transcript_path.stat()
+        transcript, end_offset = read_jsonl_from(transcript_path, offset)
+        # Hash only bytes already scanned, so appends don't look like rewrites
+        head_bytes = min(end_offset, 4096)
+        head = head_hash(transcript_path, head_bytes)
+    except OSError as e:
+        return {'path': transcript_path, 'error': str(e)}
+
+    session = transcript_path.stem
+    result = {
+        'path': transcript_path,
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'offset': end_offset,
+        'head_hash': head,
+        'head_bytes': head_bytes,
+        'entries': len(transcript),
+        'research': [],
+        'plans': [],
+        'decisions': [],
+    }
+
+    if extract_designs:
+        result['plans'] = [{
+            'content': d['content'],
+            'timestamp': d['timestamp'],
+            'session': session
+        } for d in extract_designs(transcript)]
+
+    if extract_decisions:
+        result['decisions'] = [{
+            'content': d['content'],
+            'timestamp': d['timestamp'],
+            'session': session
+        } for d in extract_decisions(transcript)]
+
+    result['research'] = [{
+        **r,
+        'session': session
+    } for r in extract_research(transcript)]
+
+    return result
 
-# extract_research imported from lib or fallback above
 
 def populate_from_transcripts(
     decisions_path: Path,
     transcripts: List[Path],
     dry_run: bool = False,
-    limit: Optional[int] = None
+    limit: Optional[int] = None,
+    workers: Optional[int] = None,
+    full: bool = False
 ) -> Dict[str, int]:
     """
     Populate decisions.yaml from conversation transcripts.
@@ -180,21 +319,39 @@ def populate_from_transcripts(
         transcripts: List of transcript files to scan
         dry_run: If True, don't modify files
         limit: Max conversations to process
+        workers: Extraction processes (default: CPU count)
+        full: Ignore the scan manifest
 
     Returns:
         Dict with counts of extracted items
     """
     stats = {
         'transcripts_scanned': 0,
+        'transcripts_skipped': 0,
         'research_found': 0,
         'plans_found': 0,
-        'decisions_found': 0
+        'decisions_found': 0,
+        'entries_added': 0
     }
 
     all_research = []
     all_plans = []
     all_decisions = []
 
+    if limit:
+        transcripts = transcripts[:limit]
+
+    manifest = ScanManifest(decisions_path.parent / '.contextune' / 'sync_manifest.json')
+
+    # Only new or grown transcripts, resuming at their last offset
+    pending = []
+    for transcript_path in transcripts:
+        offset = 0 if full else manifest.pending_offset(transcript_path)
+        if offset is None:
+            stats['transcripts_skipped'] += 1
+            continue
+        pending.append((transcript_path, offset))
+
     if console:
         progress = Progress(
             SpinnerColumn(),
@@ -205,138 +362,223 @@ def populate_from_transcripts(
     else:
         progress = None
 
+    results = []
     with progress or DummyProgress():
-        task = progress.add_task("Scanning transcripts...", total=len(transcripts)) if progress else None
-
-        for i, transcript_path in enumerate(transcripts):
-            if limit and i >= limit:
-                break
-
-            transcript = read_transcript(transcript_path)
-            if not transcript:
-                continue
-
+        task = progress.add_task("Scanning transcripts...", total=len(pending)) if progress else None
+
+        max_workers = min(workers or os.cpu_count() or 1, len(pending))
+        if max_workers <= 1:
+            for transcript_path, offset in pending:
+                results.append(scan_transcript(transcript_path, offset))
+                if progress:
+                    progress.update(task, advance=1)
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                futures = [
+                    pool.submit(scan_transcript, transcript_path, offset)
+                    for transcript_path, offset in pending
+                ]
+                for future in as_completed(futures):
+                    results.append(future.result())
+                    if progress:
+                        progress.update(task, advance=1)
+
+    # Keep transcript order stable regardless of completion order
+    order = {path: i for i, (path, _) in enumerate(pending)}
+    results.sort(key=lambda r: order[r['path']])
+
+    for result in results:
+        if 'error' in result:
+            if console:
+                console.print(f"[yellow]Warning: Failed to read {result['path'].name}: {result['error']}[/yellow]")
+            continue
+
+        if result['entries']:
             stats['transcripts_scanned'] += 1
-
-            # Extract using SessionEnd hook patterns
-            if extract_designs:
-                designs = extract_designs(transcript)
-                stats['plans_found'] += len(designs)
-                all_plans.extend([{
-                    'content': d['content'],
-                    'timestamp': d['timestamp'],
-                    'session': transcript_path.stem
-                } for d in designs])
-
-            if extract_decisions:
-                decisions = extract_decisions(transcript)
-                stats['decisions_found'] += len(decisions)
-                all_decisions.extend([{
-                    'content': d['content'],
-                    'timestamp': d['timestamp'],
-                    'session': transcript_path.stem
-                } for d in decisions])
-
-            # Extract research
-            research = extract_research(transcript)
-            stats['research_found'] += len(research)
-            all_research.extend([{
-                **r,
-                'session': transcript_path.stem
-            } for r in research])
-
-            if progress:
-                progress.update(task, advance=1)
+        stats['plans_found'] += len(result['plans'])
+        stats['decisions_found'] += len(result['decisions'])
+        stats['research_found'] += len(result['research'])
+        all_plans.extend(result['plans'])
+        all_decisions.extend(result['decisions'])
+        all_research.extend(result['research'])
 
     if console:
-        console.print(f"\n[green]✅ Scanned {stats['transcripts_scanned']} transcripts[/green]")
+        console.print(f"\n[green]✅ Scanned {stats['transcripts_scanned']} transcripts[/green]"
+                      f" [dim]({stats['transcripts_skipped']} unchanged)[/dim]")
         console.print(f"   Research: {stats['research_found']}")
         console.print(f"   Plans: {stats['plans_found']}")
         console.print(f"   Decisions: {stats['decisions_found']}")
 
-    if not dry_run and (all_research or all_plans or all_decisions):
-        # Load or create decisions.yaml
-        if decisions_path.exists():
-            with open(decisions_path) as f:
-                data = yaml.safe_load(f) or {}
-        else:
-            data = {
-                'metadata': {
-                    'project': 'contextune',
-                    'version': '1.0',
-                    'created': datetime.now().isoformat(),
-                    'last_scan': None,
-                    'auto_population_enabled': True
-                },
-                'research': {'entries': []},
-                'plans': {'entries': []},
-                'decisions': {'entries': []},
-                'features': {'entries': []}
-            }
+    if dry_run:
+        return stats
+
+    if all_research or all_plans or all_decisions:
+        research_entries = []
+        plan_entries = []
+        decision_entries = []
 
         # Append research entries
-        if all_research:
-            for i, research in enumerate(all_research[:50], 1):
-                entry = {
-                    'id': f'res-{i:03d}',
-                    'topic': research['topic'],
-                    'findings': research['findings'],
-                    'category': 'research',
-                    'conversation_link': {
-                        'session_id': research['session'],
-                        'timestamp': research['timestamp']
-                    },
-                    'created_at': datetime.now().isoformat(),
-                    'status': 'active'
-                }
-                data['research']['entries'].append(entry)
+        for research in all_research:
+            research_entries.append({
+                'id': content_id('res', f"{research['topic']}\n{research['findings']}"),
+                'topic': research['topic'],
+                'findings': research['findings'],
+                'category': 'research',
+                'conversation_link': {
+                    'session_id': research['session'],
+                    'timestamp': research['timestamp']
+                },
+                'created_at': datetime.now().isoformat(),
+                'status': 'active'
+            })
 
         # Append plan entries (NEW!)
-        if all_plans:
-            for i, plan in enumerate(all_plans[:20], 1):  # Limit to 20
-                title = extract_title(plan['content']) or f"Plan {i}"
-                entry = {
-                    'id': f'plan-{i:03d}',
-                    'title': title,
-                    'summary': plan['content'][:500] + '...',  # First 500 chars
-                    'conversation_link': {
-                        'session_id': plan['session'],
-                        'timestamp': plan['timestamp']
-                    },
-                    'created_at': datetime.now().isoformat(),
-                    'status': 'active'
-                }
-                data['plans']['entries'].append(entry)
+        for i, plan in enumerate(all_plans, 1):
+            title = extract_title(plan['content']) or f"Plan {i}"
+            plan_entries.append({
+                'id': content_id('plan', plan['content']),
+                'title': title,
+                'summary': plan['content'][:500] + '...',  # First 500 chars
+                'conversation_link': {
+                    'session_id': plan['session'],
+                    'timestamp': plan['timestamp']
+                },
+                'created_at': datetime.now().isoformat(),
+                'status': 'active'
+            })
 
         # Append decision entries (NEW!)
-        if all_decisions:
-            for i, decision in enumerate(all_decisions[:20], 1):
-                title = extract_title(decision['content']) or f"Decision {i}"
-                entry = {
-                    'id': f'dec-{i:03d}',
-                    'title': title,
-                    'summary': decision['content'][:500] + '...',
-                    'conversation_link': {
-                        'session_id': decision['session'],
-                        'timestamp': decision['timestamp']
-                    },
-                    'created_at': datetime.now().isoformat(),
-                    'status': 'accepted'
-                }
-                data['decisions']['entries'].append(entry)
-
-        # Update metadata
-        data['metadata']['last_scan'] = datetime.now().isoformat()
-
-        # Save
-        with open(decisions_path, 'w') as f:
-            yaml.dump(data, f, default_flow_style=False, sort_keys=False, allow_unicode=True)
+        for i, decision in enumerate(all_decisions, 1):
+            title = extract_title(decision['content']) or f"Decision {i}"
+            decision_entries.append({
+                'id': content_id('dec', decision['content']),
+                'title': title,
+                'summary': decision['content'][:500] + '...',
+                'conversation_link': {
+                    'session_id': decision['session'],
+                    'timestamp': decision['timestamp']
+                },
+                'created_at': datetime.now().isoformat(),
+                'status': 'accepted'
+            })
+
+        # Per-run caps: research 50, plans 20, decisions 20
+        sections = {
+            'research': (research_entries, 50),
+            'plans': (plan_entries, 20),
+            'decisions': (decision_entries, 20),
+        }
+        stats['entries_added'], deferred = save_entries(decisions_path, sections)
 
         if console:
             console.print(f"\n[green]✅ Updated {decisions_path}[/green]")
+    else:
+        deferred = set()
+
+    # Only advance offsets once the entries are safely journaled. A transcript
+    # with entries cut by a cap keeps its old offset so the next run picks
+    # them up (already-saved entries are skipped by id).
+    for result in results:
+        if 'error' not in result and not deferred.intersection(result_ids(result)):
+            manifest.record(
+                result['path'], result['size'], result['mtime_ns'],
+                result['offset'], result['head_hash'], result['head_bytes']
+            )
+    manifest.save()
 
     return stats
 
+def new_decisions_document() -> Dict[str, Any]:
+    """Skeleton for a fresh decisions.yaml."""
+    return {
+        'metadata': {
+            'project': 'contextune',
+            'version': '1.0',
+            'created': datetime.now().isoformat(),
+            'last_scan': None,
+            'auto_population_enabled': True
+        },
+        'research': {'entries': []},
+        'plans': {'entries': []},
+        'decisions': {'entries': []},
+        'features': {'entries': []}
+    }
+
+
+def result_ids(result: Dict[str, Any]) -> List[str]:
+    """Entry ids of one scan_transcript() result."""
+    return (
+        [content_id('res', f"{r['topic']}\n{r['findings']}") for r in result['research']]
+        + [content_id('plan', p['content']) for p in result['plans']]
+        + [content_id('dec', d['content']) for d in result['decisions']]
+    )
+
+
+def unique_by_id(entries: List[dict]) -> List[dict]:
+    """Drop repeated content within a batch (same content hash)."""
+    seen = set()
+    unique = []
+    for entry in entries:
+        if entry['id'] not in seen:
+            seen.add(entry['id'])
+            unique.append(entry)
+    return unique
+
+
+def save_entries(decisions_path: Path, sections: Dict[str, tuple]) -> Tuple[int, Set[str]]:
+    """
+    Append new entries to decisions.yaml.
+
+    sections maps section -> (entries, cap). Entries whose content hash id
+    already exists are skipped before the cap applies. Goes through the
+    decision store/journal (atomic appends + locked compaction) so a
+    concurrent SessionEnd hook cannot lose entries; falls back to a direct
+    rewrite when lib/ is unavailable.
+
+    Returns: (number of entries added, ids of new entries cut by a cap)
+    """
+    last_scan = datetime.now().isoformat()
+    added = 0
+    deferred = set()
+
+    if DecisionStore is not None:
+        store = DecisionStore(decisions_path)
+        if not decisions_path.exists():
+            store.journal.save_document(new_decisions_document())
+            store.sync_from_yaml()
+
+        for section, (entries, cap) in sections.items():
+            entries = unique_by_id(entries)
+            existing = store.existing_ids([e['id'] for e in entries])
+            new_entries = [e for e in entries if e['id'] not in existing]
+            deferred.update(e['id'] for e in new_entries[cap:])
+            added += len(store.add_entries(section, new_entries[:cap]))
+
+        store.journal.append([{'op': 'meta', 'fields': {'last_scan': last_scan}}])
+        store.compact()
+        return added, deferred
+
+    if decisions_path.exists():
+        with open(decisions_path) as f:
+            data = yaml.safe_load(f) or {}
+    else:
+        data = new_decisions_document()
+
+    for section, (entries, cap) in sections.items():
+        block = data.setdefault(section, {}).setdefault('entries', [])
+        existing = {e.get('id') for e in block if isinstance(e, dict)}
+        new_entries = [e for e in unique_by_id(entries) if e['id'] not in existing]
+        deferred.update(e['id'] for e in new_entries[cap:])
+        block.extend(new_entries[:cap])
+        added += len(new_entries[:cap])
+    data.setdefault('metadata', {})['last_scan'] = last_scan
+
+    with open(decisions_path, 'w') as f:
+        yaml.dump(data, f, default_flow_style=False, sort_keys=False, allow_unicode=True)
+
+    return added, deferred
+
+
 class DummyProgress:
     """Fallback if Rich not available."""
     def __enter__(self): return self
@@ -350,6 +592,8 @@ def main():
     parser.add_argument('--limit', type=int, help="Process only first N conversations")
     parser.add_argument('--output', type=Path, default=Path('decisions.yaml'), help="decisions.yaml path")
     parser.add_argument('--project', type=str, help="Specific project path to scan")
+    parser.add_argument('--workers', type=int, help="Extraction processes (default: CPU count)")
+    parser.add_argument('--full', action='store_true', help="Ignore the scan manifest and rescan everything")
 
     args = parser.parse_args()
 
@@ -379,7 +623,9 @@ def main():
         args.output,
         transcripts,
         dry_run=args.dry_run,
-        limit=args.limit
+        limit=args.limit,
+        workers=args.workers,
+        full=args.full
     )
 
     # Summary
@@ -389,9 +635,11 @@ def main():
         table.add_column("Count", style="green")
 
         table.add_row("Transcripts Scanned", str(stats['transcripts_scanned']))
+        table.add_row("Transcripts Unchanged", str(stats['transcripts_skipped']))
         table.add_row("Research Found", str(stats['research_found']))
         table.add_row("Plans Found", str(stats['plans_found']))
         table.add_row("Decisions Found", str(stats['decisions_found']))
+        table.add_row("New Entries Added", str(stats['entries_added']))
 
         console.print(table)
 
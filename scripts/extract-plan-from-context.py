@@ -30,6 +30,10 @@ import yaml
 import json
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+
+from transcript_io import iter_entries_reverse
+
 
 def find_plan_in_transcript(transcript_path: str) -> str | None:
     """
@@ -38,13 +42,9 @@ def find_plan_in_transcript(transcript_path: str) -> str | None:
     Returns: Plan content as string, or None if not found
     """
     try:
-        with open(transcript_path, 'r') as f:
-            transcript = [json.loads(line) for line in f if line.strip()]
-
-        print(f"DEBUG: Loaded {len(transcript)} conversation entries", file=sys.stderr)
-
-        # Search for plan in assistant messages
-        for entry in reversed(transcript):  # Start from most recent
+        # Search for plan in assistant messages, most recent first; stops
+        # reading as soon as one is found instead of loading the whole file
+        for entry in iter_entries_reverse(Path(transcript_path)):
             if entry.get("type") != "assistant":
                 continue
 
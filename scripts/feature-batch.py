@@ -0,0 +1,249 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.10"
+# dependencies = [
+#     "pyyaml>=6.0",
+#     "rich>=13.0.0",
+# ]
+# ///
+"""
+Feature Batch - Execute unblocked features in parallel worktrees.
+
+Without --command, creates git worktrees for every feature that is ready
+now (dependencies completed) concurrently and marks them in_progress,
+like feature-execute.py does for a single feature.
+
+With --command, also runs the command inside each worktree and walks the
+whole dependency DAG of the selected features: when a feature's command
+succeeds it is marked completed and its dependents start immediately, so
+a phase finishes in the time of its critical path rather than the sum of
+its features. Concurrency defaults to UsageMonitor's parallel task limit.
+
+Usage:
+    uv run scripts/feature-batch.py [FEATURE_ID ...] [OPTIONS]
+
+Options:
+    --phase N              Only features in Phase N
+    --max-parallel N       Concurrency cap (default: usage-based, 1-5)
+    --command CMD          Run CMD in each worktree; exit 0 = completed.
+                           {feature_id}, {worktree} and {branch} are
+                           substituted (shell-quoted); other braces
+                           are passed through
+    --timeout SECONDS      Per-feature command timeout
+    --dry-run              Show the waves without doing anything
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+from rich.console import Console
+from rich.panel import Panel
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+
+import yaml_cache
+from dag_executor import DagExecutor, TaskOutcome
+from feature_graph import FeatureGraph
+from plan_runner import ensure_worktree, expand_command
+
+console = Console()
+
+PROJECT_ROOT = Path(__file__).parent.parent
+FEATURES_FILE = PROJECT_ROOT / "features.yaml"
+LOG_DIR = PROJECT_ROOT / ".contextune" / "feature-runs"
+
+
+def load_features() -> dict:
+    """Load features.yaml."""
+    if not FEATURES_FILE.exists():
+        console.print("[red]Error: features.yaml not found[/red]")
+        sys.exit(1)
+
+    return yaml_cache.load_file(FEATURES_FILE)
+
+
+def save_features(data: dict):
+    """Save features.yaml."""
+    yaml_cache.dump_file(FEATURES_FILE, data)
+
+
+def parse_args():
+    """Parse command line arguments."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Execute unblocked features in parallel worktrees"
+    )
+    parser.add_argument("features", nargs="*", help="Feature IDs (default: all planned)")
+    parser.add_argument("--phase", type=int, help="Only features in this phase")
+    parser.add_argument("--max-parallel", type=int, help="Concurrency cap")
+    parser.add_argument("--command", help="Command to run in each worktree")
+    parser.add_argument("--timeout", type=float, help="Per-feature command timeout (seconds)")
+    parser.add_argument("--dry-run", action="store_true", help="Show the plan only")
+
+    return parser.parse_args()
+
+
+def select_features(graph: FeatureGraph, args) -> list[str]:
+    """Planned features matching the CLI selection."""
+    if args.features:
+        unknown = [fid for fid in args.features if graph.get(fid) is None]
+        if unknown:
+            console.print(f"[red]Error: Unknown features: {', '.join(unknown)}[/red]")
+            sys.exit(1)
+        candidates = [graph.get(fid) for fid in args.features]
+    else:
+        candidates = graph.features
+
+    return [
+        f["id"]
+        for f in candidates
+        if f["status"] == "planned"
+        and (args.phase is None or f.get("phase") == args.phase)
+    ]
+
+
+def parallel_limit(args) -> int:
+    """Concurrency cap: --max-parallel, else what current usage allows."""
+    if args.max_parallel:
+        return args.max_parallel
+
+    from usage_monitor import UsageMonitor
+
+    return UsageMonitor().get_parallel_task_limit()
+
+
+def make_runner(command: str | None, timeout: float | None):
+    """Build the per-feature task: worktree, then the optional command."""
+
+    def run_feature(feature_id: str) -> Path:
+        worktree_path, branch_name = ensure_worktree(PROJECT_ROOT, feature_id)
+        if not command:
+            return worktree_path
+
+        cmd = expand_command(
+            command, feature_id=feature_id, worktree=str(worktree_path), branch=branch_name
+        )
+        LOG_DIR.mkdir(parents=True, exist_ok=True)
+        log_path = LOG_DIR / f"{feature_id}.log"
+        with open(log_path, "w") as log_file:
+            try:
+                result = subprocess.run(
+                    cmd,
+                    shell=True,
+                    cwd=worktree_path,
+                    stdout=log_file,
+                    stderr=subprocess.STDOUT,
+                    timeout=timeout,
+                )
+            except subprocess.TimeoutExpired as e:
+                raise RuntimeError(f"timed out after {timeout:g}s (log: {log_path})") from e
+
+        if result.returncode != 0:
+            raise RuntimeError(f"exit code {result.returncode} (log: {log_path})")
+        return worktree_path
+
+    return run_feature
+
+
+def show_plan(graph: FeatureGraph, selected: list[str], max_parallel: int, runs_dag: bool):
+    """Show the dependency waves that will be launched."""
+    sub_graph = FeatureGraph([graph.get(fid) for fid in selected])
+    waves = sub_graph.waves() if runs_dag else sub_graph.waves()[:1]
+
+    console.print(f"[bold]Max parallel:[/bold] {max_parallel}")
+    for number, wave in enumerate(waves, 1):
+        console.print(f"[bold]Wave {number}:[/bold] {', '.join(wave)}")
+
+    if runs_dag:
+        for fid in selected:
+            outside = [d for d, _ in graph.unmet_dependencies(fid) if d not in sub_graph.by_id]
+            if outside:
+                console.print(
+                    f"[yellow]⚠ {fid} needs {', '.join(outside)} (not selected) and will be skipped[/yellow]"
+                )
+        tokens, path = sub_graph.critical_path()
+        if len(path) > 1:
+            console.print(f"[bold]Critical path:[/bold] {' → '.join(path)} ({tokens:,} tokens)")
+    console.print()
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+    data = load_features()
+    graph = FeatureGraph.from_data(data)
+    selected = select_features(graph, args)
+
+    console.print(
+        Panel.fit("[bold blue]Feature Batch Execution[/bold blue]", border_style="blue")
+    )
+    console.print()
+
+    if not args.command:
+        # Nothing will complete, so only features that are ready now can start
+        selected = [fid for fid in selected if not graph.unmet_dependencies(fid)]
+
+    if not selected:
+        console.print("[yellow]No ready features match the selection[/yellow]")
+        sys.exit(0)
+
+    for cycle in graph.find_cycles():
+        console.print(f"[red]✗ Dependency cycle: {' → '.join(cycle)}[/red]")
+
+    max_parallel = parallel_limit(args)
+    show_plan(graph, selected, max_parallel, runs_dag=bool(args.command))
+
+    if args.dry_run:
+        return
+
+    completed = [fid for fid in graph.by_id if graph.is_done(fid)]
+    executor = DagExecutor(
+        {fid: graph.dependencies[fid] + graph.missing.get(fid, []) for fid in selected},
+        max_workers=max_parallel,
+        satisfied=completed,
+    )
+
+    def on_event(event: str, outcome: TaskOutcome):
+        feature = graph.get(outcome.task_id)
+        if event == "start":
+            feature["status"] = "in_progress"
+            save_features(data)
+            console.print(f"[blue]→ {outcome.task_id}[/blue] started")
+        elif event == "done":
+            if args.command:
+                feature["status"] = "completed"
+                save_features(data)
+            console.print(
+                f"[green]✓ {outcome.task_id}[/green] {feature['status']} "
+                f"[dim]({outcome.duration:.1f}s, {outcome.result})[/dim]"
+            )
+        elif event == "failed":
+            feature["status"] = "planned"
+            save_features(data)
+            console.print(f"[red]✗ {outcome.task_id} failed: {outcome.error}[/red]")
+        elif event == "skipped":
+            console.print(f"[yellow]○ {outcome.task_id} skipped ({outcome.error})[/yellow]")
+
+    outcomes = executor.run(make_runner(args.command, args.timeout), on_event=on_event)
+
+    counts = {}
+    for outcome in outcomes.values():
+        counts[outcome.status] = counts.get(outcome.status, 0) + 1
+
+    console.print()
+    console.print(
+        "[bold]Result:[/bold] " + ", ".join(f"{status} {n}" for status, n in counts.items())
+    )
+    console.print()
+    console.print("[dim]features.yaml was updated but not committed:[/dim]")
+    console.print("  [dim]git add features.yaml && git commit -m 'chore: batch status update'[/dim]")
+    console.print()
+
+    if counts.get("failed") or counts.get("skipped"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -17,11 +17,15 @@ import subprocess
 import sys
 from pathlib import Path
 
-import yaml
 from rich.console import Console
 from rich.panel import Panel
 from rich.prompt import Confirm
 
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+
+import yaml_cache
+from feature_graph import FeatureGraph
+
 console = Console()
 
 
@@ -33,24 +37,14 @@ def load_features() -> dict:
         console.print("[red]Error: features.yaml not found[/red]")
         sys.exit(1)
 
-    with open(features_file) as f:
-        return yaml.safe_load(f)
+    return yaml_cache.load_file(features_file)
 
 
 def save_features(data: dict):
     """Save features.yaml."""
     features_file = Path(__file__).parent.parent / "features.yaml"
 
-    with open(features_file, "w") as f:
-        yaml.dump(data, f, default_flow_style=False, sort_keys=False)
-
-
-def get_feature(data: dict, feature_id: str) -> dict | None:
-    """Get feature by ID."""
-    for feature in data["features"]:
-        if feature["id"] == feature_id:
-            return feature
-    return None
+    yaml_cache.dump_file(features_file, data)
 
 
 def run_command(cmd: list[str], check=True) -> subprocess.CompletedProcess:
@@ -87,19 +81,9 @@ Completed: {feature['name']}
     console.print("[green]✓ Committed status change[/green]")
 
 
-def get_unblocked_features(data: dict, feature_id: str) -> list[dict]:
-    """Get features that are now unblocked."""
-    features = data["features"]
-    unblocked = []
-
-    for feature in features:
-        if (
-            feature["status"] == "planned"
-            and feature_id in feature.get("dependencies", [])
-        ):
-            unblocked.append(feature)
-
-    return unblocked
+def get_unblocked_features(graph: FeatureGraph, feature_id: str) -> list[dict]:
+    """Get planned dependents whose dependencies are now all completed."""
+    return graph.unblocked_by(feature_id)
 
 
 def show_completion_stats(data: dict):
@@ -126,9 +110,10 @@ def main():
 
     feature_id = sys.argv[1]
     data = load_features()
+    graph = FeatureGraph.from_data(data)
 
     # Get feature
-    feature = get_feature(data, feature_id)
+    feature = graph.get(feature_id)
     if not feature:
         console.print(f"[red]Error: Feature {feature_id} not found[/red]")
         sys.exit(1)
@@ -163,7 +148,7 @@ def main():
     commit_status_change(feature)
 
     # Check what's unblocked
-    unblocked = get_unblocked_features(data, feature_id)
+    unblocked = get_unblocked_features(graph, feature_id)
 
     if unblocked:
         console.print()
@@ -17,11 +17,15 @@ import subprocess
 import sys
 from pathlib import Path
 
-import yaml
 from rich.console import Console
 from rich.panel import Panel
 from rich.prompt import Confirm
 
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+
+import yaml_cache
+from feature_graph import FeatureGraph
+
 console = Console()
 
 
@@ -33,36 +37,19 @@ def load_features() -> dict:
         console.print("[red]Error: features.yaml not found[/red]")
         sys.exit(1)
 
-    with open(features_file) as f:
-        return yaml.safe_load(f)
+    return yaml_cache.load_file(features_file)
 
 
 def save_features(data: dict):
     """Save features.yaml."""
     features_file = Path(__file__).parent.parent / "features.yaml"
 
-    with open(features_file, "w") as f:
-        yaml.dump(data, f, default_flow_style=False, sort_keys=False)
-
-
-def get_feature(data: dict, feature_id: str) -> dict | None:
-    """Get feature by ID."""
-    for feature in data["features"]:
-        if feature["id"] == feature_id:
-            return feature
-    return None
+    yaml_cache.dump_file(features_file, data)
 
 
-def check_dependencies(data: dict, feature: dict) -> tuple[bool, list]:
+def check_dependencies(graph: FeatureGraph, feature: dict) -> tuple[bool, list]:
     """Check if dependencies are met."""
-    deps = feature.get("dependencies", [])
-    unmet = []
-
-    for dep_id in deps:
-        dep = get_feature(data, dep_id)
-        if not dep or dep["status"] != "completed":
-            unmet.append((dep_id, dep))
-
+    unmet = graph.unmet_dependencies(feature["id"])
     return len(unmet) == 0, unmet
 
 
@@ -242,9 +229,10 @@ def main():
 
     feature_id = sys.argv[1]
     data = load_features()
+    graph = FeatureGraph.from_data(data)
 
     # Get feature
-    feature = get_feature(data, feature_id)
+    feature = graph.get(feature_id)
     if not feature:
         console.print(f"[red]Error: Feature {feature_id} not found[/red]")
         sys.exit(1)
@@ -262,7 +250,7 @@ def main():
         sys.exit(1)
 
     # Check dependencies
-    deps_met, unmet = check_dependencies(data, feature)
+    deps_met, unmet = check_dependencies(graph, feature)
     if not deps_met:
         console.print("[bold]Checking dependencies...[/bold]")
         for dep_id, dep in unmet:
@@ -21,11 +21,15 @@ Formats:
 import sys
 from pathlib import Path
 
-import yaml
 from rich.console import Console
 from rich.tree import Tree
 from rich.panel import Panel
 
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+
+import yaml_cache
+from feature_graph import FeatureGraph
+
 console = Console()
 
 
@@ -37,8 +41,7 @@ def load_features() -> dict:
         console.print("[red]Error: features.yaml not found[/red]")
         sys.exit(1)
 
-    with open(features_file) as f:
-        return yaml.safe_load(f)
+    return yaml_cache.load_file(features_file)
 
 
 def get_status_symbol(status: str) -> str:
@@ -85,15 +88,16 @@ def text_format(data: dict):
     console.print("[bold]Dependency Tree:[/bold]")
     console.print()
 
-    features = data["features"]
+    graph = FeatureGraph.from_data(data)
+    features = graph.features
 
     for feature in features:
         feature_id = feature["id"]
         name = feature["name"]
         status = feature["status"]
         phase = feature.get("phase", 0)
-        deps = feature.get("dependencies", [])
-        blocks = feature.get("blocks", [])
+        deps = graph.dependencies[feature_id]
+        blocks = graph.dependents[feature_id]
 
         # Status symbol and color
         symbol = get_status_symbol(status)
@@ -107,7 +111,7 @@ def text_format(data: dict):
         # Show dependencies (what this needs)
         if deps:
             for dep_id in deps:
-                dep = next((f for f in features if f["id"] == dep_id), None)
+                dep = graph.get(dep_id)
                 if dep:
                     dep_symbol = get_status_symbol(dep["status"])
                     console.print(
@@ -117,7 +121,7 @@ def text_format(data: dict):
         # Show what this blocks
         if blocks:
             for blocked_id in blocks:
-                blocked = next((f for f in features if f["id"] == blocked_id), None)
+                blocked = graph.get(blocked_id)
                 if blocked:
                     blocked_symbol = get_status_symbol(blocked["status"])
                     console.print(
@@ -150,35 +154,32 @@ def text_format(data: dict):
     console.print("[bold]Parallel Execution Groups:[/bold]")
     console.print()
 
-    console.print("[bold green]Can execute in parallel (Phase 1):[/bold green]")
-    phase1_independent = [
-        f
-        for f in features
-        if f.get("phase") == 1
-        and not f.get("dependencies")
-        and f["status"] == "planned"
-    ]
-
-    if phase1_independent:
-        for feat in phase1_independent:
-            console.print(f"  • {feat['id']}")
-    else:
-        console.print("  [dim]None[/dim]")
+    cycles = graph.find_cycles()
+    if cycles:
+        console.print("[bold red]Dependency cycles (never schedulable):[/bold red]")
+        for cycle in cycles:
+            console.print(f"  [red]✗ {' → '.join(cycle)}[/red]")
+        console.print()
 
-    console.print()
-    console.print("[bold yellow]Sequential (Phase 2 - depends on Phase 1):[/bold yellow]")
-    phase2_dependent = [
-        f
-        for f in features
-        if f.get("phase") == 2 and f.get("dependencies")
-    ]
+    waves = graph.waves()
+    if not waves:
+        console.print("  [dim]None (all features completed)[/dim]")
+        console.print()
+
+    for number, wave in enumerate(waves, 1):
+        label = "can start now" if number == 1 else f"after wave {number - 1}"
+        console.print(f"[bold green]Wave {number} ({label}):[/bold green]")
+        for fid in wave:
+            unmet = [d for d in graph.dependencies[fid] if not graph.is_done(d)]
+            needs = f" [dim](needs: {', '.join(unmet)})[/dim]" if unmet else ""
+            console.print(f"  • {fid}{needs}")
+        console.print()
 
-    if phase2_dependent:
-        for feat in phase2_dependent:
-            deps = ", ".join(feat.get("dependencies", []))
-            console.print(f"  • {feat['id']} (needs: {deps})")
-    else:
-        console.print("  [dim]None[/dim]")
+    tokens, path = graph.critical_path()
+    if path:
+        console.print(
+            f"[bold yellow]Critical path ({tokens:,} tokens):[/bold yellow] {' → '.join(path)}"
+        )
 
 
 def mermaid_format(data: dict):
@@ -206,13 +207,8 @@ def mermaid_format(data: dict):
     console.print()
 
     # Define edges (dependencies)
-    for feature in features:
-        feature_id = feature["id"]
-        deps = feature.get("dependencies", [])
-
-        if deps:
-            for dep_id in deps:
-                console.print(f"  {dep_id} --> {feature_id}")
+    for dep_id, feature_id in FeatureGraph(features).edges():
+        console.print(f"  {dep_id} --> {feature_id}")
 
     console.print()
 
@@ -252,13 +248,8 @@ def dot_format(data: dict):
     console.print()
 
     # Define edges
-    for feature in features:
-        feature_id = feature["id"]
-        deps = feature.get("dependencies", [])
-
-        if deps:
-            for dep_id in deps:
-                console.print(f'  "{dep_id}" -> "{feature_id}" [label="depends on"];')
+    for dep_id, feature_id in FeatureGraph(features).edges():
+        console.print(f'  "{dep_id}" -> "{feature_id}" [label="depends on"];')
 
     console.print("}")
     console.print()
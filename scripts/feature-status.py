@@ -23,12 +23,16 @@ import sys
 from pathlib import Path
 from typing import Optional
 
-import yaml
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
 from rich import box
 
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+
+import yaml_cache
+from feature_graph import FeatureGraph
+
 console = Console()
 
 
@@ -40,8 +44,7 @@ def load_features() -> dict:
         console.print("[red]Error: features.yaml not found[/red]")
         sys.exit(1)
 
-    with open(features_file) as f:
-        return yaml.safe_load(f)
+    return yaml_cache.load_file(features_file)
 
 
 def parse_args():
@@ -192,20 +195,16 @@ def show_features(data: dict, args):
 
 def show_execution_recommendations(data: dict):
     """Show execution recommendations."""
-    features = data["features"]
+    graph = FeatureGraph.from_data(data)
 
     console.print("[bold]Execution Recommendations:[/bold]")
     console.print()
 
-    # Ready to execute (no dependencies)
-    ready = [
-        f
-        for f in features
-        if f["status"] == "planned" and not f.get("dependencies")
-    ]
+    # Ready to execute (all dependencies completed)
+    ready = graph.ready()
 
     if ready:
-        console.print("[bold green]Ready to execute (no dependencies):[/bold green]")
+        console.print("[bold green]Ready to execute (dependencies met):[/bold green]")
         for feature in ready:
             phase = feature.get("phase", 0)
             console.print(
@@ -213,20 +212,41 @@ def show_execution_recommendations(data: dict):
             )
         console.print()
 
-    # Blocked (has dependencies)
+    # Blocked (waiting on unfinished dependencies)
     blocked = [
-        f
-        for f in features
-        if f["status"] == "planned" and f.get("dependencies")
+        (feature, graph.unmet_dependencies(feature["id"]))
+        for feature in graph.features
+        if feature["status"] == "planned"
     ]
+    blocked = [(feature, unmet) for feature, unmet in blocked if unmet]
 
     if blocked:
         console.print("[bold yellow]Blocked (waiting on dependencies):[/bold yellow]")
-        for feature in blocked:
-            deps = ", ".join(feature.get("dependencies", []))
+        for feature, unmet in blocked:
+            deps = ", ".join(dep_id for dep_id, _ in unmet)
             console.print(f"  • {feature['id']}: {feature['name']} (needs: {deps})")
         console.print()
 
+    # Dependency cycles can never be scheduled
+    for cycle in graph.find_cycles():
+        console.print(f"[bold red]Dependency cycle:[/bold red] {' → '.join(cycle)}")
+        console.print()
+
+    # Parallel waves and the longest chain of remaining work
+    waves = graph.waves()
+    if len(waves) > 1:
+        console.print("[bold]Parallel waves:[/bold]")
+        for number, wave in enumerate(waves, 1):
+            console.print(f"  {number}. {', '.join(wave)}")
+        console.print()
+
+    tokens, path = graph.critical_path()
+    if len(path) > 1:
+        console.print(
+            f"[bold]Critical path:[/bold] {' → '.join(path)} ({tokens:,} tokens)"
+        )
+        console.print()
+
     # Commands
     console.print("[dim]Commands:[/dim]")
     console.print("  [dim]uv run scripts/feature-status.py --phase 1[/dim]")
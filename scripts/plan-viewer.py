@@ -23,10 +23,10 @@ Usage:
     plan-viewer.py search TOPIC # Search by topic
 """
 
+import sys
 import typer
 from pathlib import Path
 from typing import Optional, List
-import yaml
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
@@ -36,6 +36,11 @@ from rich import box
 from rich.text import Text
 import readchar
 
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+
+from decision_store import DecisionStore
+import yaml_cache
+
 app = typer.Typer(help="Interactive plan viewer for decisions.yaml")
 console = Console()
 
@@ -46,8 +51,7 @@ def load_decisions(path: Path = Path("decisions.yaml")) -> dict:
         console.print(f"[red]Error: {path} not found[/red]")
         raise typer.Exit(1)
 
-    with open(path) as f:
-        return yaml.safe_load(f)
+    return yaml_cache.load_file(path)
 
 
 def get_all_entries(data: dict) -> List[dict]:
@@ -267,14 +271,24 @@ def search(
     query: str = typer.Argument(..., help="Search term"),
     show_content: bool = typer.Option(False, "--content", "-c", help="Show content snippets")
 ):
-    """Search plans by topic/title."""
+    """Search plans by topic/title (BM25-ranked full-text search)."""
 
-    data = load_decisions()
-    entries = get_all_entries(data)
+    path = Path("decisions.yaml")
+    if not path.exists():
+        console.print(f"[red]Error: {path} not found[/red]")
+        raise typer.Exit(1)
 
-    # Search
-    matches = [e for e in entries if query.lower() in e['display_title'].lower() or
-               (query.lower() in e.get('summary', '').lower())]
+    hits = DecisionStore(path).search(
+        query, include_expired=True, sections=['research', 'plans', 'decisions']
+    )
+    matches = [
+        {
+            **hit.entry,
+            'entry_type': hit.entry['_type'],
+            'display_title': hit.entry.get('title') or hit.entry.get('topic', 'Unknown')
+        }
+        for hit in hits
+    ]
 
     if not matches:
         console.print(f"[yellow]No results for '{query}'[/yellow]")
@@ -322,7 +336,6 @@ def stats():
 
 if __name__ == "__main__":
     # If no command specified, run interactive mode
-    import sys
     if len(sys.argv) == 1:
         interactive()
     else:
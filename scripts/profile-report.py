@@ -0,0 +1,122 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.10"
+# dependencies = [
+#     "rich>=13.0.0",
+# ]
+# ///
+"""
+Profile Report - Merge hook profiles into a hot-function ranking
+
+Profiles are written by hooks when CONTEXTUNE_PROFILE is on (see
+lib/profiling.py). This merges the last N of them.
+
+Usage:
+    uv run scripts/profile-report.py [OPTIONS]
+
+Options:
+    --dir PATH        Profile directory (default: .contextune/profiles)
+    --hook NAME       Only this hook (e.g. user_prompt_submit)
+    --last N          Merge the last N invocations (default: all)
+    --top N           Functions to list (default: 25)
+    --collapsed       Print merged collapsed stacks instead (sampled
+                      profiles only), e.g. for flamegraph.pl or speedscope
+
+Examples:
+    CONTEXTUNE_PROFILE=sample CONTEXTUNE_PROFILE_RATE=1 <run hooks>
+    uv run scripts/profile-report.py --hook user_prompt_submit --last 50
+    uv run scripts/profile-report.py --collapsed | flamegraph.pl > hooks.svg
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from rich.console import Console
+from rich.table import Table
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+
+from profiling import (
+    PROFILE_DIR,
+    find_profiles,
+    hot_functions,
+    hot_functions_cprofile,
+    read_collapsed,
+)
+
+console = Console()
+
+
+def print_sampled(paths: list[Path], top: int):
+    rows = hot_functions(read_collapsed(paths))
+    samples = sum(row["self"] for row in rows)
+
+    table = Table(title=f"Hot functions (sampled, {len(paths)} invocations, {samples} samples)")
+    table.add_column("Function")
+    table.add_column("Self", justify="right")
+    table.add_column("Self %", justify="right")
+    table.add_column("Total %", justify="right")
+    for row in rows[:top]:
+        table.add_row(
+            row["function"],
+            str(row["self"]),
+            f"{row['self_pct']:.1f}%",
+            f"{row['total_pct']:.1f}%",
+        )
+    console.print(table)
+
+
+def print_cprofile(paths: list[Path], top: int):
+    rows = hot_functions_cprofile(paths)
+
+    table = Table(title=f"Hot functions (cProfile, {len(paths)} invocations)")
+    table.add_column("Function")
+    table.add_column("Calls", justify="right")
+    table.add_column("Self", justify="right")
+    table.add_column("Total", justify="right")
+    for row in rows[:top]:
+        table.add_row(
+            row["function"],
+            str(row["calls"]),
+            f"{row['self_ms']:.2f}ms",
+            f"{row['total_ms']:.2f}ms",
+        )
+    console.print(table)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge hook profiles into a hot-function report")
+    parser.add_argument("--dir", type=Path, default=PROFILE_DIR, help="Profile directory")
+    parser.add_argument("--hook", help="Only this hook")
+    parser.add_argument("--last", type=int, help="Merge the last N invocations")
+    parser.add_argument("--top", type=int, default=25, help="Functions to list")
+    parser.add_argument("--collapsed", action="store_true", help="Print merged collapsed stacks")
+    args = parser.parse_args()
+
+    sampled = find_profiles(args.dir, args.hook, "folded", args.last)
+
+    if args.collapsed:
+        if not sampled:
+            print("No sampled profiles (CONTEXTUNE_PROFILE=sample)", file=sys.stderr)
+            sys.exit(1)
+        for stack, count in read_collapsed(sampled).most_common():
+            print(f"{stack} {count}")
+        return
+
+    deterministic = find_profiles(args.dir, args.hook, "prof", args.last)
+    if not sampled and not deterministic:
+        console.print(f"[yellow]No profiles in {args.dir}[/yellow]")
+        console.print("Enable with CONTEXTUNE_PROFILE=sample (or cprofile) and run some hooks.")
+        sys.exit(1)
+
+    if sampled:
+        print_sampled(sampled, args.top)
+    if deterministic:
+        if sampled:
+            console.print()
+        print_cprofile(deterministic, args.top)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.10"
+# dependencies = [
+#     "rich>=13.0.0",
+# ]
+# ///
+"""
+Trace Report - Per-stage hook latency from the trace_spans table
+
+Shows where hook time goes (interpreter start, imports, stdin parse,
+detection, DB writes, subprocesses, output) and the slowest invocations.
+
+Usage:
+    uv run scripts/trace-report.py [OPTIONS]
+
+Options:
+    --db PATH         Observability DB (default: .contextune/observability.db)
+    --hook NAME       Only this hook (e.g. user_prompt_submit)
+    --since HOURS     Look back this many hours (default: 168)
+    --top N           Slowest traces to list (default: 10)
+    --trace ID        Show the span tree of one trace
+    --format FORMAT   text or json (default: text)
+
+"Share" is a stage's total time over its hook's total time; nested stages
+(e.g. db.init inside write_detection) are counted in both. Spans of
+sampled hooks (tool_router, tool_cost_tracker) count `weight` times.
+"""
+
+import argparse
+import json
+import sqlite3
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from rich.console import Console
+from rich.table import Table
+from rich.tree import Tree
+
+console = Console()
+
+
+def percentile(ordered: list[tuple[float, int]], q: float) -> float:
+    """sorted(values)[int(q * n)] with each (value, weight) repeated weight times."""
+    n = sum(weight for _, weight in ordered)
+    rank = min(int(q * n), n - 1)
+    seen = 0
+    for value, weight in ordered:
+        seen += weight
+        if seen > rank:
+            return value
+    return ordered[-1][0]
+
+
+def stage_breakdown(conn: sqlite3.Connection, since: float, hook: str | None) -> list[dict[str, Any]]:
+    """Per (hook, stage) latency stats; the hook's root span is the stage named after it."""
+    query = """
+        SELECT s.hook, s.name, s.parent_id IS NULL, s.duration_ms, s.status, s.weight
+        FROM trace_spans s
+        JOIN trace_spans r ON r.trace_id = s.trace_id AND r.parent_id IS NULL
+        WHERE r.start >= ?
+    """
+    params: list[Any] = [since]
+    if hook:
+        query += " AND s.hook = ?"
+        params.append(hook)
+
+    groups: dict[tuple[str, str], dict[str, Any]] = {}
+    for hook_name, name, is_root, duration, status, weight in conn.execute(query, params):
+        group = groups.setdefault(
+            (hook_name, name), {"root": bool(is_root), "durations": [], "errors": 0}
+        )
+        group["durations"].append((duration, weight))
+        group["errors"] += weight if status != "ok" else 0
+
+    hook_totals = {
+        hook_name: sum(duration * weight for duration, weight in group["durations"])
+        for (hook_name, _), group in groups.items()
+        if group["root"]
+    }
+
+    rows = []
+    for (hook_name, name), group in groups.items():
+        durations = sorted(group["durations"])
+        count = sum(weight for _, weight in durations)
+        total = sum(duration * weight for duration, weight in durations)
+        rows.append({
+            "hook": hook_name,
+            "stage": name,
+            "root": group["root"],
+            "count": count,
+            "avg_ms": total / count,
+            "p50_ms": percentile(durations, 0.5),
+            "p95_ms": percentile(durations, 0.95),
+            "total_ms": total,
+            "share": total / hook_totals[hook_name] if hook_totals.get(hook_name) else None,
+            "errors": group["errors"],
+        })
+    # Hooks by total time, root first, then stages by total time
+    rows.sort(key=lambda r: (-hook_totals.get(r["hook"], 0), r["hook"], not r["root"], -r["total_ms"]))
+    return rows
+
+
+def slowest_traces(conn: sqlite3.Connection, since: float, hook: str | None, top: int) -> list[dict[str, Any]]:
+    """Root spans by duration, with each trace's slowest direct stage."""
+    query = """
+        SELECT trace_id, hook, start, duration_ms, status FROM trace_spans
+        WHERE parent_id IS NULL AND start >= ?
+    """
+    params: list[Any] = [since]
+    if hook:
+        query += " AND hook = ?"
+        params.append(hook)
+    query += " ORDER BY duration_ms DESC LIMIT ?"
+    params.append(top)
+
+    traces = []
+    for trace_id, hook_name, start, duration, status in conn.execute(query, params).fetchall():
+        slowest = conn.execute(
+            """
+            SELECT c.name, c.duration_ms FROM trace_spans c
+            JOIN trace_spans r ON r.trace_id = c.trace_id AND r.span_id = c.parent_id
+            WHERE c.trace_id = ? AND r.parent_id IS NULL
+            ORDER BY c.duration_ms DESC LIMIT 1
+            """,
+            (trace_id,),
+        ).fetchone()
+        traces.append({
+            "trace_id": trace_id,
+            "hook": hook_name,
+            "start": start,
+            "duration_ms": duration,
+            "status": status,
+            "slowest_stage": slowest[0] if slowest else None,
+            "slowest_stage_ms": slowest[1] if slowest else None,
+        })
+    return traces
+
+
+def span_tree(conn: sqlite3.Connection, trace_id: str) -> list[dict[str, Any]]:
+    """All spans of one trace (prefix match on the id), ordered by start."""
+    conn.row_factory = sqlite3.Row
+    rows = conn.execute(
+        "SELECT * FROM trace_spans WHERE trace_id LIKE ? ORDER BY start",
+        (trace_id + "%",),
+    ).fetchall()
+    conn.row_factory = None
+    return [dict(row) for row in rows]
+
+
+# === OUTPUT ===
+
+def print_breakdown(rows: list[dict[str, Any]]):
+    table = Table(title="Per-stage latency")
+    for column in ("Hook / Stage", "Count", "Avg", "P50", "P95", "Share", "Errors"):
+        table.add_column(column, justify="left" if column == "Hook / Stage" else "right")
+
+    for row in rows:
+        label = f"[bold]{row['hook']}[/bold]" if row["root"] else f"  {row['stage']}"
+        share = f"{row['share']:.0%}" if row["share"] is not None else "-"
+        table.add_row(
+            label,
+            str(row["count"]),
+            f"{row['avg_ms']:.1f}ms",
+            f"{row['p50_ms']:.1f}ms",
+            f"{row['p95_ms']:.1f}ms",
+            share,
+            str(row["errors"]) if row["errors"] else "",
+        )
+    console.print(table)
+
+
+def print_slowest(traces: list[dict[str, Any]]):
+    table = Table(title="Slowest traces")
+    for column in ("Trace", "Hook", "When", "Duration", "Slowest stage"):
+        table.add_column(column)
+
+    for trace in traces:
+        stage = (
+            f"{trace['slowest_stage']} ({trace['slowest_stage_ms']:.1f}ms)"
+            if trace["slowest_stage"] else "-"
+        )
+        status = "" if trace["status"] == "ok" else " [red]✗[/red]"
+        table.add_row(
+            trace["trace_id"],
+            trace["hook"],
+            datetime.fromtimestamp(trace["start"]).strftime("%Y-%m-%d %H:%M:%S"),
+            f"{trace['duration_ms']:.1f}ms{status}",
+            stage,
+        )
+    console.print(table)
+
+
+def print_tree(spans: list[dict[str, Any]]):
+    by_parent: dict[str | None, list[dict[str, Any]]] = {}
+    ids = {span["span_id"] for span in spans}
+    for span in spans:
+        parent = span["parent_id"] if span["parent_id"] in ids else None
+        by_parent.setdefault(parent, []).append(span)
+
+    def label(span: dict[str, Any]) -> str:
+        text = f"{span['name']} [cyan]{span['duration_ms']:.2f}ms[/cyan]"
+        if span["status"] != "ok":
+            text += " [red]✗[/red]"
+        if span["attributes"]:
+            text += f" [dim]{span['attributes']}[/dim]"
+        return text
+
+    def add(node: Tree, span: dict[str, Any]):
+        branch = node.add(label(span))
+        for child in by_parent.get(span["span_id"], []):
+            add(branch, child)
+
+    for root in by_parent.get(None, []):
+        tree = Tree(f"[bold]{root['trace_id']}[/bold] {label(root)}")
+        for child in by_parent.get(root["span_id"], []):
+            add(tree, child)
+        console.print(tree)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hook latency breakdown from trace spans")
+    parser.add_argument("--db", type=Path, default=Path(".contextune/observability.db"))
+    parser.add_argument("--hook", help="Only this hook")
+    parser.add_argument("--since", type=float, default=168, help="Hours to look back")
+    parser.add_argument("--top", type=int, default=10, help="Slowest traces to list")
+    parser.add_argument("--trace", help="Show the span tree of one trace (id or prefix)")
+    parser.add_argument("--format", choices=["text", "json"], default="text")
+    args = parser.parse_args()
+
+    if not args.db.exists():
+        console.print(f"[yellow]No observability DB at {args.db}[/yellow]")
+        sys.exit(1)
+
+    conn = sqlite3.connect(f"file:{args.db}?mode=ro", uri=True)
+    try:
+        conn.execute("SELECT 1 FROM trace_spans LIMIT 1")
+    except sqlite3.OperationalError:
+        console.print("[yellow]No traces recorded yet (run a hook first)[/yellow]")
+        sys.exit(1)
+
+    if args.trace:
+        spans = span_tree(conn, args.trace)
+        if args.format == "json":
+            print(json.dumps(spans, indent=2))
+        elif spans:
+            print_tree(spans)
+        else:
+            console.print(f"[yellow]No trace matching {args.trace}[/yellow]")
+        return
+
+    since = time.time() - args.since * 3600
+    breakdown = stage_breakdown(conn, since, args.hook)
+    slowest = slowest_traces(conn, since, args.hook, args.top)
+
+    if args.format == "json":
+        print(json.dumps({"stages": breakdown, "slowest": slowest}, indent=2))
+        return
+
+    if not breakdown:
+        console.print("[yellow]No traces in this window[/yellow]")
+        return
+    print_breakdown(breakdown)
+    console.print()
+    print_slowest(slowest)
+
+
+if __name__ == "__main__":
+    main()
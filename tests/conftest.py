@@ -0,0 +1,50 @@
+"""
+Shared fixtures.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+
+import global_observability
+import profiling
+import project_registry
+import yaml_cache
+
+
+@pytest.fixture(autouse=True)
+def isolated_yaml_cache(tmp_path, monkeypatch):
+    """Keep parsed-YAML cache records out of the real home directory."""
+    directory = tmp_path / "yaml-cache"
+    monkeypatch.setattr(yaml_cache, "CACHE_DIR", directory)
+    return directory
+
+
+@pytest.fixture(autouse=True)
+def isolated_project_registry(tmp_path, monkeypatch):
+    """Keep ObservabilityDB registrations out of the real home directory."""
+    path = tmp_path / "projects.json"
+    monkeypatch.setattr(project_registry, "REGISTRY_PATH", path)
+    monkeypatch.setattr(project_registry, "_registered", set())
+    return path
+
+
+@pytest.fixture(autouse=True)
+def isolated_summary_db(tmp_path, monkeypatch):
+    """Keep GlobalObservability's summary cache out of the real home directory."""
+    path = tmp_path / "global_summary.db"
+    monkeypatch.setattr(global_observability, "SUMMARY_DB_PATH", path)
+    return path
+
+
+@pytest.fixture(autouse=True)
+def isolated_profiling_config(tmp_path, monkeypatch):
+    """Ignore a real ~/.contextune-config.yaml that turns profiling on."""
+    path = tmp_path / "contextune-config.yaml"
+    monkeypatch.setattr(profiling, "CONFIG_PATH", path)
+    for name in ("CONTEXTUNE_PROFILE", "CONTEXTUNE_PROFILE_RATE", "CONTEXTUNE_PROFILE_INTERVAL_MS"):
+        monkeypatch.delenv(name, raising=False)
+    return path
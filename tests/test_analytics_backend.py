@@ -0,0 +1,196 @@
+"""
+Tests for the pluggable analytics backends (SQLite and DuckDB).
+"""
+
+import gc
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+
+import analytics_backend
+from analytics_backend import SQLiteBackend, get_backend
+from global_observability import GlobalObservability
+from observability_db import ObservabilityDB
+
+
+def make_project(root: Path, name: str, detections: list[tuple], metrics: list[tuple] = ()) -> Path:
+    """detections: (command, method, confidence, timestamp, latency_ms)
+    metrics: (component, operation, latency_ms, timestamp)"""
+    (root / name).mkdir(parents=True)
+    db = ObservabilityDB(str(root / name / ".contextune" / "observability.db"))
+    conn = sqlite3.connect(db.db_path)
+    with conn:
+        conn.executemany(
+            "INSERT INTO detection_history (command, method, confidence, timestamp, latency_ms) "
+            "VALUES (?, ?, ?, ?, ?)",
+            detections,
+        )
+        conn.executemany(
+            "INSERT INTO performance_metrics (component, operation, latency_ms, timestamp) "
+            "VALUES (?, ?, ?, ?)",
+            metrics,
+        )
+        conn.execute(
+            "INSERT INTO error_logs (component, error_type, message, timestamp) VALUES (?, ?, ?, ?)",
+            ("hook", "ValueError", "boom", time.time()),
+        )
+    conn.close()
+    return db.db_path
+
+
+@pytest.fixture
+def databases(tmp_path):
+    now = time.time()
+    alpha = make_project(
+        tmp_path, "alpha",
+        [
+            ("/ctx:plan", "keyword", 0.9, now - 7200, 0.5),
+            ("/ctx:plan", "keyword", 0.8, now - 30, 1.5),
+            ("/ctx:execute", "model2vec", 0.7, now - 86400 * 2, 4.0),
+            ("/ctx:execute", "keyword", 0.6, now - 20, None),
+        ],
+        [("hook", "detect", float(ms), now) for ms in range(1, 101)],
+    )
+    beta = make_project(
+        tmp_path, "beta",
+        [("/ctx:plan", "keyword", 1.0, now - 10, 2.5)],
+        [("hook", "detect", 500.0, now), ("matcher", "match", 0.0, now)],
+    )
+    # Close lingering connections now: their WAL checkpoint would change the cache keys
+    gc.collect()
+    return [alpha, beta]
+
+
+def duckdb_backend():
+    pytest.importorskip("duckdb")
+    return analytics_backend.DuckDBBackend()
+
+
+def test_sqlite_percentiles_match_original_rank(databases):
+    stats = SQLiteBackend().latency_percentiles(
+        databases, table="performance_metrics", group_by="component"
+    )
+
+    # 101 hook values: 1..100 and 500
+    assert stats["hook"]["count"] == 101
+    assert stats["hook"]["p50"] == 51.0
+    assert stats["hook"]["p99"] == 100.0
+    assert stats["hook"]["max"] == 500.0
+    assert stats["matcher"] == {"count": 1, "min": 0.0, "max": 0.0, "avg": 0.0,
+                                "p50": 0.0, "p95": 0.0, "p99": 0.0}
+
+
+def test_unknown_group_column_is_rejected(databases):
+    with pytest.raises(ValueError):
+        SQLiteBackend().latency_percentiles(databases, group_by="session_id")
+
+
+def test_duckdb_summaries_match_sqlite(databases):
+    expected = SQLiteBackend().project_summaries(databases)
+    actual = duckdb_backend().project_summaries(databases)
+
+    assert actual.keys() == expected.keys()
+    for db_path, summary in expected.items():
+        got = actual[db_path]
+        for key in ("total_detections", "commands", "methods", "errors",
+                    "last_activity", "hourly", "daily", "latency"):
+            assert got[key] == summary[key], key
+        assert got["avg_confidence"] == pytest.approx(summary["avg_confidence"])
+
+
+def test_duckdb_percentiles_match_sqlite(databases):
+    for table, group_by in (("performance_metrics", "component"), ("detection_history", "method")):
+        expected = SQLiteBackend().latency_percentiles(databases, table=table, group_by=group_by)
+        actual = duckdb_backend().latency_percentiles(databases, table=table, group_by=group_by)
+        assert actual.keys() == expected.keys()
+        for group, stats in expected.items():
+            assert actual[group] == pytest.approx(stats)
+
+
+def test_duckdb_skips_unreadable_database(databases, tmp_path, capsys):
+    broken = tmp_path / "broken" / ".contextune" / "observability.db"
+    broken.parent.mkdir(parents=True)
+    broken.write_bytes(b"not a database" * 100)
+
+    summaries = duckdb_backend().project_summaries(databases + [broken])
+
+    assert set(summaries) == set(databases)
+    assert "Error reading" in capsys.readouterr().out
+
+
+def test_export_parquet(databases, tmp_path):
+    duckdb = pytest.importorskip("duckdb")
+    backend = duckdb_backend()
+    try:
+        written = backend.export_parquet(databases, tmp_path / "export")
+    except duckdb.Error as e:  # parquet support ships as an extension on some builds
+        pytest.skip(f"parquet unavailable: {e}")
+
+    rows = duckdb.sql(
+        f"SELECT project_path, COUNT(*) FROM '{written['detection_history']}' GROUP BY 1 ORDER BY 1"
+    ).fetchall()
+    assert rows == [(str(databases[0].parent.parent), 4), (str(databases[1].parent.parent), 1)]
+
+
+def test_get_backend_selection(monkeypatch):
+    monkeypatch.setenv("CONTEXTUNE_ANALYTICS_BACKEND", "sqlite")
+    assert get_backend().name == "sqlite"
+
+    with pytest.raises(ValueError):
+        get_backend("spark")
+
+    # auto never stages rows: DuckDB only with a working scanner
+    monkeypatch.setattr(
+        analytics_backend.DuckDBBackend, "_load_scanner", lambda self, install=True: False
+    )
+    assert get_backend("auto").name == "sqlite"
+
+
+def test_auto_backend_never_installs_scanner(monkeypatch):
+    duckdb = pytest.importorskip("duckdb")
+    statements = []
+
+    class OfflineConnection:
+        def execute(self, sql):
+            statements.append(sql)
+            raise duckdb.Error("extension not installed")
+
+        def close(self):
+            pass
+
+    monkeypatch.setattr(analytics_backend, "_scanner_available", {})
+    monkeypatch.setattr(duckdb, "connect", lambda: OfflineConnection())
+
+    assert get_backend("auto").name == "sqlite"
+    assert get_backend("auto").name == "sqlite"
+    assert statements == ["LOAD sqlite"]
+
+    # An explicit duckdb selection may download the extension
+    get_backend("duckdb")
+    assert statements[1:] == ["LOAD sqlite", "INSTALL sqlite"]
+
+
+def test_reporting_uses_pluggable_backend(databases, tmp_path):
+    class CountingBackend(SQLiteBackend):
+        calls = []
+
+        def project_summaries(self, databases):
+            self.calls.append(list(databases))
+            return super().project_summaries(databases)
+
+    backend = CountingBackend()
+    obs = GlobalObservability(search_root=tmp_path, backend=backend)
+    assert obs.aggregate_stats()["total_detections"] == 5
+    assert sorted(backend.calls[0]) == sorted(p.resolve() for p in databases)
+
+    # Cached on the second run: nothing handed to the backend
+    GlobalObservability(search_root=tmp_path, backend=backend).project_summaries()
+    assert len(backend.calls) == 1
+
+    stats = ObservabilityDB(str(databases[1])).get_stats(backend=backend)
+    assert stats["performance"]["hook"] == {"p50": 500.0, "p95": 500.0, "p99": 500.0, "count": 1}
@@ -0,0 +1,84 @@
+"""
+Tests for content-hash incremental writes of generated plan files.
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+
+from content_writer import MANIFEST_NAME, ContentWriter
+from plan_builder import PlanBuilder
+
+
+def test_unchanged_content_is_not_rewritten(tmp_path):
+    target = tmp_path / "design.md"
+    with ContentWriter(tmp_path) as writer:
+        assert writer.write_text(target, "# Design\n")
+    mtime = target.stat().st_mtime_ns
+
+    with ContentWriter(tmp_path) as writer:
+        assert not writer.write_text(target, "# Design\n")
+        assert writer.unchanged == [target]
+
+    assert target.stat().st_mtime_ns == mtime
+
+
+def test_changed_content_is_written_and_recorded(tmp_path):
+    target = tmp_path / "tasks" / "task-0.md"
+    with ContentWriter(tmp_path) as writer:
+        writer.write_text(target, "v1")
+        assert writer.write_text(target, "v2")
+
+    manifest = json.loads((tmp_path / MANIFEST_NAME).read_text())
+    assert target.read_text() == "v2"
+    assert set(manifest) == {"tasks/task-0.md"}
+    assert not list(tmp_path.rglob("*.tmp"))
+
+
+def test_external_edit_detected(tmp_path):
+    target = tmp_path / "design.md"
+    with ContentWriter(tmp_path) as writer:
+        writer.write_text(target, "generated")
+
+    target.write_text("edited by hand")
+    os.utime(target, ns=(0, 12345))
+
+    with ContentWriter(tmp_path) as writer:
+        assert writer.write_text(target, "generated")
+    assert target.read_text() == "generated"
+
+
+def test_existing_file_without_manifest_is_hashed(tmp_path):
+    target = tmp_path / "plan.yaml"
+    target.write_text("a: 1\n")
+
+    with ContentWriter(tmp_path) as writer:
+        assert not writer.write_yaml(target, {"a": 1})
+
+
+def test_plan_builder_rebuild_only_touches_changed_tasks(tmp_path):
+    def build(task_1_content):
+        builder = PlanBuilder("Auth", output_dir=str(tmp_path))
+        builder.add_task("task-0", "Models", "blocker", "# Models\n")
+        builder.add_task("task-1", "Routes", "high", task_1_content, ["task-0"])
+        return builder.build()
+
+    first = build("# Routes\n")
+    second = build("# Routes v2\n")
+
+    assert len(first["changed"]) == 3
+    assert second["changed"] == [tmp_path / "tasks" / "task-1.md"]
+
+
+def test_plan_builder_rebuild_keeps_created(tmp_path):
+    (tmp_path / "plan.yaml").write_text(
+        "metadata:\n  name: Auth\n  created: 20250101-000000\n  status: ready\n"
+    )
+    builder = PlanBuilder("Auth", output_dir=str(tmp_path))
+    builder.add_task("task-0", "Models", "blocker", "# Models\n")
+    builder.build()
+
+    assert builder.plan_data["metadata"]["created"] == "20250101-000000"
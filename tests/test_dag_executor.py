@@ -0,0 +1,95 @@
+"""
+Tests for DagExecutor: dependency-ordered, bounded-concurrency task runs.
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+
+from dag_executor import DagExecutor
+
+
+def test_dependents_start_after_dependencies():
+    finished = []
+    lock = threading.Lock()
+
+    def task(tid):
+        time.sleep(0.01)
+        with lock:
+            finished.append(tid)
+        return tid.upper()
+
+    outcomes = DagExecutor({"a": [], "b": ["a"], "c": ["a"], "d": ["b", "c"]}, max_workers=4).run(task)
+
+    assert finished[0] == "a" and finished[-1] == "d"
+    assert {tid: o.status for tid, o in outcomes.items()} == dict.fromkeys("abcd", "done")
+    assert outcomes["b"].result == "B"
+    assert outcomes["d"].started_at >= max(outcomes["b"].finished_at, outcomes["c"].finished_at)
+
+
+def test_concurrency_is_capped():
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def task(tid):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+
+    DagExecutor({str(i): [] for i in range(8)}, max_workers=3).run(task)
+
+    assert peak == 3
+
+
+def test_dependent_released_before_its_wave_finishes():
+    # "fast" -> "next" should not wait for the slow sibling in wave 1
+    def task(tid):
+        time.sleep(0.2 if tid == "slow" else 0.01)
+
+    outcomes = DagExecutor({"slow": [], "fast": [], "next": ["fast"]}, max_workers=3).run(task)
+
+    assert outcomes["next"].finished_at < outcomes["slow"].finished_at
+
+
+def test_failure_skips_downstream_only():
+    events = []
+
+    def task(tid):
+        if tid == "bad":
+            raise ValueError("boom")
+
+    outcomes = DagExecutor(
+        {"bad": [], "child": ["bad"], "grandchild": ["child"], "other": []}, max_workers=2
+    ).run(task, on_event=lambda event, outcome: events.append((event, outcome.task_id)))
+
+    assert outcomes["bad"].status == "failed"
+    assert outcomes["bad"].error == "ValueError: boom"
+    assert outcomes["child"].status == "skipped"
+    assert outcomes["grandchild"].status == "skipped"
+    assert outcomes["other"].status == "done"
+    assert ("skipped", "grandchild") in events
+    assert ("start", "child") not in events
+
+
+def test_external_dependencies_must_be_satisfied():
+    graph = {"a": ["done-elsewhere"], "b": ["unknown"]}
+
+    outcomes = DagExecutor(graph, satisfied=["done-elsewhere"]).run(lambda tid: None)
+
+    assert outcomes["a"].status == "done"
+    assert outcomes["b"].status == "skipped"
+    assert outcomes["b"].error == "waiting on: unknown"
+
+
+def test_cycle_is_skipped():
+    outcomes = DagExecutor({"a": ["b"], "b": ["a"], "c": []}).run(lambda tid: None)
+
+    assert [o.status for o in outcomes.values()] == ["skipped", "skipped", "done"]
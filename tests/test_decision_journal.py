@@ -0,0 +1,101 @@
+"""
+Tests for the append-only decision journal and its compaction.
+"""
+
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pytest
+import yaml
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+
+from decision_journal import DecisionJournal, apply_records
+
+
+@pytest.fixture
+def decisions_file(tmp_path: Path) -> Path:
+    path = tmp_path / "decisions.yaml"
+    path.write_text(
+        yaml.dump(
+            {
+                "metadata": {"project": "test"},
+                "decisions": {"entries": [{"id": "dec-001", "title": "Existing"}]},
+            },
+            sort_keys=False,
+        )
+    )
+    return path
+
+
+def _append_many(args):
+    decisions_path, worker = args
+    journal = DecisionJournal(Path(decisions_path))
+    for i in range(25):
+        journal.add_entries("decisions", [{"id": f"dec-{worker}-{i}", "title": "x" * 200}])
+        if i % 10 == 0:
+            journal.compact(blocking=False)
+
+
+def test_apply_records_skips_existing_ids():
+    document = {"decisions": {"entries": [{"id": "a"}]}}
+    apply_records(
+        document,
+        [
+            {"op": "add", "section": "decisions", "entry": {"id": "a", "title": "dup"}},
+            {"op": "add", "section": "research", "entry": {"id": "r"}},
+            {"op": "update", "section": "decisions", "id": "a", "fields": {"status": "ok"}},
+            {"op": "meta", "fields": {"last_scan": "now"}},
+        ],
+    )
+
+    assert document["decisions"]["entries"] == [{"id": "a", "status": "ok"}]
+    assert document["research"]["entries"] == [{"id": "r"}]
+    assert document["metadata"]["last_scan"] == "now"
+
+
+def test_load_merges_journal_tail(decisions_file):
+    journal = DecisionJournal(decisions_file)
+    journal.add_entries("decisions", [{"id": "dec-002", "title": "New"}])
+
+    ids = [e["id"] for e in journal.load()["decisions"]["entries"]]
+    assert ids == ["dec-001", "dec-002"]
+
+
+def test_partial_trailing_line_ignored(decisions_file):
+    journal = DecisionJournal(decisions_file)
+    journal.add_entries("decisions", [{"id": "dec-002"}])
+    with open(journal.journal_path, "ab") as f:
+        f.write(b'{"op": "add", "section": "dec')
+
+    records, offset = journal.read_records()
+    assert len(records) == 1
+    assert offset < journal.size()
+
+
+def test_save_document_keeps_concurrent_appends(decisions_file):
+    journal = DecisionJournal(decisions_file)
+    loaded = journal.load()
+    journal.add_entries("decisions", [{"id": "dec-002", "title": "Concurrent"}])
+
+    loaded["decisions"]["entries"][0]["status"] = "linked"
+    journal.save_document(loaded)
+
+    data = yaml.safe_load(decisions_file.read_text())
+    assert data["decisions"]["entries"] == [
+        {"id": "dec-001", "title": "Existing", "status": "linked"},
+        {"id": "dec-002", "title": "Concurrent"},
+    ]
+    assert journal.size() == 0
+
+
+def test_concurrent_writers_lose_nothing(decisions_file):
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        list(pool.map(_append_many, [(str(decisions_file), w) for w in range(4)]))
+
+    journal = DecisionJournal(decisions_file)
+    journal.compact()
+
+    data = yaml.safe_load(decisions_file.read_text())
+    assert len(data["decisions"]["entries"]) == 1 + 4 * 25
@@ -335,6 +335,38 @@ class TestTimestampMatching:
             assert match is not None  # Should match with 3s tolerance
 
 
+    def test_overlapping_sessions_prefer_latest_start(
+        self, temp_db: Path, temp_decisions: Path
+    ) -> None:
+        """Test that the most recently started session wins on overlap."""
+        now = datetime.now(timezone.utc).timestamp()
+        with sqlite3.connect(temp_db) as conn:
+            conn.execute(
+                "INSERT INTO sessions VALUES (?, ?, ?, ?, ?)",
+                ("session-long", now - 1000, now + 1000, 0, 0),
+            )
+
+        linker = DecisionLinker(str(temp_db), str(temp_decisions))
+
+        inside_both = linker.find_matching_session(int(now * 1000))
+        assert inside_both["session_id"] == "session-001"
+
+        # Only the long session covers this point
+        only_long = linker.find_matching_session(int((now + 150) * 1000))
+        assert only_long["session_id"] == "session-long"
+
+    def test_batched_detections(self, temp_db: Path, temp_decisions: Path) -> None:
+        """Test batched detection lookup matches per-session queries."""
+        linker = DecisionLinker(str(temp_db), str(temp_decisions))
+
+        batched = linker.query_detections_for_sessions(["session-001", "session-002"])
+
+        assert batched["session-001"] == linker.query_detections_for_session(
+            "session-001"
+        )
+        assert batched["session-002"] == []
+
+
 class TestIntegration:
     """Integration tests combining multiple components."""
 
@@ -3,10 +3,17 @@ Unit tests for decision-query.py
 """
 
 import importlib.util
+import sys
+import tempfile
 from datetime import datetime, timedelta
 from pathlib import Path
 
 import pytest
+import yaml
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+
+from decision_store import DecisionStore
 
 
 # Dynamic import of decision_query script
@@ -22,7 +29,14 @@ def load_decision_query_module():
 decision_query = load_decision_query_module()
 estimate_tokens = decision_query.estimate_tokens
 is_expired = decision_query.is_expired
-filter_entries = decision_query.filter_entries
+
+
+def filter_entries(entries, **filters):
+    """Run entries through the DecisionStore query path used by main()."""
+    with tempfile.TemporaryDirectory() as tmp:
+        decisions_path = Path(tmp) / "decisions.yaml"
+        decisions_path.write_text(yaml.safe_dump({"decisions": {"entries": entries}}))
+        return DecisionStore(decisions_path).query(**filters)
 
 
 class TestTokenEstimation:
@@ -0,0 +1,202 @@
+"""
+Tests for the indexed decision store backing decisions.yaml.
+"""
+
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+import yaml
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+
+from decision_store import DecisionStore, SearchHit, select_within_budget
+
+
+@pytest.fixture
+def decisions_file(tmp_path: Path) -> Path:
+    now = datetime.now()
+    data = {
+        "metadata": {"project": "test", "version": "1.0"},
+        "research": {
+            "entries": [
+                {
+                    "id": "res-001",
+                    "title": "JWT libraries",
+                    "context": "Evaluated authentication libraries",
+                    "tags": ["auth", "security"],
+                    "created_at": now.isoformat(),
+                    "expires_at": (now - timedelta(days=1)).isoformat(),
+                }
+            ]
+        },
+        "plans": {"entries": []},
+        "decisions": {
+            "entries": [
+                {
+                    "id": "dec-001",
+                    "title": "Use SQLite",
+                    "context": "Need local storage",
+                    "decision": "SQLite with WAL",
+                    "category": "architecture",
+                    "status": "accepted",
+                    "impact": "high",
+                    "tags": ["database"],
+                    "created_at": now.isoformat(),
+                },
+                {
+                    "id": "dec-002",
+                    "title": "Old process decision",
+                    "category": "process",
+                    "status": "rejected",
+                    "created_at": (now - timedelta(days=60)).isoformat(),
+                },
+            ]
+        },
+        "features": {"entries": []},
+    }
+    path = tmp_path / "decisions.yaml"
+    path.write_text(yaml.dump(data, sort_keys=False))
+    return path
+
+
+def make_store(decisions_file: Path) -> DecisionStore:
+    return DecisionStore(decisions_file, db_path=decisions_file.parent / "decisions.db")
+
+
+def test_bootstrap_imports_yaml(decisions_file):
+    store = make_store(decisions_file)
+
+    ids = [e["id"] for e in store.query(include_expired=True)]
+    assert ids == ["res-001", "dec-001", "dec-002"]
+
+
+def test_query_filters(decisions_file):
+    store = make_store(decisions_file)
+
+    assert [e["id"] for e in store.query(category="architecture")] == ["dec-001"]
+    assert [e["id"] for e in store.query(status="rejected")] == ["dec-002"]
+    assert [e["id"] for e in store.query(tags=["database"])] == ["dec-001"]
+    assert [e["id"] for e in store.query(topic="wal")] == ["dec-001"]
+    assert [e["id"] for e in store.query(since_days=30)] == ["dec-001"]
+    assert store.query(category="architecture")[0]["_type"] == "decision"
+
+
+def test_expired_entries_skipped_by_default(decisions_file):
+    store = make_store(decisions_file)
+
+    assert "res-001" not in [e["id"] for e in store.query()]
+    assert "res-001" in [e["id"] for e in store.query(include_expired=True)]
+
+
+def test_add_entries_dedups_by_id(decisions_file):
+    store = make_store(decisions_file)
+
+    added = store.add_entries(
+        "decisions",
+        [{"id": "dec-001", "title": "Duplicate"}, {"id": "dec-003", "title": "New"}],
+    )
+
+    assert [e["id"] for e in added] == ["dec-003"]
+    assert store.has_entry("dec-003")
+
+
+def test_added_entries_visible_before_compaction(decisions_file):
+    store = make_store(decisions_file)
+    store.add_entries("decisions", [{"id": "dec-003", "title": "New"}])
+
+    # decisions.yaml untouched, journal tail merged by readers
+    raw = yaml.safe_load(decisions_file.read_text())
+    assert "dec-003" not in [e["id"] for e in raw["decisions"]["entries"]]
+    merged = store.journal.load()
+    assert "dec-003" in [e["id"] for e in merged["decisions"]["entries"]]
+    assert make_store(decisions_file).has_entry("dec-003")
+
+
+def test_compaction_round_trip(decisions_file):
+    store = make_store(decisions_file)
+    store.add_entries("decisions", [{"id": "dec-003", "title": "New"}])
+    assert store.compact()
+
+    data = yaml.safe_load(decisions_file.read_text())
+
+    assert list(data) == ["metadata", "research", "plans", "decisions", "features"]
+    assert data["metadata"]["project"] == "test"
+    assert [e["id"] for e in data["decisions"]["entries"]] == [
+        "dec-001",
+        "dec-002",
+        "dec-003",
+    ]
+    assert data["decisions"]["entries"][0]["tags"] == ["database"]
+    assert store.journal.size() == 0
+
+
+def test_external_yaml_edit_is_reimported(decisions_file):
+    store = make_store(decisions_file)
+
+    data = yaml.safe_load(decisions_file.read_text())
+    data["decisions"]["entries"].append({"id": "dec-ext", "title": "From git pull"})
+    decisions_file.write_text(yaml.dump(data, sort_keys=False))
+
+    reopened = make_store(decisions_file)
+
+    assert reopened.has_entry("dec-ext")
+    assert store.has_entry("dec-ext")
+
+
+def test_search_ranks_by_relevance(decisions_file):
+    store = make_store(decisions_file)
+    store.add_entries(
+        "decisions",
+        [
+            {"id": "dec-003", "title": "Authentication tokens", "context": "sqlite mention"},
+            {"id": "dec-004", "title": "Unrelated", "context": "nothing here"},
+        ],
+    )
+
+    hits = store.search("sqlite")
+    ids = [hit.entry["id"] for hit in hits]
+
+    # Title match outranks a context-only match
+    assert ids == ["dec-001", "dec-003"]
+    assert hits[0].score > hits[1].score
+    assert hits[0].tokens >= 100
+
+
+def test_search_prefix_and_filters(decisions_file):
+    store = make_store(decisions_file)
+
+    assert [h.entry["id"] for h in store.search("authent", include_expired=True)] == [
+        "res-001"
+    ]
+    assert store.search("authent") == []
+    assert [h.entry["id"] for h in store.search("sqlite", status="accepted")] == ["dec-001"]
+
+
+def test_select_within_budget_maximizes_relevance():
+    hits = [
+        SearchHit(entry={"id": "a"}, score=5.0, tokens=300),
+        SearchHit(entry={"id": "b"}, score=3.0, tokens=150),
+        SearchHit(entry={"id": "c"}, score=3.0, tokens=150),
+        SearchHit(entry={"id": "d"}, score=1.0, tokens=100),
+    ]
+
+    selected = select_within_budget(hits, 300)
+
+    # b + c (6.0) beats a alone (5.0)
+    assert [h.entry["id"] for h in selected] == ["b", "c"]
+    assert sum(h.tokens for h in selected) <= 300
+    assert select_within_budget(hits, 10) == []
+
+
+def test_budget_without_topic_prefers_recent_entries(decisions_file):
+    store = make_store(decisions_file)
+
+    hits = store.query_hits(sections=["decisions"])
+    scores = {hit.entry["id"]: hit.score for hit in hits}
+    assert scores == {"dec-001": 1.0, "dec-002": 0.5}
+
+    # Room for either entry alone, not both
+    budget = 25 * max(-(-hit.tokens // 25) for hit in hits)
+    assert [h.entry["id"] for h in select_within_budget(hits, budget)] == ["dec-001"]
@@ -11,6 +11,7 @@ Tests:
 
 import pytest
 import tempfile
+import importlib.util
 import json
 from pathlib import Path
 from datetime import datetime
@@ -382,5 +383,120 @@ class TestIntegration:
             yaml_path.unlink()
 
 
+# ============================================================================
+# Test incremental sync (scan manifest)
+# ============================================================================
+
+def load_decision_sync_module():
+    """Load decision-sync.py as a module."""
+    script_path = Path(__file__).parent.parent / "scripts" / "decision-sync.py"
+    spec = importlib.util.spec_from_file_location("decision_sync", script_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def decision_message(title: str) -> dict:
+    text = (
+        f"## Decision: {title}\n**Status:** Accepted\n"
+        "### Context\nWhy\n### Alternatives Considered\nOthers"
+    )
+    return {
+        'type': 'assistant',
+        'timestamp': '2025-10-27T10:00:00Z',
+        'message': {'content': [{'type': 'text', 'text': text}]}
+    }
+
+
+def design_message(title: str) -> dict:
+    text = f"# {title}\n**Type:** Design\n## Architecture\nParts\n## Task Breakdown\nSteps"
+    return {
+        'type': 'assistant',
+        'timestamp': '2025-10-27T10:00:00Z',
+        'message': {'content': [{'type': 'text', 'text': text}]}
+    }
+
+
+class TestIncrementalSync:
+    """Test manifest-driven incremental scanning."""
+
+    @pytest.fixture
+    def sync(self, monkeypatch):
+        module = load_decision_sync_module()
+        monkeypatch.setattr(module, 'console', None)
+        return module
+
+    def write_lines(self, path: Path, entries: list, mode: str = 'w'):
+        with open(path, mode) as f:
+            for entry in entries:
+                f.write(json.dumps(entry) + '\n')
+
+    def decision_ids(self, decisions_path: Path) -> list:
+        data = yaml.safe_load(decisions_path.read_text())
+        return [e['id'] for e in data['decisions']['entries']]
+
+    def test_rescan_skips_unchanged_and_resumes_grown(self, sync, tmp_path):
+        decisions_path = tmp_path / 'decisions.yaml'
+        transcript = tmp_path / 'session-a.jsonl'
+        self.write_lines(transcript, [decision_message('Use SQLite')])
+
+        stats = sync.populate_from_transcripts(decisions_path, [transcript], workers=1)
+        assert stats['entries_added'] == 1
+        assert len(self.decision_ids(decisions_path)) == 1
+
+        # Unchanged transcript is not re-read
+        stats = sync.populate_from_transcripts(decisions_path, [transcript], workers=1)
+        assert stats['transcripts_skipped'] == 1
+        assert stats['decisions_found'] == 0
+
+        # Appended lines are read from the stored offset only
+        self.write_lines(transcript, [decision_message('Use WAL')], mode='a')
+        stats = sync.populate_from_transcripts(decisions_path, [transcript], workers=1)
+        assert stats['decisions_found'] == 1
+        assert len(self.decision_ids(decisions_path)) == 2
+
+    def test_full_rescan_does_not_duplicate(self, sync, tmp_path):
+        decisions_path = tmp_path / 'decisions.yaml'
+        transcript = tmp_path / 'session-a.jsonl'
+        self.write_lines(transcript, [decision_message('Use SQLite')] * 2)
+
+        sync.populate_from_transcripts(decisions_path, [transcript], workers=1)
+        stats = sync.populate_from_transcripts(
+            decisions_path, [transcript], workers=1, full=True
+        )
+
+        assert stats['decisions_found'] == 2
+        assert stats['entries_added'] == 0
+        assert len(self.decision_ids(decisions_path)) == 1
+
+    def test_rewritten_transcript_rescanned_from_start(self, sync, tmp_path):
+        decisions_path = tmp_path / 'decisions.yaml'
+        transcript = tmp_path / 'session-a.jsonl'
+        self.write_lines(transcript, [decision_message('Use SQLite'), decision_message('Use WAL')])
+        sync.populate_from_transcripts(decisions_path, [transcript], workers=1)
+
+        self.write_lines(transcript, [decision_message('Use DuckDB')])
+        manifest = sync.ScanManifest(tmp_path / '.contextune' / 'sync_manifest.json')
+
+        assert manifest.pending_offset(transcript) == 0
+
+    def test_entries_over_cap_are_picked_up_next_run(self, sync, tmp_path):
+        decisions_path = tmp_path / 'decisions.yaml'
+        transcript = tmp_path / 'session-a.jsonl'
+        self.write_lines(transcript, [design_message(f'Plan {i}') for i in range(25)])
+
+        stats = sync.populate_from_transcripts(decisions_path, [transcript], workers=1)
+        assert stats['entries_added'] == 20
+
+        # The capped transcript was not marked as scanned
+        stats = sync.populate_from_transcripts(decisions_path, [transcript], workers=1)
+        assert stats['entries_added'] == 5
+
+        stats = sync.populate_from_transcripts(decisions_path, [transcript], workers=1)
+        assert stats['transcripts_skipped'] == 1
+        data = yaml.safe_load(decisions_path.read_text())
+        assert len(data['plans']['entries']) == 25
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
@@ -0,0 +1,110 @@
+"""
+Tests for the single-pass extraction marker scanner.
+"""
+
+import random
+import re
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+
+from extraction_patterns import count_markers, scan_markers
+
+# Per-pattern regexes the scanner replaces (one findall per pattern)
+REFERENCE_PATTERNS = {
+    "design": (
+        [
+            r"\*\*Type:\*\* Design",
+            r"## Architecture",
+            r"## Task Breakdown",
+            r"```yaml\n.*?architecture:",
+            r"```yaml\n.*?tasks:",
+            r"\*\*Status:\*\* (Complete|Draft)",
+            r"\*\*Estimated Tokens:\*\*",
+        ],
+        re.IGNORECASE | re.DOTALL,
+    ),
+    "plan": (
+        [
+            r"\*\*Type:\*\* Plan",
+            r"## Plan Structure",
+            r"## Task Details",
+            r"```yaml\n.*?metadata:",
+            r"```yaml\n.*?tasks:",
+            r"\*\*Status:\*\* (Ready|Draft)",
+        ],
+        re.IGNORECASE | re.DOTALL,
+    ),
+    "decision": (
+        [
+            r"## Decision:",
+            r"\*\*Status:\*\* (Accepted|Proposed|Rejected)",
+            r"### Alternatives Considered",
+            r"### Context",
+            r"### Consequences",
+        ],
+        re.IGNORECASE,
+    ),
+    "completion": (
+        [
+            r"\*\*Type:\*\* (Design|Plan|Architecture)",
+            r"\*\*Status:\*\* (Complete|Ready)",
+            r"## Success Criteria",
+            r"## Task Breakdown",
+            r"Ready for: /ctx:plan",
+            r"Ready for: /ctx:execute",
+        ],
+        re.IGNORECASE,
+    ),
+}
+
+FRAGMENTS = [
+    "**Type:** Design", "**TYPE:** plan", "**Type:** Architecture:",
+    "**Status:** Completed", "**Status:** draft", "**Status:** Ready",
+    "**Status:** Accepted", "**Status:** Rejected", "## Architecture:",
+    "### Architecture", "## Task Breakdown", "## Plan Structure",
+    "## Task Details", "## Success Criteria", "## Decision:",
+    "### Alternatives Considered", "### Context", "### Consequences",
+    "Ready for: /ctx:plan", "ready for: /CTX:execute", "```yaml\n", "```YAML\n",
+    "tasks:", "metadata:", "Architecture:", "**Estimated Tokens:**",
+    "prose ", "\n", "#", "*", "`",
+]
+
+
+def reference_counts(text: str) -> dict:
+    return {
+        category: sum(len(re.findall(p, text, flags)) for p in patterns)
+        for category, (patterns, flags) in REFERENCE_PATTERNS.items()
+    }
+
+
+def test_matches_per_pattern_regexes():
+    rng = random.Random(7)
+    for _ in range(3000):
+        text = "".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(0, 25)))
+        assert scan_markers(text) == reference_counts(text), text
+
+
+@pytest.mark.parametrize(
+    "text,expected",
+    [
+        # One fence only pairs with the first key after it
+        ("```yaml\ntasks:\ntasks:\n```", {"yaml_tasks": 1}),
+        ("```yaml\n```yaml\ntasks:", {"yaml_tasks": 1}),
+        ("```yaml\nmetadata:\ntasks:", {"yaml_metadata": 1, "yaml_tasks": 1}),
+        # Heading nested in a deeper heading still counts
+        ("### Architecture", {"h_architecture": 1}),
+        ("just prose with no markers", {}),
+    ],
+)
+def test_count_markers(text, expected):
+    assert count_markers(text) == expected
+
+
+def test_task_breakdown_counts_towards_completion():
+    # A design with only a type line and a task breakdown is a completed plan
+    text = "**Type:** Design\n\n## Task Breakdown\n"
+    assert scan_markers(text)["completion"] == 2
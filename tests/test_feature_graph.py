@@ -0,0 +1,107 @@
+"""
+Tests for the FeatureGraph dependency index used by the feature-* scripts.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+
+from feature_graph import FeatureGraph
+
+
+def feature(fid: str, deps=(), status: str = "planned", tokens: int = 1000, blocks=()) -> dict:
+    return {
+        "id": fid,
+        "name": fid.upper(),
+        "status": status,
+        "dependencies": list(deps),
+        "blocks": list(blocks),
+        "effort": {"estimated_tokens": tokens},
+    }
+
+
+def test_blocks_and_dependencies_are_merged():
+    graph = FeatureGraph([
+        feature("a", blocks=["c"]),
+        feature("b"),
+        feature("c", deps=["a", "b"]),
+    ])
+
+    assert graph.dependencies["c"] == ["a", "b"]
+    assert graph.dependents["a"] == ["c"]
+    assert graph.edges() == [("a", "c"), ("b", "c")]
+
+
+def test_unmet_dependencies_include_unknown_ids():
+    graph = FeatureGraph([
+        feature("a", status="completed"),
+        feature("b"),
+        feature("c", deps=["a", "b", "ghost"]),
+    ])
+
+    unmet = graph.unmet_dependencies("c")
+
+    assert [dep_id for dep_id, _ in unmet] == ["b", "ghost"]
+    assert unmet[1][1] is None
+    assert [f["id"] for f in graph.ready()] == ["b"]
+
+
+def test_unblocked_by_requires_all_dependencies():
+    features = [feature("a"), feature("b"), feature("c", deps=["a", "b"]), feature("d", deps=["a"])]
+    graph = FeatureGraph(features)
+
+    features[0]["status"] = "completed"
+
+    assert [f["id"] for f in graph.unblocked_by("a")] == ["d"]
+
+
+def test_waves_skip_completed_features():
+    graph = FeatureGraph([
+        feature("done", status="completed"),
+        feature("a", deps=["done"]),
+        feature("b"),
+        feature("c", deps=["a"]),
+        feature("d", deps=["b", "c"]),
+    ])
+
+    assert graph.waves() == [["a", "b"], ["c"], ["d"]]
+    assert graph.waves(include_done=True)[0] == ["done", "b"]
+
+
+def test_critical_path_is_token_weighted():
+    graph = FeatureGraph([
+        feature("short", tokens=50_000),
+        feature("a", tokens=10_000),
+        feature("b", deps=["a"], tokens=10_000),
+        feature("c", deps=["b"], tokens=10_000),
+        feature("tail", deps=["short"], tokens=1_000),
+    ])
+
+    assert graph.critical_path() == (51_000, ["short", "tail"])
+
+
+def test_cycles_are_reported_and_left_out_of_waves():
+    graph = FeatureGraph([
+        feature("a", deps=["c"]),
+        feature("b", deps=["a"]),
+        feature("c", deps=["b"]),
+        feature("free"),
+        feature("behind", deps=["a"]),
+    ])
+
+    cycles = graph.find_cycles()
+
+    assert len(cycles) == 1
+    assert set(cycles[0]) == {"a", "b", "c"}
+    assert cycles[0][0] == cycles[0][-1]
+    assert graph.waves() == [["free"]]
+
+
+def test_long_chain_does_not_recurse():
+    chain = [feature("f0")] + [feature(f"f{i}", deps=[f"f{i - 1}"]) for i in range(1, 5000)]
+    graph = FeatureGraph(chain)
+
+    assert graph.find_cycles() == []
+    assert len(graph.waves()) == 5000
+    assert graph.critical_path()[0] == 5000 * 1000
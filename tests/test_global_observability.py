@@ -0,0 +1,111 @@
+"""
+Tests for cross-project aggregation with cached per-project summaries.
+"""
+
+import gc
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+
+from global_observability import GlobalObservability
+from observability_db import ObservabilityDB
+
+
+def make_project(root: Path, name: str, detections: list[tuple]) -> Path:
+    """detections: (command, method, confidence, timestamp, latency_ms)"""
+    project = root / name
+    project.mkdir(parents=True)
+    db = ObservabilityDB(str(project / ".contextune" / "observability.db"))
+    conn = sqlite3.connect(db.db_path)
+    with conn:
+        conn.executemany(
+            "INSERT INTO detection_history (command, method, confidence, timestamp, latency_ms) "
+            "VALUES (?, ?, ?, ?, ?)",
+            detections,
+        )
+    conn.close()
+    return db.db_path
+
+
+@pytest.fixture
+def projects(tmp_path):
+    now = time.time()
+    alpha = make_project(tmp_path, "alpha", [
+        ("/ctx:plan", "keyword", 0.9, now - 60, 0.5),
+        ("/ctx:plan", "keyword", 0.8, now - 30, 1.5),
+        ("/ctx:execute", "model2vec", 0.7, now - 20, 4.0),
+    ])
+    beta = make_project(tmp_path, "beta", [
+        ("/ctx:plan", "keyword", 1.0, now - 10, 2.5),
+    ])
+    make_project(tmp_path, "empty", [])
+    return tmp_path, alpha, beta
+
+
+def test_aggregates_across_projects(projects):
+    root, alpha, beta = projects
+    obs = GlobalObservability(search_root=root)
+
+    stats = obs.aggregate_stats()
+
+    assert stats["total_projects"] == 2
+    assert stats["total_detections"] == 4
+    assert stats["commands"] == {"/ctx:plan": 3, "/ctx:execute": 1}
+    assert stats["methods"] == {"keyword": 3, "model2vec": 1}
+    assert stats["most_active_project"]["name"] == "alpha"
+    assert sum(obs.get_time_patterns()["hourly_activity"].values()) == 4
+    assert obs.get_command_insights()["most_popular"] == ("/ctx:plan", 3)
+
+    keyword = obs.get_performance_overview()["keyword"]
+    assert keyword["count"] == 3
+    assert keyword["min"] == 0.5 and keyword["max"] == 2.5
+    assert keyword["p50"] == pytest.approx(1.5, rel=0.01)
+
+
+def test_unchanged_projects_are_served_from_cache(projects):
+    root, alpha, beta = projects
+    GlobalObservability(search_root=root).project_summaries()
+
+    obs = GlobalObservability(search_root=root)
+    obs.project_summaries()
+
+    assert obs.refresh_stats == {"cached": 3, "computed": 0, "failed": 0}
+    assert obs.aggregate_stats()["total_detections"] == 4
+
+
+def test_new_activity_recomputes_only_that_project(projects):
+    root, alpha, beta = projects
+    GlobalObservability(search_root=root).project_summaries()
+
+    conn = sqlite3.connect(beta)
+    with conn:
+        conn.execute(
+            "INSERT INTO detection_history (command, method, confidence, timestamp) VALUES (?, ?, ?, ?)",
+            ("/ctx:research", "keyword", 0.9, time.time()),
+        )
+    conn.close()
+
+    obs = GlobalObservability(search_root=root)
+    obs.project_summaries()
+
+    assert obs.refresh_stats == {"cached": 2, "computed": 1, "failed": 0}
+    assert obs.get_project_stats(beta).total_detections == 2
+
+
+def test_unreadable_project_is_skipped(projects, capsys):
+    root, alpha, beta = projects
+    gc.collect()  # close any lingering connections before replacing the file
+    for suffix in ("", "-wal", "-shm"):
+        beta.with_name(beta.name + suffix).unlink(missing_ok=True)
+    beta.write_bytes(b"not a database" * 100)
+
+    obs = GlobalObservability(search_root=root)
+
+    assert obs.aggregate_stats()["total_detections"] == 3
+    assert obs.refresh_stats["failed"] == 1
+    assert "Error reading" in capsys.readouterr().out
@@ -0,0 +1,147 @@
+"""
+Tests for the file-based background job queue used by SessionEnd/PreCompact.
+"""
+
+import os
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+
+import job_queue
+from job_queue import JobQueue
+
+
+@pytest.fixture
+def queue(tmp_path: Path) -> JobQueue:
+    return JobQueue(tmp_path / "jobs")
+
+
+def test_jobs_run_in_fifo_order(queue):
+    queue.enqueue("work", {"n": 1})
+    queue.enqueue("work", {"n": 2})
+    seen = []
+
+    stats = queue.drain({"work": lambda job, q: seen.append(job.payload["n"])})
+
+    assert seen == [1, 2]
+    assert stats == {"done": 2, "retried": 0, "failed": 0}
+    assert len(queue.status()["done"]) == 2
+
+
+def test_claim_is_exclusive(queue):
+    queue.enqueue("work", {})
+
+    assert queue.claim() is not None
+    assert queue.claim() is None
+    assert len(queue.status()["running"]) == 1
+
+
+def test_dedupe_key_replaces_pending_job(queue):
+    queue.enqueue("work", {"size": 1}, dedupe_key="session-1")
+    queue.enqueue("work", {"size": 2}, dedupe_key="session-1")
+    queue.enqueue("work", {"size": 3}, dedupe_key="session-2")
+
+    pending = queue.status()["pending"]
+
+    assert [job.payload["size"] for job in pending] == [2, 3]
+
+
+def test_failures_retry_with_backoff_then_fail(queue, monkeypatch):
+    monkeypatch.setattr(job_queue, "RETRY_BASE_SECONDS", 0.0)
+    queue.enqueue("work", {})
+    attempts = []
+
+    def flaky(job, q):
+        attempts.append(job.attempts)
+        raise RuntimeError("boom")
+
+    stats = queue.drain({"work": flaky})
+
+    assert attempts == [1, 2, 3]
+    assert stats == {"done": 0, "retried": 2, "failed": 1}
+    failed = queue.status()["failed"]
+    assert failed[0].error == "RuntimeError: boom"
+
+
+def test_backed_off_job_left_for_later_without_waiting(queue):
+    queue.enqueue("work", {})
+
+    def fail_once(job, q):
+        raise RuntimeError("transient")
+
+    queue.drain({"work": fail_once}, wait_for_retries=False)
+
+    pending = queue.status()["pending"]
+    assert pending[0].attempts == 1
+    assert pending[0].not_before > time.time()
+
+
+def test_checkpoints_survive_retry(queue, monkeypatch):
+    monkeypatch.setattr(job_queue, "RETRY_BASE_SECONDS", 0.0)
+    queue.enqueue("work", {})
+    runs = []
+
+    def handler(job, q):
+        steps = job.progress.get("steps", [])
+        runs.append(list(steps))
+        if "first" not in steps:
+            q.checkpoint(job, steps=["first"])
+            raise RuntimeError("crash after first step")
+
+    queue.drain({"work": handler})
+
+    assert runs == [[], ["first"]]
+    assert len(queue.status()["done"]) == 1
+
+
+def test_stale_running_jobs_are_requeued(queue):
+    queue.enqueue("work", {})
+    job = queue.claim()
+    running = queue.root / "running" / job.name
+    old = time.time() - job_queue.STALE_AFTER_SECONDS - 1
+    os.utime(running, (old, old))
+
+    assert queue.requeue_stale() == 1
+    assert queue.claim().id == job.id
+
+
+def test_single_worker_drains(queue):
+    queue.enqueue("work", {})
+
+    with queue.worker_lock() as acquired:
+        assert acquired
+        assert queue.drain({"work": lambda job, q: None}) == {"locked": 1}
+
+
+def test_job_enqueued_while_releasing_lock_is_drained(queue, monkeypatch):
+    queue.enqueue("work", {"n": 1})
+    worker_lock = queue.worker_lock
+    raced = []
+
+    @contextmanager
+    def racing_lock():
+        with worker_lock() as acquired:
+            yield acquired
+            # A producer enqueues after the last claim(); its spawn sees the lock held
+            if not raced:
+                raced.append(queue.enqueue("work", {"n": 2}))
+
+    monkeypatch.setattr(queue, "worker_lock", racing_lock)
+    seen = []
+
+    stats = queue.drain({"work": lambda job, q: seen.append(job.payload["n"])})
+
+    assert seen == [1, 2]
+    assert stats["done"] == 2
+
+
+def test_unknown_kind_fails_without_retry(queue):
+    queue.enqueue("mystery", {})
+
+    assert queue.drain({})["failed"] == 1
+    assert "No handler" in queue.status()["failed"][0].error
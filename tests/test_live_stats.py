@@ -0,0 +1,95 @@
+"""
+Tests for incremental dashboard aggregates (ctx-dashboard --watch).
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+
+from live_stats import LiveStats
+from observability_db import ObservabilityDB
+
+
+@pytest.fixture
+def db(tmp_path):
+    return ObservabilityDB(str(tmp_path / ".contextune" / "observability.db"))
+
+
+def log_detections(db, commands):
+    for command in commands:
+        db.set_detection(command, 0.9, "keyword", prompt_preview=f"run {command}", latency_ms=0.5)
+
+
+def test_first_poll_matches_full_scan(db):
+    log_detections(db, ["/ctx:plan", "/ctx:plan", "/ctx:execute"])
+    for latency in range(1, 101):
+        db.log_performance("hook", "detect", float(latency))
+    db.log_matcher_performance("keyword", 0.2, True)
+    db.log_matcher_performance("keyword", 0.4, False)
+    db.log_error("hook", "ValueError", "boom")
+
+    live = LiveStats(db.db_path)
+    assert live.poll() == 3 + 100 + 2 + 1
+
+    expected = db.get_stats()
+    actual = live.stats()
+    assert actual["detections"] == expected["detections"]
+    assert actual["errors"] == expected["errors"]
+    assert actual["matchers"] == expected["matchers"]
+    hook = actual["performance"]["hook"]
+    assert hook["count"] == 100
+    for key in ("p50", "p95", "p99"):
+        assert hook[key] == pytest.approx(expected["performance"]["hook"][key], rel=0.02)
+
+    recent = db.get_recent_detections(5)
+    assert list(live.recent_detections) == recent
+    assert live.recent_error_summary(24) == [
+        {key: e[key] for key in ("component", "error_type", "message", "timestamp")}
+        for e in db.get_error_summary(24)
+    ]
+    live.close()
+
+
+def test_poll_reads_only_new_rows(db):
+    log_detections(db, ["/ctx:plan"])
+    live = LiveStats(db.db_path)
+    live.poll()
+
+    assert live.poll() == 0
+
+    log_detections(db, ["/ctx:research", "/ctx:research"])
+    assert live.poll() == 2
+    assert live.stats()["detections"]["by_command"] == {"/ctx:research": 2, "/ctx:plan": 1}
+    assert live.recent_detections[0]["command"] == "/ctx:research"
+    live.close()
+
+
+def test_recreated_database_is_rebuilt(db, tmp_path):
+    log_detections(db, ["/ctx:plan", "/ctx:plan"])
+    live = LiveStats(db.db_path)
+    live.poll()
+    live.close()
+
+    for suffix in ("", "-wal", "-shm"):
+        Path(str(db.db_path) + suffix).unlink(missing_ok=True)
+    fresh = ObservabilityDB(str(db.db_path))
+    log_detections(fresh, ["/ctx:execute"])
+
+    live.poll()
+    assert live.stats()["detections"]["total"] == 1
+    live.close()
+
+
+def test_old_errors_fall_out_of_the_window(db):
+    db.log_error("hook", "ValueError", "old")
+    live = LiveStats(db.db_path)
+    live.poll()
+
+    live.recent_errors[0]["timestamp"] = time.time() - 2 * 86400
+
+    assert live.recent_error_summary(24) == []
+    live.close()
@@ -0,0 +1,74 @@
+"""
+Tests for the counters table (O(1) detection totals) in ObservabilityDB.
+"""
+
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+
+from observability_db import ObservabilityDB
+
+
+@pytest.fixture
+def db(tmp_path):
+    return ObservabilityDB(str(tmp_path / ".contextune" / "observability.db"))
+
+
+def test_set_detection_counts_by_method_and_command(db):
+    db.set_detection("/ctx:plan", 0.9, "keyword")
+    db.set_detection("/ctx:plan", 0.8, "model2vec")
+    db.set_detection("/ctx:research", 0.9, "keyword")
+
+    assert db.get_counter("detections", "total") == 3
+    assert db.get_counters("detections.method") == {"keyword": 2, "model2vec": 1}
+    assert db.get_counters("detections.command", limit=1) == {"/ctx:plan": 2}
+
+    detections = db.get_stats()["detections"]
+    assert detections == {
+        "total": 3,
+        "by_method": {"keyword": 2, "model2vec": 1},
+        "by_command": {"/ctx:plan": 2, "/ctx:research": 1},
+    }
+
+
+def test_missing_counter_is_zero(db):
+    assert db.get_counter("detections", "total") == 0
+    assert db.get_counter("nope", "nothing") == 0
+    assert db.get_counters("nope") == {}
+
+
+def test_existing_history_is_seeded_once(db):
+    conn = sqlite3.connect(db.db_path)
+    with conn:
+        conn.executemany(
+            "INSERT INTO detection_history (command, confidence, method, timestamp) VALUES (?, ?, ?, ?)",
+            [("/ctx:plan", 0.9, "keyword", 1.0), ("/ctx:execute", 0.9, "semantic", 2.0)],
+        )
+        # As if the database predated the counters table
+        conn.execute("DELETE FROM counters")
+    conn.close()
+
+    reopened = ObservabilityDB(str(db.db_path))
+    ObservabilityDB(str(db.db_path))
+
+    assert reopened.get_counter("detections", "total") == 2
+    assert reopened.get_counters("detections.method") == {"keyword": 1, "semantic": 1}
+
+
+def test_concurrent_increments_are_not_lost(db):
+    def bump():
+        for _ in range(25):
+            db.increment_counter("tips", "shown")
+
+    threads = [threading.Thread(target=bump) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert db.get_counter("tips", "shown") == 100
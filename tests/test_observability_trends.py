@@ -0,0 +1,109 @@
+"""
+Tests for downsampled trend queries and hourly rollups in ObservabilityDB.
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+
+import observability_db
+from observability_db import ObservabilityDB
+
+# Half past an hour, so the open hour already has rows in it
+NOW = 1_700_001_000.0
+HOUR = 3600
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(observability_db.time, "time", lambda: NOW)
+    db = ObservabilityDB(str(tmp_path / ".contextune" / "observability.db"))
+
+    metrics = []
+    errors = []
+    for hours_ago in range(48):
+        for i in range(1, 21):
+            metrics.append(("hook", "detect", float(i * (hours_ago + 1)), NOW - hours_ago * HOUR - i))
+        metrics.append(("matcher", "match", 1.0, NOW - hours_ago * HOUR))
+        if hours_ago % 2 == 0:
+            errors.append(("hook", "ValueError", "boom", NOW - hours_ago * HOUR - 5))
+
+    conn = sqlite3.connect(db.db_path)
+    with conn:
+        conn.executemany(
+            "INSERT INTO performance_metrics (component, operation, latency_ms, timestamp) "
+            "VALUES (?, ?, ?, ?)",
+            metrics,
+        )
+        conn.executemany(
+            "INSERT INTO error_logs (component, error_type, message, timestamp) VALUES (?, ?, ?, ?)",
+            errors,
+        )
+        conn.executemany(
+            "INSERT INTO detection_history (command, confidence, method, timestamp, latency_ms) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [("/ctx:plan", 0.9, "keyword", NOW - h * HOUR, None) for h in range(10)],
+        )
+    conn.close()
+    return db
+
+
+def test_raw_trends_are_computed_per_bucket(db):
+    points = db.get_trends(series="hook", hours=3, use_rollups=False)
+
+    # Buckets start on hour boundaries, oldest first
+    assert [p["bucket_start"] % HOUR for p in points] == [0] * len(points)
+    assert points == sorted(points, key=lambda p: p["bucket_start"])
+
+    latest = points[-1]
+    assert latest["count"] == 20
+    assert latest["mean"] == pytest.approx(10.5)
+    assert latest["p95"] == 20.0  # sorted(1..20)[int(0.95 * 20)]
+    assert latest["error_rate"] == pytest.approx(1 / 20)
+
+
+def test_rollups_match_raw_rows(db):
+    raw = db.get_trends(series="hook", bucket_seconds=6 * HOUR, hours=48, use_rollups=False)
+    rolled = db.get_trends(series="hook", bucket_seconds=6 * HOUR, hours=48)
+
+    assert [p["bucket_start"] for p in rolled] == [p["bucket_start"] for p in raw]
+    for expected, actual in zip(raw, rolled, strict=True):
+        assert actual["count"] == expected["count"]
+        assert actual["mean"] == pytest.approx(expected["mean"])
+        assert actual["error_rate"] == pytest.approx(expected["error_rate"])
+        assert actual["p95"] == pytest.approx(expected["p95"], rel=0.02)
+
+
+def test_rollups_are_incremental(db, monkeypatch):
+    assert db.refresh_rollups() > 0
+    assert db.refresh_rollups() == 0
+
+    # The next hour closes: only it is rolled up
+    monkeypatch.setattr(observability_db.time, "time", lambda: NOW + HOUR)
+    assert db.refresh_rollups() == 4  # hook, matcher, /ctx:plan, hook errors
+
+
+def test_all_series_and_metric_selection(db):
+    points = db.get_trends(metrics=["count"], hours=1)
+
+    assert points[-1] == {"bucket_start": points[-1]["bucket_start"], "count": 21}
+
+
+def test_detection_trends_without_latency(db):
+    points = db.get_trends(source="detection_history", bucket_seconds=86400, hours=24 * 3)
+
+    assert sum(p["count"] for p in points) == 10
+    assert all(p["mean"] is None and p["p95"] is None for p in points)
+
+
+def test_invalid_arguments(db):
+    with pytest.raises(ValueError):
+        db.get_trends(source="error_logs")
+    with pytest.raises(ValueError):
+        db.get_trends(metrics=["p42"])
+    with pytest.raises(ValueError):
+        db.get_trends(bucket_seconds=0)
@@ -0,0 +1,157 @@
+"""
+Tests for PlanRunner: executing PlanBuilder's plan.yaml as a DAG with
+resumable state and observability metrics.
+"""
+
+import json
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+
+from plan_builder import PlanBuilder
+from plan_runner import STATE_FILE, LocalExecutor, PlanRunner, SubprocessExecutor
+
+
+@pytest.fixture
+def plan_dir(tmp_path: Path) -> Path:
+    builder = PlanBuilder("Runner Test", output_dir=str(tmp_path / "plans"))
+    builder.add_task(id="task-0", name="Models", priority="blocker", content="# Models\n")
+    builder.add_task(id="task-1", name="API", priority="high", content="# API\n", dependencies=["task-0"])
+    builder.add_task(id="task-2", name="Docs", priority="low", content="# Docs\n")
+    builder.add_task(
+        id="task-3", name="Wire up", priority="medium", content="# Wire\n",
+        dependencies=["task-1", "task-2"],
+    )
+    builder.build()
+    return tmp_path / "plans"
+
+
+def make_runner(plan_dir: Path, func, **kwargs) -> PlanRunner:
+    return PlanRunner(
+        plan_dir, LocalExecutor(func), db_path=plan_dir.parent / "obs.db", **kwargs
+    )
+
+
+def test_runs_in_dependency_order(plan_dir):
+    order = []
+
+    outcomes = make_runner(plan_dir, lambda task: order.append(task["id"])).run()
+
+    assert all(o.status == "done" for o in outcomes.values())
+    assert order.index("task-0") < order.index("task-1") < order.index("task-3")
+    assert order.index("task-2") < order.index("task-3")
+
+
+def test_failed_run_resumes_with_unfinished_tasks(plan_dir):
+    def flaky(task):
+        if task["id"] == "task-1":
+            raise RuntimeError("tests failed")
+
+    first = make_runner(plan_dir, flaky).run()
+
+    assert first["task-1"].status == "failed"
+    assert first["task-3"].status == "skipped"
+    state = json.loads((plan_dir / STATE_FILE).read_text())
+    assert state["tasks"]["task-0"]["status"] == "done"
+    assert state["tasks"]["task-1"]["error"] == "RuntimeError: tests failed"
+
+    rerun = []
+    resumed = make_runner(plan_dir, lambda task: rerun.append(task["id"]))
+    assert resumed.ready() == ["task-1"]
+    resumed.run()
+
+    assert sorted(rerun) == ["task-1", "task-3"]
+    assert resumed.state["tasks"]["task-1"]["attempts"] == 2
+    assert resumed.completed() == ["task-0", "task-1", "task-2", "task-3"]
+
+
+def test_reset_forgets_previous_runs(plan_dir):
+    make_runner(plan_dir, lambda task: None).run()
+
+    runner = make_runner(plan_dir, lambda task: None)
+    runner.reset()
+
+    assert runner.ready() == ["task-0", "task-2"]
+    assert not (plan_dir / STATE_FILE).exists()
+
+
+def test_task_timeout(plan_dir):
+    outcomes = make_runner(
+        plan_dir, lambda task: time.sleep(1 if task["id"] == "task-2" else 0), timeout=0.05
+    ).run()
+
+    assert outcomes["task-2"].status == "failed"
+    assert outcomes["task-2"].error.startswith("TimeoutError")
+    assert outcomes["task-1"].status == "done"
+
+
+def test_concurrency_bound(plan_dir):
+    import threading
+
+    active, peak = 0, 0
+    lock = threading.Lock()
+
+    def work(task):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.03)
+        with lock:
+            active -= 1
+
+    make_runner(plan_dir, work, max_parallel=1).run()
+
+    assert peak == 1
+
+
+def test_timings_logged_to_observability_db(plan_dir):
+    make_runner(plan_dir, lambda task: None).run()
+
+    with sqlite3.connect(plan_dir.parent / "obs.db") as conn:
+        rows = conn.execute(
+            "SELECT operation, metadata FROM performance_metrics WHERE component = 'plan_runner'"
+        ).fetchall()
+
+    tasks = [json.loads(meta)["task_id"] for op, meta in rows if op == "task"]
+    assert sorted(tasks) == ["task-0", "task-1", "task-2", "task-3"]
+    run = [json.loads(meta) for op, meta in rows if op == "run"]
+    assert run[0]["plan"] == "Runner Test" and run[0]["done"] == 4
+
+
+def test_subprocess_executor(plan_dir, tmp_path):
+    executor = SubprocessExecutor(
+        'test -f {task_file} && echo "$CONTEXTUNE_TASK_ID"', project_root=tmp_path, use_worktrees=False
+    )
+    runner = PlanRunner(plan_dir, executor, db_path=None)
+
+    outcomes = runner.run()
+
+    assert all(o.status == "done" for o in outcomes.values())
+    assert (plan_dir / "logs" / "task-3.log").read_text().strip() == "task-3"
+
+    runner = PlanRunner(plan_dir, SubprocessExecutor("exit 3", use_worktrees=False), db_path=None)
+    runner.reset()
+    assert "exit code 3" in runner.run()["task-0"].error
+
+
+def test_subprocess_executor_leaves_other_braces_and_resolves_paths(plan_dir, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    relative = plan_dir.relative_to(tmp_path)
+    workdir = tmp_path / "elsewhere"
+    workdir.mkdir()
+    executor = SubprocessExecutor(
+        "echo ${HOME:+home} {plan_dir} $CONTEXTUNE_PLAN_DIR | awk '{print $1, $2 == $3, substr($2, 1, 1)}'",
+        project_root=workdir, use_worktrees=False,
+    )
+
+    executor({"id": "task-0"}, relative, None)
+
+    log = (plan_dir / "logs" / "task-0.log").read_text().split()
+    # Braces that are not tokens pass through; paths are absolute
+    assert log == ["home", "1", "/"]
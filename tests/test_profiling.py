@@ -0,0 +1,119 @@
+"""
+Tests for on-demand hook profiling.
+"""
+
+import os
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+
+import profiling
+import tracing
+
+
+def busy(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def test_settings_environment_overrides_config(isolated_profiling_config, monkeypatch):
+    isolated_profiling_config.write_text(
+        "contextune:\n  profiling:\n    enabled: true\n    mode: cprofile\n    rate: 0.5\n"
+    )
+    assert profiling.settings() == {
+        "enabled": True, "mode": "cprofile", "rate": 0.5, "interval_ms": 5.0,
+    }
+
+    monkeypatch.setenv("CONTEXTUNE_PROFILE", "sample")
+    monkeypatch.setenv("CONTEXTUNE_PROFILE_RATE", "1")
+    assert profiling.settings()["mode"] == "sample"
+    assert profiling.settings()["rate"] == 1.0
+
+    monkeypatch.setenv("CONTEXTUNE_PROFILE", "0")
+    assert profiling.settings()["enabled"] is False
+
+
+def test_disabled_or_unsampled_writes_nothing(tmp_path, monkeypatch):
+    with profiling.profile("hook", "abc", tmp_path) as path:
+        pass
+    assert path is None
+
+    monkeypatch.setenv("CONTEXTUNE_PROFILE", "1")
+    monkeypatch.setenv("CONTEXTUNE_PROFILE_RATE", "0")
+    with profiling.profile("hook", "abc", tmp_path) as path:
+        pass
+    assert path is None
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_sampled_profile_is_collapsed_stacks(tmp_path, monkeypatch):
+    monkeypatch.setenv("CONTEXTUNE_PROFILE", "sample")
+    monkeypatch.setenv("CONTEXTUNE_PROFILE_RATE", "1")
+    monkeypatch.setenv("CONTEXTUNE_PROFILE_INTERVAL_MS", "1")
+
+    with profiling.profile("user_prompt_submit", "abc123", tmp_path) as path:
+        busy(0.1)
+
+    assert path == tmp_path / "user_prompt_submit.abc123.folded"
+    stacks = profiling.read_collapsed([path])
+    assert sum(stacks.values()) > 10
+    hottest = profiling.hot_functions(stacks)[0]
+    assert hottest["function"].startswith("busy (test_profiling.py:")
+
+
+def test_cprofile_mode(tmp_path, monkeypatch):
+    monkeypatch.setenv("CONTEXTUNE_PROFILE", "cprofile")
+    monkeypatch.setenv("CONTEXTUNE_PROFILE_RATE", "1")
+
+    with profiling.profile("tool_router", "abc123", tmp_path) as path:
+        busy(0.01)
+
+    assert path.suffix == ".prof"
+    rows = profiling.hot_functions_cprofile(profiling.find_profiles(tmp_path, kind="prof"))
+    assert any(row["function"].startswith("busy ") and row["calls"] == 1 for row in rows)
+
+
+def test_merge_and_rank():
+    stacks = Counter({"main;detect;match": 6, "main;detect": 2, "main;write": 2})
+    rows = {row["function"]: row for row in profiling.hot_functions(stacks)}
+
+    assert rows["match"]["self"] == 6
+    assert rows["detect"]["self_pct"] == pytest.approx(20.0)
+    assert rows["detect"]["total_pct"] == pytest.approx(80.0)
+    assert rows["main"]["total_pct"] == pytest.approx(100.0)
+    assert profiling.hot_functions(stacks)[0]["function"] == "match"
+
+
+def test_find_profiles_last_n_and_pruning(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, "MAX_PROFILES", 3)
+    monkeypatch.setenv("CONTEXTUNE_PROFILE", "sample")
+    monkeypatch.setenv("CONTEXTUNE_PROFILE_RATE", "1")
+
+    for i in range(5):
+        with profiling.profile("hook", f"t{i}", tmp_path) as path:
+            pass
+        # File mtimes are coarse; make the write order explicit
+        os.utime(path, (1_700_000_000 + i, 1_700_000_000 + i))
+
+    assert [p.name for p in profiling.find_profiles(tmp_path, "hook", last=2)] == [
+        "hook.t3.folded", "hook.t4.folded",
+    ]
+    assert len(profiling.find_profiles(tmp_path)) == 3
+
+
+def test_trace_profiles_with_its_trace_id(tmp_path, monkeypatch):
+    monkeypatch.setattr(tracing, "_tracer", None)
+    monkeypatch.setattr(profiling, "PROFILE_DIR", tmp_path / "profiles")
+    monkeypatch.setenv("CONTEXTUNE_PROFILE", "sample")
+    monkeypatch.setenv("CONTEXTUNE_PROFILE_RATE", "1")
+
+    with tracing.trace("tool_router", db_path=tmp_path / "observability.db") as root:
+        trace_id = root._tracer.trace_id
+
+    assert (tmp_path / "profiles" / f"tool_router.{trace_id}.folded").exists()
@@ -0,0 +1,94 @@
+"""
+Tests for the project registry that replaces recursive home-directory
+globbing in GlobalObservability.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+
+import project_registry
+from global_observability import GlobalObservability
+from observability_db import ObservabilityDB
+from project_registry import ProjectRegistry
+
+
+def make_db(project: Path) -> Path:
+    db_path = project / ".contextune" / "observability.db"
+    db_path.parent.mkdir(parents=True)
+    db_path.touch()
+    return db_path
+
+
+def test_observability_db_registers_itself(tmp_path, isolated_project_registry):
+    project = tmp_path / "proj"
+    project.mkdir()
+
+    ObservabilityDB(str(project / ".contextune" / "observability.db"))
+
+    data = json.loads(isolated_project_registry.read_text())
+    assert list(data["databases"]) == [str((project / ".contextune" / "observability.db").resolve())]
+
+
+def test_registration_skips_write_while_recently_seen(tmp_path):
+    registry = ProjectRegistry()
+    db_path = make_db(tmp_path / "proj")
+
+    assert registry.register(db_path) is True
+    assert registry.register(db_path) is False
+
+
+def test_stale_last_seen_is_refreshed(tmp_path, monkeypatch):
+    registry = ProjectRegistry()
+    db_path = make_db(tmp_path / "proj")
+    registry.register(db_path)
+
+    monkeypatch.setattr(project_registry, "SEEN_REFRESH_SECONDS", -1)
+
+    assert registry.register(db_path) is True
+
+
+def test_dead_entries_are_pruned(tmp_path):
+    registry = ProjectRegistry()
+    keep = make_db(tmp_path / "keep")
+    gone = make_db(tmp_path / "gone")
+    registry.register(keep)
+    registry.register(gone)
+
+    gone.unlink()
+
+    assert registry.databases() == [keep.resolve()]
+    assert list(registry.load()) == [str(keep.resolve())]
+
+
+def test_crawl_is_bounded_and_skips_noise(tmp_path):
+    found = make_db(tmp_path / "code" / "app")
+    make_db(tmp_path / "code" / "app" / "node_modules" / "dep")
+    make_db(tmp_path / ".hidden" / "proj")
+    make_db(tmp_path / "a" / "b" / "c" / "d" / "e" / "deep")
+    (tmp_path / "link").symlink_to(tmp_path / "code")
+
+    registry = ProjectRegistry()
+    result = registry.crawl([tmp_path, tmp_path / "code"], max_depth=4)
+
+    assert result == [found]
+    assert registry.databases() == [found.resolve()]
+
+
+def test_global_observability_reads_registry(tmp_path):
+    inside = make_db(tmp_path / "home" / "proj")
+    outside = make_db(tmp_path / "elsewhere" / "proj")
+    for db_path in (inside, outside):
+        ProjectRegistry().register(db_path)
+
+    assert set(GlobalObservability(crawl=False).databases) == {inside.resolve(), outside.resolve()}
+    assert GlobalObservability(search_root=tmp_path / "home").databases == [inside.resolve()]
+
+
+def test_global_observability_crawl_registers(tmp_path):
+    db_path = make_db(tmp_path / "projects" / "old")
+
+    assert GlobalObservability(search_root=tmp_path, crawl=True).databases == [db_path.resolve()]
+    assert ProjectRegistry().databases() == [db_path.resolve()]
@@ -0,0 +1,56 @@
+"""
+Tests for the mergeable QuantileSketch used for cross-project latency percentiles.
+"""
+
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+
+from quantile_sketch import RELATIVE_ACCURACY, QuantileSketch
+
+
+def exact(values, q):
+    ordered = sorted(values)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+@pytest.mark.parametrize("q", [0.0, 0.5, 0.9, 0.95, 0.99, 1.0])
+def test_quantiles_within_relative_accuracy(q):
+    rng = random.Random(7)
+    values = [rng.lognormvariate(2, 1.2) for _ in range(5000)]
+
+    estimate = QuantileSketch().extend(values).quantile(q)
+
+    assert estimate == pytest.approx(exact(values, q), rel=RELATIVE_ACCURACY * 1.01)
+
+
+def test_merge_matches_single_sketch():
+    rng = random.Random(3)
+    a = [rng.uniform(0.1, 50) for _ in range(1000)]
+    b = [rng.uniform(20, 500) for _ in range(300)]
+
+    merged = QuantileSketch().extend(a).merge(QuantileSketch().extend(b))
+    single = QuantileSketch().extend(a + b)
+
+    assert merged.summary() == pytest.approx(single.summary())
+    assert merged.min == min(a + b) and merged.max == max(a + b)
+
+
+def test_round_trip_and_zero_values():
+    sketch = QuantileSketch().extend([0.0, 0.0, 1.5, 3.0])
+
+    restored = QuantileSketch.from_dict(sketch.to_dict())
+
+    assert restored.quantile(0.25) == 0.0
+    assert restored.quantile(1.0) == pytest.approx(3.0, rel=RELATIVE_ACCURACY)
+    assert restored.mean == pytest.approx(1.125)
+    assert QuantileSketch().quantile(0.5) is None
+
+
+def test_merge_rejects_different_accuracy():
+    with pytest.raises(ValueError):
+        QuantileSketch(0.01).merge(QuantileSketch(0.05))
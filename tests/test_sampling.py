@@ -0,0 +1,199 @@
+"""
+Tests for sampled performance logging (spool + sketches + weighted rows).
+"""
+
+import os
+import random
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+
+import sampling
+import tracing
+from live_stats import LiveStats
+from observability_db import ObservabilityDB
+from sampling import SamplingPolicy
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    monkeypatch.delenv("CONTEXTUNE_SAMPLING", raising=False)
+    random.seed(1234)
+    return tmp_path / ".contextune" / "observability.db"
+
+
+def rows(db_path):
+    conn = sqlite3.connect(db_path)
+    result = conn.execute(
+        "SELECT latency_ms, weight FROM performance_metrics ORDER BY id"
+    ).fetchall()
+    conn.close()
+    return result
+
+
+def test_policy_overrides(monkeypatch):
+    monkeypatch.setenv("CONTEXTUNE_SAMPLING", "tool_router=1000:25, cost_tracker=1")
+
+    assert sampling.policy_for("tool_router") == SamplingPolicy(1000, 25.0)
+    assert sampling.policy_for("cost_tracker") == SamplingPolicy(1, None)
+    assert sampling.policy_for("hook") is None
+
+
+def test_row_weight():
+    policy = SamplingPolicy(every=10, slow_ms=50.0)
+
+    assert sampling.row_weight(policy, 1.0, error=True) == 1
+    assert sampling.row_weight(policy, 75.0) == 1
+    assert sampling.row_weight(SamplingPolicy(every=1), 1.0) == 1
+    kept = [sampling.row_weight(policy, 1.0) for _ in range(1000)]
+    assert set(kept) == {None, 10}
+    assert 50 < kept.count(10) < 150
+
+
+def test_counts_and_percentiles_are_exact_with_few_rows(db_path, monkeypatch):
+    monkeypatch.setenv("CONTEXTUNE_SAMPLING", "tool_router=50")
+    latencies = [float(i % 100 + 1) for i in range(1000)]
+    for latency in latencies:
+        sampling.record("tool_router", "route_decision", latency, db_path=db_path)
+
+    written = rows(db_path)
+    assert 5 < len(written) < 50
+    assert {weight for _, weight in written} == {50}
+
+    stats = ObservabilityDB(str(db_path)).get_stats()["performance"]["tool_router"]
+    assert stats["count"] == 1000
+    ordered = sorted(latencies)
+    assert stats["p95"] == pytest.approx(ordered[950], rel=0.02)
+    assert stats["p50"] == pytest.approx(ordered[500], rel=0.02)
+
+
+def test_errors_and_slow_outliers_keep_full_fidelity(db_path, monkeypatch):
+    monkeypatch.setenv("CONTEXTUNE_SAMPLING", "tool_router=1000000:40")
+
+    sampling.record("tool_router", "route_decision", 45.0, db_path=db_path)
+    sampling.record("tool_router", "route_decision", 0.5, error=True, db_path=db_path)
+    sampling.record("tool_router", "route_decision", 0.5, db_path=db_path)
+
+    assert rows(db_path) == [(45.0, 1), (0.5, 1)]
+    sampled = ObservabilityDB(str(db_path)).get_sampled_stats()["tool_router"]
+    assert sampled["count"] == 3
+    assert sampled["errors"] == 1
+
+
+def test_unsampled_components_log_every_row(db_path):
+    for _ in range(3):
+        assert sampling.record("hook", "detect", 2.0, db_path=db_path)
+
+    assert rows(db_path) == [(2.0, 1)] * 3
+    assert not sampling.spool_path(db_path).exists()
+
+
+def test_unsampled_events_do_not_open_the_database(db_path, monkeypatch):
+    monkeypatch.setenv("CONTEXTUNE_SAMPLING", "tool_router=1000000")
+    db_path.parent.mkdir()
+
+    for _ in range(10):
+        assert not sampling.record("tool_router", "route_decision", 1.0, db_path=db_path)
+
+    assert not db_path.exists()
+    assert len(sampling.spool_path(db_path).read_text().splitlines()) == 10
+
+
+def test_fold_is_incremental_and_recovers_stale_claims(db_path, monkeypatch):
+    monkeypatch.setenv("CONTEXTUNE_SAMPLING", "tool_router=1000000")
+    db = ObservabilityDB(str(db_path))
+    spool = sampling.spool_path(db_path)
+
+    for _ in range(5):
+        sampling.record("tool_router", "route_decision", 1.0, db_path=db_path)
+    assert db.fold_samples() == 5
+    assert db.fold_samples() == 0
+
+    # A folder crashed after claiming: its claim is picked up once stale
+    sampling.append(spool, "tool_router", "route_decision", 1.0)
+    crashed = spool.with_name(f"{spool.name}.999.{time.time_ns()}.folding")
+    os.replace(spool, crashed)
+    assert db.fold_samples() == 0
+    old_ns = time.time_ns() - 2 * sampling.STALE_CLAIM_SECONDS * 10**9
+    os.replace(crashed, spool.with_name(f"{spool.name}.999.{old_ns}.folding"))
+    assert db.fold_samples() == 1
+
+    assert db.get_sampled_stats()["tool_router"]["count"] == 6
+
+
+def test_fresh_claim_of_idle_spool_is_not_stale(db_path):
+    spool = sampling.spool_path(db_path)
+    db_path.parent.mkdir()
+    sampling.append(spool, "tool_router", "route_decision", 1.0)
+    # The spool sat idle: its mtime (kept by the rename) is old
+    old = time.time() - 2 * sampling.STALE_CLAIM_SECONDS
+    os.utime(spool, (old, old))
+
+    first = sampling.claim(spool)
+    assert len(first) == 1
+    assert sampling.claim(spool) == []
+
+
+def test_trends_and_live_stats_weight_sampled_rows(db_path):
+    db = ObservabilityDB(str(db_path))
+    db.log_performance("tool_router", "route_decision", 1.0, weight=9)
+    db.log_performance("tool_router", "route_decision", 100.0)
+
+    for use_rollups in (True, False):
+        point = db.get_trends(series="tool_router", hours=1, use_rollups=use_rollups)[-1]
+        assert point["count"] == 10
+        assert point["mean"] == pytest.approx((9 * 1.0 + 100.0) / 10)
+        assert point["p95"] == pytest.approx(100.0, rel=0.02)
+
+    live = LiveStats(db_path)
+    live.poll()
+    assert live.stats()["performance"]["tool_router"]["count"] == 10
+    live.close()
+
+
+def test_live_stats_overlays_folded_samples(db_path, monkeypatch):
+    monkeypatch.setenv("CONTEXTUNE_SAMPLING", "tool_router=50")
+    db = ObservabilityDB(str(db_path))
+    for i in range(1000):
+        sampling.record("tool_router", "route_decision", float(i % 100 + 1), db_path=db_path)
+    db.fold_samples()
+
+    live = LiveStats(db_path)
+    live.poll()
+    expected = db.get_stats()["performance"]["tool_router"]
+    assert live.stats()["performance"]["tool_router"] == expected
+    assert expected["count"] == 1000
+
+    # A fold rewrites the bucket row in place; unchanged rows are not re-applied
+    assert live.poll() == 0
+    for _ in range(10):
+        sampling.append(sampling.spool_path(db_path), "tool_router", "route_decision", 500.0)
+    db.fold_samples()
+    assert live.poll() == 1
+    assert live.stats()["performance"]["tool_router"] == db.get_stats()["performance"]["tool_router"]
+    assert live.stats()["performance"]["tool_router"]["count"] == 1010
+    live.close()
+
+
+def test_sampled_traces(db_path, monkeypatch):
+    monkeypatch.setattr(tracing, "_tracer", None)
+    rarely = SamplingPolicy(every=1000000)
+
+    with tracing.trace("tool_router", db_path=db_path, sample=rarely):
+        pass
+    assert not db_path.exists()
+
+    with pytest.raises(ValueError):
+        with tracing.trace("tool_router", db_path=db_path, sample=rarely):
+            raise ValueError("boom")
+
+    conn = sqlite3.connect(db_path)
+    assert conn.execute(
+        "SELECT status, weight FROM trace_spans WHERE parent_id IS NULL"
+    ).fetchall() == [("error", 1)]
+    conn.close()
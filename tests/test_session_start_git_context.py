@@ -0,0 +1,114 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.10"
+# dependencies = ["pyyaml>=6.0", "pytest>=7.0"]
+# ///
+"""
+Tests for SessionStart git context.
+
+HEAD is read from .git directly: when it is still the commit recorded at
+SessionEnd no history git calls are made, otherwise only the delta since
+that commit is computed. Working tree status is always live.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "hooks"))
+
+import session_start_git_context as git_context
+
+
+def git(repo: Path, *args: str) -> str:
+    result = subprocess.run(
+        ["git", *args], cwd=repo, capture_output=True, text=True, check=True
+    )
+    return result.stdout.strip()
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    repo_dir = tmp_path / "repo"
+    repo_dir.mkdir()
+    git(repo_dir, "init", "-q")
+    git(repo_dir, "config", "user.email", "test@example.com")
+    git(repo_dir, "config", "user.name", "Test")
+    (repo_dir / "a.txt").write_text("a\n")
+    git(repo_dir, "add", "a.txt")
+    git(repo_dir, "commit", "-q", "-m", "initial")
+
+    monkeypatch.chdir(repo_dir)
+    return repo_dir
+
+
+def make_session(repo_dir: Path) -> dict:
+    return {
+        "session_id": "session-1",
+        "ended_at": "2025-10-27T10:00:00Z",
+        "last_commit": git(repo_dir, "rev-parse", "HEAD"),
+        "branch": git(repo_dir, "branch", "--show-current"),
+        "files_worked_on": ["a.txt"],
+        "file_count": 1,
+    }
+
+
+def test_read_head_commit_matches_git(repo):
+    assert git_context.read_head_commit() == git(repo, "rev-parse", "HEAD")
+
+
+def test_read_head_commit_packed_refs(repo):
+    git(repo, "pack-refs", "--all")
+    assert git_context.read_head_commit() == git(repo, "rev-parse", "HEAD")
+
+
+def git_calls(monkeypatch) -> list:
+    calls = []
+    run = subprocess.run
+
+    def recording_run(cmd, *args, **kwargs):
+        calls.append(" ".join(cmd[:2]))
+        return run(cmd, *args, **kwargs)
+
+    monkeypatch.setattr(git_context.subprocess, "run", recording_run)
+    return calls
+
+
+def test_unchanged_head_skips_history_git_calls(repo, monkeypatch):
+    session = make_session(repo)
+    calls = git_calls(monkeypatch)
+
+    summary = git_context.generate_context_summary(session)
+
+    assert "No commits since last session" in summary
+    assert calls == ["git status"]
+
+
+def test_new_commit_computes_delta_since_recorded_head(repo, monkeypatch):
+    session = make_session(repo)
+    (repo / "b.txt").write_text("b\n")
+    git(repo, "add", "b.txt")
+    git(repo, "commit", "-q", "-m", "second")
+    calls = git_calls(monkeypatch)
+
+    summary = git_context.generate_context_summary(session)
+
+    assert "1 new commit" in summary
+    assert "second" in summary
+    assert "- b.txt" in summary
+    assert "git log" in calls
+
+
+def test_working_tree_status_is_live(repo):
+    session = make_session(repo)
+
+    # Unstaged edits and untracked files change neither HEAD nor the index
+    (repo / "a.txt").write_text("edited\n")
+    (repo / "new.txt").write_text("new\n")
+
+    summary = git_context.generate_context_summary(session)
+
+    assert "2 uncommitted changes" in summary
+    assert "?? new.txt" in summary
@@ -0,0 +1,63 @@
+"""
+Tests for the status line snapshot written alongside current_detection.
+"""
+
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+
+import statusline_snapshot
+from observability_db import ObservabilityDB
+
+STATUSLINE_SH = Path(__file__).parent.parent / "statusline.sh"
+
+
+@pytest.fixture
+def db(tmp_path):
+    return ObservabilityDB(str(tmp_path / ".contextune" / "observability.db"))
+
+
+def snapshot(db):
+    return statusline_snapshot.snapshot_path(db.db_path)
+
+
+def test_detection_writes_formatted_line(db):
+    db.set_detection("/ctx:research", 0.95, "keyword")
+
+    assert snapshot(db).read_text() == "🎯 /ctx:research (95% via keyword)\n"
+    assert statusline_snapshot.read(snapshot(db)) == "🎯 /ctx:research (95% via keyword)"
+    # Only the snapshot is left behind, no temp files
+    assert sorted(p.name for p in snapshot(db).parent.glob("*statusline*")) == ["statusline"]
+
+
+def test_clear_removes_snapshot(db):
+    db.set_detection("/ctx:plan", 0.85, "model2vec")
+    db.clear_detection()
+
+    assert not snapshot(db).exists()
+    assert statusline_snapshot.read(snapshot(db)) == statusline_snapshot.READY
+
+
+def test_latest_detection_wins(db):
+    db.set_detection("/ctx:plan", 0.85, "model2vec")
+    db.set_detection("/ctx:execute", 0.29, "semantic")
+
+    assert statusline_snapshot.read(snapshot(db)) == "🎯 /ctx:execute (29% via semantic)"
+
+
+@pytest.mark.skipif(shutil.which("bash") is None, reason="bash not available")
+def test_statusline_script_reads_snapshot(db, tmp_path):
+    def render():
+        return subprocess.run(
+            ["bash", str(STATUSLINE_SH)], cwd=tmp_path, capture_output=True, text=True
+        ).stdout
+
+    assert render() == "🎯 Contextune: Ready\n"
+
+    db.set_detection("/ctx:research", 0.95, "keyword")
+    assert render() == "🎯 /ctx:research (95% via keyword)\n"
@@ -0,0 +1,118 @@
+"""
+Tests for per-invocation tracing spans.
+"""
+
+import json
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+
+import tracing
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return tmp_path / ".contextune" / "observability.db"
+
+
+@pytest.fixture(autouse=True)
+def fresh_process(monkeypatch):
+    monkeypatch.setattr(tracing, "_startup_recorded", False)
+    monkeypatch.setattr(tracing, "_tracer", None)
+    monkeypatch.delenv("CONTEXTUNE_TRACE", raising=False)
+
+
+def spans(db_path):
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    rows = [dict(r) for r in conn.execute("SELECT * FROM trace_spans ORDER BY start")]
+    conn.close()
+    return {row["name"]: row for row in rows}
+
+
+def test_nested_spans_share_trace_and_parents(db_path):
+    @tracing.span("detect")
+    def detect():
+        with tracing.span("db.write", table="detection_history"):
+            pass
+        return "/ctx:plan"
+
+    with tracing.trace("user_prompt_submit", db_path=db_path):
+        with tracing.span("parse_stdin"):
+            pass
+        assert detect() == "/ctx:plan"
+
+    recorded = spans(db_path)
+    root = recorded["user_prompt_submit"]
+    assert root["parent_id"] is None
+    assert {row["trace_id"] for row in recorded.values()} == {root["trace_id"]}
+    assert recorded["parse_stdin"]["parent_id"] == root["span_id"]
+    assert recorded["detect"]["parent_id"] == root["span_id"]
+    assert recorded["db.write"]["parent_id"] == recorded["detect"]["span_id"]
+    assert json.loads(recorded["db.write"]["attributes"]) == {"table": "detection_history"}
+    assert recorded["imports"]["parent_id"] == root["span_id"]
+    assert root["duration_ms"] >= recorded["detect"]["duration_ms"]
+
+
+def test_spans_are_noops_outside_a_trace(db_path):
+    @tracing.span("detect")
+    def detect():
+        return 42
+
+    with tracing.span("orphan") as orphan:
+        assert detect() == 42
+    assert orphan.span_id is None
+    assert not db_path.exists()
+
+
+def test_spans_flush_in_one_batch_at_trace_end(db_path):
+    with tracing.trace("tool_router", db_path=db_path):
+        for _ in range(10):
+            with tracing.span("route"):
+                pass
+        assert not db_path.exists()
+
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("SELECT COUNT(*) FROM trace_spans WHERE name = 'route'").fetchone()[0] == 10
+    conn.close()
+
+
+def test_error_and_exit_status(db_path):
+    with pytest.raises(SystemExit):
+        with tracing.trace("git_workflow_detector", db_path=db_path):
+            with pytest.raises(ValueError):
+                with tracing.span("parse_stdin"):
+                    raise ValueError("bad json")
+            sys.exit(0)
+
+    recorded = spans(db_path)
+    assert recorded["parse_stdin"]["status"] == "error"
+    assert json.loads(recorded["parse_stdin"]["attributes"]) == {"error": "ValueError"}
+    assert recorded["git_workflow_detector"]["status"] == "ok"
+
+
+def test_startup_spans_only_for_first_trace(db_path):
+    with tracing.trace("first", db_path=db_path):
+        pass
+    with tracing.trace("second", db_path=db_path):
+        pass
+
+    conn = sqlite3.connect(db_path)
+    hooks = [r[0] for r in conn.execute("SELECT hook FROM trace_spans WHERE name = 'imports'")]
+    conn.close()
+    assert hooks == ["first"]
+
+
+def test_disabled_by_environment(db_path, monkeypatch):
+    monkeypatch.setenv("CONTEXTUNE_TRACE", "0")
+
+    with tracing.trace("tool_router", db_path=db_path) as root:
+        with tracing.span("route"):
+            pass
+
+    assert root is None
+    assert not db_path.exists()
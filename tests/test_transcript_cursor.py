@@ -0,0 +1,123 @@
+"""
+Tests for incremental transcript reading: per-session cursors shared by the
+PreCompact/SessionEnd hooks, and the reverse tail reader.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+
+from transcript_cursor import TranscriptCursor
+from transcript_io import iter_entries_reverse, iter_lines_reverse, read_jsonl_from
+
+
+def append_entries(path: Path, entries: list[dict]):
+    with open(path, "a") as f:
+        for entry in entries:
+            f.write(json.dumps(entry) + "\n")
+
+
+@pytest.fixture
+def transcript(tmp_path: Path) -> Path:
+    path = tmp_path / "session.jsonl"
+    append_entries(path, [{"type": "user", "n": 1}, {"type": "assistant", "n": 2}])
+    return path
+
+
+def open_cursor(transcript: Path, consumer: str = "test") -> TranscriptCursor:
+    return TranscriptCursor("session-1", consumer, transcript, cursor_dir=transcript.parent / "cursors")
+
+
+def test_only_appended_entries_are_read(transcript):
+    cursor = open_cursor(transcript)
+    assert cursor.is_fresh
+    assert [e["n"] for e in cursor.read_new()] == [1, 2]
+    cursor.state["seen"] = 2
+    cursor.save()
+
+    append_entries(transcript, [{"type": "user", "n": 3}])
+    resumed = open_cursor(transcript)
+
+    assert resumed.entry_count == 2
+    assert resumed.state == {"seen": 2}
+    assert [e["n"] for e in resumed.read_new()] == [3]
+    assert resumed.entry_count == 3
+
+
+def test_unsaved_progress_is_reread(transcript):
+    open_cursor(transcript).read_new()
+
+    assert len(open_cursor(transcript).read_new()) == 2
+
+
+def test_consumers_are_independent(transcript):
+    first = open_cursor(transcript, "context_preserver")
+    first.read_new()
+    first.save()
+
+    assert len(open_cursor(transcript, "session_end_extractor").read_new()) == 2
+    assert open_cursor(transcript, "context_preserver").read_new() == []
+
+
+def test_rewritten_transcript_resets_cursor(transcript):
+    cursor = open_cursor(transcript)
+    cursor.read_new()
+    cursor.state["seen"] = 2
+    cursor.save()
+
+    transcript.write_text(json.dumps({"type": "user", "n": 9}) + "\n")
+    reset = open_cursor(transcript)
+
+    assert reset.is_fresh
+    assert reset.state == {}
+    assert [e["n"] for e in reset.read_new()] == [9]
+
+
+def test_partial_trailing_line_is_deferred(transcript):
+    with open(transcript, "a") as f:
+        f.write('{"type": "user", "n"')
+
+    entries, offset = read_jsonl_from(transcript)
+
+    assert len(entries) == 2
+    with open(transcript, "a") as f:
+        f.write(': 3}\n')
+    assert [e["n"] for e in read_jsonl_from(transcript, offset)[0]] == [3]
+
+
+@pytest.mark.parametrize("block_size", [1, 7, 64, 1 << 16])
+def test_reverse_lines_across_block_boundaries(tmp_path, block_size):
+    path = tmp_path / "t.jsonl"
+    entries = [{"n": i, "pad": "x" * (i * 13)} for i in range(20)]
+    append_entries(path, entries)
+
+    reversed_entries = list(iter_entries_reverse(path, block_size=block_size))
+
+    assert reversed_entries == entries[::-1]
+
+
+def test_reverse_lines_without_trailing_newline(tmp_path):
+    path = tmp_path / "t.jsonl"
+    path.write_bytes(b'{"n": 1}\n\n{"n": 2}')
+
+    assert list(iter_lines_reverse(path, block_size=4)) == [b'{"n": 2}', b'{"n": 1}']
+
+
+def test_last_assistant_message_reads_tail_only(tmp_path):
+    sys.path.insert(0, str(Path(__file__).parent.parent / "hooks"))
+    import context_preserver
+
+    path = tmp_path / "t.jsonl"
+    append_entries(path, [
+        {"type": "assistant", "message": {"content": [{"type": "text", "text": "old"}]}},
+        {"type": "assistant", "message": {"content": [{"type": "text", "text": "new"}]}},
+        {"type": "user", "message": {"content": "question"}},
+    ])
+    with open(path, "a") as f:
+        f.write("not json\n")
+
+    assert context_preserver.extract_last_message_for_scratch_pad(str(path)) == "new"
@@ -0,0 +1,72 @@
+"""
+Tests for the shared YAML loader with the parsed-document cache.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+
+import yaml_cache
+
+
+def count_parses(monkeypatch) -> list:
+    calls = []
+    real_load = yaml.load
+
+    def counting_load(*args, **kwargs):
+        calls.append(1)
+        return real_load(*args, **kwargs)
+
+    monkeypatch.setattr(yaml_cache.yaml, "load", counting_load)
+    return calls
+
+
+def test_unchanged_file_is_parsed_once(tmp_path, monkeypatch):
+    path = tmp_path / "features.yaml"
+    path.write_text("features:\n- id: feat-1\n  status: planned\n")
+    parses = count_parses(monkeypatch)
+
+    first = yaml_cache.load_file(path)
+    second = yaml_cache.load_file(path)
+
+    assert first == second == {"features": [{"id": "feat-1", "status": "planned"}]}
+    assert len(parses) == 1
+    # Callers get independent copies
+    second["features"].clear()
+    assert yaml_cache.load_file(path)["features"]
+
+
+def test_modified_file_is_reparsed(tmp_path):
+    path = tmp_path / "plan.yaml"
+    path.write_text("a: 1\n")
+    assert yaml_cache.load_file(path) == {"a": 1}
+
+    path.write_text("a: 22\n")
+    os.utime(path, ns=(0, path.stat().st_mtime_ns + 1000))
+
+    assert yaml_cache.load_file(path) == {"a": 22}
+
+
+def test_dump_file_round_trips_and_primes_cache(tmp_path, monkeypatch):
+    path = tmp_path / "decisions.yaml"
+    data = {"metadata": {"project": "ü"}, "decisions": {"entries": [{"id": "dec-1"}]}}
+
+    yaml_cache.dump_file(path, data, allow_unicode=True)
+    parses = count_parses(monkeypatch)
+
+    assert yaml_cache.load_file(path) == data
+    assert parses == []
+    assert list(yaml.safe_load(path.read_text())) == ["metadata", "decisions"]
+    assert "ü" in path.read_text(encoding="utf-8")
+
+
+def test_missing_and_empty_files_return_default(tmp_path):
+    empty = tmp_path / "empty.yaml"
+    empty.write_text("")
+
+    assert yaml_cache.load_file(tmp_path / "missing.yaml", default={}) == {}
+    assert yaml_cache.load_file(empty, default={}) == {}